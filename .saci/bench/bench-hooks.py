@@ -0,0 +1,426 @@
+#!/usr/bin/env python3
+"""
+Saci Hook Benchmark: Latency and Memory per Hook
+
+Replays the recorded hook payloads in payloads.jsonl through the hooks, each
+call in a fresh process exactly as Claude Code runs them, and reports per
+hook:
+
+  cold   first call with an empty bytecode cache (what a new machine pays)
+  first  slowest first call of a payload, before any verdict or test cache
+         holds it (what a new command pays)
+  p50/p95/p99  latency of the warm calls (bytecode cached)
+  rss    peak resident memory of a hook process (from wait4; includes the
+         ~10 MB this runner has when it forks)
+
+With --server the calls go through hook_client.py to a warm hook_server.py,
+as during `saci jump`.
+
+A hook whose p95 or first call reaches the timeout its hook config gives it
+(Claude Code then kills it, and a safety check is silently skipped) fails
+the run, and is never recorded as a baseline.
+
+Pathological inputs (huge commands, multi-MB test logs) are generated from
+the corpus entries instead of being stored. Hooks run inside a throwaway
+fixture project (git repo + package.json), so they never touch this repo.
+
+Usage:
+  bench-hooks.py                    # run and print the table
+  bench-hooks.py --check            # also compare with baseline.json (exit 1 on regression)
+  bench-hooks.py --update-baseline  # record the current numbers as the baseline
+  bench-hooks.py --hooks safety-check --runs 50 --server
+"""
+
+import argparse
+import json
+import math
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(os.path.dirname(BENCH_DIR))
+
+HOOKS = {
+    "validate-bash": ".saci/hooks/validate-bash.py",
+    "safety-check": "templates/hooks/scripts/safety-check.py",
+    "check-test-output": ".saci/hooks/check-test-output.py",
+    "check-if-done": ".saci/hooks/check-if-done.py",
+}
+
+CORPUS_FILE = os.path.join(BENCH_DIR, "payloads.jsonl")
+BASELINE_FILE = os.path.join(BENCH_DIR, "baseline.json")
+
+# Hook configs whose "timeout" (seconds) the hooks must stay under
+HOOK_CONFIGS = [
+    os.path.join(REPO_DIR, "templates", "hooks", "hooks.json"),
+    os.path.join(REPO_DIR, ".claude", "settings.json"),
+]
+
+# Claude Code's timeout for command hooks that don't set one
+DEFAULT_TIMEOUT_MS = 60000
+
+# Metrics compared against the baseline, with the absolute slack allowed on
+# top of the relative tolerance (timings on a busy machine are noisy)
+CHECKED_METRICS = {
+    "cold_ms": 20.0,
+    "p95_ms": 10.0,
+    "rss_kb": 4096,
+}
+DEFAULT_TOLERANCE = 0.5
+
+FIXTURE_PACKAGE = {
+    "name": "saci-bench-fixture",
+    "scripts": {"test": "node -e 0", "build": "node -e 0", "lint": "node -e 0"},
+}
+
+
+# ============================================================================
+# Corpus
+# ============================================================================
+
+def _long_command(size):
+    """A long && chain mixing quoting, redirects and file operations."""
+    pieces = []
+    i = 0
+    while sum(len(p) for p in pieces) < size:
+        pieces.append(f"echo \"step {i}: $HOME/'quoted path'\" >> build/log.txt && ls -la src/{i}")
+        i += 1
+    return " && ".join(pieces)
+
+
+def _huge_output(size, passing=False):
+    """A test log of about `size` chars; failing logs end with a TypeError."""
+    line = "  ✓ renders the component with the given props and state (3 ms)\n"
+    body = line * max(1, size // len(line))
+    if passing:
+        return body + "Tests: 4000 passed, 4000 total\n"
+    return body + (
+        "FAIL src/app.test.ts\n"
+        "TypeError: Cannot read properties of undefined (reading 'map')\n"
+        "    at render (src/app.ts:42:13)\n"
+    )
+
+
+def load_corpus(hooks):
+    """Corpus entries for the selected hooks, with generated payloads filled in."""
+    entries = []
+    with open(CORPUS_FILE, "r") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            if entry["hook"] not in hooks:
+                continue
+            kind = entry.get("generate")
+            if kind == "long_command":
+                entry["payload"] = {
+                    "session_id": "bench", "hook_event_name": "PreToolUse", "tool_name": "Bash",
+                    "tool_input": {"command": _long_command(entry["size"])},
+                }
+            elif kind == "huge_output":
+                entry["payload"] = {
+                    "session_id": "bench", "hook_event_name": "PostToolUse", "tool_name": "Bash",
+                    "tool_input": {"command": "npm test"},
+                    "tool_response": {"stdout": _huge_output(entry["size"], entry.get("passing")),
+                                      "stderr": "", "interrupted": False},
+                }
+            entries.append(entry)
+    return entries
+
+
+def write_payloads(root, hooks):
+    """Write each payload to its own stdin file and an index to corpus.json."""
+    entries = []
+    for index, entry in enumerate(load_corpus(hooks)):
+        path = os.path.join(root, f"payload-{index}.json")
+        with open(path, "w") as f:
+            json.dump(entry["payload"], f)
+        entries.append({"hook": entry["hook"], "name": entry["name"], "stdin": path})
+    with open(os.path.join(root, "corpus.json"), "w") as f:
+        json.dump(entries, f)
+
+
+# ============================================================================
+# Running hooks
+# ============================================================================
+
+def make_fixture(root):
+    """Throwaway project the hooks run in."""
+    project = os.path.join(root, "project")
+    os.makedirs(os.path.join(project, "src"))
+    with open(os.path.join(project, "package.json"), "w") as f:
+        json.dump(FIXTURE_PACKAGE, f)
+    with open(os.path.join(project, "src", "index.js"), "w") as f:
+        f.write("module.exports = 1\n")
+    git = ["git", "-c", "user.email=bench@saci", "-c", "user.name=bench"]
+    subprocess.run(git + ["init", "-q"], cwd=project, check=True)
+    subprocess.run(git + ["add", "-A"], cwd=project, check=True)
+    subprocess.run(git + ["commit", "-qm", "fixture"], cwd=project, check=True)
+    return project
+
+
+def run_once(argv, stdin_path, cwd, env):
+    """Run one hook process. Returns (elapsed ms, peak RSS in KB)."""
+    with open(stdin_path, "rb") as stdin:
+        start = time.perf_counter()
+        proc = subprocess.Popen(argv, stdin=stdin, stdout=subprocess.DEVNULL,
+                                stderr=subprocess.DEVNULL, cwd=cwd, env=env)
+        _, status, rusage = os.wait4(proc.pid, 0)
+        elapsed = (time.perf_counter() - start) * 1000
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    # ru_maxrss is in KB on Linux, bytes on macOS
+    rss = rusage.ru_maxrss // 1024 if sys.platform == "darwin" else rusage.ru_maxrss
+    return elapsed, rss
+
+
+def start_server(root, env):
+    """Start a warm hook server with every hook preloaded. Returns (process, socket)."""
+    socket_path = os.path.join(root, "hooks.sock")
+    scripts = [os.path.join(REPO_DIR, path) for path in HOOKS.values()]
+    server = subprocess.Popen(
+        [sys.executable, os.path.join(REPO_DIR, ".saci/hooks/hook_server.py"),
+         "--socket", socket_path, "--preload"] + scripts,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=env,
+        cwd=os.path.join(root, "project"),
+    )
+    for _ in range(50):
+        if os.path.exists(socket_path):
+            return server, socket_path
+        time.sleep(0.1)
+    server.kill()
+    raise RuntimeError("hook server did not start")
+
+
+def _server_rss(pid):
+    """Peak RSS (KB) of a running process, from /proc (Linux only)."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def percentile(values, p):
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+def bench(hooks, runs, use_server):
+    """Benchmark the hooks. Returns {hook: metrics}."""
+    root = tempfile.mkdtemp(prefix="saci-bench-")
+    server = None
+    try:
+        project = make_fixture(root)
+        env = dict(os.environ)
+        env.pop("SACI_HOOK_SOCKET", None)
+        env.update({
+            "CLAUDE_PROJECT_DIR": project,
+            "XDG_CACHE_HOME": os.path.join(root, "cache"),
+            "XDG_CONFIG_HOME": os.path.join(root, "config"),
+            "SACI_HOOKS_DIR": os.path.join(REPO_DIR, ".saci", "hooks"),
+        })
+        if use_server:
+            server, socket_path = start_server(root, env)
+            env["SACI_HOOK_SOCKET"] = socket_path
+
+        # A forked child starts with this process's peak RSS, so the multi-MB
+        # payloads are generated in a separate process to keep ours small
+        subprocess.run([sys.executable, os.path.abspath(__file__), "--write-payloads", root,
+                        "--hooks"] + list(hooks), check=True)
+        with open(os.path.join(root, "corpus.json"), "r") as f:
+            entries = json.load(f)
+
+        results = {}
+        for hook in hooks:
+            script = os.path.join(REPO_DIR, HOOKS[hook])
+            argv = [sys.executable, script]
+            if use_server:
+                argv = [sys.executable, os.path.join(REPO_DIR, ".saci/hooks/hook_client.py"), script]
+            hook_entries = [e for e in entries if e["hook"] == hook]
+            if not hook_entries:
+                continue
+
+            # Cold: empty bytecode cache; warm calls share a populated one
+            cold_env = dict(env, PYTHONPYCACHEPREFIX=tempfile.mkdtemp(dir=root))
+            cold_ms, _ = run_once(argv, hook_entries[0]["stdin"], project, cold_env)
+
+            warm_env = dict(env, PYTHONPYCACHEPREFIX=os.path.join(root, "pycache"))
+            first = {}
+            for entry in hook_entries:
+                first[entry["name"]], _ = run_once(argv, entry["stdin"], project, warm_env)
+            first_slowest = max(first, key=first.get)
+
+            timings, peak = [], 0
+            per_payload = {}
+            for _ in range(runs):
+                for entry in hook_entries:
+                    elapsed, rss = run_once(argv, entry["stdin"], project, warm_env)
+                    timings.append(elapsed)
+                    peak = max(peak, rss)
+                    per_payload.setdefault(entry["name"], []).append(elapsed)
+
+            results[hook] = {
+                "calls": len(timings),
+                "cold_ms": round(cold_ms, 1),
+                "first_ms": round(first[first_slowest], 1),
+                "first_payload": first_slowest,
+                "p50_ms": round(percentile(timings, 50), 1),
+                "p95_ms": round(percentile(timings, 95), 1),
+                "p99_ms": round(percentile(timings, 99), 1),
+                "rss_kb": peak,
+                "slowest_payload": max(per_payload, key=lambda name: percentile(per_payload[name], 50)),
+            }
+
+        if server:
+            results["_server"] = {"rss_kb": _server_rss(server.pid)}
+        return results
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+        shutil.rmtree(root, ignore_errors=True)
+
+
+# ============================================================================
+# Reporting and baseline
+# ============================================================================
+
+def print_table(results, mode):
+    print(f"Hook latency ({mode} mode)")
+    print(f"{'hook':<20}{'calls':>6}{'cold':>9}{'first':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'rss':>10}  slowest payload")
+    for hook, m in results.items():
+        if hook.startswith("_"):
+            continue
+        print(f"{hook:<20}{m['calls']:>6}{m['cold_ms']:>7.1f}ms{m['first_ms']:>7.1f}ms{m['p50_ms']:>7.1f}ms"
+              f"{m['p95_ms']:>7.1f}ms{m['p99_ms']:>7.1f}ms{m['rss_kb'] / 1024:>8.1f}MB  {m['slowest_payload']}")
+    server = results.get("_server")
+    if server and server.get("rss_kb"):
+        print(f"hook server peak RSS: {server['rss_kb'] / 1024:.1f}MB")
+
+
+def hook_timeouts():
+    """Timeout (ms) of each benchmarked hook: the lowest any hook config gives it."""
+    timeouts = {hook: DEFAULT_TIMEOUT_MS for hook in HOOKS}
+    for path in HOOK_CONFIGS:
+        try:
+            with open(path, "r") as f:
+                config = json.load(f)
+        except (OSError, ValueError):
+            continue
+        for groups in config.get("hooks", {}).values():
+            for group in groups:
+                for entry in group.get("hooks", []):
+                    if not isinstance(entry.get("timeout"), (int, float)):
+                        continue
+                    for hook, script in HOOKS.items():
+                        if os.path.basename(script) in entry.get("command", ""):
+                            timeouts[hook] = min(timeouts[hook], entry["timeout"] * 1000)
+    return timeouts
+
+
+def check_timeouts(results, timeouts):
+    """Return a message for every hook whose p95 or first call reaches its hook timeout."""
+    messages = []
+    for hook, metrics in results.items():
+        if hook.startswith("_"):
+            continue
+        for metric, payload in (("p95_ms", "slowest_payload"), ("first_ms", "first_payload")):
+            if metrics[metric] >= timeouts[hook]:
+                messages.append(f"{hook} {metric}: {metrics[metric]} >= hook timeout "
+                                f"{timeouts[hook]:.0f} (payload {metrics[payload]})")
+    return messages
+
+
+def check_baseline(results, baseline, tolerance):
+    """Return a list of regression messages (empty if within tolerance)."""
+    regressions = []
+    for hook, metrics in results.items():
+        expected = baseline.get(hook)
+        if hook.startswith("_") or not expected:
+            continue
+        for metric, slack in CHECKED_METRICS.items():
+            if metric not in expected:
+                continue
+            limit = expected[metric] * (1 + tolerance) + slack
+            if metrics[metric] > limit:
+                regressions.append(
+                    f"{hook} {metric}: {metrics[metric]} > {limit:.1f} (baseline {expected[metric]})"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Saci hooks")
+    parser.add_argument("--hooks", nargs="+", choices=sorted(HOOKS), default=list(HOOKS),
+                        help="Hooks to benchmark (default: all)")
+    parser.add_argument("--runs", type=int, default=10, help="Replays of the corpus per hook")
+    parser.add_argument("--server", action="store_true", help="Run hooks through the warm hook server")
+    parser.add_argument("--check", action="store_true", help="Fail if slower/larger than baseline.json")
+    parser.add_argument("--update-baseline", action="store_true", help="Write results to baseline.json")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed relative regression for --check (default 0.5 = +50%%)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--write-payloads", metavar="DIR", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.write_payloads:
+        write_payloads(args.write_payloads, args.hooks)
+        return
+
+    mode = "server" if args.server else "process"
+    results = bench(args.hooks, args.runs, args.server)
+
+    if args.json:
+        print(json.dumps({mode: results}, indent=2))
+    else:
+        print_table(results, mode)
+
+    try:
+        with open(BASELINE_FILE, "r") as f:
+            baseline = json.load(f)
+    except (OSError, ValueError):
+        baseline = {}
+
+    timed_out = check_timeouts(results, hook_timeouts())
+    if timed_out:
+        print("\nHOOK TIMEOUT:", file=sys.stderr)
+        for message in timed_out:
+            print(f"  {message}", file=sys.stderr)
+        if args.update_baseline:
+            print("Baseline not updated", file=sys.stderr)
+        sys.exit(1)
+
+    if args.update_baseline:
+        recorded = baseline.setdefault(mode, {})
+        for hook, metrics in results.items():
+            if not hook.startswith("_"):
+                recorded[hook] = {metric: metrics[metric] for metric in CHECKED_METRICS}
+        with open(BASELINE_FILE, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Baseline updated: {os.path.relpath(BASELINE_FILE, REPO_DIR)} ({mode})")
+
+    if args.check:
+        if mode not in baseline:
+            print(f"No {mode} baseline in {BASELINE_FILE}; run with --update-baseline first", file=sys.stderr)
+            sys.exit(1)
+        regressions = check_baseline(results, baseline[mode], args.tolerance)
+        if regressions:
+            print("\nPERFORMANCE REGRESSION:", file=sys.stderr)
+            for message in regressions:
+                print(f"  {message}", file=sys.stderr)
+            sys.exit(1)
+        print("Within baseline")
+
+
+if __name__ == "__main__":
+    main()
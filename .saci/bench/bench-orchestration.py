@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Saci Orchestration Benchmark: What Saci Itself Costs per Iteration
+
+Runs `saci jump --provider stub` (lib/stub_cli.py: canned sessions, no model,
+no network) over a synthetic PRP in a throwaway git project, then reads the
+run's timing trace (see lib/profile_report.py) and reports:
+
+  overhead    per iteration: wall-clock time minus the CLI session, i.e.
+              prompt building, PRP queries, tests, commit and bookkeeping,
+              with the phases it is spent in
+  selection   latency of picking the next task (`loop-state` sequentially,
+              `ready` with --jobs)
+  throughput  completed tasks per minute over the whole run, and the share
+              of the run's wall-clock time that is not inside a CLI session
+
+The synthetic PRP has --tasks tasks over --features features. With
+--fan-out K the tasks form a K-ary dependency tree (task i depends on task
+(i-1) // K), so K controls how many tasks each completion unlocks; 0 makes
+them independent. Each task's test checks for the file its stub session
+writes, so every task passes on its first iteration.
+
+Usage:
+  bench-orchestration.py                          # 20 independent tasks
+  bench-orchestration.py --tasks 50 --fan-out 3 --jobs 4
+  bench-orchestration.py --delay-ms 500 --json    # with 0.5s of "model" time
+  bench-orchestration.py -- --no-hook-server      # extra saci jump options
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(os.path.dirname(BENCH_DIR))
+SACI = os.path.join(REPO_DIR, "saci.sh")
+
+sys.path.insert(0, os.path.join(REPO_DIR, "lib"))
+import profile_report  # noqa: E402
+
+
+# PRP queries that pick the next task
+SELECTION_QUERIES = ("loop-state", "ready")
+
+
+# ============================================================================
+# Fixture
+# ============================================================================
+
+def synthetic_prp(tasks, features, fan_out):
+    """PRP with `tasks` tasks spread over `features` features."""
+    ids = [f"F{i * features // tasks + 1}-T{i + 1}" for i in range(tasks)]
+    prp = {"project": {"name": "Saci orchestration bench"}, "features": []}
+    for number in range(1, features + 1):
+        prp["features"].append({"id": f"F{number}", "name": f"Feature {number}", "tasks": []})
+
+    for i, task_id in enumerate(ids):
+        dependencies = [ids[(i - 1) // fan_out]] if fan_out and i else []
+        feature = prp["features"][int(task_id[1:task_id.index("-")]) - 1]
+        feature["tasks"].append({
+            "id": task_id,
+            "title": f"Synthetic task {i + 1}",
+            "description": "Generated by bench-orchestration.py",
+            "dependencies": dependencies,
+            "passes": False,
+            "tests": {"command": f"test -f stub/{task_id}.txt"},
+        })
+    return prp
+
+
+def make_fixture(root, prp):
+    """Throwaway git project with the PRP committed."""
+    project = os.path.join(root, "project")
+    os.makedirs(project)
+    with open(os.path.join(project, "prp.json"), "w") as f:
+        json.dump(prp, f, indent=2)
+    with open(os.path.join(project, ".gitignore"), "w") as f:
+        f.write(".saci/\n")
+    git = ["git", "-c", "user.email=bench@saci", "-c", "user.name=bench"]
+    subprocess.run(git + ["init", "-q"], cwd=project, check=True)
+    subprocess.run(git + ["add", "-A"], cwd=project, check=True)
+    subprocess.run(git + ["commit", "-qm", "fixture"], cwd=project, check=True)
+    # saci jump commits each task; give the fixture an identity for it
+    subprocess.run(["git", "config", "user.email", "bench@saci"], cwd=project, check=True)
+    subprocess.run(["git", "config", "user.name", "bench"], cwd=project, check=True)
+    return project
+
+
+# ============================================================================
+# Benchmark
+# ============================================================================
+
+def _stats(values):
+    if not values:
+        return {"count": 0, "mean_ms": 0, "p50_ms": 0, "p95_ms": 0, "max_ms": 0}
+    return {
+        "count": len(values),
+        "mean_ms": round(sum(values) / len(values), 1),
+        "p50_ms": round(profile_report._percentile(values, 0.5), 1),
+        "p95_ms": round(profile_report._percentile(values, 0.95), 1),
+        "max_ms": round(max(values), 1),
+    }
+
+
+def analyze(spans, wall_ms, tasks):
+    """Benchmark results from the trace of one run."""
+    iterations = profile_report.iterations(spans)
+    overhead, cli, phases = [], [], {}
+    for entry in iterations:
+        cli_ms = sum(row["total_ms"] for row in entry["phases"] if row["name"] == "cli")
+        cli.append(cli_ms)
+        overhead.append(entry["wall_ms"] - cli_ms)
+        for row in entry["phases"]:
+            if row["name"] != "cli":
+                phases.setdefault(f"{row['kind']} {row['name']}", []).append(row["total_ms"])
+        phases.setdefault("other", []).append(entry["other_ms"])
+
+    selection = [span["duration_ms"] for span in spans
+                 if span.get("kind") == "prp" and span.get("name") in SELECTION_QUERIES]
+    completed = sum(1 for entry in iterations if entry["outcome"] == "success")
+    total_cli = sum(cli)
+    return {
+        "tasks": tasks,
+        "completed": completed,
+        "iterations": len(iterations),
+        "wall_ms": round(wall_ms, 1),
+        "tasks_per_minute": round(completed * 60000 / wall_ms, 1) if wall_ms else 0,
+        "saci_share": round(max(0, 1 - total_cli / wall_ms), 3) if wall_ms else 0,
+        "overhead": _stats(overhead),
+        "overhead_phases": {name: round(sum(values) / len(values), 1)
+                            for name, values in sorted(phases.items(), key=lambda item: -sum(item[1]))},
+        "cli": _stats(cli),
+        "selection": _stats(selection),
+    }
+
+
+def bench(tasks, features, fan_out, jobs, delay_ms, saci_args, keep=False):
+    root = tempfile.mkdtemp(prefix="saci-bench-orchestration-")
+    try:
+        project = make_fixture(root, synthetic_prp(tasks, features, fan_out))
+        env = dict(os.environ, SACI_STUB_DELAY_MS=str(delay_ms),
+                   XDG_CACHE_HOME=os.path.join(root, "cache"), TUI_MODE="false")
+        for name in ("SACI_HOOK_SOCKET", "SACI_TRACE_FILE", "SACI_TASK_ID", "SACI_ITERATION", "SACI_STUB_SCRIPT"):
+            env.pop(name, None)
+
+        argv = ["bash", SACI, "jump", "--provider", "stub", "--max-iter", "1", "--jobs", str(jobs)] + saci_args
+        start = time.perf_counter()
+        result = subprocess.run(argv, cwd=project, env=env, stdin=subprocess.DEVNULL,
+                                stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        wall_ms = (time.perf_counter() - start) * 1000
+        spans = profile_report.load_spans(os.path.join(project, profile_report.TRACE_FILE))
+        if result.returncode != 0 or not spans:
+            tail = result.stdout.decode("utf-8", "replace").splitlines()[-20:]
+            raise RuntimeError("saci jump failed:\n" + "\n".join(tail))
+
+        results = analyze(spans, wall_ms, tasks)
+        results.update({"features": features, "fan_out": fan_out, "jobs": jobs, "delay_ms": delay_ms})
+        if keep:
+            results["fixture"] = project
+        return results
+    finally:
+        if not keep:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+# ============================================================================
+# Reporting
+# ============================================================================
+
+def _row(name, stats):
+    return (f"  {name:<22}{stats['count']:>6}{stats['mean_ms']:>10.1f}ms{stats['p50_ms']:>9.1f}ms"
+            f"{stats['p95_ms']:>9.1f}ms{stats['max_ms']:>9.1f}ms")
+
+
+def print_report(results):
+    print(f"Saci orchestration: {results['tasks']} tasks, {results['features']} feature(s), "
+          f"fan-out {results['fan_out']}, jobs {results['jobs']}, stub delay {results['delay_ms']}ms")
+    print(f"  completed {results['completed']}/{results['tasks']} in {results['iterations']} iteration(s), "
+          f"{results['wall_ms'] / 1000:.2f}s - {results['tasks_per_minute']} tasks/min, "
+          f"{100 * results['saci_share']:.1f}% of the run outside CLI sessions")
+    print("")
+    print(f"  {'':<22}{'count':>6}{'mean':>12}{'p50':>11}{'p95':>11}{'max':>11}")
+    print(_row("overhead/iteration", results["overhead"]))
+    print(_row("cli session", results["cli"]))
+    print(_row("task selection", results["selection"]))
+    print("")
+    print("  Overhead per iteration by phase (mean):")
+    for name, mean_ms in results["overhead_phases"].items():
+        print(f"    {name:<20}{mean_ms:>10.1f}ms")
+    if results.get("fixture"):
+        print("")
+        print(f"  Fixture kept in {results['fixture']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Saci's orchestration overhead offline")
+    parser.add_argument("--tasks", type=int, default=20, help="Tasks in the synthetic PRP (default: 20)")
+    parser.add_argument("--features", type=int, default=1, help="Features the tasks are spread over")
+    parser.add_argument("--fan-out", type=int, default=0,
+                        help="Dependents per task (K-ary dependency tree); 0 = independent tasks")
+    parser.add_argument("--jobs", type=int, default=1, help="saci jump --jobs (default: 1)")
+    parser.add_argument("--delay-ms", type=int, default=0, help="Model time of each stub session")
+    parser.add_argument("--keep", action="store_true", help="Keep the fixture project for inspection")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("saci_args", nargs="*", help="Extra saci jump options (after --)")
+    args = parser.parse_args()
+
+    if args.tasks < 1 or not 1 <= args.features <= args.tasks or args.fan_out < 0 or args.jobs < 1:
+        parser.error("need tasks >= 1, 1 <= features <= tasks, fan-out >= 0 and jobs >= 1")
+
+    try:
+        results = bench(args.tasks, args.features, args.fan_out, args.jobs, args.delay_ms,
+                        args.saci_args, args.keep)
+    except (RuntimeError, OSError, subprocess.SubprocessError) as e:
+        print(f"Benchmark failed: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_report(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -20,7 +20,7 @@ echo ""
 # Test 1: Context Injection (UserPromptSubmit)
 echo -e "${YELLOW}Test 1: UserPromptSubmit Hook${NC}"
 echo "Simulating prompt submission..."
-context_output=$(.saci/hooks/add-context.sh 2>&1)
+context_output=$(.saci/hooks/add-context.py < /dev/null 2>&1)
 if echo "$context_output" | grep -q "Repository Context"; then
     echo -e "${GREEN}✓ PASS${NC}: Context injection working"
 else
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Saci UserPromptSubmit Hook: Auto Context Injection
+
+Injects repository context at the start of each Claude Code iteration so
+Claude does not have to search for it:
+
+- current git branch, uncommitted file count and the last 3 commits
+- npm scripts (read from package.json, without booting Node for `npm run`)
+- last npm error from ~/.npm/_logs (if any)
+- project type (framework, language, test runner)
+
+Everything except the uncommitted file count is cached in
+.saci/cache/repo-context.json (and in memory inside the warm hook server),
+keyed by HEAD, the index and the manifests, so repeated prompts in the same
+iteration only cost a few stat() calls plus one `git status`. The count is
+always fresh: editing a file changes neither HEAD nor the index.
+
+Exit code: 0 (always allow, just adding context)
+
+Input (stdin): JSON (not used, but required by hook protocol)
+Output (stdout): Context text that gets added to the prompt
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+import project_meta
+import saci_trace
+from saci_cache import load_json, save_json
+
+
+CONTEXT_FILE = "repo-context.json"
+
+# Bump when the cached layout changes
+CONTEXT_VERSION = 1
+
+# Scripts listed (the rest are left to package.json)
+MAX_SCRIPTS = 10
+
+# Commits listed under "Recent commits"
+RECENT_COMMITS = 3
+
+# npm logs older than this (seconds) are not searched for errors
+NPM_LOG_MAX_AGE = 24 * 60 * 60
+
+# (package.json dependency, label) - first match wins
+FRAMEWORKS = [("next", "Next.js"), ("react", "React"), ("vue", "Vue.js"), ("@angular/core", "Angular")]
+TEST_RUNNERS = [("jest", "Jest"), ("vitest", "Vitest"), ("mocha", "Mocha")]
+
+# In-process memo: absolute cwd -> (signature, sections)
+_MEMO = {}
+
+
+def _stat(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _read_text(path):
+    try:
+        with open(path, "r", errors="replace") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _git(args):
+    try:
+        result = subprocess.run(["git"] + args, capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout if result.returncode == 0 else None
+
+
+# ============================================================================
+# Git state, read from .git without spawning git
+# ============================================================================
+
+def find_git_dir(start="."):
+    """The git directory of the work tree containing `start`, or None."""
+    path = os.path.abspath(start)
+    while True:
+        dot_git = os.path.join(path, ".git")
+        if os.path.isdir(dot_git):
+            return dot_git
+        if os.path.isfile(dot_git):
+            # Worktrees and submodules: "gitdir: <path>"
+            content = _read_text(dot_git) or ""
+            if content.startswith("gitdir:"):
+                return os.path.normpath(os.path.join(path, content[len("gitdir:"):].strip()))
+            return None
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None
+        path = parent
+
+
+def _common_dir(git_dir):
+    """Where refs live: the main .git for a linked worktree, else git_dir."""
+    common = _read_text(os.path.join(git_dir, "commondir"))
+    return os.path.normpath(os.path.join(git_dir, common.strip())) if common else git_dir
+
+
+def _resolve_ref(git_dir, ref):
+    for base in dict.fromkeys([git_dir, _common_dir(git_dir)]):
+        value = _read_text(os.path.join(base, ref))
+        if value is not None:
+            return value.strip()
+    for line in (_read_text(os.path.join(_common_dir(git_dir), "packed-refs")) or "").splitlines():
+        if line.endswith(" " + ref):
+            return line.split(" ", 1)[0]
+    return None
+
+
+def read_head(git_dir):
+    """(branch or None when detached, commit sha or None before the first commit)."""
+    head = (_read_text(os.path.join(git_dir, "HEAD")) or "").strip()
+    if head.startswith("ref:"):
+        ref = head[len("ref:"):].strip()
+        branch = ref[len("refs/heads/"):] if ref.startswith("refs/heads/") else ref
+        return branch, _resolve_ref(git_dir, ref)
+    return None, head or None
+
+
+# ============================================================================
+# Context sections
+# ============================================================================
+
+def _npm_logs_dir():
+    return os.path.join(os.path.expanduser("~"), ".npm", "_logs")
+
+
+def _signature(git_dir):
+    """Everything the cached sections depend on."""
+    head = read_head(git_dir) if git_dir else None
+    return [
+        head and list(head),
+        _stat(os.path.join(git_dir, "index")) if git_dir else None,
+        _stat("package.json"),
+        _stat("tsconfig.json"),
+        _stat(_npm_logs_dir()),
+    ]
+
+
+def _last_npm_error():
+    """Last `npm ERR!` line of the newest recent npm log that has one."""
+    logs_dir = _npm_logs_dir()
+    try:
+        names = [name for name in os.listdir(logs_dir) if name.endswith(".log")]
+    except OSError:
+        return None
+    cutoff = time.time() - NPM_LOG_MAX_AGE
+    logs = []
+    for name in names:
+        path = os.path.join(logs_dir, name)
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            continue
+        if mtime >= cutoff:
+            logs.append((mtime, path))
+    for _, path in sorted(logs, reverse=True):
+        errors = [line for line in (_read_text(path) or "").splitlines() if "npm ERR!" in line]
+        if errors:
+            return errors[-1]
+    return None
+
+
+def _project_type(package_text):
+    lines = []
+    for dependency, label in FRAMEWORKS:
+        if f'"{dependency}"' in package_text:
+            lines.append(f"- **Framework**: {label}")
+            break
+    lines.append("- **Language**: " + ("TypeScript" if os.path.isfile("tsconfig.json") else "JavaScript"))
+    for dependency, label in TEST_RUNNERS:
+        if f'"{dependency}"' in package_text:
+            lines.append(f"- **Testing**: {label}")
+            break
+    return lines
+
+
+def build_sections(git_dir):
+    """The cacheable parts of the context."""
+    sections = {"git": None, "npm": None, "project_type": []}
+
+    if git_dir:
+        branch, sha = read_head(git_dir)
+        commits = _git(["log", "--oneline", f"-{RECENT_COMMITS}"]) if sha else None
+        sections["git"] = {
+            "branch": branch or "detached HEAD",
+            "commits": commits.splitlines() if commits else [],
+        }
+
+    package_text = _read_text("package.json")
+    if package_text is not None:
+        scripts = project_meta.load()["scripts"]
+        logs_exist = os.path.isdir(_npm_logs_dir())
+        sections["npm"] = {
+            "scripts": [[name, body] for name, body in scripts.items()][:MAX_SCRIPTS],
+            "logs": logs_exist,
+            "error": _last_npm_error() if logs_exist else None,
+        }
+        sections["project_type"] = _project_type(package_text)
+
+    return sections
+
+
+def load_sections():
+    """Cached sections for the current directory, rebuilt when their inputs change."""
+    git_dir = find_git_dir()
+    signature = _signature(git_dir)
+
+    key = os.getcwd()
+    memo = _MEMO.get(key)
+    if memo and memo[0] == signature:
+        return git_dir, memo[1]
+
+    cached = load_json(CONTEXT_FILE, None)
+    if isinstance(cached, dict) and cached.get("version") == CONTEXT_VERSION \
+            and cached.get("signature") == signature:
+        sections = cached["sections"]
+    else:
+        sections = build_sections(git_dir)
+        # Only worth persisting for real projects; don't create .saci/cache elsewhere
+        if git_dir or sections["npm"]:
+            save_json(CONTEXT_FILE, {"version": CONTEXT_VERSION, "signature": signature,
+                                     "sections": sections})
+
+    _MEMO[key] = (signature, sections)
+    return git_dir, sections
+
+
+def uncommitted_count():
+    status = _git(["status", "--porcelain"])
+    return len(status.splitlines()) if status else 0
+
+
+def render(sections, uncommitted):
+    lines = ["## 🔍 Repository Context", ""]
+
+    git = sections["git"]
+    if git:
+        lines.append("### Git Status")
+        lines.append(f"- **Branch**: {git['branch']}")
+        if uncommitted > 0:
+            lines.append(f"- **Uncommitted changes**: {uncommitted} file(s)")
+        else:
+            lines.append("- **Working tree**: clean")
+        lines.append("- **Recent commits**:")
+        lines.extend(f"  - {commit}" for commit in git["commits"] or ["No commits yet"])
+        lines.append("")
+
+    npm = sections["npm"]
+    if npm:
+        lines.append("### Available npm Scripts")
+        if npm["scripts"]:
+            lines.extend(f"- `{name}`: {body}" for name, body in npm["scripts"])
+        else:
+            lines.append("- No scripts defined")
+        lines.append("")
+
+        lines.append("### Last npm Error (if any)")
+        if not npm["logs"]:
+            lines.append("✓ No npm log directory")
+        elif npm["error"]:
+            lines.extend(["⚠️  Recent error found:", "```", npm["error"], "```"])
+        else:
+            lines.append("✓ No recent npm errors")
+        lines.append("")
+
+    lines.append("### Project Type")
+    lines.extend(sections["project_type"])
+    lines.extend(["", "---", ""])
+    return "\n".join(lines)
+
+
+def main():
+    # Read input (required by hook protocol, but we don't use it)
+    try:
+        if not sys.stdin.isatty():
+            sys.stdin.read()
+    except (OSError, ValueError):
+        pass
+
+    try:
+        git_dir, sections = load_sections()
+        print(render(sections, uncommitted_count() if git_dir else 0))
+    except Exception as e:
+        # Context is a convenience; never block the prompt over it
+        print(f"Warning: could not build repository context: {e}", file=sys.stderr)
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    saci_trace.run_hook(main, __file__)
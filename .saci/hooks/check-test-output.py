@@ -23,117 +23,295 @@ import json
 import sys
 import re
 
+import saci_trace
+from regex_prefilter import priority_regex, required_literals
 
-def classify_error(output):
-    """
-    Classify error type based on output text.
+try:
+    import rule_packs
+except ImportError:
+    rule_packs = None
 
-    Returns: dict with type, reason, suggestion
-    """
-    output_lower = output.lower()
 
+# Hook input larger than this (chars) is classified while streaming from
+# stdin instead of being loaded and decoded in one piece
+STREAMING_THRESHOLD = 1 << 20
+
+# Stdin read size in streaming mode
+READ_SIZE = 1 << 16
+
+# Text is scanned in line-aligned chunks of about this many chars
+CHUNK_CHARS = 1 << 20
+
+# The last line of each chunk is scanned again with the next one, so a match
+# spanning the boundary is not lost; capped for pathological single lines
+OVERLAP_CHARS = 4096
+
+# Max combined regexes kept (one per distinct candidate set)
+MATCHER_CACHE_SIZE = 64
+
+
+# ============================================================================
+# Classification patterns - in priority order (first matching pattern wins)
+# ============================================================================
+
+CLASSIFICATION_PATTERNS = [
     # ENVIRONMENT ERRORS - Missing dependencies, scripts, paths
-    environment_patterns = [
-        (r"npm ERR!.*missing script", "ENVIRONMENT",
-         "npm script missing",
-         "Check package.json for available scripts. Use 'npm run' to list all scripts."),
+    (r"npm ERR!.*missing script", "ENVIRONMENT",
+     "npm script missing",
+     "Check package.json for available scripts. Use 'npm run' to list all scripts."),
 
-        (r"ENOENT:? no such file or directory", "ENVIRONMENT",
-         "File or directory not found",
-         "Verify the file path exists. Check for typos in the path."),
+    (r"ENOENT:? no such file or directory", "ENVIRONMENT",
+     "File or directory not found",
+     "Verify the file path exists. Check for typos in the path."),
 
-        (r"(command not found|No such file or directory).*\b(npm|node|npx|yarn)\b", "ENVIRONMENT",
-         "Node.js command not found",
-         "Ensure Node.js and npm are installed. Check PATH environment variable."),
+    (r"(command not found|No such file or directory).*\b(npm|node|npx|yarn)\b", "ENVIRONMENT",
+     "Node.js command not found",
+     "Ensure Node.js and npm are installed. Check PATH environment variable."),
 
-        (r"Cannot find module", "ENVIRONMENT",
-         "Missing Node.js module",
-         "Run 'npm install' to install dependencies. Check if module name is correct."),
+    (r"Cannot find module", "ENVIRONMENT",
+     "Missing Node.js module",
+     "Run 'npm install' to install dependencies. Check if module name is correct."),
 
-        (r"MODULE_NOT_FOUND", "ENVIRONMENT",
-         "Module not found",
-         "Install missing dependency with 'npm install <package-name>'."),
+    (r"MODULE_NOT_FOUND", "ENVIRONMENT",
+     "Module not found",
+     "Install missing dependency with 'npm install <package-name>'."),
 
-        (r"EACCES.*permission denied", "ENVIRONMENT",
-         "Permission denied",
-         "Check file permissions. You may need to run with appropriate permissions."),
+    (r"EACCES.*permission denied", "ENVIRONMENT",
+     "Permission denied",
+     "Check file permissions. You may need to run with appropriate permissions."),
 
-        (r"Port \d+ is already in use", "ENVIRONMENT",
-         "Port already in use",
-         "Stop the process using that port or use a different port."),
-    ]
+    (r"Port \d+ is already in use", "ENVIRONMENT",
+     "Port already in use",
+     "Stop the process using that port or use a different port."),
 
     # CODE ERRORS - Syntax, type errors, logic bugs
-    code_patterns = [
-        (r"SyntaxError:", "CODE",
-         "JavaScript/TypeScript syntax error",
-         "Fix the syntax error. Check for missing brackets, semicolons, or typos."),
+    (r"SyntaxError:", "CODE",
+     "JavaScript/TypeScript syntax error",
+     "Fix the syntax error. Check for missing brackets, semicolons, or typos."),
 
-        (r"TypeError:", "CODE",
-         "Type error",
-         "Check variable types and initialization. Common issue: calling method on undefined/null."),
+    (r"TypeError:", "CODE",
+     "Type error",
+     "Check variable types and initialization. Common issue: calling method on undefined/null."),
 
-        (r"ReferenceError:", "CODE",
-         "Reference error",
-         "Variable is not defined. Check if variable name is correct and in scope."),
+    (r"ReferenceError:", "CODE",
+     "Reference error",
+     "Variable is not defined. Check if variable name is correct and in scope."),
 
-        (r"Test (failed|failure)", "CODE",
-         "Test failure",
-         "Debug the failing test. Check test expectations vs actual behavior."),
+    (r"Test (failed|failure)", "CODE",
+     "Test failure",
+     "Debug the failing test. Check test expectations vs actual behavior."),
 
-        (r"\d+\s+(tests?|specs?|checks?)\s+(failing|failed)", "CODE",
-         "Tests failed",
-         "Review failing tests. Fix code logic to pass tests."),
+    (r"\d+\s+(tests?|specs?|checks?)\s+(failing|failed)", "CODE",
+     "Tests failed",
+     "Review failing tests. Fix code logic to pass tests."),
 
-        (r"^FAIL\s+", "CODE",
-         "Test failure detected",
-         "Review the failing tests and fix the code issues."),
+    (r"^FAIL\s+", "CODE",
+     "Test failure detected",
+     "Review the failing tests and fix the code issues."),
 
-        (r"Expected .* but (got|received)", "CODE",
-         "Assertion failure",
-         "Check test assertions. Actual value doesn't match expected value."),
+    (r"Expected .* but (got|received)", "CODE",
+     "Assertion failure",
+     "Check test assertions. Actual value doesn't match expected value."),
 
-        (r"ESLint.*error", "CODE",
-         "Linting error",
-         "Fix code style issues. Run 'npm run lint:fix' if available."),
-    ]
+    (r"ESLint.*error", "CODE",
+     "Linting error",
+     "Fix code style issues. Run 'npm run lint:fix' if available."),
 
     # TIMEOUT ERRORS
-    timeout_patterns = [
-        (r"(timeout|timed out|ETIMEDOUT)", "TIMEOUT",
-         "Operation timed out",
-         "Check for infinite loops or hanging operations. Increase timeout if needed."),
-
-        (r"(killed|SIGTERM|SIGKILL)", "TIMEOUT",
-         "Process killed",
-         "Process was terminated. May be due to timeout or resource limits."),
-    ]
-
-    # Check all patterns
-    for patterns in [environment_patterns, code_patterns, timeout_patterns]:
-        for pattern, error_type, reason, suggestion in patterns:
-            if re.search(pattern, output, re.IGNORECASE | re.MULTILINE):
-                return {
-                    "type": error_type,
-                    "reason": reason,
-                    "suggestion": suggestion,
-                    "matched_pattern": pattern
-                }
-
-    # Default: UNKNOWN
-    return {
-        "type": "UNKNOWN",
-        "reason": "Unclassified error",
-        "suggestion": "Review the error output carefully to understand the issue."
-    }
+    (r"(timeout|timed out|ETIMEDOUT)", "TIMEOUT",
+     "Operation timed out",
+     "Check for infinite loops or hanging operations. Increase timeout if needed."),
+
+    (r"(killed|SIGTERM|SIGKILL)", "TIMEOUT",
+     "Process killed",
+     "Process was terminated. May be due to timeout or resource limits."),
+]
+
+CLASSIFICATION_FLAGS = re.IGNORECASE | re.MULTILINE
+
+
+_MATCHERS = {}
+
+
+def _matcher(patterns, candidates):
+    """Combined regex for a candidate subset of `patterns` (cached)."""
+    key = tuple(patterns[i][0] for i in candidates)
+    if key not in _MATCHERS:
+        if len(_MATCHERS) >= MATCHER_CACHE_SIZE:
+            _MATCHERS.clear()
+        try:
+            _MATCHERS[key] = priority_regex(
+                [(i, patterns[i][0]) for i in candidates], CLASSIFICATION_FLAGS
+            )
+        except re.error:
+            _MATCHERS[key] = None
+    return _MATCHERS[key]
+
+
+def classification_index(patterns):
+    """Prefilter data for a pattern table: required literals per pattern."""
+    return [required_literals(p[0]) for p in patterns]
+
+
+_BUILTIN_LITERALS = []
+
+
+def _builtin_literals():
+    if not _BUILTIN_LITERALS:
+        _BUILTIN_LITERALS.extend(classification_index(CLASSIFICATION_PATTERNS))
+    return _BUILTIN_LITERALS
+
+
+def active_patterns():
+    """
+    Classification patterns in effect: the built-in table merged with any
+    rule packs (.saci/rules.json, ~/.config/saci/rules.json).
+
+    Returns: (patterns, literals or None if they must be derived)
+    """
+    if rule_packs is None:
+        return CLASSIFICATION_PATTERNS, None
+    try:
+        return rule_packs.load_table("classify", CLASSIFICATION_PATTERNS, classification_index)
+    except Exception as e:
+        print(f"Warning: rule packs not loaded: {e}", file=sys.stderr)
+        return CLASSIFICATION_PATTERNS, None
+
+
+class StreamingClassifier:
+    """
+    Classify command output fed in pieces, with bounded memory.
+
+    Text is scanned in line-aligned chunks. Per chunk, a substring prefilter
+    on each pattern's required literals picks the candidates, and one
+    combined regex reports the highest-priority candidate that matches. Only
+    patterns ranked above the best match so far are tried on later chunks,
+    so the first-match priority of the pattern list is preserved. Error
+    details (file:line, message) are taken from the first chunk that has them.
+    """
+
+    def __init__(self, patterns=None, literals=None):
+        if patterns is None:
+            patterns, literals = active_patterns()
+        self.patterns = patterns
+        if literals is None:
+            literals = _builtin_literals() if patterns is CLASSIFICATION_PATTERNS \
+                else classification_index(patterns)
+        self.literals = literals
+        self.best = None        # index of the best matching pattern so far
+        self.details = {}
+        self.length = 0         # total chars fed
+        self._pending = []
+        self._pending_len = 0
+        self._overlap = ""      # last line of the previous chunk
+
+    def feed(self, text):
+        if not text:
+            return
+        self.length += len(text)
+        self._pending.append(text)
+        self._pending_len += len(text)
+        if self._pending_len >= CHUNK_CHARS:
+            self._scan(final=False)
+
+    def finish(self):
+        """Scan whatever is left and return the classification dict."""
+        self._scan(final=True)
+        return self.classification()
+
+    def _done(self):
+        return self.best == 0 and "file" in self.details and "message" in self.details
+
+    def _scan(self, final):
+        data = "".join(self._pending)
+        self._pending = []
+        self._pending_len = 0
+
+        if not final:
+            cut = data.rfind("\n") + 1
+            if cut:
+                data, rest = data[:cut], data[cut:]
+                if rest:
+                    self._pending = [rest]
+                    self._pending_len = len(rest)
+
+        if not data or self._done():
+            return
+
+        chunk = self._overlap + data
+        self._match(chunk)
+
+        if "file" not in self.details or "message" not in self.details:
+            found = extract_error_details(chunk)
+            if "file" in found and "file" not in self.details:
+                self.details.update((k, found[k]) for k in ("file", "line", "column") if k in found)
+            if "message" in found and "message" not in self.details:
+                self.details["message"] = found["message"]
+
+        last_line = chunk.rfind("\n", 0, len(chunk) - 1) + 1
+        self._overlap = chunk[last_line:][-OVERLAP_CHARS:]
+
+    def _match(self, chunk):
+        limit = len(self.patterns) if self.best is None else self.best
+        if limit == 0:
+            return
+
+        lowered = chunk.lower()
+        candidates = tuple(
+            i for i in range(limit)
+            if self.literals[i] is None or any(lit in lowered for lit in self.literals[i])
+        )
+        if not candidates:
+            return
+
+        matcher = _matcher(self.patterns, candidates)
+        if matcher is not None:
+            match = matcher.match(chunk)
+            if match:
+                self.best = int(match.lastgroup[1:])
+            return
+
+        # Patterns that cannot be combined are tried one at a time
+        for i in candidates:
+            if re.search(self.patterns[i][0], chunk, CLASSIFICATION_FLAGS):
+                self.best = i
+                return
+
+    def classification(self):
+        if self.best is None:
+            return {
+                "type": "UNKNOWN",
+                "reason": "Unclassified error",
+                "suggestion": "Review the error output carefully to understand the issue."
+            }
+        pattern, error_type, reason, suggestion = self.patterns[self.best]
+        return {
+            "type": error_type,
+            "reason": reason,
+            "suggestion": suggestion,
+            "matched_pattern": pattern
+        }
+
+
+def classify_error(output):
+    """
+    Classify error type based on output text.
+
+    Returns: dict with type, reason, suggestion
+    """
+    classifier = StreamingClassifier()
+    classifier.feed(output)
+    return classifier.finish()
 
 
 def extract_error_details(output):
     """Extract specific error details from output."""
     details = {}
 
-    # Extract file and line number
-    file_match = re.search(r'(\S+\.(?:ts|js|tsx|jsx)):(\d+):?(\d+)?', output)
+    # Extract file and line number (the substring checks skip regex work on
+    # the long logs where neither can match)
+    file_match = any(ext in output for ext in (".ts:", ".js:", ".tsx:", ".jsx:")) and \
+        re.search(r'(\S+\.(?:ts|js|tsx|jsx)):(\d+):?(\d+)?', output)
     if file_match:
         details["file"] = file_match.group(1)
         details["line"] = file_match.group(2)
@@ -141,35 +319,207 @@ def extract_error_details(output):
             details["column"] = file_match.group(3)
 
     # Extract error message
-    error_match = re.search(r'(Error|FAIL|ERR!):(.+?)(?:\n|$)', output, re.MULTILINE)
+    error_match = any(tag in output for tag in ("Error:", "FAIL:", "ERR!:")) and \
+        re.search(r'(Error|FAIL|ERR!):(.+?)(?:\n|$)', output, re.MULTILINE)
     if error_match:
         details["message"] = error_match.group(2).strip()
 
     return details
 
 
-def main():
+# ============================================================================
+# Streaming input
+# ============================================================================
+
+_STRUCTURAL_RE = re.compile(r'["{}\[\],:]')
+
+# Longest escape that may need the next piece: a \uXXXX\uXXXX surrogate pair
+_MAX_ESCAPE = 12
+_HIGH_SURROGATE_RE = re.compile(r'\\u[dD][89abAB][0-9a-fA-F]{2}$')
+
+
+def _escaped(data, pos):
+    """True if data[pos] is preceded by an odd number of backslashes."""
+    count = 0
+    while pos - count - 1 >= 0 and data[pos - count - 1] == '\\':
+        count += 1
+    return count % 2 == 1
+
+
+def _escape_boundary(data, start, end):
+    """
+    Where to split an unterminated string segment data[start:end] so that no
+    escape sequence is cut: before the first backslash run that begins in
+    its last _MAX_ESCAPE chars.
+    """
+    tail = max(start, end - _MAX_ESCAPE)
+    first = data.find('\\', tail, end)
+    if first == -1:
+        return end
+    # Keep a high surrogate together with the low surrogate that follows it
+    if _HIGH_SURROGATE_RE.match(data, max(start, first - 6), first):
+        first -= 6
+    while first > start and data[first - 1] == '\\':
+        first -= 1
+    return first
+
+
+def _decode(raw):
+    """Decode the body of a JSON string (without quotes)."""
+    if '\\' not in raw:
+        return raw
     try:
-        # Read input from stdin
-        input_data = json.load(sys.stdin)
+        return json.decoder.scanstring(raw + '"', 0, False)[0]
+    except ValueError:
+        return raw
+
+# Keys longer than this can't be the one we look for; don't buffer them
+MAX_KEY_CHARS = 64
 
-        # Extract tool response (command output)
-        tool_response = input_data.get("tool_response", "")
 
-        # Convert to string if needed
-        if isinstance(tool_response, dict):
-            tool_response = json.dumps(tool_response)
-        elif not isinstance(tool_response, str):
-            tool_response = str(tool_response)
+class ResponseTextExtractor:
+    """
+    Incrementally pull the text of one top-level key out of a JSON document.
+
+    Feed raw JSON text in arbitrary pieces; each call returns the decoded
+    string values found under `key` so far (for an object value, all of its
+    string values, one per line). Nothing but a small escape buffer is kept
+    between calls.
+    """
 
-        if not tool_response or len(tool_response) < 10:
+    def __init__(self, key="tool_response"):
+        self.key = key
+        self.stack = []             # open containers: '{' or '['
+        self.expect_key = False     # in an object, before the next ':'
+        self.in_string = False
+        self.string_is_key = False
+        self.key_chars = []
+        self.last_key = None        # last key read at the top level
+        self.in_target = False      # inside the value of `key`
+        self.pending = ""           # string tail held back so no escape is split
+
+    def _text(self, text, out):
+        if self.string_is_key:
+            if len(self.stack) == 1 and sum(map(len, self.key_chars)) < MAX_KEY_CHARS:
+                self.key_chars.append(text)
+        elif self.in_target:
+            out.append(text)
+
+    def _end_string(self, out):
+        self.in_string = False
+        if self.string_is_key:
+            if len(self.stack) == 1:
+                self.last_key = "".join(self.key_chars)
+            self.key_chars = []
+        elif self.in_target and len(self.stack) > 1:
+            out.append("\n")
+
+    def feed(self, data):
+        data = self.pending + data
+        self.pending = ""
+        out = []
+        i = 0
+        n = len(data)
+
+        while i < n:
+            if self.in_string:
+                # Find the closing quote (one not preceded by an odd run of backslashes)
+                end = data.find('"', i)
+                while end != -1 and _escaped(data, end):
+                    end = data.find('"', end + 1)
+
+                if end == -1:
+                    # String continues in the next piece; keep a possibly
+                    # incomplete escape (or surrogate pair) for later
+                    cut = _escape_boundary(data, i, n)
+                    self._text(_decode(data[i:cut]), out)
+                    self.pending = data[cut:]
+                    break
+
+                self._text(_decode(data[i:end]), out)
+                self._end_string(out)
+                i = end + 1
+                continue
+
+            match = _STRUCTURAL_RE.search(data, i)
+            if not match:
+                break
+            c = match.group()
+            i = match.end()
+
+            if c == '"':
+                self.in_string = True
+                self.string_is_key = bool(self.stack) and self.stack[-1] == '{' and self.expect_key
+            elif c in '{[':
+                self.stack.append(c)
+                self.expect_key = c == '{'
+            elif c in '}]':
+                if self.stack:
+                    self.stack.pop()
+                if len(self.stack) <= 1 and c == '}' and not self.stack:
+                    self.in_target = False
+                self.expect_key = False
+            elif c == ',':
+                self.expect_key = bool(self.stack) and self.stack[-1] == '{'
+                if len(self.stack) == 1:
+                    self.in_target = False
+            elif c == ':':
+                self.expect_key = False
+                if len(self.stack) == 1:
+                    self.in_target = self.last_key == self.key
+
+        return out
+
+
+def _response_text(value):
+    """Text of a (non-streamed) tool_response: strings joined, one per line."""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, dict):
+        value = list(value.values())
+    if isinstance(value, list):
+        return "\n".join(filter(None, (_response_text(v) for v in value)))
+    return "" if value is None else str(value)
+
+
+def classify_stdin(stream):
+    """
+    Read the hook input from `stream` and classify its tool_response.
+
+    Small inputs are parsed normally. Inputs above STREAMING_THRESHOLD are
+    never held in memory as a whole: the tool_response text is extracted and
+    classified piece by piece.
+
+    Returns: (classification, details, response length)
+    """
+    head = stream.read(STREAMING_THRESHOLD)
+    classifier = StreamingClassifier()
+
+    if len(head) < STREAMING_THRESHOLD:
+        input_data = json.loads(head)
+        classifier.feed(_response_text(input_data.get("tool_response", "")))
+    else:
+        extractor = ResponseTextExtractor("tool_response")
+        data = head
+        while data:
+            for text in extractor.feed(data):
+                classifier.feed(text)
+            data = stream.read(READ_SIZE)
+
+    if classifier.length < 10:
+        return None, {}, classifier.length
+    return classifier.finish(), classifier.details, classifier.length
+
+
+def main():
+    try:
+        # Read input from stdin and classify the tool response (command output)
+        classification, error_details, length = classify_stdin(sys.stdin)
+
+        if classification is None:
             # No meaningful output, allow
             sys.exit(0)
 
-        # Classify error
-        classification = classify_error(tool_response)
-        error_details = extract_error_details(tool_response)
-
         # Build response
         error_type = classification["type"]
         reason = classification["reason"]
@@ -217,4 +567,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    saci_trace.run_hook(main, __file__)
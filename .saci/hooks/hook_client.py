@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Saci Hook Client: Shim in Front of the Hook Server
+
+Hook configs invoke this instead of the hook script itself:
+
+  python3 .saci/hooks/hook_client.py .saci/hooks/validate-bash.py
+
+When SACI_HOOK_SOCKET points at a running hook_server.py, stdin is forwarded
+to it and its stdout/stderr/exit code are replayed, so the hook runs in an
+already-warm process. If the server is not running (or does not answer), the
+hook script is executed in this process exactly as if it had been called
+directly.
+
+Only cheap modules are imported here so the shim itself starts fast.
+"""
+
+import io
+import json
+import os
+import socket
+import sys
+
+
+# Seconds to wait for the server to accept a connection
+CONNECT_TIMEOUT = 1.0
+
+# Environment passed to the server (hooks read project dir, saci state, etc.)
+FORWARDED_ENV_PREFIXES = ("CLAUDE_", "SACI_")
+
+# Larger hook inputs (e.g. huge test logs) are not copied through the socket:
+# the hook runs in-process and reads the rest of stdin as a stream
+MAX_FORWARD_CHARS = 1 << 20
+
+
+def forward(script, payload):
+    """
+    Send one hook invocation to the server.
+
+    Returns: response dict, or None if the server is unavailable
+    """
+    socket_path = os.environ.get("SACI_HOOK_SOCKET")
+    if not socket_path:
+        return None
+
+    request = {
+        "script": os.path.abspath(script),
+        "stdin": payload,
+        "cwd": os.getcwd(),
+        "env": {k: v for k, v in os.environ.items() if k.startswith(FORWARDED_ENV_PREFIXES)}
+    }
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(CONNECT_TIMEOUT)
+            sock.connect(socket_path)
+            # The hook itself may legitimately take a while (e.g. running tests)
+            sock.settimeout(None)
+            sock.sendall(json.dumps(request).encode("utf-8"))
+            sock.shutdown(socket.SHUT_WR)
+
+            chunks = []
+            while True:
+                data = sock.recv(65536)
+                if not data:
+                    break
+                chunks.append(data)
+    except OSError:
+        return None
+
+    try:
+        response = json.loads(b"".join(chunks).decode("utf-8"))
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+    return response if isinstance(response, dict) and "exit" in response else None
+
+
+class _PrefixedStdin:
+    """Text stream that replays an already-read prefix, then the real stdin."""
+
+    def __init__(self, prefix, rest):
+        self._prefix = prefix
+        self._rest = rest
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            data, self._prefix = self._prefix + self._rest.read(), ""
+            return data
+        if self._prefix:
+            data, self._prefix = self._prefix[:size], self._prefix[size:]
+            return data
+        return self._rest.read(size)
+
+
+def run_in_process(script, stdin):
+    """Fallback: run the hook script here, as `python3 script` would."""
+    import runpy
+
+    sys.argv = [script]
+    sys.stdin = io.StringIO(stdin) if isinstance(stdin, str) else stdin
+    sys.path.insert(0, os.path.dirname(os.path.abspath(script)))
+    runpy.run_path(script, run_name="__main__")
+    sys.exit(0)
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: hook_client.py <hook-script>", file=sys.stderr)
+        sys.exit(1)
+
+    script = sys.argv[1]
+    payload = sys.stdin.read(MAX_FORWARD_CHARS)
+
+    if len(payload) == MAX_FORWARD_CHARS:
+        run_in_process(script, _PrefixedStdin(payload, sys.stdin))
+
+    response = forward(script, payload)
+    if response is None:
+        run_in_process(script, payload)
+
+    sys.stdout.write(response.get("stdout", ""))
+    sys.stderr.write(response.get("stderr", ""))
+    sys.exit(response["exit"])
+
+
+if __name__ == "__main__":
+    main()
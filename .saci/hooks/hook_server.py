@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Saci Hook Server: Warm Hook Daemon
+
+Long-lived local process that keeps the hook scripts (validators, compiled
+regexes, parsed project state) loaded between tool calls. `saci jump` starts
+it for the duration of a run and exports SACI_HOOK_SOCKET so that every hook
+invoked through hook_client.py is answered from this warm process instead of
+paying a fresh Python startup.
+
+Protocol (one request per connection, client half-closes after sending):
+  Request:  {"script": "/abs/path/hook.py", "stdin": "...", "cwd": "...", "env": {...}}
+  Response: {"exit": 0, "stdout": "...", "stderr": "..."}
+
+Hooks rely on the working directory, the environment and sys.stdin/stdout,
+which are process-wide, so only one request at a time runs in the server
+process itself (keeping its warm in-memory state). A request that arrives
+while another one runs - a Stop hook running tests, a slow safety check from
+a parallel session - is run in a forked copy of the server instead, so it
+never waits behind it (and past the hook timeout).
+
+Usage:
+  hook_server.py --socket PATH [--parent-pid PID] [--preload SCRIPT ...]
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import signal
+import socketserver
+import sys
+import threading
+import time
+import warnings
+
+import saci_trace
+
+
+# Seconds between checks that the parent `saci jump` process is still alive
+PARENT_POLL_INTERVAL = 5
+
+# Loaded hook modules: realpath -> (mtime_ns, module)
+_HOOK_MODULES = {}
+
+# Held by the request running in the server process itself
+_IN_PROCESS = threading.Lock()
+
+# The forked child only runs the hook and exits; it takes no locks the
+# request threads could be holding (Python 3.12+ warns about fork in threads)
+warnings.filterwarnings("ignore", message=".*multi-threaded.*fork", category=DeprecationWarning)
+
+# Environment and directory the server started with (restored in forked runs)
+_BASE_ENV = dict(os.environ)
+_BASE_CWD = os.getcwd()
+
+
+def load_hook(script):
+    """Import a hook script as a module, reloading it when the file changes."""
+    path = os.path.realpath(script)
+    mtime = os.stat(path).st_mtime_ns
+
+    cached = _HOOK_MODULES.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    name = "saci_hook_" + os.path.basename(path).replace("-", "_").replace(".py", "")
+    spec = importlib.util.spec_from_file_location(name, path)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Cannot load hook script: {path}")
+
+    module = importlib.util.module_from_spec(spec)
+    # Let hooks import sibling helper modules the same way they do when run directly
+    hook_dir = os.path.dirname(path)
+    if hook_dir not in sys.path:
+        sys.path.insert(0, hook_dir)
+    spec.loader.exec_module(module)
+
+    if not callable(getattr(module, "main", None)):
+        raise ImportError(f"Hook script has no main(): {path}")
+
+    _HOOK_MODULES[path] = (mtime, module)
+    return module
+
+
+def _exit_code(code):
+    """Translate a SystemExit code the same way the interpreter does."""
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    print(code, file=sys.stderr)
+    return 1
+
+
+def run_hook(request):
+    """
+    Run one hook invocation in-process.
+
+    Returns: dict with exit, stdout and stderr
+    """
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+    exit_code = 0
+
+    saved_cwd = os.getcwd()
+    saved_stdin = sys.stdin
+    saved_env = {}
+
+    try:
+        module = load_hook(request["script"])
+
+        cwd = request.get("cwd")
+        if cwd:
+            os.chdir(cwd)
+
+        for key, value in request.get("env", {}).items():
+            saved_env[key] = os.environ.get(key)
+            os.environ[key] = value
+
+        payload = request.get("stdin", "")
+        sys.stdin = io.StringIO(payload)
+
+        saci_trace.begin_hook()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            try:
+                module.main()
+            except SystemExit as e:
+                exit_code = _exit_code(e.code)
+            except Exception:
+                exit_code = 1
+                raise
+            finally:
+                # Recorded while the request's env (trace file, task) applies
+                saci_trace.end_hook(request["script"], (time.perf_counter() - start) * 1000, exit_code,
+                                    payload, len(payload.encode("utf-8", "replace")), "server")
+
+    except Exception as e:
+        stderr.write(f"Error in hook server: {e}\n")
+        exit_code = 1
+
+    finally:
+        sys.stdin = saved_stdin
+        for key, value in saved_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        try:
+            os.chdir(saved_cwd)
+        except OSError:
+            pass
+
+    return {
+        "exit": exit_code,
+        "stdout": stdout.getvalue(),
+        "stderr": stderr.getvalue()
+    }
+
+
+def run_forked(request):
+    """Run one hook invocation in a forked copy of the (warm) server."""
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        # Child: start from the server's own state, not the in-process request's
+        os.close(read_fd)
+        try:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            os.environ.clear()
+            os.environ.update(_BASE_ENV)
+            os.chdir(_BASE_CWD)
+            with os.fdopen(write_fd, "wb") as pipe:
+                pipe.write(json.dumps(run_hook(request)).encode("utf-8"))
+        finally:
+            os._exit(0)
+
+    os.close(write_fd)
+    with os.fdopen(read_fd, "rb") as pipe:
+        data = pipe.read()
+    os.waitpid(pid, 0)
+    try:
+        return json.loads(data.decode("utf-8"))
+    except (ValueError, UnicodeDecodeError):
+        return {"exit": 1, "stdout": "", "stderr": "Hook server: forked hook run failed\n"}
+
+
+def dispatch(request):
+    """Run in-process when the server is free, in a fork while another hook runs."""
+    if _IN_PROCESS.acquire(blocking=False):
+        try:
+            return run_hook(request)
+        finally:
+            _IN_PROCESS.release()
+    return run_forked(request)
+
+
+class HookRequestHandler(socketserver.StreamRequestHandler):
+    """Read one JSON request until EOF and answer with one JSON response."""
+
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.read().decode("utf-8"))
+        except (ValueError, UnicodeDecodeError) as e:
+            response = {"exit": 1, "stdout": "", "stderr": f"Invalid hook request: {e}\n"}
+        else:
+            response = dispatch(request)
+
+        self.wfile.write(json.dumps(response).encode("utf-8"))
+
+
+class HookServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    timeout = PARENT_POLL_INTERVAL
+    daemon_threads = True
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def serve(socket_path, parent_pid=None, preload=()):
+    """Serve hook requests until terminated or the parent process exits."""
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+
+    for script in preload:
+        try:
+            load_hook(script)
+        except Exception as e:
+            print(f"Warning: could not preload {script}: {e}", file=sys.stderr)
+
+    # SIGTERM from saci.sh should still remove the socket
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    old_umask = os.umask(0o177)
+    try:
+        server = HookServer(socket_path, HookRequestHandler)
+    finally:
+        os.umask(old_umask)
+
+    try:
+        while True:
+            server.handle_request()
+            if parent_pid and not _pid_alive(parent_pid):
+                break
+    finally:
+        server.server_close()
+        with contextlib.suppress(OSError):
+            os.unlink(socket_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Saci warm hook server")
+    parser.add_argument("--socket", required=True, help="Unix socket path to listen on")
+    parser.add_argument("--parent-pid", type=int, help="Exit when this process goes away")
+    parser.add_argument("--preload", nargs="*", default=[], help="Hook scripts to import at startup")
+    args = parser.parse_args()
+
+    serve(args.socket, args.parent_pid, args.preload)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Saci Project Metadata: Cached package.json Facts Shared by All Hooks
+
+Hooks need the same few facts about the project on nearly every call: the
+npm scripts, the test command and, in a monorepo, the workspace packages and
+their scripts. Parsing every manifest each time is wasted work, so the facts
+are kept in .saci/cache/project-meta.json (and in memory inside the warm hook
+server), invalidated by the mtime/size of every manifest they came from plus
+the workspace directories (so a new package is noticed).
+
+Checking the cache costs a handful of stat() calls; manifests are only parsed
+again after one of them changes.
+
+Workspaces come from package.json "workspaces" (array or {"packages": [...]})
+or pnpm-workspace.yaml.
+"""
+
+import glob
+import json
+import os
+
+from saci_cache import load_json, save_json
+
+
+META_FILE = "project-meta.json"
+
+# Bump when the cached layout changes
+META_VERSION = 1
+
+# Script names check-if-done.py falls back to when there is no "test" script
+TEST_SCRIPT_FALLBACKS = ["test:unit", "test:all", "jest", "vitest"]
+
+# In-process memo: absolute root -> (signature, metadata)
+_MEMO = {}
+
+
+def _stat(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _read_package_json(path):
+    try:
+        with open(path, "r") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _scripts(pkg):
+    scripts = pkg.get("scripts") if pkg else None
+    return scripts if isinstance(scripts, dict) else {}
+
+
+def _pnpm_workspace_patterns(root):
+    """Package globs from pnpm-workspace.yaml (just the `packages:` list)."""
+    patterns = []
+    try:
+        with open(os.path.join(root, "pnpm-workspace.yaml"), "r") as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return patterns
+
+    in_packages = False
+    for line in lines:
+        stripped = line.split("#", 1)[0].rstrip()
+        if not stripped:
+            continue
+        if not line[0].isspace():
+            in_packages = stripped == "packages:"
+            continue
+        if in_packages and stripped.lstrip().startswith("-"):
+            patterns.append(stripped.lstrip()[1:].strip().strip("'\""))
+    return patterns
+
+
+def _workspace_patterns(root, pkg):
+    workspaces = pkg.get("workspaces") if pkg else None
+    if isinstance(workspaces, dict):
+        workspaces = workspaces.get("packages")
+    if isinstance(workspaces, list):
+        return [p for p in workspaces if isinstance(p, str)]
+    return _pnpm_workspace_patterns(root)
+
+
+def _expand_workspaces(root, patterns):
+    """Relative directories of the workspace packages matched by `patterns`."""
+    included, excluded = set(), set()
+    for pattern in patterns:
+        target = excluded if pattern.startswith("!") else included
+        pattern = pattern.lstrip("!").rstrip("/")
+        for manifest in glob.glob(os.path.join(root, pattern, "package.json"), recursive=True):
+            rel = os.path.relpath(os.path.dirname(manifest), root)
+            if "node_modules" not in rel.split(os.sep):
+                target.add(rel)
+    return sorted(included - excluded)
+
+
+def _watched_dirs(root, patterns):
+    """Directories whose listing decides which workspace packages exist."""
+    dirs = set()
+    for pattern in patterns:
+        static = []
+        for part in pattern.lstrip("!").rstrip("/").split("/"):
+            if glob.has_magic(part):
+                break
+            static.append(part)
+        dirs.add(os.path.join(root, *static) if static else root)
+    return sorted(dirs)
+
+
+def _test_command(scripts):
+    if "test" in scripts:
+        return "npm test"
+    for script in TEST_SCRIPT_FALLBACKS:
+        if script in scripts:
+            return f"npm run {script}"
+    return "npm test"
+
+
+def _build(root):
+    """Parse the manifests. Returns (metadata, signature)."""
+    root_manifest = os.path.join(root, "package.json")
+    pkg = _read_package_json(root_manifest)
+    patterns = _workspace_patterns(root, pkg)
+
+    watched = [root_manifest, os.path.join(root, "pnpm-workspace.yaml")]
+    watched += _watched_dirs(root, patterns)
+
+    workspaces = {}
+    for rel in _expand_workspaces(root, patterns):
+        manifest = os.path.join(root, rel, "package.json")
+        watched.append(manifest)
+        ws_pkg = _read_package_json(manifest) or {}
+        name = ws_pkg.get("name") if isinstance(ws_pkg.get("name"), str) else rel
+        workspaces[name] = {"path": rel, "scripts": sorted(_scripts(ws_pkg))}
+
+    scripts = _scripts(pkg)
+    meta = {
+        "exists": pkg is not None,
+        "scripts": {name: body for name, body in scripts.items() if isinstance(body, str)},
+        "test_command": _test_command(scripts),
+        "workspaces": workspaces,
+    }
+    return meta, [[path, _stat(path)] for path in watched]
+
+
+def _fresh(signature):
+    return all(_stat(path) == stat for path, stat in signature)
+
+
+def load(root="."):
+    """
+    Project metadata for `root`:
+
+      exists        whether package.json exists and parses
+      scripts       {name: command} from the root package.json
+      test_command  `npm test` or `npm run <fallback>`
+      workspaces    {package name: {"path": dir, "scripts": [names]}}
+    """
+    key = os.path.abspath(root)
+    memo = _MEMO.get(key)
+    if memo and _fresh(memo[0]):
+        return memo[1]
+
+    cached = load_json(META_FILE, None, root)
+    if isinstance(cached, dict) and cached.get("version") == META_VERSION \
+            and _fresh(cached.get("signature", [[None, None]])):
+        signature, meta = cached["signature"], cached["meta"]
+    else:
+        meta, signature = _build(root)
+        # Only worth persisting for real projects; don't create .saci/cache elsewhere
+        if meta["exists"]:
+            save_json(META_FILE, {"version": META_VERSION, "signature": signature, "meta": meta}, root)
+
+    _MEMO[key] = (signature, meta)
+    return meta
+
+
+def signature(root="."):
+    """[[path, stat], ...] the metadata of `root` was built from (see load)."""
+    load(root)
+    return _MEMO[os.path.abspath(root)][0]
+
+
+def find_workspace(meta, selector):
+    """Return (name, info) for a `-w` selector (package name or directory), or None."""
+    workspaces = meta["workspaces"]
+    if selector in workspaces:
+        return selector, workspaces[selector]
+    path = os.path.normpath(selector)
+    for name, info in workspaces.items():
+        if os.path.normpath(info["path"]) == path:
+            return name, info
+    return None
+
+
+if __name__ == "__main__":
+    print(json.dumps(load(), indent=2))
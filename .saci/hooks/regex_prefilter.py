@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Saci Regex Prefilter: Literal Keywords and Prioritized Combined Regexes
+
+Shared by the rule-table hooks (check-test-output.py, safety-check.py):
+
+- literal_prefix / required_literals derive literal text a pattern's matches
+  must contain, used as a substring prefilter so most rules never run their
+  regex. Both return "nothing" (no prefilter) for a top-level `a|b`, whose
+  branches need not share any literal.
+- priority_regex combines a rule table into one regex that reports the first
+  rule by table order that matches anywhere in the text.
+"""
+
+import re
+
+
+# Regex metacharacters that end a literal run
+REGEX_META = set('.^$*+?{}[]|()')
+
+
+def literal_run(text):
+    """Lowercased literal text `text` starts with (stops at the first regex construct)."""
+    chars = []
+    i = 0
+    while i < len(text):
+        c = text[i]
+        if c == '\\':
+            # Escaped punctuation is a literal; \s, \d, \b, ... are not
+            if i + 1 >= len(text) or text[i + 1].isalnum():
+                break
+            literal, step = text[i + 1], 2
+        elif c in REGEX_META:
+            break
+        else:
+            literal, step = c, 1
+        # A quantifier that allows zero repetitions makes this char optional
+        if text[i + step:i + step + 1] in ('*', '?', '{'):
+            break
+        chars.append(literal)
+        i += step
+    return ''.join(chars).lower()
+
+
+def _class_end(pattern, start):
+    """Index just past the `]` closing the class opened at `start`."""
+    close = pattern.find(']', start + 2)
+    return len(pattern) if close == -1 else close + 1
+
+
+def group_end(pattern, start):
+    """Index of the `)` closing the group opened at `start`, or -1."""
+    level = 0
+    i = start
+    while i < len(pattern):
+        c = pattern[i]
+        if c == '\\':
+            i += 2
+            continue
+        if c == '[':
+            i = _class_end(pattern, i)
+            continue
+        if c == '(':
+            level += 1
+        elif c == ')':
+            level -= 1
+            if level == 0:
+                return i
+        i += 1
+    return -1
+
+
+def has_top_level_alternation(pattern):
+    """True if `pattern` has a `|` outside any group or character class."""
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        if c == '\\':
+            i += 2
+        elif c == '(':
+            end = group_end(pattern, i)
+            if end == -1:
+                return False
+            i = end + 1
+        elif c == '[':
+            i = _class_end(pattern, i)
+        elif c == '|':
+            return True
+        else:
+            i += 1
+    return False
+
+
+def literal_prefix(pattern):
+    """
+    Return the literal text every match of `pattern` must start with
+    (lowercased), or '' when there is none - including top-level
+    alternation, where each branch starts differently.
+    """
+    if has_top_level_alternation(pattern):
+        return ''
+    return literal_run(pattern)
+
+
+def _more_selective(current, candidate):
+    if current is None or min(map(len, candidate)) > min(map(len, current)):
+        return candidate
+    return current
+
+
+def required_literals(pattern):
+    """
+    Return lowercased literals of which at least one occurs in any match of
+    `pattern`, or None if no such set can be derived.
+
+    Considers top-level literal runs and plain `(a|b|c)` groups, and picks the
+    most selective one.
+    """
+    if has_top_level_alternation(pattern):
+        return None
+
+    best = None
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        if c == '(':
+            end = group_end(pattern, i)
+            if end == -1:
+                return best
+            body = pattern[i + 1:end]
+            optional = pattern[end + 1:end + 2] in ('?', '*', '{')
+            if body.startswith('?:'):
+                body = body[2:]
+            if not optional and not body.startswith('?') and '(' not in body:
+                branches = [literal_run(branch) for branch in body.split('|')]
+                if all(branches):
+                    best = _more_selective(best, branches)
+            i = end + 1
+        elif c == '[':
+            i = _class_end(pattern, i)
+        elif c == '\\' and i + 1 < len(pattern) and pattern[i + 1].isalnum():
+            i += 2
+        elif c == '{':
+            close = pattern.find('}', i)
+            i = len(pattern) if close == -1 else close + 1
+        elif c in REGEX_META:
+            i += 1
+        else:
+            run = literal_run(pattern[i:])
+            if run:
+                best = _more_selective(best, [run])
+                i += len(run) if '\\' not in pattern[i:i + 2 * len(run)] else 1
+            else:
+                i += 1
+    return best
+
+
+def priority_regex(patterns, flags=0):
+    """
+    Compile (index, pattern) pairs into one regex whose match reports the
+    FIRST pattern by list order that matches anywhere in the text (not the
+    leftmost match). `match.lastgroup` is `p<index>` of the winner.
+
+    Each pattern becomes a lookahead anchored at the start of the text; the
+    alternation tries them in order.
+    """
+    alternatives = [
+        rf'(?=[\s\S]*?(?P<p{index}>{pattern}))'
+        for index, pattern in patterns
+    ]
+    return re.compile(r'\A(?:' + '|'.join(alternatives) + ')', flags)
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Saci Rule Packs: External Rules for the Classifier and Safety Hooks
+
+Extra rules can be added without forking the hooks, from JSON rule packs:
+
+  ${XDG_CONFIG_HOME:-~/.config}/saci/rules.json   (user)
+  <project>/.saci/rules.json                       (project)
+
+  {
+    "classify": [
+      {"pattern": "ModuleNotFoundError: No module named", "type": "ENVIRONMENT",
+       "reason": "Missing Python module", "suggestion": "pip install it",
+       "position": "before"}
+    ],
+    "safety": [
+      {"category": "Dangerous command", "pattern": "terraform\\s+destroy",
+       "message": "terraform destroy is blocked"}
+    ],
+    "protected_files": ["terraform.tfstate"]
+  }
+
+Pack rules are appended after the built-in ones (first match still wins), or
+placed before them with "position": "before". Safety rules join the built-in
+category of the same name; new categories are checked last. User packs load
+before project packs.
+
+Validation (compiling every pattern) only happens when a pack changes: the
+merged, validated table and the hook's prefilter index are cached in the user
+cache dir, keyed by the hash of the pack files and the built-in table. Python
+cannot persist compiled regex programs, so the combined matchers themselves
+are still compiled in-process, lazily, for the candidate sets actually seen
+(and kept across calls by the warm hook server).
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+
+from saci_cache import load_json_file, save_json_file, user_cache_dir
+
+
+# Bump when the cached table layout or the way its prefilter index is derived changes
+CACHE_VERSION = 2
+
+PACK_NAME = "rules.json"
+
+ERROR_TYPES = ("ENVIRONMENT", "CODE", "TIMEOUT", "UNKNOWN")
+
+# Pack sections; each one is a list
+SECTIONS = ("classify", "safety", "protected_files")
+
+
+def candidate_paths(project_dir=None):
+    """Where rule packs are looked for, in load order (user, then project)."""
+    config_home = os.environ.get("XDG_CONFIG_HOME") or os.path.expanduser("~/.config")
+    project_dir = project_dir or os.environ.get("CLAUDE_PROJECT_DIR") or os.getcwd()
+    return [
+        os.path.join(config_home, "saci", PACK_NAME),
+        os.path.join(project_dir, ".saci", PACK_NAME),
+    ]
+
+
+def pack_paths(project_dir=None):
+    """Rule pack files that exist, in load order (user, then project)."""
+    seen = []
+    for path in candidate_paths(project_dir):
+        real = os.path.realpath(path)
+        if os.path.isfile(real) and real not in seen:
+            seen.append(real)
+    return seen
+
+
+def _warn(path, message):
+    print(f"Warning: rule pack {path}: {message}", file=sys.stderr)
+
+
+def _read_raw(path):
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except OSError as e:
+        _warn(path, f"unreadable ({e})")
+        return b""
+
+
+def _parse_pack(path, raw):
+    """Parse a rule pack; an invalid pack counts as empty, an invalid section is skipped."""
+    try:
+        pack = json.loads(raw.decode("utf-8")) if raw else {}
+    except ValueError as e:
+        _warn(path, f"invalid JSON ({e})")
+        return {}
+    if not isinstance(pack, dict):
+        _warn(path, "top level must be an object")
+        return {}
+    for section in SECTIONS:
+        if section in pack and not isinstance(pack[section], list):
+            _warn(path, f"{section!r} must be a list, section skipped")
+            del pack[section]
+    return pack
+
+
+def _valid_pattern(path, pattern):
+    if not isinstance(pattern, str) or not pattern:
+        _warn(path, "rule without a pattern skipped")
+        return False
+    try:
+        re.compile(pattern)
+    except re.error as e:
+        _warn(path, f"invalid pattern {pattern!r} skipped ({e})")
+        return False
+    return True
+
+
+def _merge_classify(builtin, packs):
+    before, after = [], []
+    for path, pack in packs:
+        for rule in pack.get("classify", []):
+            if not isinstance(rule, dict) or not _valid_pattern(path, rule.get("pattern")):
+                continue
+            error_type = str(rule.get("type", "UNKNOWN")).upper()
+            if error_type not in ERROR_TYPES:
+                _warn(path, f"unknown type {error_type!r} for {rule['pattern']!r} skipped")
+                continue
+            row = [
+                rule["pattern"], error_type,
+                str(rule.get("reason", "Matched rule pack pattern")),
+                str(rule.get("suggestion", "Review the error output carefully to understand the issue.")),
+            ]
+            (before if rule.get("position") == "before" else after).append(row)
+    return before + [list(row) for row in builtin] + after
+
+
+def _merge_safety(builtin, packs):
+    checks = [[category, [list(rule) for rule in rules]] for category, rules in builtin["checks"]]
+    protected = list(builtin["protected_files"])
+    by_category = {category: rules for category, rules in checks}
+
+    for path, pack in packs:
+        for rule in pack.get("safety", []):
+            if not isinstance(rule, dict) or not _valid_pattern(path, rule.get("pattern")):
+                continue
+            category = str(rule.get("category", "Rule pack"))
+            if category not in by_category:
+                by_category[category] = []
+                checks.append([category, by_category[category]])
+            by_category[category].append(
+                [rule["pattern"], str(rule.get("message", f"Blocked by rule pack: {category}"))]
+            )
+        for name in pack.get("protected_files", []):
+            if isinstance(name, str) and name and name not in protected:
+                protected.append(name)
+
+    return {"checks": checks, "protected_files": protected}
+
+
+_MERGERS = {"classify": _merge_classify, "safety": _merge_safety}
+
+# Tables loaded by this process: section -> (key, (table, index))
+_LOADED = {}
+
+
+def load_table(section, builtin, index=None, project_dir=None):
+    """
+    Built-in rule table for `section` ("classify" or "safety") merged with
+    the rule packs, plus `index(table)` (the hook's precomputed prefilter data).
+
+    Returns: (table, index data or None). With no rule packs the built-in
+    table itself is returned (index None) and nothing is cached. The same
+    table object is returned while the packs are unchanged, so callers can
+    keep what they build from it.
+    """
+    paths = pack_paths(project_dir)
+    if not paths:
+        return builtin, None
+
+    raws = [(path, _read_raw(path)) for path in paths]
+    digest = hashlib.sha256()
+    digest.update(f"{CACHE_VERSION}\0{section}\0".encode())
+    digest.update(json.dumps(builtin, sort_keys=True).encode())
+    digest.update(getattr(index, "__name__", "").encode())
+    for path, raw in raws:
+        digest.update(b"\0" + path.encode() + b"\0" + raw)
+    key = digest.hexdigest()
+
+    # One cache file per set of pack paths; the content hash is checked inside
+    cache_file = None
+    try:
+        slot = hashlib.sha256("\0".join(paths).encode()).hexdigest()[:16]
+        cache_file = os.path.join(user_cache_dir(), f"rules-{section}-{slot}.json")
+    except OSError:
+        pass
+
+    loaded = _LOADED.get(section)
+    if loaded and loaded[0] == key:
+        return loaded[1]
+
+    cached = load_json_file(cache_file) if cache_file else None
+    if isinstance(cached, dict) and cached.get("key") == key:
+        result = cached["table"], cached.get("index")
+    else:
+        packs = [(path, _parse_pack(path, raw)) for path, raw in raws]
+        table = _MERGERS[section](builtin, packs)
+        result = table, index(table) if index else None
+        if cache_file:
+            save_json_file(cache_file, {"key": key, "table": result[0], "index": result[1]})
+
+    _LOADED[section] = (key, result)
+    return result
+
+
+if __name__ == "__main__":
+    # List the rule packs in effect and report invalid rules
+    for path in pack_paths():
+        pack = _parse_pack(path, _read_raw(path))
+        _merge_classify([], [(path, pack)])
+        _merge_safety({"checks": [], "protected_files": []}, [(path, pack)])
+        print(f"{path}: {len(pack.get('classify', []))} classify, "
+              f"{len(pack.get('safety', []))} safety, "
+              f"{len(pack.get('protected_files', []))} protected files")
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Saci Cache: Shared Location and Helpers for Runtime Caches
+
+Hooks and helper scripts keep derived state (test verdicts, parsed project
+metadata, ...) under `.saci/cache/` in the project. The directory carries its
+own `.gitignore` so cached files never show up in `git status`, are skipped
+by `git add -A` and survive Saci's `git clean -fd` rollbacks.
+
+Writes are atomic (temp file + rename) so a hook killed mid-write, or two
+hooks writing at once, never leave a truncated file behind.
+"""
+
+import json
+import os
+import tempfile
+
+
+CACHE_DIR_NAME = os.path.join(".saci", "cache")
+
+
+def cache_dir(root="."):
+    """Return the cache directory for the project at `root`, creating it if needed."""
+    path = os.path.join(root, CACHE_DIR_NAME)
+    os.makedirs(path, exist_ok=True)
+
+    ignore_file = os.path.join(path, ".gitignore")
+    if not os.path.exists(ignore_file):
+        with open(ignore_file, "w") as f:
+            f.write("*\n")
+    return path
+
+
+def cache_path(name, root="."):
+    """Full path of a named cache file."""
+    return os.path.join(cache_dir(root), name)
+
+
+def user_cache_dir():
+    """Per-user cache directory (${XDG_CACHE_HOME:-~/.cache}/saci), for state not tied to a project."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    path = os.path.join(base, "saci")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def load_json(name, default=None, root="."):
+    """Load a JSON cache file, returning `default` if missing or unreadable."""
+    return load_json_file(os.path.join(root, CACHE_DIR_NAME, name), default)
+
+
+def save_json(name, data, root="."):
+    """Atomically write a JSON cache file. Failures are ignored (it's only a cache)."""
+    try:
+        directory = cache_dir(root)
+    except OSError:
+        return
+    save_json_file(os.path.join(directory, name), data)
+
+
+def load_json_file(path, default=None):
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def save_json_file(path, data):
+    """Atomically write `data` as JSON to `path` (temp file + rename)."""
+    tmp_path = None
+    try:
+        fd, tmp_path = tempfile.mkstemp(
+            dir=os.path.dirname(path), prefix=f".{os.path.basename(path)}.", suffix=".tmp"
+        )
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        if tmp_path:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
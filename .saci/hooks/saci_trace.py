@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Saci Trace: Timing Spans for Hooks and Loop Phases
+
+The metrics log only records one duration per iteration. To see where that
+time goes, hooks (and the tests the Stop hook runs) append timing spans to a
+JSON-lines trace, next to the spans saci.sh writes for its own phases (CLI
+session, tests, rollback, PRP queries). `saci profile` aggregates them.
+
+Tracing is on while SACI_TRACE_FILE names the trace (`saci jump` exports it);
+hooks run outside of Saci write nothing. Spans are attributed to the task and
+iteration in SACI_TASK_ID / SACI_ITERATION.
+
+One span per line:
+  {"ts": START, "kind": "hook", "name": "validate-bash", "task_id": "F1-T1",
+   "iteration": 2, "duration_ms": 3.1, "outcome": "blocked",
+   "event": "PreToolUse", "payload_bytes": 412, "mode": "server"}
+
+Each line is written with a single O_APPEND write, so concurrent hooks and
+parallel workers can share one trace.
+"""
+
+import contextlib
+import json
+import os
+import re
+import sys
+import time
+
+
+TRACE_ENV = "SACI_TRACE_FILE"
+
+# Payload prefix kept to find the hook event name
+EVENT_SCAN_CHARS = 4096
+
+_EVENT_RE = re.compile(r'"hook_event_name"\s*:\s*"([^"]*)"')
+
+# Fields set by the running hook through annotate()
+_annotations = {}
+
+
+def enabled():
+    return bool(os.environ.get(TRACE_ENV))
+
+
+def record(kind, name, duration_ms, outcome="ok", **fields):
+    """Append one span that ended now. Failures are ignored (it's only a trace)."""
+    path = os.environ.get(TRACE_ENV)
+    if not path:
+        return
+    iteration = os.environ.get("SACI_ITERATION", "")
+    span = {
+        "ts": round(time.time() - duration_ms / 1000.0, 3),
+        "kind": kind,
+        "name": name,
+        "task_id": os.environ.get("SACI_TASK_ID", ""),
+        "iteration": int(iteration) if iteration.isdigit() else None,
+        "duration_ms": round(duration_ms, 3),
+        "outcome": outcome,
+    }
+    span.update(fields)
+    line = (json.dumps(span, separators=(",", ":")) + "\n").encode("utf-8", "replace")
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+    except OSError:
+        pass
+
+
+@contextlib.contextmanager
+def span(kind, name, **fields):
+    """
+    Time a block as one span.
+
+    Yields the span's fields; set "outcome" (default "ok", "error" if the
+    block raises) or add fields before the block ends.
+    """
+    fields.setdefault("outcome", "ok")
+    start = time.perf_counter()
+    try:
+        yield fields
+    except Exception:
+        if fields["outcome"] == "ok":
+            fields["outcome"] = "error"
+        raise
+    finally:
+        record(kind, name, (time.perf_counter() - start) * 1000, **fields)
+
+
+def annotate(**fields):
+    """Set fields (e.g. outcome="blocked") on the span of the running hook."""
+    _annotations.update(fields)
+
+
+def hook_name(script):
+    return os.path.splitext(os.path.basename(script))[0]
+
+
+def hook_outcome(exit_code):
+    """Outcome of a hook from its exit code (2 blocks the action)."""
+    if exit_code == 0:
+        return "ok"
+    return "blocked" if exit_code == 2 else "error"
+
+
+def event_name(payload):
+    match = _EVENT_RE.search(payload[:EVENT_SCAN_CHARS])
+    return match.group(1) if match else ""
+
+
+def begin_hook():
+    _annotations.clear()
+
+
+def end_hook(script, duration_ms, exit_code, payload, payload_bytes, mode):
+    """Record the span of one hook invocation."""
+    fields = {
+        "outcome": hook_outcome(exit_code),
+        "event": event_name(payload),
+        "payload_bytes": payload_bytes,
+        "mode": mode,
+    }
+    fields.update(_annotations)
+    _annotations.clear()
+    record("hook", hook_name(script), duration_ms, **fields)
+
+
+class _CountingStdin:
+    """stdin wrapper that counts what the hook reads and keeps its start."""
+
+    def __init__(self, stream):
+        self._stream = stream
+        self.count = 0
+        self.head = ""
+
+    def _seen(self, data):
+        self.count += len(data.encode("utf-8", "replace")) if isinstance(data, str) else len(data)
+        if len(self.head) < EVENT_SCAN_CHARS and isinstance(data, str):
+            self.head += data[:EVENT_SCAN_CHARS - len(self.head)]
+        return data
+
+    def read(self, *args):
+        return self._seen(self._stream.read(*args))
+
+    def readline(self, *args):
+        return self._seen(self._stream.readline(*args))
+
+    def __iter__(self):
+        for line in self._stream:
+            yield self._seen(line)
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+def _exit_code(code):
+    if code is None:
+        return 0
+    return code if isinstance(code, int) else 1
+
+
+def run_hook(main, script):
+    """Run a hook's main() as the process entry point, tracing it when enabled."""
+    if not enabled():
+        main()
+        return
+
+    stdin = sys.stdin = _CountingStdin(sys.stdin)
+    begin_hook()
+    exit_code = 0
+    start = time.perf_counter()
+    try:
+        main()
+    except SystemExit as e:
+        exit_code = _exit_code(e.code)
+        raise
+    except BaseException:
+        exit_code = 1
+        raise
+    finally:
+        end_hook(script, (time.perf_counter() - start) * 1000, exit_code,
+                 stdin.head, stdin.count, "process")
@@ -0,0 +1,580 @@
+#!/usr/bin/env python3
+"""
+Saci Shell Parser: Tokenize a Bash Command Once for All Validators
+
+Splits a command string into segments (simple commands) in a single pass,
+handling quotes, escapes, pipelines, `&&`/`||`/`;` chains, redirections,
+subshells, command substitution and heredocs. Validators query the parsed
+structure instead of re-scanning the raw string with their own regexes.
+Scripts run inline (`bash -c "..."`, `eval ...`) are parsed too, and their
+segments follow the one that runs them:
+
+    parsed = parse_command("cd src && rm -f a.txt > log 2>&1")
+    for segment in parsed.commands("rm"):
+        segment.operands()      # ['a.txt']
+
+This is not a full Bash grammar - just enough structure for the hooks to make
+decisions on what is executed, with which arguments, and where output goes.
+"""
+
+import os
+
+
+# Operators that separate simple commands
+CONTROL_OPERATORS = ("&&", "||", ";;", "|&", ";", "|", "&", "\n")
+
+# Redirection operators, longest first
+REDIRECT_OPERATORS = ("&>>", "<<<", "<<-", "<<", ">>", ">|", ">&", "<&", "&>", "<>", ">", "<")
+
+# Words that start a compound command or negate a pipeline; the real command follows
+RESERVED_PREFIXES = {"if", "then", "else", "elif", "do", "while", "until", "!", "{", "time"}
+
+# Words that only close a compound command
+RESERVED_CLOSERS = {"fi", "done", "esac", "}"}
+
+# Wrappers that run their arguments as a command
+COMMAND_WRAPPERS = {"sudo", "doas", "env", "nohup", "command", "exec", "nice", "xargs",
+                    "timeout", "stdbuf", "ionice", "chrt", "taskset", "setsid", "unbuffer"}
+
+# Wrapper options that take the next word as their value (`nice -n 10 cmd`)
+WRAPPER_OPTION_VALUES = {
+    "sudo": {"-u", "-g", "-h", "-p", "-C", "-D", "-r", "-t", "-U"},
+    "doas": {"-u", "-C"},
+    "env": {"-u", "-C", "-S", "--unset", "--chdir", "--split-string"},
+    "nice": {"-n", "--adjustment"},
+    "timeout": {"-s", "-k", "--signal", "--kill-after"},
+    "stdbuf": {"-i", "-o", "-e"},
+    "ionice": {"-c", "-n", "-p", "-P", "-u"},
+    "xargs": {"-a", "-d", "-E", "-I", "-L", "-n", "-P", "-s"},
+}
+
+# Arguments a wrapper takes before the command (`timeout 5 cmd`, `chrt 10 cmd`)
+WRAPPER_OPERANDS = {"timeout": 1, "chrt": 1, "taskset": 1}
+
+# Shells whose `-c SCRIPT` argument is parsed as a nested command
+INLINE_SHELLS = {"sh", "bash", "zsh", "dash", "ksh"}
+
+# Nesting limit for inline scripts (`bash -c "sh -c '...'"`)
+MAX_INLINE_DEPTH = 8
+
+
+class Word:
+    """One shell word after quote removal."""
+
+    __slots__ = ("text", "quoted", "expansion")
+
+    def __init__(self, text, quoted=False, expansion=False):
+        self.text = text
+        self.quoted = quoted          # any part of the word was quoted
+        self.expansion = expansion    # contains $VAR, ${...}, $(...) or `...`
+
+    @property
+    def glob(self):
+        """True if the word contains unquoted-looking glob characters."""
+        return not self.quoted and any(c in self.text for c in "*?[")
+
+    def __repr__(self):
+        return f"Word({self.text!r})"
+
+
+class Redirect:
+    """One redirection attached to a segment, e.g. `2>&1` or `> out.log`."""
+
+    __slots__ = ("fd", "op", "target")
+
+    def __init__(self, fd, op, target):
+        self.fd = fd            # explicit fd number as string, or ''
+        self.op = op            # '>', '>>', '<', '>&', ...
+        self.target = target    # Word (or None for a dangling operator)
+
+    @property
+    def truncates(self):
+        """True if the redirect truncates/overwrites its target file."""
+        return self.op in (">", ">|", "&>") and self.target is not None \
+            and not self.target.text.isdigit()
+
+    @property
+    def writes(self):
+        return self.op in (">", ">>", ">|", "&>", "&>>", "<>")
+
+    def __repr__(self):
+        return f"Redirect({self.fd}{self.op}{self.target.text if self.target else ''})"
+
+
+class Segment:
+    """A simple command: words, redirections and how it is joined to the previous one."""
+
+    __slots__ = ("words", "assignments", "redirects", "operator", "depth")
+
+    def __init__(self, operator="", depth=0):
+        self.words = []         # [Word] - command name and arguments
+        self.assignments = []   # leading VAR=value words
+        self.redirects = []     # [Redirect]
+        self.operator = operator  # operator before this segment ('' for the first)
+        self.depth = depth      # nesting level: subshells / command substitutions
+
+    @property
+    def argv(self):
+        return [w.text for w in self.words]
+
+    def _unwrap(self):
+        """(wrapper names, remaining words) after reserved prefixes and wrappers."""
+        words = list(self.words)
+        while words and words[0].text in RESERVED_PREFIXES:
+            words.pop(0)
+
+        wrappers = []
+        while words and os.path.basename(words[0].text) in COMMAND_WRAPPERS:
+            wrapper = os.path.basename(words.pop(0).text)
+            wrappers.append(wrapper)
+            takes_value = WRAPPER_OPTION_VALUES.get(wrapper, ())
+            operands = WRAPPER_OPERANDS.get(wrapper, 0)
+            # Skip the wrapper's own flags, env assignments and leading arguments
+            while words:
+                text = words[0].text
+                if text == "--":
+                    words.pop(0)
+                    break
+                if text.startswith("-"):
+                    words.pop(0)
+                    if text in takes_value and words:
+                        words.pop(0)
+                elif "=" in text and not text.startswith("="):
+                    words.pop(0)
+                elif operands:
+                    words.pop(0)
+                    operands -= 1
+                else:
+                    break
+        return wrappers, words
+
+    def effective_words(self):
+        """Words with reserved prefixes and wrappers (sudo, env, timeout, ...) stripped."""
+        return self._unwrap()[1]
+
+    def wrappers(self):
+        """Names of the wrappers the command runs under, outermost first."""
+        return self._unwrap()[0]
+
+    @property
+    def name(self):
+        """Command name (basename), after stripping wrappers; '' if none."""
+        words = self.effective_words()
+        return os.path.basename(words[0].text) if words else ""
+
+    @property
+    def args(self):
+        """Argument words after the command name."""
+        return self.effective_words()[1:]
+
+    def operands(self, flags_with_values=()):
+        """
+        Non-option arguments as strings.
+
+        Stops treating words as options after `--`. Options listed in
+        `flags_with_values` consume the following word.
+        """
+        return [w.text for w in self.operand_words(flags_with_values)]
+
+    def operand_words(self, flags_with_values=()):
+        operands = []
+        words = self.args
+        i = 0
+        options_done = False
+        while i < len(words):
+            text = words[i].text
+            if not options_done and text == "--":
+                options_done = True
+            elif not options_done and text.startswith("-") and text != "-":
+                if text in flags_with_values:
+                    i += 1
+            else:
+                operands.append(words[i])
+            i += 1
+        return operands
+
+    def options(self):
+        """Option arguments (before `--`) as strings."""
+        result = []
+        for w in self.args:
+            if w.text == "--":
+                break
+            if w.text.startswith("-") and w.text != "-":
+                result.append(w.text)
+        return result
+
+    def has_option(self, *names):
+        """True if any long option matches, or any short option cluster contains the letter."""
+        for opt in self.options():
+            for name in names:
+                if opt == name:
+                    return True
+                if len(name) == 2 and not opt.startswith("--") and name[1] in opt[1:]:
+                    return True
+        return False
+
+    def __repr__(self):
+        return f"Segment({self.operator!r}, {self.argv}, {self.redirects})"
+
+
+class ParsedCommand:
+    """All segments of a command line, in execution order."""
+
+    def __init__(self, source, segments):
+        self.source = source
+        self.segments = segments
+
+    def commands(self, *names):
+        """Segments whose command name is one of `names`."""
+        return [s for s in self.segments if s.name in names]
+
+    def redirects(self):
+        for segment in self.segments:
+            for redirect in segment.redirects:
+                yield segment, redirect
+
+    def piped_into(self, *names):
+        """Segments named `names` that read from a pipe (`... | name`)."""
+        return [s for s in self.segments
+                if s.name in names and s.operator in ("|", "|&")]
+
+    def __iter__(self):
+        return iter(self.segments)
+
+    def __len__(self):
+        return len(self.segments)
+
+
+class _Parser:
+    """Single left-to-right scan over the command text."""
+
+    def __init__(self, text, depth=0):
+        self.text = text
+        self.pos = 0
+        self.depth = depth
+        self.segments = []
+        self.pending_heredocs = []  # (delimiter, strip_tabs)
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    def _peek(self, s):
+        return self.text.startswith(s, self.pos)
+
+    def _find_closing(self, start, open_ch, close_ch):
+        """Index of the matching close char for an opener just before `start`."""
+        level = 1
+        i = start
+        text = self.text
+        while i < len(text):
+            c = text[i]
+            if c == "\\":
+                i += 2
+                continue
+            if c == "'":
+                end = text.find("'", i + 1)
+                i = len(text) if end == -1 else end + 1
+                continue
+            if c == '"':
+                i = self._skip_double_quoted(i + 1)
+                continue
+            if c == open_ch:
+                level += 1
+            elif c == close_ch:
+                level -= 1
+                if level == 0:
+                    return i
+            i += 1
+        return len(text)
+
+    def _skip_double_quoted(self, i):
+        text = self.text
+        while i < len(text):
+            c = text[i]
+            if c == "\\":
+                i += 2
+                continue
+            if c == '"':
+                return i + 1
+            if c == "$" and text.startswith("$(", i):
+                i = self._find_closing(i + 2, "(", ")") + 1
+                continue
+            i += 1
+        return len(text)
+
+    def _nested(self, source):
+        """Parse a subshell / command substitution body into our segment list."""
+        parser = _Parser(source, self.depth + 1)
+        parser.parse()
+        self.segments.extend(parser.segments)
+
+    # ------------------------------------------------------------------
+    # Words
+    # ------------------------------------------------------------------
+
+    def _read_word(self):
+        """Read one word starting at self.pos; returns Word or None."""
+        text = self.text
+        chars = []
+        quoted = False
+        expansion = False
+        start = self.pos
+
+        while self.pos < len(text):
+            c = text[self.pos]
+
+            if c in " \t\n;&|<>()" :
+                # `(` inside a word (e.g. function-call-like args) ends it too
+                break
+
+            if c == "\\":
+                if self.pos + 1 < len(text):
+                    nxt = text[self.pos + 1]
+                    if nxt != "\n":
+                        chars.append(nxt)
+                        quoted = True
+                self.pos += 2
+                continue
+
+            if c == "'":
+                end = text.find("'", self.pos + 1)
+                end = len(text) if end == -1 else end
+                chars.append(text[self.pos + 1:end])
+                quoted = True
+                self.pos = end + 1
+                continue
+
+            if c == '"':
+                quoted = True
+                self.pos += 1
+                while self.pos < len(text) and text[self.pos] != '"':
+                    d = text[self.pos]
+                    if d == "\\" and self.pos + 1 < len(text) and text[self.pos + 1] in '"\\$`\n':
+                        if text[self.pos + 1] != "\n":
+                            chars.append(text[self.pos + 1])
+                        self.pos += 2
+                        continue
+                    if d == "$" and self._peek("$("):
+                        end = self._find_closing(self.pos + 2, "(", ")")
+                        self._nested(text[self.pos + 2:end])
+                        chars.append(text[self.pos:end + 1])
+                        expansion = True
+                        self.pos = end + 1
+                        continue
+                    if d in "$`":
+                        expansion = True
+                    chars.append(d)
+                    self.pos += 1
+                self.pos += 1
+                continue
+
+            if c == "$":
+                expansion = True
+                if self._peek("$("):
+                    end = self._find_closing(self.pos + 2, "(", ")")
+                    if not self._peek("$(("):
+                        self._nested(text[self.pos + 2:end])
+                    chars.append(text[self.pos:end + 1])
+                    self.pos = end + 1
+                    continue
+                if self._peek("${"):
+                    end = self._find_closing(self.pos + 2, "{", "}")
+                    chars.append(text[self.pos:end + 1])
+                    self.pos = end + 1
+                    continue
+                chars.append(c)
+                self.pos += 1
+                continue
+
+            if c == "`":
+                expansion = True
+                end = text.find("`", self.pos + 1)
+                end = len(text) if end == -1 else end
+                self._nested(text[self.pos + 1:end])
+                chars.append(text[self.pos:end + 1])
+                self.pos = end + 1
+                continue
+
+            chars.append(c)
+            self.pos += 1
+
+        if self.pos == start:
+            return None
+        return Word("".join(chars), quoted, expansion)
+
+    # ------------------------------------------------------------------
+    # Heredocs
+    # ------------------------------------------------------------------
+
+    def _skip_heredoc_bodies(self):
+        """Called right after a newline: skip bodies of pending heredocs."""
+        text = self.text
+        for delimiter, strip_tabs in self.pending_heredocs:
+            while self.pos < len(text):
+                end = text.find("\n", self.pos)
+                line_end = len(text) if end == -1 else end
+                line = text[self.pos:line_end]
+                self.pos = line_end + 1
+                if (line.lstrip("\t") if strip_tabs else line) == delimiter:
+                    break
+        self.pending_heredocs = []
+
+    # ------------------------------------------------------------------
+    # Main loop
+    # ------------------------------------------------------------------
+
+    def parse(self):
+        text = self.text
+        segment = Segment("", self.depth)
+
+        def finish(operator):
+            nonlocal segment
+            if segment.words or segment.redirects or segment.assignments:
+                # A segment made only of closers (fi, done, }) carries no command
+                if not all(w.text in RESERVED_CLOSERS for w in segment.words) or segment.redirects:
+                    self.segments.append(segment)
+            segment = Segment(operator, self.depth)
+
+        while self.pos < len(text):
+            c = text[self.pos]
+
+            if c in " \t":
+                self.pos += 1
+                continue
+
+            if c == "#" and (self.pos == 0 or text[self.pos - 1] in " \t\n;&|("):
+                end = text.find("\n", self.pos)
+                self.pos = len(text) if end == -1 else end
+                continue
+
+            if c == "\\" and self._peek("\\\n"):
+                self.pos += 2
+                continue
+
+            # Subshell / grouping
+            if c == "(":
+                end = self._find_closing(self.pos + 1, "(", ")")
+                if not self._peek("(("):
+                    self._nested(text[self.pos + 1:end])
+                self.pos = end + 1
+                continue
+            if c == ")":
+                self.pos += 1
+                continue
+
+            # Redirections, optionally preceded by an fd number
+            fd = ""
+            j = self.pos
+            while j < len(text) and text[j].isdigit():
+                j += 1
+            redirect_op = None
+            for op in REDIRECT_OPERATORS:
+                if text.startswith(op, j):
+                    redirect_op = op
+                    break
+            if redirect_op and (j == self.pos or not segment_has_word_at(text, self.pos)):
+                fd = text[self.pos:j]
+                self.pos = j + len(redirect_op)
+                while self.pos < len(text) and text[self.pos] in " \t":
+                    self.pos += 1
+                target = self._read_word()
+                if redirect_op in ("<<", "<<-") and target is not None:
+                    self.pending_heredocs.append((target.text, redirect_op == "<<-"))
+                segment.redirects.append(Redirect(fd, redirect_op, target))
+                continue
+
+            # Control operators
+            operator = None
+            for op in CONTROL_OPERATORS:
+                if self._peek(op):
+                    operator = op
+                    break
+            if operator:
+                self.pos += len(operator)
+                finish(operator)
+                if operator == "\n" and self.pending_heredocs:
+                    self._skip_heredoc_bodies()
+                continue
+
+            word = self._read_word()
+            if word is None:
+                # Unknown character; skip it rather than loop forever
+                self.pos += 1
+                continue
+
+            if not segment.words and not word.quoted and _is_assignment(word.text):
+                segment.assignments.append(word)
+            else:
+                segment.words.append(word)
+
+        finish("")
+        return self.segments
+
+
+def segment_has_word_at(text, pos):
+    """
+    True if the digits at `pos` are part of a word rather than an fd prefix.
+
+    `2>err` is an fd redirect; `file2>out` never reaches here because the
+    word reader consumes it up to `>`.
+    """
+    return pos > 0 and text[pos - 1] not in " \t\n;&|()"
+
+
+def _is_assignment(text):
+    name, sep, _ = text.partition("=")
+    return bool(sep) and name.replace("_", "a").isalnum() and not name[0].isdigit()
+
+
+def inline_script(segment):
+    """
+    Words a segment runs as a script of their own, or None.
+
+    `bash -c SCRIPT ...` -> [SCRIPT]; `eval ARGS` -> ARGS (joined with spaces
+    by the shell). Check the words' `expansion` flag: a script built from
+    variables can't be known here.
+    """
+    name = segment.name
+    if name == "eval":
+        return segment.args
+    if name in INLINE_SHELLS and segment.has_option("-c"):
+        operands = segment.operand_words(flags_with_values=("-o", "-O", "--rcfile", "--init-file"))
+        return operands[:1]
+    return None
+
+
+def _parse_segments(text, depth=0, inline_depth=0):
+    parser = _Parser(text, depth)
+    try:
+        parser.parse()
+    except (IndexError, ValueError):
+        pass
+
+    segments = []
+    for segment in parser.segments:
+        segments.append(segment)
+        script = inline_script(segment)
+        if script and inline_depth < MAX_INLINE_DEPTH:
+            segments.extend(_parse_segments(" ".join(w.text for w in script),
+                                            segment.depth + 1, inline_depth + 1))
+    return segments
+
+
+def parse_command(command):
+    """Parse a command string into a ParsedCommand (never raises on odd input)."""
+    return ParsedCommand(command, _parse_segments(command or ""))
+
+
+def expand_user_path(path, cwd="."):
+    """Resolve `~` and a virtual working directory for a path operand."""
+    path = os.path.expanduser(path)
+    if not os.path.isabs(path):
+        path = os.path.join(cwd, path)
+    return os.path.normpath(path)
+
+
+if __name__ == "__main__":
+    import sys
+    for segment in parse_command(" ".join(sys.argv[1:]) or sys.stdin.read()):
+        print(segment)
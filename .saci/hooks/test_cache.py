@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Saci Test Cache: Memoize Test Verdicts by Working-Tree State
+
+A test run's pass/fail verdict is stored under a key made of:
+- a content hash of the working tree (tracked + untracked, honoring
+  .gitignore), computed with `git write-tree` on a throwaway copy of the index
+- the resolved test command
+- the contents of package.json
+
+So when nothing changed, the Stop hook (check-if-done.py) and saci.sh's
+post-session test run answer instantly instead of re-running the suite.
+Saci's own bookkeeping files (prp.json, progress.txt, .saci/) are left out of
+the hash because they change between runs without affecting the tests.
+
+Usage (from saci.sh):
+  test_cache.py lookup "<test command>" [--output FILE]
+      hit:  prints "pass" or "fail" (cached output written to FILE)
+      miss: prints "miss <key>"
+      exit 1 if the tree can't be hashed (not a git repo, ...)
+  test_cache.py record "<test command>" <exit-code> [--key KEY] [--output FILE]
+"""
+
+import argparse
+import hashlib
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from saci_cache import load_json, save_json
+
+
+CACHE_FILE = "test-results.json"
+
+# Verdicts kept (oldest dropped first)
+MAX_ENTRIES = 64
+
+# Tail of the test output kept with each verdict (feeds LAST_ERROR)
+MAX_OUTPUT_CHARS = 20000
+
+# Saci state that changes between runs but never affects test results
+EXCLUDED_PATHS = ("prp.json", "progress.txt", ".saci")
+
+
+def _git(args, cwd, env=None):
+    result = subprocess.run(
+        ["git"] + args, cwd=cwd, env=env,
+        capture_output=True, text=True, timeout=30
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip())
+    return result.stdout.strip()
+
+
+def project_root(cwd="."):
+    """Top level of the git work tree containing `cwd`, or None."""
+    try:
+        return _git(["rev-parse", "--show-toplevel"], cwd)
+    except (RuntimeError, OSError, subprocess.SubprocessError):
+        return None
+
+
+def tree_hash(root):
+    """
+    Hash of the current working tree, or None if it can't be computed.
+
+    The real index is never touched: a copy is updated with `git add -A`
+    (which only re-hashes files whose stat info changed) and written as a tree.
+    """
+    tmp_dir = tempfile.mkdtemp(prefix="saci-index-")
+    try:
+        tmp_index = os.path.join(tmp_dir, "index")
+        index_path = _git(["rev-parse", "--git-path", "index"], root)
+        index_path = os.path.join(root, index_path)
+        if os.path.exists(index_path):
+            shutil.copy2(index_path, tmp_index)
+
+        env = dict(os.environ, GIT_INDEX_FILE=tmp_index)
+        # Glob pathspecs: a literal one naming an ignored path (.saci/ is
+        # often gitignored) makes `git add` fail
+        excludes = [f":(exclude,glob)**/{path}" for path in EXCLUDED_PATHS]
+        _git(["add", "-A", "--", "."] + excludes, root, env)
+        return _git(["write-tree"], root, env)
+    except (RuntimeError, OSError, subprocess.SubprocessError):
+        return None
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def cache_key(command, root):
+    """Cache key for running `command` in the project at `root`, or None."""
+    tree = tree_hash(root)
+    if not tree:
+        return None
+
+    digest = hashlib.sha256()
+    digest.update(tree.encode())
+    digest.update(b"\0" + command.encode())
+    try:
+        with open(os.path.join(root, "package.json"), "rb") as f:
+            digest.update(b"\0" + f.read())
+    except OSError:
+        pass
+    return digest.hexdigest()
+
+
+def lookup(command, cwd="."):
+    """
+    Look up the cached verdict for `command` on the current tree.
+
+    Compute the key BEFORE running the tests and pass it to record(): test
+    runs may leave files behind (coverage reports, snapshots) that would
+    otherwise change the hash.
+
+    Returns: (key, entry) - entry is a dict with success (bool), output and
+             command, or None on a miss; key is None if the tree can't be hashed
+    """
+    root = project_root(cwd)
+    if not root:
+        return None, None
+
+    key = cache_key(command, root)
+    if not key:
+        return None, None
+
+    return key, load_json(CACHE_FILE, {}, root).get(key)
+
+
+def record(command, success, output="", cwd=".", key=None):
+    """Store the verdict of a completed test run on the current tree."""
+    root = project_root(cwd)
+    if not root:
+        return
+
+    key = key or cache_key(command, root)
+    if not key:
+        return
+
+    entries = load_json(CACHE_FILE, {}, root)
+    entries[key] = {
+        "success": bool(success),
+        "command": command,
+        "output": output[-MAX_OUTPUT_CHARS:],
+        "ts": time.time()
+    }
+
+    if len(entries) > MAX_ENTRIES:
+        oldest = sorted(entries, key=lambda k: entries[k].get("ts", 0))
+        for stale in oldest[:len(entries) - MAX_ENTRIES]:
+            del entries[stale]
+
+    save_json(CACHE_FILE, entries, root)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Saci test result cache")
+    sub = parser.add_subparsers(dest="action", required=True)
+
+    lookup_parser = sub.add_parser("lookup", help="Print cached verdict or 'miss <key>'")
+    lookup_parser.add_argument("command")
+    lookup_parser.add_argument("--output", help="Write cached test output to this file")
+
+    record_parser = sub.add_parser("record", help="Store the verdict of a test run")
+    record_parser.add_argument("command")
+    record_parser.add_argument("exit_code", type=int)
+    record_parser.add_argument("--key", help="Key printed by lookup before the run")
+    record_parser.add_argument("--output", help="File with the test output")
+
+    args = parser.parse_args()
+
+    try:
+        if args.action == "lookup":
+            key, entry = lookup(args.command)
+            if key is None:
+                sys.exit(1)
+            if entry is None:
+                print(f"miss {key}")
+                sys.exit(0)
+            if args.output:
+                with open(args.output, "w") as f:
+                    f.write(entry.get("output", ""))
+            print("pass" if entry["success"] else "fail")
+            sys.exit(0)
+
+        output = ""
+        if args.output:
+            with open(args.output, "r", errors="replace") as f:
+                output = f.read()
+        record(args.command, args.exit_code == 0, output, key=args.key)
+        sys.exit(0)
+
+    except Exception as e:
+        # A broken cache must never change a test verdict
+        print(f"Warning: test cache error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
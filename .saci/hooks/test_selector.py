@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Saci Test Selector: Run Only the Tests Affected by This Iteration
+
+Given the git checkpoint saci.sh took before the iteration (SACI_CHECKPOINT),
+work out which files changed and narrow the test command to the tests that
+touch them:
+
+- jest:   npm test -- --findRelatedTests <changed files>
+- vitest: the test script's own vitest invocation (env, wrappers, config
+  flags) as `vitest related --run <changed files>`, run with `npm exec`
+- other runners that take test file arguments (mocha, ava, node --test, ...):
+  test files found through a project import map, passed to `npm test --`
+
+Anything uncertain falls back to the full suite: no checkpoint, changed
+config/manifests, a deleted file (its importers are no longer found), a
+changed file that is not source code (fixtures, JSON, snapshots - tests read
+them without importing them), too many changes, an unknown runner, or no
+related tests.
+
+The import map is kept in .saci/cache/import-map.json and only re-parsed for
+files whose mtime/size changed.
+"""
+
+import os
+import re
+import shlex
+import subprocess
+
+from saci_cache import load_json, save_json
+
+
+IMPORT_MAP_FILE = "import-map.json"
+
+# Above this many changed files, selection costs more than it saves
+MAX_CHANGED_FILES = 100
+
+# Files listed in a block reason
+MAX_LISTED_FILES = 10
+
+SOURCE_EXTENSIONS = (".js", ".jsx", ".ts", ".tsx", ".mjs", ".cjs", ".mts", ".cts", ".vue", ".svelte")
+
+SKIP_DIRS = {"node_modules", ".git", ".saci", "dist", "build", "coverage", ".next", ".nuxt", "out", ".turbo"}
+
+# Changes to these can affect any test
+CONFIG_PATTERNS = [
+    r'(^|/)package\.json$',
+    r'(^|/)(package-lock\.json|yarn\.lock|pnpm-lock\.yaml|bun\.lockb)$',
+    r'(^|/)(jest|vitest|vite|babel|webpack|rollup|mocha|ava)\.config\.\w+$',
+    r'(^|/)(\.babelrc|\.mocharc\.\w+|\.swcrc)$',
+    r'(^|/)tsconfig[\w.-]*\.json$',
+    r'(^|/)\.env[\w.-]*$',
+    r'(^|/)(jest\.setup|setupTests|vitest\.setup)\.\w+$',
+]
+CONFIG_RE = re.compile('|'.join(CONFIG_PATTERNS))
+
+TEST_FILE_RE = re.compile(r'(\.(test|spec)\.[cm]?[jt]sx?$)|(^|/)(__tests__|test|tests)/')
+
+IMPORT_RE = re.compile(
+    r'''(?:\bimport\s[^'"]*?\bfrom\s*|\bimport\s*\(?\s*|\bexport\s[^'"]*?\bfrom\s*|\brequire\s*\(\s*)['"]([^'"]+)['"]'''
+)
+
+# Runners that accept test file paths as plain arguments
+FILE_ARG_RUNNERS = ("mocha", "ava", "tap", "node --test", "uvu", "tape")
+
+# Saci's own bookkeeping, changed every iteration without affecting tests
+# (same files test_cache.py leaves out of the tree hash)
+BOOKKEEPING_FILES = {"prp.json", "progress.txt"}
+
+# vitest subcommands a test script may start with; `related` replaces them
+VITEST_SUBCOMMANDS = {"run", "watch", "dev", "related"}
+
+
+def _git(args, cwd="."):
+    result = subprocess.run(["git"] + args, cwd=cwd, capture_output=True, text=True, timeout=30)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip())
+    return result.stdout
+
+
+def changed_files(checkpoint, root="."):
+    """Files changed since `checkpoint` (committed, staged, unstaged and untracked)."""
+    changed = _git(["diff", "--name-only", checkpoint, "--"], root).splitlines()
+    changed += _git(["ls-files", "--others", "--exclude-standard"], root).splitlines()
+    return sorted({path for path in changed if path and not path.startswith(".saci/")})
+
+
+def detect_runner(test_script):
+    """Return 'jest', 'vitest', 'files' (takes file args) or None for a test script."""
+    if not test_script:
+        return None
+    # Arguments after `npm test --` go to the LAST command of a chain, so
+    # only single-command scripts can be narrowed
+    if re.search(r'&&|\|\||;|\|', test_script):
+        return None
+    words = test_script.split()
+    # Skip env assignments and wrappers like `cross-env FOO=1 jest`
+    while words and ("=" in words[0] or words[0] in ("cross-env", "npx", "env")):
+        words.pop(0)
+    if not words:
+        return None
+    runner = os.path.basename(words[0])
+    if runner == "jest":
+        return "jest"
+    if runner == "vitest":
+        return "vitest"
+    if any(" ".join(words).startswith(name) for name in FILE_ARG_RUNNERS):
+        return "files"
+    return None
+
+
+def vitest_related_command(test_script, files):
+    """
+    The test script's vitest invocation narrowed to `files`, or None.
+
+    `cross-env CI=1 vitest run --config vitest.unit.ts` becomes
+    `npm exec -- cross-env CI=1 vitest related --run --config vitest.unit.ts <files>`,
+    keeping the project's config and flags.
+    """
+    try:
+        words = shlex.split(test_script)
+    except ValueError:
+        return None
+    runner = next((i for i, word in enumerate(words) if os.path.basename(word) == "vitest"), None)
+    if runner is None:
+        return None
+
+    env = []
+    while len(env) < runner and "=" in words[len(env)]:
+        env.append(words[len(env)])
+    wrappers = [word for word in words[len(env):runner] if word != "npx"]
+    flags = words[runner + 1:]
+    if flags and flags[0] in VITEST_SUBCOMMANDS:
+        flags = flags[1:]
+
+    argv = wrappers + [words[runner], "related", "--run"] + flags + list(files)
+    return " ".join(shlex.quote(word) for word in env + ["npm", "exec", "--"] + argv)
+
+
+# ============================================================================
+# Import map
+# ============================================================================
+
+def _resolve(specifier, importer, files):
+    """Resolve a relative import specifier to a project file, or None."""
+    if not specifier.startswith("."):
+        return None
+    base = os.path.normpath(os.path.join(os.path.dirname(importer), specifier))
+    candidates = [base] + [base + ext for ext in SOURCE_EXTENSIONS] + \
+        [os.path.join(base, "index" + ext) for ext in SOURCE_EXTENSIONS]
+    # `./foo.js` written for a TypeScript source `./foo.ts`
+    stem, ext = os.path.splitext(base)
+    if ext in (".js", ".mjs", ".cjs", ".jsx"):
+        candidates += [stem + e for e in (".ts", ".tsx", ".mts", ".cts")]
+    for candidate in candidates:
+        if candidate in files:
+            return candidate
+    return None
+
+
+def _source_files(root):
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS and not d.startswith(".")]
+        for name in filenames:
+            if name.endswith(SOURCE_EXTENSIONS):
+                yield os.path.relpath(os.path.join(dirpath, name), root)
+
+
+def build_import_map(root="."):
+    """
+    Map of project file -> list of project files it imports.
+
+    Per-file results are cached by mtime/size in .saci/cache.
+    """
+    cache = load_json(IMPORT_MAP_FILE, {}, root)
+    files = set(_source_files(root))
+    specifiers = {}
+    fresh_cache = {}
+
+    for path in files:
+        try:
+            stat = os.stat(os.path.join(root, path))
+        except OSError:
+            continue
+        signature = [stat.st_mtime_ns, stat.st_size]
+        entry = cache.get(path)
+        if entry and entry[0] == signature:
+            specs = entry[1]
+        else:
+            try:
+                with open(os.path.join(root, path), "r", errors="replace") as f:
+                    specs = sorted(set(IMPORT_RE.findall(f.read())))
+            except OSError:
+                specs = []
+        fresh_cache[path] = [signature, specs]
+        specifiers[path] = specs
+
+    if fresh_cache != cache:
+        save_json(IMPORT_MAP_FILE, fresh_cache, root)
+
+    imports = {}
+    for path, specs in specifiers.items():
+        resolved = (_resolve(spec, path, files) for spec in specs)
+        imports[path] = sorted({r for r in resolved if r})
+    return imports
+
+
+def related_test_files(changed, imports):
+    """Test files that are, or transitively import, any of the changed files."""
+    importers = {}
+    for path, deps in imports.items():
+        for dep in deps:
+            importers.setdefault(dep, []).append(path)
+
+    seen = set()
+    queue = [path for path in changed if path in imports or path in importers]
+    while queue:
+        path = queue.pop()
+        if path in seen:
+            continue
+        seen.add(path)
+        queue.extend(importers.get(path, []))
+
+    return sorted(path for path in seen if TEST_FILE_RE.search(path))
+
+
+# ============================================================================
+# Selection
+# ============================================================================
+
+def _full(command, reason):
+    return {"mode": "full", "command": command, "files": [], "reason": reason}
+
+
+def select_tests(base_command, test_script, checkpoint, root="."):
+    """
+    Choose the test command for this iteration.
+
+    Returns: dict with mode ("affected" or "full"), command, files (the
+             changed files or test files the subset is based on) and reason
+    """
+    if os.environ.get("SACI_TEST_SELECTION", "affected") == "full":
+        return _full(base_command, "affected-test selection disabled")
+    if not checkpoint:
+        return _full(base_command, "no iteration checkpoint")
+
+    try:
+        changed = changed_files(checkpoint, root)
+    except (RuntimeError, OSError, subprocess.SubprocessError):
+        return _full(base_command, "could not diff against checkpoint")
+
+    if not changed:
+        return _full(base_command, "no changes since checkpoint")
+    if len(changed) > MAX_CHANGED_FILES:
+        return _full(base_command, f"{len(changed)} files changed")
+
+    config = [path for path in changed if CONFIG_RE.search(path)]
+    if config:
+        return _full(base_command, f"config changed ({config[0]})")
+
+    sources = [path for path in changed if path not in BOOKKEEPING_FILES]
+    if not sources:
+        return _full(base_command, "no changed source files")
+    deleted = [path for path in sources if not os.path.lexists(os.path.join(root, path))]
+    if deleted:
+        return _full(base_command, f"file deleted ({deleted[0]})")
+    other = [path for path in sources if not path.endswith(SOURCE_EXTENSIONS)]
+    if other:
+        return _full(base_command, f"non-source file changed ({other[0]})")
+
+    runner = detect_runner(test_script)
+
+    if runner in ("jest", "vitest"):
+        quoted = " ".join(shlex.quote(path) for path in sources)
+        if runner == "jest":
+            command = f"{base_command} -- --findRelatedTests {quoted}"
+        else:
+            command = vitest_related_command(test_script, sources)
+            if not command:
+                return _full(base_command, "vitest invocation not understood")
+        return {"mode": "affected", "command": command, "files": sources,
+                "reason": f"{runner} related tests"}
+
+    if runner == "files":
+        tests = related_test_files(sources, build_import_map(root))
+        if not tests:
+            return _full(base_command, "no related test files found")
+        quoted = " ".join(shlex.quote(path) for path in tests)
+        return {"mode": "affected", "command": f"{base_command} -- {quoted}",
+                "files": tests, "reason": "import map"}
+
+    return _full(base_command, "test runner does not support selection")
+
+
+def describe(selection):
+    """One-line description of a selection for block reasons and logs."""
+    if selection["mode"] == "full":
+        return f"full suite ({selection['reason']})"
+    files = selection["files"]
+    listed = ", ".join(files[:MAX_LISTED_FILES])
+    more = f" and {len(files) - MAX_LISTED_FILES} more" if len(files) > MAX_LISTED_FILES else ""
+    return f"affected tests via {selection['reason']} for {len(files)} file(s): {listed}{more}"
+
+
+if __name__ == "__main__":
+    import sys
+    import project_meta
+    script = project_meta.load()["scripts"].get("test", "")
+    checkpoint = sys.argv[1] if len(sys.argv) > 1 else os.environ.get("SACI_CHECKPOINT")
+    selection = select_tests("npm test", script, checkpoint)
+    print(selection["command"])
+    print(describe(selection), file=sys.stderr)
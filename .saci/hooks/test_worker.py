@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Saci Test Worker: Speculative Test Runs While the Session Edits
+
+The Stop hook (check-if-done.py) used to start the tests only once Claude
+tried to stop, and then block for up to a minute. With speculative tests
+enabled (SACI_SPECULATIVE_TESTS=true, `saci jump --speculative-tests`), every
+Write/Edit call (track-edits.py) pokes a background worker instead:
+
+- edits are debounced: the worker waits until no edit arrived for
+  DEBOUNCE_SECONDS, then runs the command the Stop hook would run on this
+  tree (same affected-test selection)
+- an edit arriving during a run cancels it (the whole process group), and
+  the worker debounces again
+- a finished run is stored in the test cache (test_cache.py) under the key
+  of the tree it started on
+
+When the Stop hook fires, the verdict for the current tree is usually cached
+already. If the worker is still running that exact command on that tree the
+hook waits for it; if it is still debouncing, the hook tells it to start now
+and waits. Anything else (a different tree, no worker) runs as before. The
+wait is capped at JOIN_WAIT_SECONDS, well under the Stop hook's timeout: a
+run that takes longer is reported as still running (StillRunning) instead of
+being waited for or started a second time.
+
+One worker per project; its files are in .saci/cache/test-worker/:
+  requests    one byte appended per edit (the size is the edit count)
+  worker.pid  pid of the live worker (created exclusively)
+  state.json  {"state": "debounce" | "running" | "idle", "key", "command"}
+  flush       created by the Stop hook to skip the rest of the debounce
+  worker.log  the worker's stderr
+The worker exits after IDLE_SECONDS without edits; `saci jump` stops it
+when the session ends (test_worker.py stop).
+"""
+
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+
+import saci_trace
+import test_cache
+from saci_cache import cache_dir, load_json_file, save_json_file
+
+
+ENABLE_ENV = "SACI_SPECULATIVE_TESTS"
+
+WORKER_DIR = "test-worker"
+
+# Quiet period after the last edit before a run starts
+DEBOUNCE_SECONDS = 1.5
+
+# The worker exits after this long without edits
+IDLE_SECONDS = 120
+
+# Same limit as the Stop hook's own test run
+TEST_TIMEOUT = 60
+
+# How long the Stop hook waits for a debouncing worker to start its run
+FLUSH_WAIT_SECONDS = 5
+
+# How long the Stop hook waits for a verdict in flight (its timeout is 5s)
+JOIN_WAIT_SECONDS = 3
+
+POLL_SECONDS = 0.05
+
+
+class StillRunning(Exception):
+    """The worker is still testing the tree when the Stop hook's wait ends."""
+
+
+def enabled():
+    return os.environ.get(ENABLE_ENV) == "true"
+
+
+def _path(root, name):
+    return os.path.join(cache_dir(root), WORKER_DIR, name)
+
+
+def _edit_count(root):
+    try:
+        return os.path.getsize(_path(root, "requests"))
+    except OSError:
+        return 0
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def worker_pid(root):
+    """Pid of the project's live worker, or None."""
+    try:
+        with open(_path(root, "worker.pid")) as f:
+            pid = int(f.read().strip() or 0)
+    except (OSError, ValueError):
+        return None
+    return pid if pid > 0 and _pid_alive(pid) else None
+
+
+def state(root):
+    return load_json_file(_path(root, "state.json"), {}) or {}
+
+
+def _set_state(root, name, **fields):
+    fields["state"] = name
+    save_json_file(_path(root, "state.json"), fields)
+
+
+# ============================================================================
+# Hook side
+# ============================================================================
+
+def trigger(root, worker_script):
+    """Record an edit and make sure a worker is running (spawned detached)."""
+    os.makedirs(os.path.join(cache_dir(root), WORKER_DIR), exist_ok=True)
+    fd = os.open(_path(root, "requests"), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, b"\n")
+    finally:
+        os.close(fd)
+
+    if worker_pid(root):
+        return
+    with open(_path(root, "worker.log"), "ab") as log:
+        subprocess.Popen(
+            [sys.executable, worker_script, "--worker"], cwd=root,
+            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=log,
+            start_new_session=True, close_fds=True
+        )
+
+
+def wait_for(key, root, timeout=JOIN_WAIT_SECONDS):
+    """
+    Verdict for `key` from the worker, waiting up to `timeout` seconds while
+    it is being produced.
+
+    Returns: the test cache entry, or None if the worker is not working on
+             this tree (the caller runs the tests itself)
+    Raises: StillRunning if the worker is still on this tree at the deadline
+    """
+    deadline = time.monotonic() + timeout
+    flush_deadline = None
+    while time.monotonic() < deadline:
+        entry = test_cache.load_json(test_cache.CACHE_FILE, {}, root).get(key)
+        if entry:
+            return entry
+        if not worker_pid(root):
+            return None
+
+        current = state(root)
+        # Edits the worker has not picked up yet count as debouncing
+        pending = current.get("state") == "debounce" or (
+            current.get("state") == "idle" and current.get("edits") != _edit_count(root))
+        if current.get("state") == "running":
+            if current.get("key") != key:
+                return None
+        elif pending and flush_deadline is None:
+            open(_path(root, "flush"), "w").close()
+            flush_deadline = time.monotonic() + FLUSH_WAIT_SECONDS
+        elif flush_deadline is None or time.monotonic() > flush_deadline:
+            return None
+        time.sleep(POLL_SECONDS)
+    raise StillRunning(key)
+
+
+# ============================================================================
+# Worker side
+# ============================================================================
+
+def _claim(root):
+    """Become the project's worker; False if another one is alive."""
+    path = _path(root, "worker.pid")
+    for _ in range(2):
+        try:
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+        except FileExistsError:
+            if worker_pid(root):
+                return False
+            try:
+                os.unlink(path)  # left behind by a dead worker
+            except OSError:
+                pass
+            continue
+        with os.fdopen(fd, "w") as f:
+            f.write(str(os.getpid()))
+        return True
+    return False
+
+
+def _debounce(root):
+    """Wait until edits settle (or the Stop hook flushes); returns the edit count."""
+    _set_state(root, "debounce")
+    count, quiet_since = _edit_count(root), time.monotonic()
+    while time.monotonic() - quiet_since < DEBOUNCE_SECONDS:
+        if os.path.exists(_path(root, "flush")):
+            break
+        time.sleep(POLL_SECONDS)
+        latest = _edit_count(root)
+        if latest != count:
+            count, quiet_since = latest, time.monotonic()
+    try:
+        os.unlink(_path(root, "flush"))
+    except OSError:
+        pass
+    return _edit_count(root)
+
+
+def _kill(proc):
+    try:
+        os.killpg(proc.pid, signal.SIGTERM)
+    except OSError:
+        pass
+    try:
+        proc.wait(timeout=5)
+    except subprocess.TimeoutExpired:
+        os.killpg(proc.pid, signal.SIGKILL)
+        proc.wait()
+
+
+def run_once(select, root, edits):
+    """Run the Stop hook's tests for the current tree unless cached; returns the outcome."""
+    command, selection = select()
+    key, cached = test_cache.lookup(command, root)
+    if cached or not key:
+        return "cached" if cached else "unhashable"
+
+    _set_state(root, "running", key=key, command=command)
+    with tempfile.TemporaryFile() as output, \
+            saci_trace.span("test", "speculative", selection=selection) as span:
+        proc = subprocess.Popen(command, shell=True, cwd=root, stdin=subprocess.DEVNULL,
+                                stdout=output, stderr=subprocess.STDOUT, start_new_session=True)
+        started = time.monotonic()
+        try:
+            while proc.poll() is None:
+                if _edit_count(root) != edits:
+                    span["outcome"] = "cancelled"
+                    return "cancelled"
+                if time.monotonic() - started > TEST_TIMEOUT:
+                    span["outcome"] = "timeout"
+                    return "timeout"
+                time.sleep(POLL_SECONDS)
+        finally:
+            if proc.poll() is None:
+                _kill(proc)
+
+        output.seek(0)
+        text = output.read().decode("utf-8", "replace")
+        span["outcome"] = "pass" if proc.returncode == 0 else "fail"
+        test_cache.record(command, proc.returncode == 0, text, cwd=root, key=key)
+        return span["outcome"]
+
+
+def _serve_until_idle(select, root, done):
+    idle_since = time.monotonic()
+    while time.monotonic() - idle_since <= IDLE_SECONDS:
+        if _edit_count(root) == done:
+            time.sleep(POLL_SECONDS * 4)
+            continue
+        done = _debounce(root)
+        run_once(select, root, done)
+        _set_state(root, "idle", edits=done)
+        idle_since = time.monotonic()
+    return done
+
+
+def serve(select, root="."):
+    """Worker loop: debounce edits, run, repeat; exits after IDLE_SECONDS without edits."""
+    # `test_worker.py stop` sends SIGTERM; unwind so the test run is killed too
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    done = 0
+    while _claim(root):
+        try:
+            done = _serve_until_idle(select, root, done)
+        finally:
+            _set_state(root, "idle", edits=done)
+            try:
+                os.unlink(_path(root, "worker.pid"))
+            except OSError:
+                pass
+        # An edit that arrived while exiting found this worker still alive
+        if _edit_count(root) == done:
+            break
+
+
+def stop(root, timeout=10):
+    """Stop the project's worker (which kills its test run) and wait for it to exit."""
+    pid = worker_pid(root)
+    if pid:
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except OSError:
+            pass
+        deadline = time.monotonic() + timeout
+        while _pid_alive(pid) and time.monotonic() < deadline:
+            time.sleep(POLL_SECONDS)
+    for name in ("worker.pid", "state.json", "flush"):
+        try:
+            os.unlink(_path(root, name))
+        except OSError:
+            pass
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] != ["stop"]:
+        print("Usage: test_worker.py stop", file=sys.stderr)
+        sys.exit(2)
+    root = test_cache.project_root()
+    if root:
+        stop(root)
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Saci PostToolUse Hook: Edit Journal for Targeted Rollbacks
+
+Records every file the session writes through Claude's file tools (Write,
+Edit, MultiEdit, NotebookEdit) in the iteration's edit journal, so a failed
+iteration can be rolled back by restoring just those paths (see
+lib/checkpoint.py) instead of `git reset --hard` + `git clean -fd` over the
+whole tree.
+
+Changes made by Bash commands need no journal: the rollback finds them by
+comparing the working tree with the checkpoint snapshot. What only the
+journal knows is which *ignored* files the session created itself (Write
+reports "create"), so those are removed while ignored build/test caches are
+kept.
+
+With speculative tests on (SACI_SPECULATIVE_TESTS=true), each edit also
+pokes the background test worker (test_worker.py), which re-runs the Stop
+hook's tests once the edits settle.
+
+The journal is the file named by SACI_EDIT_JOURNAL (`saci jump` exports it
+at each checkpoint); outside of Saci the hook does nothing. One JSON object
+per line, written with a single O_APPEND write:
+  {"path": "/abs/project/src/app.ts", "tool": "Write", "created": true}
+
+Exit code: 0 (always allow, it only records)
+
+Input (stdin): JSON with tool_name, tool_input and tool_response
+"""
+
+import json
+import os
+import sys
+
+import saci_trace
+
+try:
+    import test_cache
+    import test_worker
+except ImportError:
+    test_cache = test_worker = None
+
+
+JOURNAL_ENV = "SACI_EDIT_JOURNAL"
+
+# Runs the background test worker (check-if-done.py --worker)
+STOP_HOOK = os.path.join(os.path.dirname(os.path.abspath(__file__)), "check-if-done.py")
+
+# Tool -> field of tool_input holding the path it writes
+FILE_TOOLS = {
+    "Write": "file_path",
+    "Edit": "file_path",
+    "MultiEdit": "file_path",
+    "NotebookEdit": "notebook_path",
+}
+
+
+def edited_path(data):
+    """(path, tool, created) written by a file tool call, or None."""
+    tool = data.get("tool_name", "")
+    field = FILE_TOOLS.get(tool)
+    tool_input = data.get("tool_input")
+    if not field or not isinstance(tool_input, dict):
+        return None
+    path = tool_input.get(field)
+    if not isinstance(path, str) or not path:
+        return None
+
+    response = data.get("tool_response")
+    created = isinstance(response, dict) and response.get("type") == "create"
+    return path, tool, created
+
+
+def record(journal, path, tool, created, cwd="."):
+    """Append one edit to the journal (relative paths are resolved against `cwd`)."""
+    path = os.path.abspath(os.path.join(cwd, path))
+    line = json.dumps({"path": path, "tool": tool, "created": created}) + "\n"
+    fd = os.open(journal, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, line.encode("utf-8", "replace"))
+    finally:
+        os.close(fd)
+
+
+def main():
+    journal = os.environ.get(JOURNAL_ENV)
+    try:
+        data = json.loads(sys.stdin.read() or "{}")
+    except (OSError, ValueError):
+        data = {}
+
+    edit = edited_path(data) if isinstance(data, dict) else None
+    if edit and journal:
+        try:
+            record(journal, *edit, cwd=data.get("cwd") or ".")
+        except OSError as e:
+            # Without the entry the rollback still finds the change (or falls
+            # back to a full reset); never fail the tool call over it
+            print(f"Warning: could not record edit: {e}", file=sys.stderr)
+
+    if edit and test_worker and test_worker.enabled():
+        root = test_cache.project_root(data.get("cwd") or ".")
+        if root:
+            try:
+                test_worker.trigger(root, STOP_HOOK)
+            except OSError as e:
+                print(f"Warning: could not start speculative tests: {e}", file=sys.stderr)
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    saci_trace.run_hook(main, __file__)
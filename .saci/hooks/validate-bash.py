@@ -8,6 +8,10 @@ Validates Bash commands BEFORE Claude executes them to prevent:
 - File operations on non-existent paths
 - Other impossible commands
 
+Verdicts are remembered per command (verdict_cache.py) together with the
+package.json state and path checks they depended on, so repeated commands
+skip validation until one of those changes.
+
 Exit codes:
 - 0: Allow command (valid)
 - 2: BLOCK command (invalid, sends feedback to Claude via JSON)
@@ -20,107 +24,220 @@ import json
 import sys
 import re
 import os
-import subprocess
-from pathlib import Path
-
-
-def load_package_json():
-    """Load and parse package.json if it exists."""
-    package_json_path = Path("package.json")
-    if package_json_path.exists():
-        try:
-            with open(package_json_path, 'r') as f:
-                return json.load(f)
-        except json.JSONDecodeError:
-            return None
-    return None
-
-
-def get_available_npm_scripts():
-    """Get list of available npm scripts from package.json."""
-    pkg = load_package_json()
-    if pkg and "scripts" in pkg:
-        return list(pkg["scripts"].keys())
-    return []
-
-
-def validate_npm_script(command):
-    """Validate npm run <script> commands."""
-    match = re.search(r'npm\s+run\s+(\S+)', command)
-    if not match:
-        return {"allow": True}
 
-    script_name = match.group(1)
-    available_scripts = get_available_npm_scripts()
+from shell_parser import Word, parse_command, expand_user_path
+import project_meta
+import saci_trace
+from saci_cache import cache_dir
+from verdict_cache import Dependencies, open_cache
 
-    if not available_scripts:
-        # No package.json or no scripts section
-        return {
-            "allow": False,
-            "reason": f"Script '{script_name}' does not exist: package.json not found or has no scripts section."
-        }
 
-    if script_name not in available_scripts:
+# npm options that take a value (so the value isn't mistaken for the script)
+NPM_FLAGS_WITH_VALUES = ("-w", "--workspace", "--prefix", "-C")
+
+VERDICTS_FILE = "bash-verdicts.jsonl"
+
+# Code the verdicts depend on (a changed validator invalidates them all)
+CODE_FILES = [os.path.join(os.path.dirname(os.path.abspath(__file__)), name)
+              for name in (os.path.basename(__file__), "shell_parser.py", "project_meta.py", "verdict_cache.py")]
+
+
+def _list_scripts(scripts):
+    return f"{', '.join(scripts[:5])}{'...' if len(scripts) > 5 else ''}"
+
+
+def _workspace_selectors(segment):
+    """Values of -w/--workspace options (before `--`)."""
+    selectors = []
+    words = segment.args
+    for i, word in enumerate(words):
+        text = word.text
+        if text == "--":
+            break
+        if text in ("-w", "--workspace") and i + 1 < len(words):
+            selectors.append(words[i + 1])
+        elif text.startswith("--workspace="):
+            selectors.append(Word(text.split("=", 1)[1], word.quoted, word.expansion))
+    return selectors
+
+
+def _validate_workspace_script(script_name, segment, meta):
+    """Check a script run with -w/--workspaces against the workspace packages."""
+    if not meta["workspaces"]:
         return {
             "allow": False,
-            "reason": f"Script '{script_name}' does not exist in package.json. Available scripts: {', '.join(available_scripts[:5])}{'...' if len(available_scripts) > 5 else ''}"
+            "reason": "npm workspace option used, but package.json defines no workspaces."
         }
 
+    if segment.has_option("--workspaces", "-ws"):
+        missing = sorted(name for name, info in meta["workspaces"].items()
+                         if script_name not in info["scripts"])
+        if missing:
+            return {
+                "allow": False,
+                "reason": f"Script '{script_name}' does not exist in workspace(s): {_list_scripts(missing)}. Add --if-present to skip them."
+            }
+        return {"allow": True}
+
+    for selector in _workspace_selectors(segment):
+        if selector.expansion:
+            continue
+        found = project_meta.find_workspace(meta, selector.text)
+        if not found:
+            return {
+                "allow": False,
+                "reason": f"Workspace '{selector.text}' not found. Available workspaces: {_list_scripts(sorted(meta['workspaces']))}"
+            }
+        name, info = found
+        if script_name not in info["scripts"]:
+            return {
+                "allow": False,
+                "reason": f"Script '{script_name}' does not exist in workspace '{name}'. Available scripts: {_list_scripts(info['scripts'])}"
+            }
     return {"allow": True}
 
 
-def validate_git_command(command):
-    """Validate git commands to prevent dangerous operations."""
-    # Block force push to main/master
-    if re.search(r'git\s+push\s+.*--force', command):
-        if re.search(r'\b(main|master)\b', command):
+def validate_npm_script(parsed, deps):
+    """Validate npm run <script> commands (including -w/--workspaces)."""
+    for segment in parsed.commands("npm"):
+        operands = segment.operand_words(flags_with_values=NPM_FLAGS_WITH_VALUES)
+        if not operands or operands[0].text not in ("run", "run-script"):
+            continue
+
+        if len(operands) < 2:
+            # Bare `npm run` just lists scripts
+            continue
+
+        script = operands[1]
+        if script.expansion:
+            # $SCRIPT - can't know the name before the shell expands it
+            continue
+        if segment.has_option("--if-present"):
+            continue
+        if any(opt in ("--prefix", "-C") or opt.startswith("--prefix=") for opt in segment.options()):
+            # Runs in another project
+            continue
+
+        script_name = script.text
+        meta = project_meta.load()
+        deps.signature(project_meta.signature())
+
+        if _workspace_selectors(segment) or segment.has_option("--workspaces", "-ws"):
+            result = _validate_workspace_script(script_name, segment, meta)
+            if not result["allow"]:
+                return result
+            continue
+
+        available_scripts = list(meta["scripts"])
+
+        if not available_scripts:
+            # No package.json or no scripts section
             return {
                 "allow": False,
-                "reason": "Force push to main/master branch is blocked for safety. Use regular push or create a pull request."
+                "reason": f"Script '{script_name}' does not exist: package.json not found or has no scripts section."
             }
 
-    # Block hard reset without confirmation
-    if re.search(r'git\s+reset\s+--hard', command):
-        # This is actually used by Saci itself, so we allow it
-        # But we could add a warning or check if it's in a safe context
-        pass
+        if script_name not in available_scripts:
+            return {
+                "allow": False,
+                "reason": f"Script '{script_name}' does not exist in package.json. Available scripts: {_list_scripts(available_scripts)}"
+            }
 
     return {"allow": True}
 
 
-def validate_file_operation(command):
-    """Validate file operations (rm, mv, cp) to check if paths exist."""
-    # Match common file operations
-    patterns = [
-        (r'\brm\s+(?:-\w+\s+)?(.+)', "remove"),
-        (r'\bmv\s+(\S+)\s+', "move"),
-        (r'\bcp\s+(\S+)\s+', "copy"),
-    ]
-
-    for pattern, operation in patterns:
-        match = re.search(pattern, command)
-        if match:
-            file_path = match.group(1).strip()
-            # Remove flags and quotes
-            file_path = re.sub(r'^-\w+\s+', '', file_path)
-            file_path = file_path.strip('"').strip("'")
-
-            # Skip wildcards and special paths
-            if '*' in file_path or file_path.startswith('/dev/') or file_path.startswith('/tmp/'):
-                continue
-
-            # Check if path exists
-            if not os.path.exists(file_path):
+def validate_git_command(parsed, deps):
+    """Validate git commands to prevent dangerous operations."""
+    for segment in parsed.commands("git"):
+        # Skip global options such as `git -C dir push`
+        operands = segment.operands(flags_with_values=("-C", "-c"))
+        if not operands or operands[0] != "push":
+            continue
+
+        # Block force push to main/master
+        force = any(opt.startswith("--force") for opt in segment.options()) \
+            or segment.has_option("-f")
+        for ref in operands[1:]:
+            if re.search(r'\b(main|master)\b', ref) and (force or ref.startswith("+")):
                 return {
                     "allow": False,
-                    "reason": f"Cannot {operation} '{file_path}': file or directory does not exist."
+                    "reason": "Force push to main/master branch is blocked for safety. Use regular push or create a pull request."
                 }
 
+    # `git reset --hard` is used by Saci itself, so it is allowed
+
     return {"allow": True}
 
 
-def validate_command(command):
-    """Main validation function - runs all validators."""
+# Operands that can't (or shouldn't) be checked for existence
+def _skip_path_check(word):
+    path = word.text
+    return (
+        word.expansion or word.glob
+        or path.startswith('/dev/') or path.startswith('/tmp/')
+    )
+
+
+def validate_file_operation(parsed, deps):
+    """Validate file operations (rm, mv, cp) to check if paths exist."""
+    # Paths created earlier in the same command line (mkdir x && rm -r x)
+    created = set()
+    cwd = "."
+
+    for segment in parsed:
+        name = segment.name
+
+        if name == "cd":
+            operands = segment.operand_words()
+            if not operands:
+                cwd = os.path.expanduser("~")
+            elif operands[0].expansion or operands[0].text == "-":
+                # Unknown directory from here on - stop checking
+                return {"allow": True}
+            else:
+                cwd = expand_user_path(operands[0].text, cwd)
+            continue
+
+        if name in ("rm", "mv", "cp"):
+            operands = segment.operand_words(flags_with_values=("-t", "-S", "--suffix"))
+            if name == "rm":
+                sources, operation = operands, "remove"
+            else:
+                # Last operand is the destination (unless -t DIR was given)
+                has_target_dir = "-t" in segment.options() or \
+                    any(opt.startswith("--target-directory") for opt in segment.options())
+                sources = operands if has_target_dir else operands[:-1] or operands
+                operation = "move" if name == "mv" else "copy"
+
+            for word in sources:
+                if _skip_path_check(word):
+                    continue
+                path = expand_user_path(word.text, cwd)
+                if path not in created and not deps.exists(path):
+                    return {
+                        "allow": False,
+                        "reason": f"Cannot {operation} '{word.text}': file or directory does not exist."
+                    }
+
+            if name in ("mv", "cp") and len(operands) > 1:
+                created.add(expand_user_path(operands[-1].text, cwd))
+
+        elif name in ("mkdir", "touch"):
+            for word in segment.operand_words(flags_with_values=("-m",)):
+                created.add(expand_user_path(word.text, cwd))
+
+        for redirect in segment.redirects:
+            if redirect.writes and redirect.target is not None:
+                created.add(expand_user_path(redirect.target.text, cwd))
+
+    return {"allow": True}
+
+
+def validate_command(command, deps=None):
+    """Main validation function - runs all validators on one parse."""
+    parsed = parse_command(command)
+    deps = deps if deps is not None else Dependencies()
+
     validators = [
         validate_npm_script,
         validate_git_command,
@@ -128,13 +245,29 @@ def validate_command(command):
     ]
 
     for validator in validators:
-        result = validator(command)
+        result = validator(parsed, deps)
         if not result["allow"]:
             return result
 
     return {"allow": True}
 
 
+def cached_validate_command(command):
+    """validate_command, answered from the verdict cache when nothing it depended on changed."""
+    try:
+        path = os.path.join(cache_dir(os.environ.get("CLAUDE_PROJECT_DIR") or "."), VERDICTS_FILE)
+    except OSError:
+        return validate_command(command)
+    cache = open_cache(os.path.abspath(path), CODE_FILES)
+    key = cache.key(command)
+    result = cache.lookup(key)
+    if result is None:
+        deps = Dependencies()
+        result = validate_command(command, deps)
+        cache.store(key, result, deps)
+    return result
+
+
 def main():
     try:
         # Read input from stdin
@@ -148,7 +281,7 @@ def main():
             sys.exit(0)
 
         # Validate command
-        result = validate_command(command)
+        result = cached_validate_command(command)
 
         if result["allow"]:
             # Allow command (exit 0)
@@ -163,6 +296,7 @@ def main():
                 }
             }
             print(json.dumps(output), file=sys.stdout)
+            saci_trace.annotate(outcome="blocked")
             sys.exit(0)  # Changed from exit 2 to exit 0 with JSON output
 
     except json.JSONDecodeError as e:
@@ -174,4 +308,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    saci_trace.run_hook(main, __file__)
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Saci Verdict Cache: Remembered PreToolUse Verdicts for Repeated Commands
+
+The agent runs the same few commands (`npm test`, `npm run lint`,
+`git status`) hundreds of times per run, and the Bash validators used to
+parse and check every one of them from scratch. A verdict (allow, or deny
+with its reason) is now remembered together with what it depended on:
+
+- the command, the working directory and $HOME (which resolve paths)
+- the hook's own code files (their mtime/size)
+- whatever the validator looked at while deciding, recorded through a
+  Dependencies object: mtime/size of files such as package.json, and
+  whether checked paths existed
+
+A remembered verdict is only used while every dependency still holds, so
+adding a script to package.json or deleting a file re-validates the commands
+that depended on it, and nothing else.
+
+Entries live in a JSON-lines journal (one appended line per new verdict,
+rewritten down to the MAX_ENTRIES most recently stored or used entries once
+it holds twice that many) and in memory inside the warm hook server, so a
+repeated command costs a dictionary lookup plus one stat() per dependency.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from collections import OrderedDict
+
+
+# Verdicts kept after a compaction (least recently used dropped first)
+MAX_ENTRIES = 512
+
+# Bump when the entry layout changes
+VERDICT_VERSION = 1
+
+# Loaded journals: path -> VerdictCache
+_OPEN = {}
+
+
+def _stat(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+class Dependencies:
+    """What a verdict depended on, recorded while the validators run."""
+
+    def __init__(self):
+        self.items = []
+
+    def exists(self, path):
+        """os.path.exists(path), remembered as a dependency."""
+        result = os.path.exists(path)
+        self.items.append(["exists", os.path.abspath(path), result])
+        return result
+
+    def file(self, path):
+        """Depend on the mtime/size of `path` (or on its absence)."""
+        self.items.append(["stat", os.path.abspath(path), _stat(path)])
+
+    def signature(self, signature):
+        """Depend on a [[path, stat], ...] signature (see project_meta.signature)."""
+        for path, stat in signature:
+            self.items.append(["stat", os.path.abspath(path), stat])
+
+
+def _holds(dependency):
+    kind, path, expected = dependency
+    if kind == "exists":
+        return os.path.exists(path) == expected
+    return _stat(path) == expected
+
+
+class VerdictCache:
+    """LRU verdicts for one hook, persisted in a JSON-lines journal."""
+
+    def __init__(self, path, code_files=(), max_entries=MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.code_files = [os.path.abspath(p) for p in code_files]
+        self.entries = OrderedDict()    # key -> [verdict, dependencies]
+        self._loaded = None             # journal stat when last read
+        self._lines = 0
+
+    def _code_salt(self):
+        return json.dumps([VERDICT_VERSION] + [_stat(path) for path in self.code_files])
+
+    def key(self, command, cwd=None):
+        text = json.dumps([self._code_salt(), cwd or os.getcwd(), os.path.expanduser("~"), command])
+        return hashlib.sha256(text.encode("utf-8", "surrogateescape")).hexdigest()[:32]
+
+    def _refresh(self):
+        """(Re)read the journal if another process appended to it."""
+        stat = _stat(self.path)
+        if stat == self._loaded:
+            return
+        self.entries.clear()
+        self._lines = 0
+        try:
+            with open(self.path, "r") as f:
+                for line in f:
+                    self._lines += 1
+                    try:
+                        key, verdict, dependencies = json.loads(line)
+                    except ValueError:
+                        continue    # a line torn by a concurrent append
+                    self.entries.pop(key, None)
+                    self.entries[key] = [verdict, dependencies]
+        except OSError:
+            pass
+        self._loaded = stat
+
+    def lookup(self, key):
+        """The remembered verdict for `key`, or None if unknown or stale."""
+        self._refresh()
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if not all(_holds(dependency) for dependency in entry[1]):
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return entry[0]
+
+    def store(self, key, verdict, dependencies):
+        """Remember a verdict and what it depended on."""
+        self._refresh()
+        items = dependencies.items if isinstance(dependencies, Dependencies) else list(dependencies)
+        self.entries.pop(key, None)
+        self.entries[key] = [verdict, items]
+        try:
+            if self._lines + 1 >= 2 * self.max_entries:
+                self._compact()
+            else:
+                with open(self.path, "a") as f:
+                    f.write(json.dumps([key, verdict, items], separators=(",", ":")) + "\n")
+                self._lines += 1
+        except OSError:
+            return  # only a cache
+        self._loaded = _stat(self.path)
+
+    def _compact(self):
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.path),
+                                        prefix=f".{os.path.basename(self.path)}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                for key, (verdict, items) in self.entries.items():
+                    f.write(json.dumps([key, verdict, items], separators=(",", ":")) + "\n")
+            os.replace(tmp_path, self.path)
+        except OSError:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+        self._lines = len(self.entries)
+
+
+def open_cache(path, code_files=()):
+    """The VerdictCache for a journal path, kept for the life of the process."""
+    cache = _OPEN.get(path)
+    if cache is None:
+        cache = _OPEN[path] = VerdictCache(path, code_files)
+    return cache
+
@@ -85,6 +85,7 @@ mkdir -p "$SACI_LIB_DIR/templates"
 
 # Copy core files
 cp "$SOURCE_DIR/lib/"*.sh "$SACI_LIB_DIR/lib/"
+cp "$SOURCE_DIR/lib/"*.py "$SACI_LIB_DIR/lib/" 2>/dev/null || true
 cp -r "$SOURCE_DIR/templates/"* "$SACI_LIB_DIR/templates/"
 cp "$SOURCE_DIR/saci.sh" "$SACI_LIB_DIR/saci"
 
@@ -148,6 +149,25 @@ if [ -f "$SOURCE_DIR/templates/hooks/scripts/safety-check.py" ]; then
     echo "  ✓ Safety hook installed"
 fi
 
+# Hook client shim (talks to the warm hook server started by `saci jump`)
+if [ -f "$SOURCE_DIR/.saci/hooks/hook_client.py" ]; then
+    cp "$SOURCE_DIR/.saci/hooks/hook_client.py" "$CLAUDE_HOOKS_DIR/"
+    chmod +x "$CLAUDE_HOOKS_DIR/hook_client.py"
+fi
+
+# Shared shell tokenizer used by the safety hook (falls back to substring checks without it)
+if [ -f "$SOURCE_DIR/.saci/hooks/shell_parser.py" ]; then
+    cp "$SOURCE_DIR/.saci/hooks/shell_parser.py" "$CLAUDE_HOOKS_DIR/"
+fi
+
+# Rule pack loader (user/project rules.json), the verdict cache, the cache helpers they use,
+# the timing trace and the rule prefilter
+for module in rule_packs.py saci_cache.py verdict_cache.py saci_trace.py regex_prefilter.py; do
+    if [ -f "$SOURCE_DIR/.saci/hooks/$module" ]; then
+        cp "$SOURCE_DIR/.saci/hooks/$module" "$CLAUDE_HOOKS_DIR/"
+    fi
+done
+
 # Configure settings.json with all hooks
 mkdir -p "$CLAUDE_DIR"
 
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Saci Analyze Engine: Batch Pattern Analysis for `saci analyze`
+
+analyzer.sh looks at one file per run and greps it once per pattern. To learn
+a codebase's conventions, this engine takes files, directories and globs,
+analyzes every matching file on a process pool (each file is read once and
+all detectors of its kind run on the text in memory), and aggregates how
+often each pattern occurs across the codebase.
+
+The detectors are the ones of analyzer.sh, with the same file kinds:
+*.tsx/*.jsx are components, other files under an api/ directory are API
+routes, other *.ts/*.js files are components.
+
+Patterns used by at least MIN_HINT_SHARE of the files of their kind are
+codebase conventions; their hints are reported ready to paste into a task's
+`context.hints` in prp.json.
+
+Usage:
+  analyze_engine.py [--format shell|json] [--jobs N] [--min-share F] PATH...
+
+  PATH   file, directory (searched recursively, .gitignore honored) or glob
+  shell  files|TOTAL|COMPONENTS|API_ROUTES
+         pattern|NAME|FILES|PERCENT|EXAMPLE   (most frequent first)
+         hint|TEXT
+  json   the same report as one object
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import scan_engine
+
+
+# Extensions analyzed when walking directories
+EXTENSIONS = (".tsx", ".jsx", ".ts", ".js")
+
+# Below this many files the pool costs more than it saves
+MIN_POOL_FILES = 64
+
+# Share of the files of a kind that makes a pattern a convention
+MIN_HINT_SHARE = 0.2
+
+# Example files listed per pattern in the JSON report
+MAX_EXAMPLES = 3
+
+# (pattern, regex, hint) per file kind - the greps of analyzer.sh;
+# "{file}" in a hint is replaced by an example file
+DETECTORS = {
+    "component": [
+        ("Uses forwardRef", r"forwardRef", "Use forwardRef for component refs like in {file}"),
+        ("TypeScript Props interface", r"interface.*Props", "Define Props interface following pattern in {file}"),
+        ("Client Component", r"'use client'", None),
+        ("Server Actions", r"'use server'", "Use Server Actions pattern from {file}"),
+        ("React Hooks", r"useState|useEffect|useCallback|useMemo", None),
+        ("Uses cn() for classNames", r"className.*cn\(", "Use cn() utility for conditional classes"),
+        ("Class Variance Authority (cva)", r"variants|cva\(", "Use cva for component variants like {file}"),
+        ("Tailwind class merging", r"clsx|twMerge", None),
+        ("Test IDs for testing", r"data-testid", "Add data-testid attributes for testing"),
+        ("Accessibility attributes", r"aria-", "Include proper aria-* attributes for a11y"),
+    ],
+    "api": [
+        ("Next.js App Router API", r"NextRequest|NextResponse", "Use NextRequest/NextResponse pattern"),
+        ("Route handlers", r"export async function GET|POST|PUT|DELETE|PATCH", None),
+        ("Zod validation", r"zod|z\.", "Validate request body with zod"),
+        ("Error handling with try/catch", r"try.*catch", "Wrap in try/catch and return proper error responses"),
+        ("Database operations", r"prisma|db\.", None),
+    ],
+}
+
+_COMPILED = {kind: [(name, re.compile(regex), hint) for name, regex, hint in detectors]
+             for kind, detectors in DETECTORS.items()}
+
+
+def file_kind(path):
+    """Detector set for a file (the case statement of run_analyzer), or None."""
+    normalized = path.replace(os.sep, "/")
+    if normalized.endswith((".tsx", ".jsx")):
+        return "component"
+    if "/api/" in "/" + normalized:
+        return "api"
+    if normalized.endswith((".ts", ".js")):
+        return "component"
+    return None
+
+
+def analyze_file(path):
+    """Returns (path, kind, names of the patterns found); kind is None if skipped."""
+    kind = file_kind(path)
+    if kind is None:
+        return path, None, []
+    try:
+        with open(path, "r", errors="replace") as f:
+            text = f.read()
+    except OSError:
+        return path, None, []
+    return path, kind, [name for name, regex, _ in _COMPILED[kind] if regex.search(text)]
+
+
+def _walk(directory):
+    """Source files under `directory`, skipping ignored and always-pruned subtrees."""
+    pending = [(directory, scan_engine.IgnoreRules())]
+    while pending:
+        path, rules = pending.pop()
+        rel = os.path.relpath(path, directory).replace(os.sep, "/")
+        rel = "" if rel == "." else rel
+        try:
+            entries = sorted(os.scandir(path), key=lambda entry: entry.name)
+        except OSError:
+            continue
+        try:
+            with open(os.path.join(path, ".gitignore"), "r", errors="replace") as f:
+                rules = rules.child(rel, f.read())
+        except OSError:
+            pass
+        for entry in entries:
+            child = rel + "/" + entry.name if rel else entry.name
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                continue
+            if rules.ignored(child, is_dir):
+                continue
+            if is_dir:
+                if entry.name not in scan_engine.ALWAYS_PRUNED:
+                    pending.append((entry.path, rules))
+            elif entry.name.endswith(EXTENSIONS):
+                yield entry.path
+
+
+def expand_paths(targets):
+    """Files named by `targets` (files, directories, globs), without duplicates."""
+    files = {}
+    for target in targets:
+        matches = [target] if os.path.exists(target) else sorted(glob.glob(target, recursive=True))
+        for match in matches:
+            if os.path.isdir(match):
+                for path in _walk(match):
+                    files.setdefault(os.path.normpath(path))
+            elif os.path.isfile(match):
+                files.setdefault(os.path.normpath(match))
+    return list(files)
+
+
+def analyze(paths, jobs=None):
+    """Analyze files; uses a process pool for large batches."""
+    if len(paths) < MIN_POOL_FILES or jobs == 1:
+        return [analyze_file(path) for path in paths]
+    jobs = jobs or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(analyze_file, paths, chunksize=max(1, len(paths) // (jobs * 8))))
+
+
+def report(results, min_share=MIN_HINT_SHARE):
+    """Aggregate per-file results into pattern frequencies and hints."""
+    per_kind = {kind: 0 for kind in DETECTORS}
+    found = {}
+    for path, kind, names in results:
+        if kind is None:
+            continue
+        per_kind[kind] += 1
+        for name in names:
+            found.setdefault((kind, name), []).append(path)
+
+    patterns, hints = [], []
+    for kind, detectors in DETECTORS.items():
+        for name, _, hint in detectors:
+            files = sorted(found.get((kind, name), []))
+            if not files:
+                continue
+            share = len(files) / per_kind[kind]
+            patterns.append({"name": name, "kind": kind, "files": len(files),
+                             "share": round(share, 3), "examples": files[:MAX_EXAMPLES]})
+            if hint and share >= min_share:
+                hints.append(hint.format(file=files[0]))
+
+    patterns.sort(key=lambda pattern: -pattern["files"])
+    return {
+        "files": sum(per_kind.values()),
+        "components": per_kind["component"],
+        "api_routes": per_kind["api"],
+        "patterns": patterns,
+        "hints": hints,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Saci batch pattern analyzer")
+    parser.add_argument("paths", nargs="+", help="files, directories or globs")
+    parser.add_argument("--format", choices=["shell", "json"], default="shell")
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--min-share", type=float, default=MIN_HINT_SHARE,
+                        help=f"share of files that makes a pattern a hint (default: {MIN_HINT_SHARE})")
+    args = parser.parse_args()
+
+    files = expand_paths(args.paths)
+    if not files:
+        print(f"Error: no files found in: {' '.join(args.paths)}", file=sys.stderr)
+        sys.exit(1)
+
+    result = report(analyze(files, args.jobs), args.min_share)
+    if args.format == "json":
+        print(json.dumps(result, indent=2))
+        return
+
+    print(f"files|{result['files']}|{result['components']}|{result['api_routes']}")
+    for pattern in result["patterns"]:
+        print(f"pattern|{pattern['name']}|{pattern['files']}|{round(pattern['share'] * 100)}|{pattern['examples'][0]}")
+    for hint in result["hints"]:
+        print(f"hint|{hint}")
+
+
+if __name__ == "__main__":
+    main()
@@ -18,6 +18,9 @@ log_success() { echo -e "${GREEN}[✓]${NC} $1"; }
 log_item() { echo -e "  ${CYAN}•${NC} $1"; }
 log_hint() { echo -e "  ${YELLOW}→${NC} $1"; }
 
+# Batch analysis of directories/globs (lib/analyze_engine.py)
+ANALYZE_ENGINE="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/analyze_engine.py"
+
 # ============================================================================
 # File Analysis
 # ============================================================================
@@ -191,13 +194,73 @@ analyze_api_route() {
     fi
 }
 
+# ============================================================================
+# Batch Analysis
+# ============================================================================
+
+run_batch_analyzer() {
+    if ! command -v python3 >/dev/null 2>&1 || [ ! -f "$ANALYZE_ENGINE" ]; then
+        echo -e "${RED}[✗]${NC} Analyzing several files needs python3"
+        exit 1
+    fi
+
+    echo ""
+    echo -e "${CYAN}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━${NC}"
+    echo -e "${CYAN}  🔬 Saci Analyzer - Codebase Pattern Report${NC}"
+    echo -e "${CYAN}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━${NC}"
+    echo ""
+
+    local report
+    report=$(python3 "$ANALYZE_ENGINE" "$@") || exit 1
+
+    local kind rest name count percent example
+    local hints=()
+    while IFS='|' read -r kind rest; do
+        case "$kind" in
+            files)
+                IFS='|' read -r count name percent <<< "$rest"
+                log_info "$count files analyzed ($name components, $percent API routes)"
+                echo ""
+                log_info "Pattern frequency:"
+                ;;
+            pattern)
+                IFS='|' read -r name count percent example <<< "$rest"
+                log_item "$name: $count files ($percent%), e.g. $example"
+                ;;
+            hint)
+                hints+=("$rest")
+                ;;
+        esac
+    done <<< "$report"
+    echo ""
+
+    if [ ${#hints[@]} -gt 0 ]; then
+        log_info "Codebase conventions (hints for prp.json):"
+        for h in "${hints[@]}"; do
+            log_hint "$h"
+        done
+        echo ""
+        echo "  \"hints\": $(printf '%s\n' "${hints[@]}" | jq -R . | jq -s -c .)"
+        echo ""
+    fi
+
+    log_success "Analysis complete!"
+    echo ""
+}
+
 # ============================================================================
 # Main Analyzer
 # ============================================================================
 
 run_analyzer() {
-    local target="$1"
-    
+    local target="${1:-}"
+
+    # Directories, globs and several files get one aggregated report
+    if [ $# -gt 1 ] || [ -d "$target" ] || { [ -n "$target" ] && [ ! -e "$target" ] && [[ "$target" == *[*?[]* ]]; }; then
+        run_batch_analyzer "$@"
+        return
+    fi
+
     if [ ! -f "$target" ]; then
         echo -e "${RED}[✗]${NC} File not found: $target"
         exit 1
@@ -232,7 +295,7 @@ run_analyzer() {
 # Run if called directly
 if [[ "${BASH_SOURCE[0]}" == "${0}" ]]; then
     if [ $# -lt 1 ]; then
-        echo "Usage: analyzer.sh <file>"
+        echo "Usage: analyzer.sh <file|directory|glob>..."
         exit 1
     fi
     run_analyzer "$@"
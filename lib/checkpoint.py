@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Saci Checkpoint: Snapshot Before an Iteration, Targeted Rollback After It
+
+A failed iteration used to be undone with `git reset --hard` + `git clean
+-fd`, which rewrites the index, stats and rewrites across the whole tree and
+deletes every untracked file it did not know about. On large trees that is
+slow, and it throws away state the next test run would have reused.
+
+Instead, `create` snapshots the iteration's starting point:
+- HEAD and the branch it is on
+- a copy of the index
+- the working tree (tracked + untracked, honoring .gitignore) as a git tree,
+  hashed like the test cache does (test_cache.tree_hash, Saci's own
+  prp.json / progress.txt / .saci left out)
+
+and starts the edit journal the PostToolUse hook (track-edits.py) appends to.
+
+`restore` moves HEAD back (if the session committed), puts the index copy
+back, and restores only the paths that differ from the snapshot: changed and
+deleted files are checked out of the snapshot tree, new ones are removed.
+Ignored files the session created with Write (from the journal) are removed
+too; other ignored files - node_modules, build and test caches - are kept.
+The result is verified by hashing the tree again. If anything cannot be
+restored this way (the session switched branches, a path could not be
+written, the hash differs), restore exits 1 and saci.sh falls back to the
+full reset.
+
+Usage (from saci.sh):
+  checkpoint.py create [--dir DIR]    prints the edit journal to export as
+                                      SACI_EDIT_JOURNAL, exit 1 if no snapshot
+  checkpoint.py restore [--dir DIR]   prints what was restored, exit 1 if the
+                                      caller must reset instead
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+HOOKS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".saci", "hooks")
+sys.path.insert(0, HOOKS_DIR)
+
+import test_cache  # noqa: E402
+from saci_cache import CACHE_DIR_NAME, cache_dir, load_json_file, save_json_file  # noqa: E402
+
+
+STATE_DIR = os.path.join(CACHE_DIR_NAME, "checkpoint")
+STATE_FILE = "checkpoint.json"
+INDEX_COPY = "index"
+EDIT_JOURNAL = "edits.jsonl"
+
+
+class CheckpointError(Exception):
+    """The working tree can't be snapshotted or restored without a full reset."""
+
+
+def _git(args, root, env=None, stdin=None):
+    result = subprocess.run(
+        ["git"] + args, cwd=root, env=env, input=stdin,
+        capture_output=True, text=True, timeout=120
+    )
+    if result.returncode != 0:
+        raise CheckpointError(f"git {args[0]}: {result.stderr.strip()}")
+    return result.stdout
+
+
+def _symbolic_ref(root):
+    result = subprocess.run(["git", "symbolic-ref", "-q", "HEAD"], cwd=root,
+                            capture_output=True, text=True, timeout=30)
+    return result.stdout.strip()
+
+
+def _index_path(root):
+    return os.path.join(root, _git(["rev-parse", "--git-path", "index"], root).strip())
+
+
+def _copy_atomic(source, target):
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(target), prefix=".saci-index.")
+    os.close(fd)
+    try:
+        shutil.copy2(source, tmp_path)
+        os.replace(tmp_path, target)
+    except OSError:
+        os.unlink(tmp_path)
+        raise
+
+
+def create(root, state_dir):
+    """Snapshot the project at `root`; returns the edit journal's path."""
+    head = _git(["rev-parse", "HEAD"], root).strip()
+    tree = test_cache.tree_hash(root)
+    if not tree:
+        raise CheckpointError("working tree could not be hashed")
+
+    os.makedirs(state_dir, exist_ok=True)
+    index_path = _index_path(root)
+    has_index = os.path.exists(index_path)
+    if has_index:
+        shutil.copy2(index_path, os.path.join(state_dir, INDEX_COPY))
+
+    journal = os.path.join(state_dir, EDIT_JOURNAL)
+    open(journal, "w").close()
+    save_json_file(os.path.join(state_dir, STATE_FILE), {
+        "head": head,
+        "ref": _symbolic_ref(root),
+        "tree": tree,
+        "index": has_index,
+    })
+    return journal
+
+
+def changed_paths(root, snapshot, tree):
+    """(paths to check out of the snapshot, paths to remove) between two trees."""
+    output = _git(["diff-tree", "-r", "-z", "--no-renames", "--name-status", snapshot, tree], root)
+    fields = output.split("\0")
+    restore, remove = [], []
+    for status, path in zip(fields[0::2], fields[1::2]):
+        (remove if status == "A" else restore).append(path)
+    return restore, remove
+
+
+def created_ignored_files(root, state_dir, snapshot):
+    """Files the journal says the session created that git status can't see."""
+    try:
+        with open(os.path.join(state_dir, EDIT_JOURNAL), errors="replace") as f:
+            entries = f.readlines()
+    except OSError:
+        return []
+
+    created = set()
+    for line in entries:
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            continue
+        if not (isinstance(entry, dict) and entry.get("created") and isinstance(entry.get("path"), str)):
+            continue
+        path = os.path.relpath(entry["path"], root)
+        if not path.startswith(os.pardir) and os.path.lexists(os.path.join(root, path)):
+            created.add(path)
+    if not created:
+        return []
+
+    # Only ignored files; the rest is covered by the tree diff
+    result = subprocess.run(["git", "check-ignore", "-z", "--stdin"], cwd=root,
+                            input="\0".join(sorted(created)) + "\0",
+                            capture_output=True, text=True, timeout=30)
+    ignored = [path for path in result.stdout.split("\0") if path]
+    if not ignored:
+        return []
+    in_snapshot = set(_git(["ls-tree", "-r", "-z", "--name-only", snapshot, "--"] + ignored, root).split("\0"))
+    return [path for path in ignored if path not in in_snapshot]
+
+
+def _remove(root, path):
+    full = os.path.join(root, path)
+    if os.path.isdir(full) and not os.path.islink(full):
+        shutil.rmtree(full)
+    elif os.path.lexists(full):
+        os.unlink(full)
+    # Drop directories left empty, like `git clean -fd` would
+    parent = os.path.dirname(path)
+    while parent:
+        try:
+            os.rmdir(os.path.join(root, parent))
+        except OSError:
+            break
+        parent = os.path.dirname(parent)
+
+
+def _checkout(root, snapshot, paths):
+    """Write `paths` from the snapshot tree, without touching the real index."""
+    tmp_dir = tempfile.mkdtemp(prefix="saci-index-")
+    try:
+        env = dict(os.environ, GIT_INDEX_FILE=os.path.join(tmp_dir, "index"))
+        _git(["read-tree", snapshot], root, env)
+        _git(["checkout-index", "-f", "-z", "--stdin"], root, env, stdin="\0".join(paths) + "\0")
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def restore(root, state_dir):
+    """Roll the project back to the checkpoint; returns (restored, removed)."""
+    state = load_json_file(os.path.join(state_dir, STATE_FILE))
+    if not isinstance(state, dict) or not state.get("tree"):
+        raise CheckpointError("no checkpoint")
+    if _symbolic_ref(root) != state.get("ref", ""):
+        raise CheckpointError("the session switched branches")
+
+    if _git(["rev-parse", "HEAD"], root).strip() != state["head"]:
+        _git(["reset", "-q", "--soft", state["head"]], root)
+    index_copy = os.path.join(state_dir, INDEX_COPY)
+    if state.get("index") and os.path.exists(index_copy):
+        _copy_atomic(index_copy, _index_path(root))
+
+    snapshot = state["tree"]
+    current = test_cache.tree_hash(root)
+    if not current:
+        raise CheckpointError("working tree could not be hashed")
+    restore_paths, remove_paths = changed_paths(root, snapshot, current) if current != snapshot else ([], [])
+    remove_paths += created_ignored_files(root, state_dir, snapshot)
+
+    try:
+        for path in remove_paths:
+            _remove(root, path)
+    except OSError as e:
+        raise CheckpointError(f"could not remove {e.filename}: {e.strerror}")
+    if restore_paths:
+        _checkout(root, snapshot, restore_paths)
+
+    if (restore_paths or remove_paths) and test_cache.tree_hash(root) != snapshot:
+        raise CheckpointError("working tree differs from the snapshot after restoring")
+    return restore_paths, remove_paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Saci iteration checkpoints")
+    parser.add_argument("action", choices=["create", "restore"])
+    parser.add_argument("--dir", help="State directory (default: .saci/cache/checkpoint)")
+    args = parser.parse_args()
+
+    root = test_cache.project_root()
+    if not root:
+        print("Not inside a git work tree", file=sys.stderr)
+        sys.exit(1)
+    state_dir = os.path.abspath(args.dir or os.path.join(root, STATE_DIR))
+
+    try:
+        if args.action == "create":
+            if not args.dir:
+                cache_dir(root)  # creates .saci/cache with its .gitignore
+            print(create(root, state_dir))
+        else:
+            restored, removed = restore(root, state_dir)
+            print(f"restored {len(restored)}, removed {len(removed)} path(s)")
+    except (CheckpointError, OSError, subprocess.SubprocessError) as e:
+        print(f"Checkpoint {args.action} failed: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+Saci Failure Digest: Compact Summary of Failing Test Output for Retries
+
+After a failed iteration the next prompt used to carry the last 50 lines of
+the test output, which are mostly stack frames, code frames and reporter
+noise. This digest keeps what a retry needs, within a token budget:
+
+- the error type from the PostToolUse classifier (check-test-output.py,
+  rule packs included)
+- the runner's summary line(s) and the names of the failing tests
+  (jest/vitest, mocha, node:test/TAP, pytest, go test)
+- the first assertion (matcher, expected/received, code frame)
+- distinct error messages and the top stack frames, deduplicated by
+  location and without node_modules/node internals
+
+Sections are added in that order of priority until the budget is spent.
+Output without any of these (a crash, a build error) is summarized by its
+last lines instead, like before. The output is read line by line, so huge
+logs only cost a pass over the file.
+
+Usage:
+  failure_digest.py FILE [--tokens N] [--format text|json]
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import re
+import sys
+
+HOOKS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".saci", "hooks")
+sys.path.insert(0, HOOKS_DIR)
+
+
+# Default budget for the digest (tokens, estimated at CHARS_PER_TOKEN)
+DEFAULT_TOKENS = 600
+CHARS_PER_TOKEN = 4
+
+# Caps per section
+MAX_TESTS = 10
+MAX_ASSERTION_LINES = 12
+MAX_ERRORS = 3
+MAX_FRAMES = 5
+MAX_SUMMARY_LINES = 3
+MAX_TAIL_LINES = 50
+
+# Longest line kept (minified code, huge diffs)
+MAX_LINE_CHARS = 300
+
+_ANSI_RE = re.compile(r"\x1b\[[0-9;]*[A-Za-z]")
+
+# Failing test names, one capture group each
+FAILED_TEST_PATTERNS = [
+    re.compile(r"^\s*● (?!Console\b)(.+?)\s*$"),                          # jest blocks
+    re.compile(r"^\s*(?:✕|×|✗)\s+(.+?)(?:\s+\(?\d+(?:\.\d+)?\s*m?s\)?)?\s*$"),  # jest/vitest lists
+    re.compile(r"^\s*FAIL\s+(\S+\s+>\s+.+?)\s*$"),                         # vitest
+    re.compile(r"^\s*not ok \d+ - (.+?)\s*$"),                             # node:test / TAP
+    re.compile(r"^FAILED\s+(\S+)"),                                        # pytest
+    re.compile(r"^\s*--- FAIL: (\S+)"),                                    # go test
+]
+
+# mocha: "  1) Suite" (its test name follows on a deeper "test name:" line)
+_MOCHA_TEST_RE = re.compile(r"^(\s+)\d+\) (.+?)\s*$")
+
+# Separators between suite and test names (jest, vitest)
+_TEST_PATH_RE = re.compile(r" › | > ")
+
+_FAILED_FILE_RE = re.compile(r"^\s*FAIL\s+(\S+)\s*$")
+
+# Start of the first assertion
+_ASSERTION_RE = re.compile(
+    r"expect\(|AssertionError|assert\.|^>\s+assert\b|^\s*Expected\b|^\s*- Expected|^E\s+assert\b|^\s*\w+_test\.go:\d+:")
+
+# Lines that end an assertion block
+_BLOCK_END_RE = re.compile(r"^\s*(?:at |●|FAIL\b|FAILED\b|PASS\b|✕|×|not ok|--- FAIL|={3,}|_{3,})")
+
+_ERROR_RE = re.compile(r"^\s*(?:Uncaught )?((?:\w+\.)*\w*(?:Error|Exception)):\s*(.+?)\s*$")
+
+_FRAME_RE = re.compile(r"^\s*at (?:(.+?) \()?((?:[A-Za-z]:)?[^():\s]+):(\d+):\d+\)?\s*$")
+_PY_FRAME_RE = re.compile(r"^\s*(\S+\.py):(\d+): (?:in (\S+)|(\w+Error|\w+Exception))")
+_IGNORED_FRAME_RE = re.compile(r"node_modules|node:internal|^internal/|site-packages|<frozen")
+
+_SUMMARY_RE = re.compile(
+    r"^\s*(?:Tests?:\s+.*\d|Test (?:Suites|Files)\s*:?\s+.*\d|\d+ (?:passing|failing|pending)\b"
+    r"|=+ .*\b(?:failed|passed|errors?)\b.*=+$|# (?:pass|fail|tests) \d+|(?:ok|FAIL)\s+\S+\s+[\d.]+s$)")
+
+_classifier_module = None
+
+
+def _load_classifier():
+    """check-test-output.py (dash-named, so imported from its path), or None."""
+    global _classifier_module
+    if _classifier_module is None:
+        path = os.path.join(HOOKS_DIR, "check-test-output.py")
+        try:
+            spec = importlib.util.spec_from_file_location("saci_check_test_output", path)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+        except (ImportError, OSError, AttributeError, SyntaxError):
+            module = False
+        _classifier_module = module
+    return _classifier_module or None
+
+
+def _clip(line):
+    line = line.rstrip()
+    return line if len(line) <= MAX_LINE_CHARS else line[:MAX_LINE_CHARS - 3] + "..."
+
+
+class FailureDigest:
+    """Collects the digest sections from test output fed line by line."""
+
+    def __init__(self):
+        module = _load_classifier()
+        self.classifier = module.StreamingClassifier() if module else None
+        self.tests = []
+        self.test_count = 0
+        self._seen_tests = {}   # leaf name -> name listed
+        self._mocha = None      # (indent, suite) waiting for its test name line
+        self.files = []
+        self.assertion = []
+        self._in_assertion = False
+        self._assertion_done = False
+        self.errors = []
+        self.frames = []
+        self._seen_frames = set()
+        self.summary = []
+        self.tail = []
+
+    def feed(self, line):
+        line = _ANSI_RE.sub("", line).rstrip("\r\n")
+        if self.classifier:
+            self.classifier.feed(line + "\n")
+        if not line.strip():
+            return
+        self.tail.append(_clip(line))
+        if len(self.tail) > MAX_TAIL_LINES:
+            del self.tail[0]
+
+        self._assertion_line(line)
+        self._test_name(line)
+        if _SUMMARY_RE.match(line):
+            self.summary.append(_clip(line.strip()))
+            del self.summary[:-MAX_SUMMARY_LINES]
+            return
+
+        file_match = _FAILED_FILE_RE.match(line)
+        if file_match and file_match.group(1) not in self.files:
+            self.files.append(file_match.group(1))
+
+        error = _ERROR_RE.match(line)
+        if error and len(self.errors) < MAX_ERRORS:
+            text = _clip(f"{error.group(1)}: {error.group(2)}")
+            if text not in self.errors:
+                self.errors.append(text)
+
+        self._frame(line)
+
+    def _test_name(self, line):
+        if self._mocha:
+            indent, suite = self._mocha
+            self._mocha = None
+            stripped = line.strip()
+            if stripped.endswith(":") and len(line) - len(line.lstrip()) > indent:
+                self._add_test(f"{suite} › {stripped[:-1]}")
+                return
+            self._add_test(suite)
+
+        match = _MOCHA_TEST_RE.match(line)
+        if match:
+            self._mocha = (len(match.group(1)), _clip(match.group(2)))
+            return
+        for pattern in FAILED_TEST_PATTERNS:
+            match = pattern.match(line)
+            if match:
+                self._add_test(_clip(match.group(1)))
+                return
+
+    def _add_test(self, name):
+        # Reporters list a failure twice ("✕ name", then "● Suite › name"):
+        # one test per leaf name, under its most qualified form
+        leaf = _TEST_PATH_RE.split(name)[-1]
+        known = self._seen_tests.get(leaf)
+        if known is None:
+            self._seen_tests[leaf] = name
+            self.test_count += 1
+            if len(self.tests) < MAX_TESTS:
+                self.tests.append(name)
+        elif len(name) > len(known) and known in self.tests:
+            self.tests[self.tests.index(known)] = name
+            self._seen_tests[leaf] = name
+
+    def _assertion_line(self, line):
+        if self._assertion_done:
+            return
+        if not self._in_assertion:
+            if not _ASSERTION_RE.search(line):
+                return
+            self._in_assertion = True
+        elif _BLOCK_END_RE.match(line):
+            self._assertion_done = True
+            return
+        self.assertion.append(_clip(line))
+        if len(self.assertion) >= MAX_ASSERTION_LINES:
+            self._assertion_done = True
+
+    def _frame(self, line):
+        if len(self.frames) >= MAX_FRAMES:
+            return
+        match = _FRAME_RE.match(line)
+        if match:
+            function, path, lineno = match.group(1), match.group(2), match.group(3)
+        else:
+            match = _PY_FRAME_RE.match(line)
+            if not match:
+                return
+            path, lineno, function = match.group(1), match.group(2), match.group(3) or match.group(4)
+        if _IGNORED_FRAME_RE.search(path) or (path, lineno) in self._seen_frames:
+            return
+        self._seen_frames.add((path, lineno))
+        self.frames.append(f"{path}:{lineno}" + (f" ({function})" if function else ""))
+
+    def result(self):
+        if self._mocha:
+            self._add_test(self._mocha[1])
+            self._mocha = None
+        classification = self.classifier.finish() if self.classifier else None
+        if (classification is None or classification["type"] == "UNKNOWN") and (self.tests or self.assertion):
+            # Runners whose output the classifier has no pattern for
+            classification = {"type": "CODE", "reason": "Test failure",
+                              "suggestion": "Debug the failing test. Check test expectations vs actual behavior."}
+        details = self.classifier.details if self.classifier else {}
+        return {
+            "error_type": classification["type"] if classification else "UNKNOWN",
+            "reason": classification["reason"] if classification else "",
+            "suggestion": classification["suggestion"] if classification else "",
+            "location": f"{details['file']}:{details['line']}" if "file" in details else "",
+            "summary": self.summary,
+            "failing_tests": self.tests,
+            "failing_test_count": self.test_count,
+            "failing_files": self.files,
+            "assertion": self.assertion,
+            "errors": self.errors,
+            "frames": self.frames,
+            "tail": self.tail,
+        }
+
+
+def digest_lines(lines):
+    digest = FailureDigest()
+    for line in lines:
+        digest.feed(line)
+    return digest.result()
+
+
+def digest_file(path):
+    with open(path, "r", errors="replace") as f:
+        return digest_lines(f)
+
+
+def _sections(result):
+    """(heading, lines) in order of priority."""
+    header = f"Error type: {result['error_type']}"
+    if result["reason"]:
+        header += f" ({result['reason']})"
+    sections = [(None, [header])]
+    if result["summary"]:
+        sections.append((None, result["summary"]))
+
+    tests = [f"- {name}" for name in result["failing_tests"]]
+    more = result["failing_test_count"] - len(tests)
+    if more > 0:
+        tests.append(f"- ... and {more} more")
+    if tests:
+        sections.append((f"Failing tests ({result['failing_test_count']}):", tests))
+    elif result["failing_files"]:
+        sections.append(("Failing files:", [f"- {path}" for path in result["failing_files"]]))
+
+    if result["assertion"]:
+        indent = min(len(line) - len(line.lstrip()) for line in result["assertion"])
+        sections.append(("First assertion:", ["  " + line[indent:] for line in result["assertion"]]))
+    errors = [error for error in result["errors"]
+              if not any(error.split(": ", 1)[-1] in line for line in result["assertion"])]
+    if errors:
+        sections.append(("Errors:", [f"- {error}" for error in errors]))
+    if result["frames"]:
+        sections.append(("Top frames:", [f"  {frame}" for frame in result["frames"]]))
+    elif result["location"]:
+        sections.append((None, [f"Location: {result['location']}"]))
+
+    if len(sections) <= 2 and not result["failing_files"]:
+        # Nothing structured found: fall back to the end of the output
+        sections.append(("Last lines of output:", result["tail"]))
+    elif result["suggestion"]:
+        sections.append((None, [f"Suggestion: {result['suggestion']}"]))
+    return sections
+
+
+def render(result, tokens=DEFAULT_TOKENS):
+    """The digest as text, at most `tokens` (estimated) long."""
+    budget = tokens * CHARS_PER_TOKEN
+    out = []
+    used = 0
+    sections = _sections(result)
+    # The fallback tail keeps its most recent lines
+    if sections[-1][0] == "Last lines of output:":
+        heading, lines = sections[-1]
+        fixed = sum(len(line) + 1 for _, section in sections[:-1] for line in section) + len(heading) + 1
+        kept = []
+        for line in reversed(lines):
+            if fixed + len(line) + 1 > budget:
+                break
+            fixed += len(line) + 1
+            kept.append(line)
+        sections[-1] = (heading, list(reversed(kept)))
+
+    for heading, lines in sections:
+        if heading:
+            # A heading only goes in together with its first line
+            if not lines or used + len(heading) + len(lines[0]) + 2 > budget:
+                break
+            out.append(heading)
+            used += len(heading) + 1
+        for index, line in enumerate(lines):
+            if used + len(line) + 1 > budget:
+                if index:
+                    out.append("  ...")
+                return "\n".join(out)
+            out.append(line)
+            used += len(line) + 1
+    return "\n".join(out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Saci failing test output digest")
+    parser.add_argument("file", help="Test output (use - for stdin)")
+    parser.add_argument("--tokens", type=int, default=DEFAULT_TOKENS,
+                        help=f"Approximate size limit of the digest (default: {DEFAULT_TOKENS})")
+    parser.add_argument("--format", choices=["text", "json"], default="text")
+    args = parser.parse_args()
+
+    try:
+        result = digest_lines(sys.stdin) if args.file == "-" else digest_file(args.file)
+    except OSError as e:
+        print(f"Error: cannot read {args.file}: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.format == "json":
+        print(json.dumps(result, indent=2))
+    else:
+        print(render(result, args.tokens))
+
+
+if __name__ == "__main__":
+    main()
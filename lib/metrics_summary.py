@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Saci Metrics Summary: Incremental Aggregates of .saci/metrics.jsonl
+
+The TUI shows totals from the metrics log on every render. Instead of
+re-reading the whole log (`jq -s`), the running aggregates are kept in
+.saci/cache/metrics-summary.json together with the byte offset they cover,
+and each call only parses the lines appended since then.
+
+The checkpoint also remembers the file's inode and the bytes just before the
+offset, so a log that was truncated, replaced or rewritten is summed again
+from the start. A partially written last line is left for the next call.
+
+Usage:
+  metrics_summary.py [summary|tokens|cost] [--file PATH]
+
+  summary  {"total_tokens":N,"cost_usd":N,"avg_time_ms":N,"success_rate":N,"error_counts":{...}}
+  tokens   total tokens
+  cost     total cost in USD
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".saci", "hooks"))
+from saci_cache import load_json, save_json  # noqa: E402
+
+
+METRICS_FILE = os.path.join(".saci", "metrics.jsonl")
+SUMMARY_FILE = "metrics-summary.json"
+
+# Bump when the checkpoint layout changes
+SUMMARY_VERSION = 1
+
+# Bytes before the offset used to detect a rewritten log
+ANCHOR_BYTES = 64
+
+
+def _empty_state():
+    return {
+        "version": SUMMARY_VERSION,
+        "inode": None,
+        "offset": 0,
+        "anchor": "",
+        "count": 0,
+        "total_tokens": 0,
+        "cost_usd": 0.0,
+        "duration_ms": 0,
+        "successes": 0,
+        "error_counts": {},
+    }
+
+
+def _anchor(f, offset):
+    start = max(0, offset - ANCHOR_BYTES)
+    f.seek(start)
+    return f.read(offset - start).decode("utf-8", "replace")
+
+
+def _number(value):
+    return value if isinstance(value, (int, float)) and not isinstance(value, bool) else 0
+
+
+def _add(state, record):
+    state["count"] += 1
+    state["total_tokens"] += _number(record.get("total_tokens"))
+    state["cost_usd"] += _number(record.get("cost_usd"))
+    state["duration_ms"] += _number(record.get("duration_ms"))
+    if record.get("result") == "success":
+        state["successes"] += 1
+    error_type = record.get("error_type")
+    if error_type:
+        counts = state["error_counts"]
+        counts[str(error_type)] = counts.get(str(error_type), 0) + 1
+
+
+def update(path=METRICS_FILE, root="."):
+    """Bring the checkpointed aggregates up to date with the log. Returns the state."""
+    state = load_json(SUMMARY_FILE, None, root)
+    if not isinstance(state, dict) or state.get("version") != SUMMARY_VERSION:
+        state = _empty_state()
+
+    try:
+        f = open(os.path.join(root, path), "rb")
+    except OSError:
+        return _empty_state()
+
+    with f:
+        stat = os.fstat(f.fileno())
+        offset = state["offset"]
+        if (state["inode"] != stat.st_ino or stat.st_size < offset
+                or _anchor(f, offset) != state["anchor"]):
+            state = _empty_state()
+            offset = 0
+
+        if stat.st_size == offset:
+            return state
+
+        f.seek(offset)
+        appended = f.read()
+        # Only complete lines; a line still being written is picked up next time
+        complete = appended[:appended.rfind(b"\n") + 1]
+        for line in complete.splitlines():
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict):
+                _add(state, record)
+
+        state["inode"] = stat.st_ino
+        state["offset"] = offset + len(complete)
+        state["anchor"] = _anchor(f, state["offset"])
+
+    save_json(SUMMARY_FILE, state, root)
+    return state
+
+
+def summary(state):
+    """The TUI's summary object (same shape the jq version produced)."""
+    count = state["count"]
+    return {
+        "total_tokens": state["total_tokens"],
+        "cost_usd": state["cost_usd"],
+        "avg_time_ms": state["duration_ms"] / count if count else 0,
+        "success_rate": state["successes"] * 100.0 / count if count else 0.0,
+        "error_counts": state["error_counts"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Saci metrics summary")
+    parser.add_argument("field", nargs="?", default="summary", choices=["summary", "tokens", "cost"])
+    parser.add_argument("--file", default=METRICS_FILE, help="Metrics log (default: .saci/metrics.jsonl)")
+    args = parser.parse_args()
+
+    state = update(args.file)
+    if args.field == "tokens":
+        print(state["total_tokens"])
+    elif args.field == "cost":
+        print(state["cost_usd"])
+    else:
+        print(json.dumps(summary(state), separators=(",", ":")))
+
+
+if __name__ == "__main__":
+    main()
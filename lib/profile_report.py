@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Saci Profile: Where the Wall-Clock Time of a Run Goes
+
+Aggregates the timing trace (.saci/trace.jsonl, see .saci/hooks/saci_trace.py)
+written by `saci jump` and its hooks into a breakdown per task iteration and
+a summary per span over the whole trace.
+
+Per iteration, the loop phases (prompt, CLI session, tests, commit, rollback)
+run one after another and add up, with "other" for the rest of the
+iteration's wall-clock time. Hooks, the tests they run and PRP queries happen
+inside those phases; they are listed below them with their share of the
+iteration, not added to it.
+
+Usage:
+  profile_report.py [--file PATH] [--task ID] [--last N] [--json]
+"""
+
+import argparse
+import json
+import os
+import sys
+
+
+TRACE_FILE = os.path.join(".saci", "trace.jsonl")
+
+# Spans that run one after another inside an iteration; everything else nests
+SEQUENTIAL = {("phase", "prompt"), ("phase", "cli"), ("phase", "commit"),
+              ("phase", "rollback"), ("test", "loop")}
+
+# Outcomes that are not failures
+OK_OUTCOMES = {"ok", "pass", "cached", "success"}
+
+
+def load_spans(path):
+    """Spans of the trace, skipping lines that are not span objects."""
+    spans = []
+    try:
+        with open(path, "r", errors="replace") as f:
+            for line in f:
+                try:
+                    span = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(span, dict) and isinstance(span.get("duration_ms"), (int, float)):
+                    spans.append(span)
+    except OSError:
+        pass
+    return spans
+
+
+def span_label(span):
+    """Row label: hooks are told apart by event, e.g. "check-if-done (Stop)"."""
+    name = str(span.get("name", "?"))
+    if span.get("kind") == "hook" and span.get("event"):
+        name += f" ({span['event']})"
+    return name
+
+
+def _percentile(values, share):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(share * len(ordered)))]
+
+
+def summarize(spans):
+    """Per (kind, label): calls, total/mean/p95/max ms and non-ok outcomes."""
+    rows = {}
+    for span in spans:
+        rows.setdefault((span.get("kind", "?"), span_label(span)), []).append(span)
+
+    summary = []
+    for (kind, label), group in rows.items():
+        durations = [span["duration_ms"] for span in group]
+        outcomes = {}
+        for span in group:
+            outcome = span.get("outcome", "ok")
+            if outcome not in OK_OUTCOMES:
+                outcomes[outcome] = outcomes.get(outcome, 0) + 1
+        summary.append({
+            "kind": kind,
+            "name": label,
+            "calls": len(group),
+            "total_ms": round(sum(durations), 3),
+            "mean_ms": round(sum(durations) / len(durations), 3),
+            "p95_ms": round(_percentile(durations, 0.95), 3),
+            "max_ms": round(max(durations), 3),
+            "outcomes": outcomes,
+        })
+    summary.sort(key=lambda row: -row["total_ms"])
+    return summary
+
+
+def iterations(spans):
+    """Breakdown per (task, iteration), in the order the iterations started."""
+    groups = {}
+    for span in spans:
+        task_id = span.get("task_id") or ""
+        if not task_id or span.get("iteration") is None:
+            continue
+        groups.setdefault((task_id, span["iteration"]), []).append(span)
+
+    result = []
+    for (task_id, iteration), group in groups.items():
+        wall, sequential, nested = [], [], []
+        for span in group:
+            key = (span.get("kind"), span.get("name"))
+            if key == ("phase", "iteration"):
+                wall.append(span)
+            elif key in SEQUENTIAL:
+                sequential.append(span)
+            else:
+                nested.append(span)
+        accounted = sum(span["duration_ms"] for span in sequential)
+        wall_ms = wall[-1]["duration_ms"] if wall else accounted
+        result.append({
+            "task_id": task_id,
+            "iteration": iteration,
+            "started": min(span.get("ts", 0) for span in group),
+            "wall_ms": wall_ms,
+            "outcome": wall[-1].get("outcome") if wall else "running",
+            "phases": summarize(sequential),
+            "other_ms": round(max(0, wall_ms - accounted), 3),
+            "nested": summarize(nested),
+        })
+    result.sort(key=lambda entry: entry["started"])
+    return result
+
+
+def report(spans, task_id=None, last=None):
+    if task_id:
+        spans = [span for span in spans if span.get("task_id") == task_id]
+    breakdown = iterations(spans)
+    if last:
+        breakdown = breakdown[-last:]
+    return {
+        "spans": len(spans),
+        "wall_ms": round(sum(entry["wall_ms"] for entry in breakdown), 3),
+        "iterations": breakdown,
+        "outside_iterations": summarize([span for span in spans
+                                         if not span.get("task_id") or span.get("iteration") is None]),
+        "summary": summarize(spans),
+    }
+
+
+def _seconds(ms):
+    return f"{ms / 1000:.2f}s" if ms >= 1000 else f"{ms:.1f}ms"
+
+
+def _share(ms, wall_ms):
+    return f"{100 * ms / wall_ms:5.1f}%" if wall_ms else "     -"
+
+
+def _outcomes(row):
+    return " ".join(f"{count} {outcome}" for outcome, count in sorted(row["outcomes"].items()))
+
+
+def print_report(result):
+    for entry in result["iterations"]:
+        wall_ms = entry["wall_ms"]
+        print(f"Task {entry['task_id']} - iteration {entry['iteration']}: "
+              f"{_seconds(wall_ms)} ({entry['outcome']})")
+        for row in entry["phases"]:
+            print(f"  {row['kind']:<6} {row['name']:<32} {_seconds(row['total_ms']):>10} "
+                  f"{_share(row['total_ms'], wall_ms)}  {_outcomes(row)}")
+        print(f"  {'':<6} {'other':<32} {_seconds(entry['other_ms']):>10} {_share(entry['other_ms'], wall_ms)}")
+        if entry["nested"]:
+            print("  within the above:")
+            for row in entry["nested"]:
+                print(f"    {row['kind']:<6} {row['name']:<30} {_seconds(row['total_ms']):>10} "
+                      f"{_share(row['total_ms'], wall_ms)}  x{row['calls']}  {_outcomes(row)}")
+        print("")
+
+    if result["outside_iterations"]:
+        print("Outside iterations (scheduler, hook server):")
+        for row in result["outside_iterations"]:
+            print(f"  {row['kind']:<6} {row['name']:<32} {_seconds(row['total_ms']):>10}  x{row['calls']}")
+        print("")
+
+    print(f"All spans ({result['spans']}, {len(result['iterations'])} iterations, "
+          f"{_seconds(result['wall_ms'])} in iterations):")
+    print(f"  {'kind':<6} {'name':<32} {'calls':>6} {'total':>10} {'mean':>10} {'p95':>10} {'max':>10}")
+    for row in result["summary"]:
+        print(f"  {row['kind']:<6} {row['name']:<32} {row['calls']:>6} {_seconds(row['total_ms']):>10} "
+              f"{_seconds(row['mean_ms']):>10} {_seconds(row['p95_ms']):>10} {_seconds(row['max_ms']):>10}"
+              f"  {_outcomes(row)}".rstrip())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Saci timing profile")
+    parser.add_argument("--file", default=TRACE_FILE, help="Trace file (default: .saci/trace.jsonl)")
+    parser.add_argument("--task", help="Only this task's spans")
+    parser.add_argument("--last", type=int, help="Only the last N iterations in the breakdown")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    spans = load_spans(args.file)
+    if not spans:
+        print(f"No timing spans in {args.file} - run `saci jump` first (tracing is on unless --no-trace)",
+              file=sys.stderr)
+        sys.exit(1)
+
+    result = report(spans, args.task, args.last)
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print_report(result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,449 @@
+#!/usr/bin/env python3
+"""
+Saci PRP Engine: Task Scheduling from One Parse of prp.json
+
+The main loop used to ask jq for every fact it needed: one call to sort the
+candidates, another per dependency per candidate, and one per task field.
+This engine loads prp.json once, builds the features[].tasks[] dependency
+graph and answers from memory, with the same semantics as the jq queries it
+replaces:
+
+- Candidates are tasks with `passes: false`, in stable `priority` order
+  (jq's sort_by ordering: null < booleans < numbers < strings).
+- A dependency is met when the task it names has `passes: true`.
+  `dependencyMode: "any"` needs one met dependency, otherwise all of them.
+
+Status is read with the pending journal entries of prp_store applied, and
+status changes (mark, reset) go through that journal.
+
+Usage:
+  prp_engine.py [--prp FILE] COMMAND [ARGS]
+
+  next                  first ready task id (empty if none)
+  ready                 all ready task ids, in priority order
+  pending               all pending task ids, in priority order (ready or not)
+  loop-state            NEXT_TASK, REMAINING_TASKS, TOTAL_TASKS as shell assignments
+  task-env ID           TASK_* fields of one task as shell assignments
+  field ID NAME         one task field, printed like `jq -r`
+  context ID            formatted files/libraries/hints
+  acceptance ID         acceptance criteria as "- item" lines
+  test-command ID       tests.command (default: npm test)
+  feature ID            name of the feature containing the task
+  deps-met ID           exit 0 if the task's dependencies are met, else 1
+  blocked ID            unmet dependency ids, space separated
+  status                id|passes|unmet dependency ids|title for every task
+  remaining | total     task counts
+  complete              exit 0 if every task passes
+  validate              dependency problems, one per line (exit 1 if any):
+                          duplicate|ID, missing|ID|DEP, mode|ID|MODE, cycle|A -> B -> A
+  structure             task structure problems, one per line (exit 1 if any),
+                          followed by tasks|N
+  mark ID               set passes: true
+  reset [ID [--cascade]]  set passes: false (all tasks without ID; with
+                          --cascade also every task depending on ID,
+                          transitively); prints the reset ids
+  compact               fold the status journal back into prp.json
+"""
+
+import argparse
+import json
+import re
+import shlex
+import sys
+from collections import deque
+
+import prp_store
+
+
+# Fields every task must have (saci validate)
+REQUIRED_FIELDS = ("id", "title", "description", "priority", "passes", "context", "acceptance", "tests")
+
+TASK_ID_FORMAT = re.compile(r"^F[0-9]+-T[0-9]+$")
+
+# jq's ordering of JSON types, used for sort_by(.priority)
+_TYPE_RANK = {type(None): 0, bool: 1, int: 2, float: 2, str: 3, list: 4, dict: 5}
+
+
+def _sort_key(value):
+    rank = _TYPE_RANK.get(type(value), 5)
+    if rank in (1, 2, 3):
+        return (rank, value)
+    return (rank, json.dumps(value, sort_keys=True))
+
+
+def jq_raw(value):
+    """Format a value the way `jq -r` prints it."""
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, str):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, (int, float)):
+        return str(value)
+    return json.dumps(value, indent=2, ensure_ascii=False)
+
+
+def _join(values, sep):
+    return sep.join(jq_raw(v) for v in values or [] if v is not None)
+
+
+class PRP:
+    """A parsed prp.json with its task dependency graph."""
+
+    def __init__(self, data):
+        self.tasks = []             # tasks in document order
+        self.by_id = {}             # id -> first task with that id
+        self.feature_of = {}        # id -> feature name
+
+        for feature in data.get("features") or []:
+            for task in feature.get("tasks") or []:
+                self.tasks.append(task)
+                task_id = task.get("id")
+                if task_id not in self.by_id:
+                    self.by_id[task_id] = task
+                    self.feature_of[task_id] = feature.get("name")
+
+    @classmethod
+    def load(cls, path):
+        return cls(prp_store.load(path))
+
+    def task(self, task_id):
+        return self.by_id.get(task_id)
+
+    def passes(self, task_id):
+        task = self.by_id.get(task_id)
+        return bool(task) and task.get("passes") is True
+
+    def dependencies(self, task_id):
+        task = self.by_id.get(task_id) or {}
+        return [dep for dep in task.get("dependencies") or [] if dep]
+
+    def blocked_by(self, task_id):
+        """Dependencies of the task that are not passing yet."""
+        return [dep for dep in self.dependencies(task_id) if not self.passes(dep)]
+
+    def dependencies_met(self, task_id):
+        deps = self.dependencies(task_id)
+        if not deps:
+            return True
+        met = len(deps) - len(self.blocked_by(task_id))
+        mode = (self.by_id.get(task_id) or {}).get("dependencyMode") or "all"
+        if mode == "any":
+            return met > 0
+        return met == len(deps)
+
+    def pending(self):
+        """Task ids with `passes: false`, highest priority first."""
+        pending = [t for t in self.tasks if t.get("passes") is False]
+        pending.sort(key=lambda t: _sort_key(t.get("priority")))
+        return [t.get("id") for t in pending]
+
+    def dependents_closure(self, task_id):
+        """The task and every task that depends on it, directly or not."""
+        dependents = {}
+        for task in self.tasks:
+            for dep in task.get("dependencies") or []:
+                if isinstance(dep, str):
+                    dependents.setdefault(dep, []).append(task.get("id"))
+        closure = [task_id]
+        seen = {task_id}
+        queue = deque([task_id])
+        while queue:
+            for dependent in dependents.get(queue.popleft(), []):
+                if dependent not in seen:
+                    seen.add(dependent)
+                    closure.append(dependent)
+                    queue.append(dependent)
+        return closure
+
+    def ready(self):
+        """Ready task ids (pending, dependencies met), highest priority first."""
+        return [task_id for task_id in self.pending() if self.dependencies_met(task_id)]
+
+    def next_task(self):
+        ready = self.ready()
+        return ready[0] if ready else None
+
+    def remaining(self):
+        return sum(1 for t in self.tasks if t.get("passes") is False)
+
+    def total(self):
+        return len(self.tasks)
+
+    def complete(self):
+        total = self.total()
+        return total > 0 and sum(1 for t in self.tasks if t.get("passes") is True) == total
+
+    # Validation
+
+    def duplicate_ids(self):
+        seen, duplicates = set(), []
+        for task in self.tasks:
+            task_id = task.get("id")
+            if task_id in seen and task_id not in duplicates:
+                duplicates.append(task_id)
+            seen.add(task_id)
+        return duplicates
+
+    def dependency_cycles(self):
+        """One cycle path per strongly connected component of the dependency graph.
+
+        Iterative Tarjan, so the whole graph is walked once (O(V+E)) and long
+        dependency chains cannot hit the recursion limit. Every cycle group is
+        reported, each as the shortest path from its first task back to itself.
+        """
+        graph = {tid: [d for d in self.dependencies(tid) if d in self.by_id] for tid in self.by_id}
+        order = {tid: n for n, tid in enumerate(self.by_id)}
+        index, low = {}, {}
+        stack, on_stack = [], set()
+        components = []
+
+        for root in graph:
+            if root in index:
+                continue
+            index[root] = low[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(graph[root]))]
+            while work:
+                node, deps = work[-1]
+                for dep in deps:
+                    if dep not in index:
+                        index[dep] = low[dep] = len(index)
+                        stack.append(dep)
+                        on_stack.add(dep)
+                        work.append((dep, iter(graph[dep])))
+                        break
+                    if dep in on_stack:
+                        low[node] = min(low[node], index[dep])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        low[parent] = min(low[parent], low[node])
+                    if low[node] == index[node]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == node:
+                                break
+                        if len(component) > 1 or node in graph[node]:
+                            components.append(component)
+
+        cycles = []
+        for component in components:
+            start = min(component, key=order.get)
+            cycles.append(_cycle_through(graph, set(component), start))
+        cycles.sort(key=lambda path: order[path[0]])
+        return cycles
+
+    def dependency_problems(self):
+        """(kind, task id, detail) for duplicates, unknown ids, bad modes and cycles."""
+        problems = [("duplicate", task_id, "") for task_id in self.duplicate_ids()]
+        for task_id, task in self.by_id.items():
+            for dep in self.dependencies(task_id):
+                if dep not in self.by_id:
+                    problems.append(("missing", task_id, dep))
+            mode = task.get("dependencyMode")
+            if mode is not None and mode not in ("all", "any"):
+                problems.append(("mode", task_id, jq_raw(mode)))
+        for path in self.dependency_cycles():
+            problems.append(("cycle", " -> ".join(path), ""))
+        return problems
+
+    def structure_problems(self):
+        """(kind, task id, detail) for tasks that break the PRP task schema."""
+        problems = [("duplicate", task_id, "") for task_id in self.duplicate_ids()]
+        for task in self.tasks:
+            task_id = jq_raw(task.get("id"))
+            if not TASK_ID_FORMAT.match(task_id):
+                problems.append(("format", task_id, ""))
+            for field in REQUIRED_FIELDS:
+                if field not in task:
+                    problems.append(("field", task_id, field))
+            priority = task.get("priority")
+            if priority is None or priority is False or not re.match(r"^[0-9]+$", jq_raw(priority)):
+                problems.append(("priority", task_id, ""))
+            if not isinstance(task.get("passes"), bool):
+                problems.append(("passes", task_id, ""))
+            if not _jq_length(task.get("acceptance")):
+                problems.append(("acceptance", task_id, ""))
+            tests = task.get("tests")
+            if not isinstance(tests, dict) or tests.get("command") in (None, False):
+                problems.append(("tests", task_id, ""))
+        return problems
+
+    # Task fields, formatted like the jq queries in saci.sh
+
+    def context(self, task_id):
+        context = (self.by_id.get(task_id) or {}).get("context") or {}
+        hints = "\n".join("- " + jq_raw(h) for h in context.get("hints") or [])
+        return (f"Files: {_join(context.get('files'), ', ')}\n"
+                f"Libraries: {_join(context.get('libraries'), ', ')}\n"
+                f"Hints:\n{hints}")
+
+    def acceptance(self, task_id):
+        items = (self.by_id.get(task_id) or {}).get("acceptance") or []
+        return "\n".join("- " + jq_raw(item) for item in items)
+
+    def test_command(self, task_id):
+        tests = (self.by_id.get(task_id) or {}).get("tests") or {}
+        return tests.get("command") or "npm test"
+
+    def task_env(self, task_id):
+        """Everything the iteration needs about one task, as {VAR: value}."""
+        task = self.by_id.get(task_id) or {}
+        context = task.get("context") or {}
+        return {
+            "TASK_TITLE": jq_raw(task.get("title")),
+            "TASK_DESCRIPTION": jq_raw(task.get("description")),
+            "TASK_CONTEXT": self.context(task_id),
+            "TASK_ACCEPTANCE": self.acceptance(task_id),
+            "TASK_TEST_CMD": self.test_command(task_id),
+            "TASK_FEATURE": jq_raw(self.feature_of.get(task_id)),
+            "TASK_FILES": _join(context.get("files"), " "),
+            "TASK_LIBRARIES": _join(context.get("libraries"), " "),
+            "TASK_HINTS": _join(context.get("hints"), " "),
+        }
+
+
+def _cycle_through(graph, members, start):
+    """Shortest dependency path from start back to itself inside one component."""
+    parent = {start: None}
+    queue = deque([start])
+    while queue:
+        node = queue.popleft()
+        for dep in graph[node]:
+            if dep == start:
+                path = [node]
+                while parent[path[-1]] is not None:
+                    path.append(parent[path[-1]])
+                return path[::-1] + [start]
+            if dep in members and dep not in parent:
+                parent[dep] = node
+                queue.append(dep)
+    return [start, start]
+
+
+def _jq_length(value):
+    """jq's `length` (0 where jq would fail)."""
+    if isinstance(value, bool) or value is None:
+        return 0
+    if isinstance(value, (int, float)):
+        return abs(value)
+    return len(value)
+
+
+def _print_problems(problems):
+    for kind, task_id, detail in problems:
+        print("|".join(str(part) for part in (kind, task_id, detail)).rstrip("|"))
+
+
+def _assignments(values):
+    return "\n".join(f"{name}={shlex.quote(str(value))}" for name, value in values.items())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Saci PRP engine")
+    parser.add_argument("--prp", default="prp.json", help="PRP file (default: prp.json)")
+    parser.add_argument("command")
+    parser.add_argument("args", nargs="*")
+    parser.add_argument("--cascade", action="store_true", help="reset: include dependent tasks")
+    args = parser.parse_args()
+
+    if args.command == "compact":
+        try:
+            prp_store.compact(args.prp)
+        except (OSError, ValueError) as e:
+            print(f"Error: cannot compact {args.prp}: {e}", file=sys.stderr)
+            sys.exit(2)
+        return
+
+    try:
+        prp = PRP.load(args.prp)
+    except (OSError, ValueError) as e:
+        print(f"Error: cannot load {args.prp}: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    command, rest = args.command, args.args
+    task_id = rest[0] if rest else None
+
+    if command == "next":
+        print(prp.next_task() or "")
+    elif command == "ready":
+        for ready_id in prp.ready():
+            print(ready_id)
+    elif command == "pending":
+        for pending_id in prp.pending():
+            print(pending_id)
+    elif command == "loop-state":
+        print(_assignments({
+            "NEXT_TASK": prp.next_task() or "",
+            "REMAINING_TASKS": prp.remaining(),
+            "TOTAL_TASKS": prp.total(),
+        }))
+    elif command == "task-env":
+        print(_assignments(prp.task_env(task_id)))
+    elif command == "field":
+        task = prp.task(task_id)
+        if task is not None:
+            print(jq_raw(task.get(rest[1])))
+    elif command == "context":
+        print(prp.context(task_id))
+    elif command == "acceptance":
+        print(prp.acceptance(task_id))
+    elif command == "test-command":
+        print(prp.test_command(task_id))
+    elif command == "feature":
+        if prp.task(task_id) is not None:
+            print(jq_raw(prp.feature_of.get(task_id)))
+    elif command == "deps-met":
+        sys.exit(0 if prp.dependencies_met(task_id) else 1)
+    elif command == "blocked":
+        print(" ".join(prp.blocked_by(task_id)))
+    elif command == "status":
+        for task in prp.tasks:
+            tid = task.get("id")
+            blocked = " ".join(prp.blocked_by(tid)) if not prp.dependencies_met(tid) else ""
+            print(f"{tid}|{jq_raw(task.get('passes') or False)}|{blocked}|{jq_raw(task.get('title'))}")
+    elif command == "remaining":
+        print(prp.remaining())
+    elif command == "total":
+        print(prp.total())
+    elif command == "complete":
+        sys.exit(0 if prp.complete() else 1)
+    elif command in ("mark", "reset"):
+        try:
+            if command == "mark":
+                prp_store.set_passes(args.prp, [task_id], True)
+            elif task_id is None:
+                prp_store.set_all_passes(args.prp, False)
+                print(" ".join(jq_raw(t.get("id")) for t in prp.tasks))
+            else:
+                reset_ids = prp.dependents_closure(task_id) if args.cascade else [task_id]
+                prp_store.set_passes(args.prp, reset_ids, False)
+                print(" ".join(jq_raw(t) for t in reset_ids))
+        except OSError as e:
+            print(f"Error: cannot update {args.prp}: {e}", file=sys.stderr)
+            sys.exit(2)
+    elif command == "validate":
+        problems = prp.dependency_problems()
+        _print_problems(problems)
+        sys.exit(1 if problems else 0)
+    elif command == "structure":
+        problems = prp.structure_problems()
+        _print_problems(problems)
+        print(f"tasks|{prp.total()}")
+        sys.exit(1 if problems else 0)
+    else:
+        print(f"Error: unknown command '{command}'", file=sys.stderr)
+        sys.exit(2)
+
+
+if __name__ == "__main__":
+    main()
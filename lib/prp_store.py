@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Saci PRP Store: Journaled Task Status Updates for prp.json
+
+Flipping one task's `passes` used to rewrite the whole prp.json through
+`jq ... > tmp && mv`, once per task (and once per task again for a cascade
+reset), with nothing stopping two processes from racing on it.
+
+Status changes are now appended to a journal instead:
+
+    .saci/cache/<prp file name>.journal    {"id": "F1-T2", "passes": true}
+                                           {"all": true, "passes": false}
+
+next to the PRP file. An update is one appended line plus an fsync, and a
+reader applies the journal on top of prp.json, so prp.json stays the
+human-editable source of truth. Compaction folds the journal back into
+prp.json (temp file + fsync + rename, then the journal is truncated). It
+runs once the journal holds COMPACT_EVERY entries and whenever Saci is about
+to hand prp.json to someone else (a CLI session, the end of a run).
+
+Entries set a value rather than toggle it, so replaying a journal that a
+crash left behind after a compaction changes nothing. All access goes
+through flock on the journal: exclusive to append or compact, shared to read.
+"""
+
+import fcntl
+import json
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".saci", "hooks"))
+from saci_cache import CACHE_DIR_NAME, cache_dir  # noqa: E402
+
+
+# Journal entries before an update compacts into prp.json
+COMPACT_EVERY = 32
+
+
+def journal_path(prp_path):
+    """The journal of a PRP file: in the .saci/cache of the PRP's directory."""
+    prp_path = os.path.abspath(prp_path)
+    return os.path.join(os.path.dirname(prp_path), CACHE_DIR_NAME, os.path.basename(prp_path) + ".journal")
+
+
+def _read_entries(f):
+    f.seek(0)
+    entries = []
+    for line in f.read().splitlines():
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            continue  # a line torn by a crash mid-append
+        if isinstance(entry, dict) and isinstance(entry.get("passes"), bool):
+            entries.append(entry)
+    return entries
+
+
+def apply_entries(data, entries):
+    """Apply journal entries to parsed prp.json data, in order."""
+    if not entries:
+        return data
+    tasks_by_id = {}
+    all_tasks = []
+    for feature in data.get("features") or []:
+        for task in feature.get("tasks") or []:
+            if isinstance(task, dict):
+                all_tasks.append(task)
+                tasks_by_id.setdefault(task.get("id"), []).append(task)
+    for entry in entries:
+        targets = all_tasks if entry.get("all") else tasks_by_id.get(entry.get("id"), [])
+        for task in targets:
+            task["passes"] = entry["passes"]
+    return data
+
+
+def _load_file(path):
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def load(prp_path):
+    """prp.json with pending journal entries applied."""
+    try:
+        f = open(journal_path(prp_path), "r")
+    except OSError:
+        return _load_file(prp_path)
+    with f:
+        fcntl.flock(f, fcntl.LOCK_SH)
+        return apply_entries(_load_file(prp_path), _read_entries(f))
+
+
+def _write_atomic(path, data):
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)),
+                                    prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+            f.flush()
+            os.fsync(f.fileno())
+        # Keep the original permissions (mkstemp creates 0600)
+        try:
+            os.chmod(tmp_path, os.stat(path).st_mode & 0o7777)
+        except OSError:
+            pass
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _compact_locked(prp_path, f):
+    entries = _read_entries(f)
+    if not entries:
+        return 0
+    _write_atomic(prp_path, apply_entries(_load_file(prp_path), entries))
+    f.truncate(0)
+    f.flush()
+    os.fsync(f.fileno())
+    return len(entries)
+
+
+def record(prp_path, entries, compact_every=COMPACT_EVERY):
+    """Append status entries to the journal; compacts once it is long enough."""
+    cache_dir(os.path.dirname(os.path.abspath(prp_path)))
+    lines = "".join(json.dumps(entry, separators=(",", ":")) + "\n" for entry in entries)
+    with open(journal_path(prp_path), "a+") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        f.write(lines)
+        f.flush()
+        os.fsync(f.fileno())
+        if compact_every and len(_read_entries(f)) >= compact_every:
+            _compact_locked(prp_path, f)
+
+
+def set_passes(prp_path, task_ids, passes):
+    record(prp_path, [{"id": task_id, "passes": passes} for task_id in task_ids])
+
+
+def set_all_passes(prp_path, passes):
+    record(prp_path, [{"all": True, "passes": passes}])
+
+
+def compact(prp_path):
+    """Fold the journal into prp.json. Returns the number of entries applied."""
+    try:
+        f = open(journal_path(prp_path), "r+")
+    except OSError:
+        return 0
+    with f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        return _compact_locked(prp_path, f)
@@ -0,0 +1,432 @@
+#!/usr/bin/env python3
+"""
+Saci Scan Engine: Parallel, Incremental Codebase Scan for `saci scan`
+
+scanner.sh detected code patterns with `find .` over the whole tree
+(node_modules included), one sequential walk per pattern, and repeated all of
+it on every run. This engine walks the tree once:
+
+- directories are listed with os.scandir on a thread pool, one task per
+  directory, so slow filesystems are read concurrently
+- .gitignore files are honored as the walk descends (plus .git and
+  node_modules, always), so ignored subtrees are never entered
+- every workspace package (project_meta) is analyzed concurrently with the walk,
+  and its layout (API routes, hooks folder) counts like the root's
+
+Listings and per-file findings are kept in .saci/cache/scan-index.json:
+
+    {"dirs": {"src/app": {"mtime": ..., "dirs": [...], "files": [...],
+                          "sources": {"page.tsx": [mtime, size, ["server_actions"]]},
+                          "gitignore": [[mtime, size], "text"]}}}
+
+A directory whose mtime is unchanged is not listed again, and a source file
+whose mtime/size is unchanged is not read again, so a re-scan costs roughly
+one stat() per directory and source file.
+
+Stack, library and path detection use the same rules as the shell functions
+in scanner.sh; in a monorepo the stack and libraries of every workspace
+package are merged into the project's.
+
+Usage:
+  scan_engine.py [--root DIR] [--format shell|json]
+
+  shell  one finding per line:
+           stack|NAME  path|KEY|./DIR  lib|NAME  pattern|TEXT
+           package|NAME|DIR|STACK, ...  scanned|DIRECTORIES|RESCANNED
+  json   the same findings as one object
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".saci", "hooks"))
+import project_meta  # noqa: E402
+from saci_cache import CACHE_DIR_NAME, load_json, save_json  # noqa: E402
+
+
+SCAN_INDEX_FILE = "scan-index.json"
+
+# Bump when the index layout or the findings change
+INDEX_VERSION = 1
+
+# Directory listings running at once
+MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Never entered, ignored or not
+ALWAYS_PRUNED = {".git", "node_modules"}
+
+# Saci's own cache (the scan index included) is rewritten on every run
+PRUNED_PATHS = {CACHE_DIR_NAME.replace(os.sep, "/")}
+
+# Files whose contents are searched for patterns
+SOURCE_EXTENSIONS = (".tsx", ".jsx")
+
+# ============================================================================
+# Detection rules (same as scanner.sh; in each group the first match wins)
+# ============================================================================
+
+FRAMEWORKS = [("Next.js", '"next"'), ("React", '"react"'), ("Vue", '"vue"'),
+              ("Svelte", '"svelte"'), ("Express", '"express"')]
+CSS_FRAMEWORKS = [("Tailwind", '"tailwindcss"'), ("styled-components", '"styled-components"')]
+TEST_FRAMEWORKS = [("Jest", '"jest"'), ("Vitest", '"vitest"')]
+DATABASES = [("Prisma", '"prisma"'), ("Drizzle", '"drizzle-orm"')]
+PYTHON_FRAMEWORKS = [("FastAPI", "fastapi"), ("Django", "django"), ("Flask", "flask")]
+
+# (library, package.json needle) - every match is reported
+LIBRARIES = [
+    ("zustand", '"zustand"'), ("redux-toolkit", '"@reduxjs/toolkit"'), ("jotai", '"jotai"'),
+    ("recoil", '"recoil"'), ("react-hook-form", '"react-hook-form"'), ("formik", '"formik"'),
+    ("zod", '"zod"'), ("yup", '"yup"'), ("axios", '"axios"'),
+    ("react-query", '"@tanstack/react-query"'), ("swr", '"swr"'), ("next-auth", '"next-auth"'),
+    ("clerk", '"@clerk'), ("supabase", '"@supabase'), ("radix-ui", '"@radix-ui'),
+    ("shadcn", '"@shadcn'), ("chakra-ui", '"@chakra-ui'), ("material-ui", '"@mui'),
+    ("framer-motion", '"framer-motion"'), ("date-fns", '"date-fns"'), ("dayjs", '"dayjs"'),
+]
+
+# (key, directory) - reported when the directory exists
+PATHS = [
+    ("src", "src"), ("app", "app"), ("lib", "lib"), ("pages", "pages"), ("components", "components"),
+    ("components", "src/components"), ("app", "src/app"),
+    ("api", "api"), ("api", "src/api"), ("api", "src/app/api"),
+    ("tests", "tests"), ("tests", "test"), ("tests", "__tests__"), ("tests", "src/__tests__"),
+    ("styles", "styles"), ("styles", "src/styles"),
+    ("utils", "utils"), ("utils", "src/utils"), ("lib", "src/lib"),
+]
+
+# Finding -> pattern description, in report order
+PATTERNS = [
+    ("forward_ref", "Uses forwardRef for component refs"),
+    ("app_router_api", "Next.js App Router API routes"),
+    ("pages_router_api", "Next.js Pages Router API routes"),
+    ("hooks_folder", "Custom hooks in dedicated folder"),
+    ("context", "React Context for state"),
+    ("server_actions", "Uses Server Actions"),
+    ("colocated_tests", "Co-located test files"),
+]
+
+
+def _read_text(path):
+    try:
+        with open(path, "r", errors="replace") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _first_match(text, rules):
+    for name, needle in rules:
+        if needle in text:
+            return name
+    return None
+
+
+def node_stack(directory):
+    """Stack entries from the package.json in `directory` ([] without one)."""
+    text = _read_text(os.path.join(directory, "package.json"))
+    if text is None:
+        return []
+    stack = [_first_match(text, FRAMEWORKS)]
+    typescript = os.path.isfile(os.path.join(directory, "tsconfig.json")) or '"typescript"' in text
+    stack.append("TypeScript" if typescript else "JavaScript")
+    stack += [_first_match(text, CSS_FRAMEWORKS), _first_match(text, TEST_FRAMEWORKS),
+              _first_match(text, DATABASES)]
+    return [entry for entry in stack if entry]
+
+
+def project_stack(root):
+    stack = node_stack(root)
+    python_manifests = [_read_text(os.path.join(root, name)) for name in ("requirements.txt", "pyproject.toml")]
+    python_manifests = [text for text in python_manifests if text is not None]
+    if python_manifests:
+        stack.append("Python")
+        for name, needle in PYTHON_FRAMEWORKS:
+            if any(needle in text for text in python_manifests):
+                stack.append(name)
+                break
+    if os.path.isfile(os.path.join(root, "go.mod")):
+        stack.append("Go")
+    if os.path.isfile(os.path.join(root, "Cargo.toml")):
+        stack.append("Rust")
+    if os.path.isfile(os.path.join(root, "Dockerfile")) or os.path.isfile(os.path.join(root, "docker-compose.yml")):
+        stack.append("Docker")
+    return stack
+
+
+def libraries(directory):
+    text = _read_text(os.path.join(directory, "package.json"))
+    if text is None:
+        return []
+    return [name for name, needle in LIBRARIES if needle in text]
+
+
+def paths(root):
+    return [[key, "./" + directory] for key, directory in PATHS if os.path.isdir(os.path.join(root, directory))]
+
+
+# ============================================================================
+# .gitignore
+# ============================================================================
+
+def _translate(pattern):
+    """Regex for one gitignore glob (matched against a slash-separated path)."""
+    out = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            out.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            out.append("[^/]")
+            i += 1
+        elif pattern[i] == "[" and "]" in pattern[i + 2:]:
+            end = pattern.index("]", i + 2)
+            body = pattern[i + 1:end]
+            out.append("[" + ("^" + body[1:] if body[0] in "!^" else body).replace("\\", "\\\\") + "]")
+            i = end + 1
+        else:
+            if pattern[i] == "\\" and i + 1 < len(pattern):
+                i += 1
+            out.append(re.escape(pattern[i]))
+            i += 1
+    return "".join(out)
+
+
+class IgnoreRules:
+    """The .gitignore patterns in effect in one directory: its own plus inherited ones."""
+
+    def __init__(self, rules=()):
+        self.rules = tuple(rules)   # (base prefix, compiled regex, negated, directories only)
+
+    def child(self, rel_dir, text):
+        """Rules for `rel_dir`, adding the patterns of its .gitignore."""
+        base = rel_dir + "/" if rel_dir else ""
+        rules = list(self.rules)
+        for line in text.splitlines():
+            line = line.rstrip()
+            if not line or line.startswith("#"):
+                continue
+            negated = line.startswith("!")
+            if negated:
+                line = line[1:]
+            elif line.startswith("\\"):
+                line = line[1:]
+            directories_only = line.endswith("/")
+            line = line.rstrip("/")
+            if not line:
+                continue
+            anchored = "/" in line
+            body = _translate(line.lstrip("/"))
+            regex = re.compile(body if anchored else "(?:.*/)?" + body)
+            rules.append((base, regex, negated, directories_only))
+        return IgnoreRules(rules)
+
+    def ignored(self, rel_path, is_dir):
+        ignored = False
+        for base, regex, negated, directories_only in self.rules:
+            if directories_only and not is_dir:
+                continue
+            if rel_path.startswith(base) and regex.fullmatch(rel_path[len(base):]):
+                ignored = not negated
+        return ignored
+
+
+# ============================================================================
+# Parallel, incremental walk
+# ============================================================================
+
+def layout_findings(directory):
+    """Patterns given away by the directory layout of one package."""
+    findings = set()
+    if os.path.isdir(os.path.join(directory, "src/app/api")) or os.path.isdir(os.path.join(directory, "app/api")):
+        findings.add("app_router_api")
+    elif os.path.isdir(os.path.join(directory, "pages/api")):
+        findings.add("pages_router_api")
+    if os.path.isdir(os.path.join(directory, "src/hooks")) or os.path.isdir(os.path.join(directory, "hooks")):
+        findings.add("hooks_folder")
+    return findings
+
+
+def _stat(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _source_findings(path, name):
+    text = _read_text(path) or ""
+    findings = []
+    if "forwardRef" in text:
+        findings.append("forward_ref")
+    if name.endswith(".tsx") and "use server" in text:
+        findings.append("server_actions")
+    return findings
+
+
+def _name_findings(name):
+    findings = []
+    if "Context" in name or "Provider" in name:
+        findings.append("context")
+    if ".test." in name or ".spec." in name:
+        findings.append("colocated_tests")
+    return findings
+
+
+def scan_dir(root, rel, rules, cached):
+    """
+    Examine one directory, reusing its index entry where nothing changed.
+
+    Returns: (index entry, rules for its subdirectories, findings, rescanned)
+    """
+    path = os.path.join(root, rel)
+    stat = _stat(path)
+    cached = cached or {}
+
+    rescanned = stat is None or cached.get("mtime") != stat[0]
+    if rescanned:
+        dirs, files = [], []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            dirs.append(entry.name)
+                        elif entry.is_file():
+                            files.append(entry.name)
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+        dirs.sort()
+        files.sort()
+    else:
+        dirs, files = cached["dirs"], cached["files"]
+
+    entry = {"mtime": stat[0] if stat else None, "dirs": dirs, "files": files, "sources": {}, "gitignore": None}
+
+    if ".gitignore" in files:
+        ignore_stat = _stat(os.path.join(path, ".gitignore"))
+        previous = cached.get("gitignore")
+        if previous and previous[0] == ignore_stat:
+            entry["gitignore"] = previous
+        else:
+            entry["gitignore"] = [ignore_stat, _read_text(os.path.join(path, ".gitignore")) or ""]
+        rules = rules.child(rel, entry["gitignore"][1])
+
+    findings = set()
+    previous_sources = cached.get("sources") or {}
+    for name in files:
+        rel_file = rel + "/" + name if rel else name
+        if rules.ignored(rel_file, False):
+            continue
+        findings.update(_name_findings(name))
+        if name.endswith(SOURCE_EXTENSIONS):
+            file_stat = _stat(os.path.join(path, name))
+            previous = previous_sources.get(name)
+            if previous and previous[0] == file_stat:
+                entry["sources"][name] = previous
+            else:
+                entry["sources"][name] = [file_stat, _source_findings(os.path.join(path, name), name)]
+            findings.update(entry["sources"][name][1])
+    for name in dirs:
+        findings.update(finding for finding in _name_findings(name) if finding == "context")
+
+    return entry, rules, findings, rescanned
+
+
+def _subdirectories(rel, entry, rules):
+    for name in entry["dirs"]:
+        child = rel + "/" + name if rel else name
+        if name not in ALWAYS_PRUNED and child not in PRUNED_PATHS and not rules.ignored(child, True):
+            yield child
+
+
+def scan(root=".", workers=MAX_WORKERS):
+    """Scan the project at `root`. Returns the findings as a dict."""
+    root = os.path.abspath(root)
+    index = load_json(SCAN_INDEX_FILE, None, root)
+    previous = index.get("dirs", {}) if isinstance(index, dict) and index.get("version") == INDEX_VERSION else {}
+
+    meta = project_meta.load(root)
+    dirs, findings, rescanned = {}, set(), 0
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        packages = {name: pool.submit(lambda info: (node_stack(os.path.join(root, info["path"])),
+                                                    libraries(os.path.join(root, info["path"]))), info)
+                    for name, info in meta["workspaces"].items()}
+
+        pending = {pool.submit(scan_dir, root, "", IgnoreRules(), previous.get("")): ""}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                rel = pending.pop(future)
+                entry, rules, dir_findings, changed = future.result()
+                dirs[rel] = entry
+                findings |= dir_findings
+                rescanned += changed
+                for child in _subdirectories(rel, entry, rules):
+                    pending[pool.submit(scan_dir, root, child, rules, previous.get(child))] = child
+
+        package_results = {name: future.result() for name, future in packages.items()}
+
+    save_json(SCAN_INDEX_FILE, {"version": INDEX_VERSION, "dirs": dirs}, root)
+
+    for package_root in [root] + [os.path.join(root, info["path"]) for info in meta["workspaces"].values()]:
+        findings |= layout_findings(package_root)
+
+    stack, libs = project_stack(root), libraries(root)
+    for package_stack, package_libs in package_results.values():
+        stack += [entry for entry in package_stack if entry not in stack]
+        libs += [lib for lib in package_libs if lib not in libs]
+    if "TypeScript" in stack and "JavaScript" in stack:
+        stack.remove("JavaScript")
+
+    return {
+        "stack": stack,
+        "paths": paths(root),
+        "libraries": libs,
+        "patterns": [text for finding, text in PATTERNS if finding in findings],
+        "packages": [{"name": name, "path": meta["workspaces"][name]["path"], "stack": package_stack}
+                     for name, (package_stack, _) in sorted(package_results.items())],
+        "directories": len(dirs),
+        "rescanned": rescanned,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Saci scan engine")
+    parser.add_argument("--root", default=".", help="project directory (default: .)")
+    parser.add_argument("--format", choices=["shell", "json"], default="shell")
+    args = parser.parse_args()
+
+    result = scan(args.root)
+    if args.format == "json":
+        print(json.dumps(result, indent=2))
+        return
+
+    for entry in result["stack"]:
+        print(f"stack|{entry}")
+    for key, directory in result["paths"]:
+        print(f"path|{key}|{directory}")
+    for lib in result["libraries"]:
+        print(f"lib|{lib}")
+    for pattern in result["patterns"]:
+        print(f"pattern|{pattern}")
+    for package in result["packages"]:
+        print(f"package|{package['name']}|{package['path']}|{', '.join(package['stack'])}")
+    print(f"scanned|{result['directories']}|{result['rescanned']}")
+
+
+if __name__ == "__main__":
+    main()
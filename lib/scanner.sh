@@ -17,6 +17,14 @@ log_info() { echo -e "${BLUE}[SCAN]${NC} $1"; }
 log_success() { echo -e "${GREEN}[✓]${NC} $1"; }
 log_item() { echo -e "  ${CYAN}•${NC} $1"; }
 
+# Parallel, incremental scanner (lib/scan_engine.py); the detect_* functions
+# below are the fallback when python3 is not available
+SCAN_ENGINE="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/scan_engine.py"
+
+use_scan_engine() {
+    command -v python3 >/dev/null 2>&1 && [ -f "$SCAN_ENGINE" ]
+}
+
 # ============================================================================
 # Stack Detection
 # ============================================================================
@@ -244,41 +252,53 @@ run_scan() {
     echo -e "${CYAN}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━${NC}"
     echo ""
     
-    log_info "Detecting stack..."
-    local stack_raw=$(detect_stack)
-    local stack=()
-    if [ -n "$stack_raw" ]; then
-        read -ra stack <<< "$stack_raw"
+    local stack=() paths=() libs=() patterns=()
+    if use_scan_engine; then
+        log_info "Scanning codebase..."
+        local scan_output
+        scan_output=$(python3 "$SCAN_ENGINE" --root .)
+        local kind value rest
+        while IFS='|' read -r kind value rest; do
+            case "$kind" in
+                stack) stack+=("$value") ;;
+                path) paths+=("$value:$rest") ;;
+                lib) libs+=("$value") ;;
+                pattern) patterns+=("$value") ;;
+                package) log_item "Package $value (${rest%%|*}): ${rest#*|}" ;;
+                scanned) log_item "$value directories ($rest changed since last scan)" ;;
+            esac
+        done <<< "$scan_output"
+    else
+        local stack_raw=$(detect_stack)
+        [ -n "$stack_raw" ] && read -ra stack <<< "$stack_raw"
+        local paths_raw=$(detect_paths)
+        [ -n "$paths_raw" ] && read -ra paths <<< "$paths_raw"
+        local libs_raw=$(detect_libraries)
+        [ -n "$libs_raw" ] && read -ra libs <<< "$libs_raw"
     fi
+
+    log_info "Detected stack:"
     for s in "${stack[@]:-}"; do
         [ -n "$s" ] && log_item "$s"
     done
-    
-    log_info "Mapping directory structure..."
-    local paths_raw=$(detect_paths)
-    local paths=()
-    if [ -n "$paths_raw" ]; then
-        read -ra paths <<< "$paths_raw"
-    fi
+
+    log_info "Directory structure:"
     for p in "${paths[@]:-}"; do
         [ -n "$p" ] && log_item "$p"
     done
-    
-    log_info "Detecting libraries..."
-    local libs_raw=$(detect_libraries)
-    local libs=()
-    if [ -n "$libs_raw" ]; then
-        read -ra libs <<< "$libs_raw"
-    fi
+
+    log_info "Detected libraries:"
     for l in "${libs[@]:-}"; do
         [ -n "$l" ] && log_item "$l"
     done
-    
-    # Detect patterns
-    log_info "Analyzing code patterns..."
-    local patterns_raw=$(detect_patterns)
-    # patterns are strings with spaces, handle differently
-    
+
+    if [ ${#patterns[@]} -gt 0 ]; then
+        log_info "Code patterns:"
+        for pattern in "${patterns[@]}"; do
+            log_item "$pattern"
+        done
+    fi
+
     # Generate JSON
     log_info "Generating project context..."
     
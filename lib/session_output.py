@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Saci Session Output: One Streaming Pass over CLI Session Output
+
+`claude --print --output-format json --verbose` writes the whole session as
+a JSON array of messages, ending with a `type: "result"` object that carries
+usage, cost and model. Verbose transcripts get large, and reading them with
+one jq query per field parsed the whole file six times per iteration.
+
+This parser reads the file once, in chunks, and decodes one top-level
+message object at a time, so memory stays bounded by the largest single
+message. It also accepts newline-delimited output (stream-json) and skips
+text between messages, such as stderr lines mixed in by `2>&1`.
+
+From the messages it keeps:
+- usage, cost and model from the last `result` message (jq's `keys[0]` of
+  modelUsage, i.e. the first model in sorted order)
+- one token count per assistant turn (input + cache reads + output, like
+  total_tokens); messages sharing an API message id count as one turn
+
+Usage:
+  session_output.py FILE [--format csv|json]
+
+  csv   input,output,cache_read,cache_creation,total,model,cost_usd,turns,turn_tokens
+        (turn_tokens is a JSON array and always the last field)
+  json  the same fields as one object
+"""
+
+import argparse
+import codecs
+import json
+import re
+
+
+CHUNK_SIZE = 64 * 1024
+
+# A message starts with `{"`; a lone `{` in a log line does not
+_MESSAGE_START = re.compile(r'\{\s*"')
+_PARTIAL_TOKEN = re.compile(r'[\w.+-]*')
+
+
+class MessageStream:
+    """Incrementally splits text into top-level JSON objects.
+
+    Each object is decoded by json's C scanner straight from the buffer.
+    An object cut off by the end of the buffer is retried once more text
+    has arrived; `wanted` grows with it, so a huge message is decoded a
+    logarithmic number of times instead of once per chunk. Anything between
+    objects (array brackets, commas, stray log lines) is skipped.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._decoder = json.JSONDecoder()
+        self.wanted = CHUNK_SIZE  # how much to read before calling feed again
+
+    def feed(self, text, final=False):
+        """Yield every object completed by this piece of text."""
+        buffer = self._buffer + text if self._buffer else text
+        pos = 0
+        self._buffer = ""
+        self.wanted = CHUNK_SIZE
+        while True:
+            match = _MESSAGE_START.search(buffer, pos)
+            if match is None:
+                # Keep a trailing `{` that may start a message in the next chunk
+                tail = buffer.rfind("{", pos)
+                if tail >= 0 and not final:
+                    self._buffer = buffer[tail:]
+                return
+            start = match.start()
+            try:
+                message, pos = self._decoder.raw_decode(buffer, start)
+            except ValueError as e:
+                # Cut off mid-string, or mid-literal/number (`tru`, `12.`)
+                incomplete = (e.msg.startswith("Unterminated string")
+                              or _PARTIAL_TOKEN.fullmatch(buffer, e.pos) is not None)
+                if incomplete and not final:
+                    self._buffer = buffer[start:]
+                    self.wanted = max(CHUNK_SIZE, len(self._buffer))
+                    return
+                pos = start + 1
+                continue
+            yield message
+
+
+def _number(value):
+    return value if isinstance(value, (int, float)) and not isinstance(value, bool) else 0
+
+
+def _turn_tokens(usage):
+    return (_number(usage.get("input_tokens")) + _number(usage.get("cache_read_input_tokens"))
+            + _number(usage.get("output_tokens")))
+
+
+class SessionSummary:
+    """Usage, cost, model and per-turn tokens of one CLI session."""
+
+    def __init__(self):
+        self.result = None
+        self.turn_tokens = []
+        self._turn_ids = {}     # API message id -> index in turn_tokens
+
+    def add(self, message):
+        if not isinstance(message, dict):
+            return
+        kind = message.get("type")
+        if kind == "result":
+            self.result = message
+        elif kind == "assistant":
+            body = message.get("message")
+            if not isinstance(body, dict) or not isinstance(body.get("usage"), dict):
+                return
+            tokens = _turn_tokens(body["usage"])
+            message_id = body.get("id")
+            if message_id is not None and message_id in self._turn_ids:
+                # Several content blocks of one response repeat its usage
+                self.turn_tokens[self._turn_ids[message_id]] = tokens
+                return
+            if message_id is not None:
+                self._turn_ids[message_id] = len(self.turn_tokens)
+            self.turn_tokens.append(tokens)
+
+    def fields(self):
+        result = self.result or {}
+        usage = result.get("usage") if isinstance(result.get("usage"), dict) else {}
+        model_usage = result.get("modelUsage")
+        models = sorted(model_usage) if isinstance(model_usage, dict) else []
+        input_tokens = _number(usage.get("input_tokens"))
+        output_tokens = _number(usage.get("output_tokens"))
+        cache_read = _number(usage.get("cache_read_input_tokens"))
+        turns = result.get("num_turns")
+        return {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "cache_read_tokens": cache_read,
+            "cache_creation_tokens": _number(usage.get("cache_creation_input_tokens")),
+            # Total = new input + cache reads + output (cache creation is counted in input)
+            "total_tokens": input_tokens + cache_read + output_tokens,
+            "model": models[0] if models else "unknown",
+            "cost_usd": _number(result.get("total_cost_usd")),
+            "turns": turns if isinstance(turns, int) and not isinstance(turns, bool) else len(self.turn_tokens),
+            "turn_tokens": self.turn_tokens,
+        }
+
+
+def parse(stream):
+    """Summarize a session from a binary stream, reading it once."""
+    summary = SessionSummary()
+    messages = MessageStream()
+    decoder = codecs.getincrementaldecoder("utf-8")("replace")
+    while True:
+        chunk = stream.read(messages.wanted)
+        text = decoder.decode(chunk, final=not chunk)
+        for message in messages.feed(text, final=not chunk):
+            summary.add(message)
+        if not chunk:
+            return summary
+
+
+def parse_file(path):
+    try:
+        with open(path, "rb") as f:
+            return parse(f)
+    except OSError:
+        return SessionSummary()
+
+
+def to_csv(fields):
+    values = [fields[name] for name in ("input_tokens", "output_tokens", "cache_read_tokens",
+                                        "cache_creation_tokens", "total_tokens", "model", "cost_usd", "turns")]
+    values.append(json.dumps(fields["turn_tokens"], separators=(",", ":")))
+    return ",".join(str(value) for value in values)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Saci session output parser")
+    parser.add_argument("file", help="CLI output file")
+    parser.add_argument("--format", choices=["csv", "json"], default="csv")
+    args = parser.parse_args()
+
+    fields = parse_file(args.file).fields()
+    if args.format == "json":
+        print(json.dumps(fields, separators=(",", ":")))
+    else:
+        print(to_csv(fields))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Saci Stub CLI: Offline Stand-in for claude/amp (`--provider stub`)
+
+Lets `saci jump` run end to end without a model or network, so the time Saci
+itself spends per iteration (prompt, PRP queries, tests, commit, bookkeeping)
+can be measured - see .saci/bench/bench-orchestration.py.
+
+Reads the prompt from stdin like `claude --print`, takes the task ID and
+iteration from it, then replays one canned session:
+- writes the session's file edits
+- sleeps for the session's model time (delay_ms)
+- prints a canned `--output-format json` transcript (system, assistant and
+  result messages with usage), which Saci parses for tokens and cost
+
+Without a script every session writes `stub/<task id>.txt`, which is what
+the bench's synthetic tasks test for. A script (SACI_STUB_SCRIPT, JSON) sets
+the sessions per task and iteration; "*" applies to any task:
+
+  {"F1-T1": [{"edits": {"src/a.js": "broken"}},      <- iteration 1
+             {"edits": {"src/a.js": "fixed"}, "delay_ms": 200}],
+   "*": [{"exit": 1}]}
+
+Missing iterations reuse the last entry. A session may also set "usage",
+"cost_usd" and "exit" (a non-zero exit is a failed CLI session).
+
+Environment: SACI_STUB_SCRIPT, SACI_STUB_DELAY_MS (default model time, 0)
+"""
+
+import json
+import os
+import re
+import sys
+import time
+
+
+DEFAULT_USAGE = {"input_tokens": 1200, "output_tokens": 300,
+                 "cache_read_input_tokens": 9000, "cache_creation_input_tokens": 0}
+
+# Nonzero so Saci does not estimate a cost for it
+DEFAULT_COST_USD = 0.0001
+
+MODEL = "stub"
+
+_TASK_RE = re.compile(r"^\*\*Task ID:\*\* (\S+)", re.M)
+_ITERATION_RE = re.compile(r"^# Iteration (\d+) of", re.M)
+
+
+def load_script(path):
+    if not path:
+        return {}
+    with open(path) as f:
+        script = json.load(f)
+    if not isinstance(script, dict):
+        raise ValueError("stub script must be a JSON object of task id -> sessions")
+    return script
+
+
+def session_for(script, task_id, iteration):
+    """The canned session of a task's iteration (1-based)."""
+    sessions = script.get(task_id, script.get("*"))
+    if not sessions:
+        return {"edits": {os.path.join("stub", f"{task_id}.txt"): f"{task_id} iteration {iteration}\n"}}
+    return sessions[min(iteration, len(sessions)) - 1]
+
+
+def apply_edits(edits):
+    for path, content in edits.items():
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if content is None:
+            if os.path.exists(path):
+                os.remove(path)
+            continue
+        with open(path, "w") as f:
+            f.write(content)
+
+
+def transcript(session, task_id, duration_ms):
+    usage = dict(DEFAULT_USAGE, **session.get("usage", {}))
+    return [
+        {"type": "system", "subtype": "init", "model": MODEL, "session_id": f"stub-{task_id}"},
+        {"type": "assistant", "message": {"id": f"stub-{task_id}", "model": MODEL, "usage": usage,
+                                          "content": [{"type": "text", "text": f"Stub session for {task_id}"}]}},
+        {"type": "result", "subtype": "success", "is_error": False, "duration_ms": duration_ms,
+         "num_turns": 1, "result": "done", "usage": usage,
+         "total_cost_usd": session.get("cost_usd", DEFAULT_COST_USD), "modelUsage": {MODEL: {}}},
+    ]
+
+
+def main():
+    start = time.monotonic()
+    prompt = sys.stdin.read()
+    task = _TASK_RE.search(prompt)
+    iteration = _ITERATION_RE.search(prompt)
+    task_id = task.group(1) if task else "unknown"
+
+    try:
+        script = load_script(os.environ.get("SACI_STUB_SCRIPT"))
+    except (OSError, ValueError) as e:
+        print(f"stub: invalid SACI_STUB_SCRIPT: {e}", file=sys.stderr)
+        sys.exit(1)
+    session = session_for(script, task_id, int(iteration.group(1)) if iteration else 1)
+
+    apply_edits(session.get("edits", {}))
+    delay_ms = session.get("delay_ms", int(os.environ.get("SACI_STUB_DELAY_MS", "0") or 0))
+    if delay_ms > 0:
+        time.sleep(delay_ms / 1000)
+
+    print(json.dumps(transcript(session, task_id, int((time.monotonic() - start) * 1000))))
+    sys.exit(session.get("exit", 0))
+
+
+if __name__ == "__main__":
+    main()
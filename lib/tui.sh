@@ -55,14 +55,21 @@ tui_log() {
 # Token Metrics Functions
 # ============================================================================
 
-# Cache for metrics summary to avoid recalculating on every render
-METRICS_CACHE=""
-METRICS_CACHE_TIME=0
+# Incremental aggregator: keeps running totals plus a byte-offset checkpoint in
+# .saci/cache, so each render only parses lines appended since the last one
+METRICS_SUMMARY_PY="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/metrics_summary.py"
+
+# Run the aggregator; fails if python3 or the script is unavailable
+metrics_summary() {
+    command -v python3 &> /dev/null && [ -f "$METRICS_SUMMARY_PY" ] || return 1
+    python3 "$METRICS_SUMMARY_PY" "$@" 2>/dev/null
+}
 
 # Calculate total tokens used from metrics.jsonl
 calculate_total_tokens() {
     if [ -f .saci/metrics.jsonl ]; then
-        jq -s 'map(.total_tokens) | add // 0' .saci/metrics.jsonl 2>/dev/null || echo "0"
+        metrics_summary tokens ||
+            jq -s 'map(.total_tokens) | add // 0' .saci/metrics.jsonl 2>/dev/null || echo "0"
     else
         echo "0"
     fi
@@ -71,7 +78,8 @@ calculate_total_tokens() {
 # Calculate total cost from metrics.jsonl
 calculate_total_cost() {
     if [ -f .saci/metrics.jsonl ]; then
-        jq -s 'map(.cost_usd) | add // 0' .saci/metrics.jsonl 2>/dev/null || echo "0.000000"
+        metrics_summary cost ||
+            jq -s 'map(.cost_usd) | add // 0' .saci/metrics.jsonl 2>/dev/null || echo "0.000000"
     else
         echo "0.000000"
     fi
@@ -87,40 +95,32 @@ calculate_metrics_summary() {
         return
     fi
 
-    # Check cache (valid for 5 seconds to optimize frequent renders)
-    local current_time
-    current_time=$(date +%s)
-    if [ -n "$METRICS_CACHE" ] && [ $((current_time - METRICS_CACHE_TIME)) -lt 5 ]; then
-        echo "$METRICS_CACHE"
-        return
-    fi
-
-    # Use jq streaming mode for performance with large files
     local summary
-    summary=$(jq -s '
-        {
-            total_tokens: (map(.total_tokens) | add // 0),
-            cost_usd: (map(.cost_usd) | add // 0.0),
-            avg_time_ms: (if length > 0 then (map(.duration_ms) | add / length) else 0 end),
-            success_rate: (if length > 0 then ((map(select(.result == "success")) | length) * 100.0 / length) else 0.0 end),
-            error_counts: (
-                map(select(.error_type != ""))
-                | group_by(.error_type)
-                | map({key: .[0].error_type, value: length})
-                | from_entries
-            )
-        }
-    ' .saci/metrics.jsonl 2>/dev/null)
+    summary=$(metrics_summary summary) || summary=""
+
+    # Without python3, fall back to summing the whole log with jq
+    if [ -z "$summary" ]; then
+        summary=$(jq -s '
+            {
+                total_tokens: (map(.total_tokens) | add // 0),
+                cost_usd: (map(.cost_usd) | add // 0.0),
+                avg_time_ms: (if length > 0 then (map(.duration_ms) | add / length) else 0 end),
+                success_rate: (if length > 0 then ((map(select(.result == "success")) | length) * 100.0 / length) else 0.0 end),
+                error_counts: (
+                    map(select(.error_type != ""))
+                    | group_by(.error_type)
+                    | map({key: .[0].error_type, value: length})
+                    | from_entries
+                )
+            }
+        ' .saci/metrics.jsonl 2>/dev/null)
+    fi
 
     # If jq fails, return zeros
     if [ -z "$summary" ]; then
         summary='{"total_tokens":0,"cost_usd":0.0,"avg_time_ms":0,"success_rate":0.0,"error_counts":{}}'
     fi
 
-    # Update cache
-    METRICS_CACHE="$summary"
-    METRICS_CACHE_TIME=$current_time
-
     echo "$summary"
 }
 
@@ -128,48 +128,57 @@ calculate_metrics_summary() {
 # Task List Generation
 # ============================================================================
 
+PRP_ENGINE_PY="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/prp_engine.py"
+
+# One line per task: id|passes|unmet dependencies|title
+# Dependency status comes from the PRP engine (without python3 nothing is shown as blocked)
+tui_task_status() {
+    local prp_file="$1"
+
+    if command -v python3 &> /dev/null && [ -f "$PRP_ENGINE_PY" ]; then
+        python3 "$PRP_ENGINE_PY" --prp "$prp_file" status 2>/dev/null && return
+    fi
+    jq -r '.features[] | .tasks[] | "\(.id)|\(.passes // false)||\(.title)"' "$prp_file" 2>/dev/null
+}
+
+# Completed and total task counts from tui_task_status output
+# (the engine's view includes status changes still in the journal)
+tui_task_counts() {
+    local status_lines="$1"
+    local completed=0 total=0
+    local task_id passes rest
+    while IFS='|' read -r task_id passes rest; do
+        [ -z "$task_id" ] && continue
+        total=$((total + 1))
+        [ "$passes" = "true" ] && completed=$((completed + 1))
+    done <<< "$status_lines"
+    echo "$completed $total"
+}
+
 # Generate task list with status icons
 tui_task_list() {
     local prp_file="$1"
     local current_task="$2"
+    local status_lines="${3:-}"
 
-    # We need to source saci.sh to use check_dependencies_met()
-    # This assumes saci.sh is in the parent directory
-    local saci_path
-    saci_path="$(dirname "${BASH_SOURCE[0]}")/../saci.sh"
-    if [ -f "$saci_path" ]; then
-        # shellcheck source=../saci.sh
-        source "$saci_path"
-    fi
+    [ -n "$status_lines" ] || status_lines=$(tui_task_status "$prp_file")
 
-    # Get all tasks and check their status
-    jq -r '.features[] | .tasks[] | "\(.id)|\(.title[0:25])|\(.passes // false)|\(.dependencies // [])"' "$prp_file" 2>/dev/null | while IFS='|' read -r task_id title passes deps; do
+    echo "$status_lines" | while IFS='|' read -r task_id passes blocked title; do
+        [ -z "$task_id" ] && continue
         local icon
 
         if [ "$task_id" = "$current_task" ]; then
             icon="▶"
         elif [ "$passes" = "true" ]; then
             icon="■"
+        elif [ -n "$blocked" ]; then
+            # Blocked by unsatisfied dependencies
+            icon="⊗"
         else
-            # Check if task is blocked by unsatisfied dependencies
-            if [ "$deps" != "[]" ] && [ -n "$deps" ]; then
-                # Temporarily set PRP_FILE for dependency check
-                local old_prp="$PRP_FILE"
-                export PRP_FILE="$prp_file"
-
-                if ! check_dependencies_met "$task_id" 2>/dev/null; then
-                    icon="⊗"
-                else
-                    icon="□"
-                fi
-
-                export PRP_FILE="$old_prp"
-            else
-                icon="□"
-            fi
+            icon="□"
         fi
 
-        echo "$icon $task_id $title"
+        echo "$icon $task_id ${title:0:25}"
     done
 }
 
@@ -181,10 +190,11 @@ tui_render() {
     
     [ "$TUI_ENABLED" != "true" ] && return
     
+    local status_lines
+    status_lines=$(tui_task_status "$prp_file")
     local completed
     local total
-    completed=$(jq '[.features[].tasks[] | select(.passes == true)] | length' "$prp_file" 2>/dev/null || echo 0)
-    total=$(jq '[.features[].tasks[]] | length' "$prp_file" 2>/dev/null || echo 0)
+    read -r completed total <<< "$(tui_task_counts "$status_lines")"
     local percent=0
     [ "$total" -gt 0 ] && percent=$((completed * 100 / total))
     
@@ -209,7 +219,7 @@ tui_render() {
 
     # Task list
     local tasks
-    tasks=$(tui_task_list "$prp_file" "$current_task")
+    tasks=$(tui_task_list "$prp_file" "$current_task" "$status_lines")
 
     # Build left panel content with token metrics
     local left_content="Tasks ($completed/$total)
@@ -340,8 +350,9 @@ show_status() {
     local completed
     local total
     project_name=$(jq -r '.project.name // "Unknown"' "$prp_file")
-    completed=$(jq '[.features[].tasks[] | select(.passes == true)] | length' "$prp_file")
-    total=$(jq '[.features[].tasks[]] | length' "$prp_file")
+    local status_lines
+    status_lines=$(tui_task_status "$prp_file")
+    read -r completed total <<< "$(tui_task_counts "$status_lines")"
     local percent=$((total > 0 ? completed * 100 / total : 0))
     
     # Header
@@ -370,40 +381,15 @@ show_status() {
     
     echo ""
     
-    # Task list - source saci.sh for dependency functions
-    local saci_path
-    saci_path="$(dirname "${BASH_SOURCE[0]}")/../saci.sh"
-    if [ -f "$saci_path" ]; then
-        # shellcheck source=../saci.sh
-        source "$saci_path"
-    fi
-
     # Show tasks with dependency information
-    jq -r '.features[] | .tasks[] | "\(.id)|\(.title)|\(.passes // false)|\(.dependencies // [])"' "$prp_file" | while IFS='|' read -r task_id title passes deps; do
+    echo "$status_lines" | while IFS='|' read -r task_id passes blocked title; do
+        [ -z "$task_id" ] && continue
         if [ "$passes" = "true" ]; then
             echo "  ✓ $task_id: $title"
+        elif [ -n "$blocked" ]; then
+            echo "  ○ $task_id: $title [depends on: $blocked]"
         else
-            # Check if blocked
-            local status_line="  ○ $task_id: $title"
-
-            if [ "$deps" != "[]" ] && [ -n "$deps" ]; then
-                # Temporarily set PRP_FILE for dependency check
-                local old_prp="$PRP_FILE"
-                export PRP_FILE="$prp_file"
-
-                if ! check_dependencies_met "$task_id" 2>/dev/null; then
-                    # Get blocked dependencies
-                    local blocked
-                    blocked=$(get_blocked_dependencies "$task_id" 2>/dev/null)
-                    if [ -n "$blocked" ]; then
-                        status_line="$status_line [depends on: $blocked]"
-                    fi
-                fi
-
-                export PRP_FILE="$old_prp"
-            fi
-
-            echo "$status_line"
+            echo "  ○ $task_id: $title"
         fi
     done
     
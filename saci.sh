@@ -20,9 +20,19 @@ PRP_FILE="${PRP_FILE:-prp.json}"
 PROGRESS_FILE="${PROGRESS_FILE:-progress.txt}"
 MAX_ITERATIONS="${MAX_ITERATIONS:-10}"
 DRY_RUN="${DRY_RUN:-false}"
-CLI_PROVIDER="${CLI_PROVIDER:-claude}"  # Options: claude, amp
+CLI_PROVIDER="${CLI_PROVIDER:-claude}"  # Options: claude, amp, stub (offline replay, for benchmarks)
 TUI_MODE="${TUI_MODE:-false}"  # Enable TUI with gum
 TUI_ENABLED="${TUI_ENABLED:-false}"  # Set by tui_init when gum is ready
+HOOK_SERVER="${HOOK_SERVER:-true}"  # Keep hooks warm in a local daemon during jump
+TEST_CACHE="${TEST_CACHE:-true}"  # Reuse test verdicts for an unchanged working tree
+TEST_SELECTION="${TEST_SELECTION:-affected}"  # Stop hook test scope: affected or full
+SPECULATIVE_TESTS="${SPECULATIVE_TESTS:-false}"  # Re-run the Stop hook's tests in the background as files are edited
+ROLLBACK="${ROLLBACK:-targeted}"  # Failed iterations: restore changed paths (targeted) or reset the tree (full)
+JOBS="${JOBS:-1}"  # Ready tasks run concurrently, each in its own git worktree
+METRICS_FILE="${METRICS_FILE:-.saci/metrics.jsonl}"
+TRACE="${TRACE:-true}"  # Record timing spans of hooks and loop phases
+TRACE_FILE="${TRACE_FILE:-.saci/trace.jsonl}"
+FAILURE_DIGEST_TOKENS="${FAILURE_DIGEST_TOKENS:-600}"  # Size of the test failure summary in retry prompts
 
 # Determine PROMPT_FILE
 # 1. Environment variable
@@ -41,6 +51,24 @@ else
     PROMPT_FILE="prompt.md"
 fi
 
+# Intelligent hooks (validate-bash.py, hook_server.py, ...)
+# Exported so installed hooks can import shared modules (shell_parser.py)
+export SACI_HOOKS_DIR="$SCRIPT_DIR/.saci/hooks"
+
+# In-memory PRP scheduler: answers task queries from one parse of prp.json.
+# The jq queries below remain as the fallback when python3 is unavailable.
+PRP_ENGINE="$SCRIPT_DIR/lib/prp_engine.py"
+PRP_ENGINE_OK=""
+
+# Failing test output is summarized for the next iteration's prompt
+FAILURE_DIGEST="$SCRIPT_DIR/lib/failure_digest.py"
+
+# Iteration snapshots for rolling back only the paths a session changed
+CHECKPOINT_PY="$SCRIPT_DIR/lib/checkpoint.py"
+
+# Offline stand-in for the CLI (--provider stub), replays canned sessions
+STUB_CLI="$SCRIPT_DIR/lib/stub_cli.py"
+
 # ============================================================================
 # Helper Functions
 # ============================================================================
@@ -83,6 +111,46 @@ log_iteration() {
 
 timestamp() { date '+%Y-%m-%d %H:%M:%S'; }
 
+# Milliseconds since the epoch (EPOCHREALTIME needs bash 5, date +%s is whole seconds)
+now_ms() {
+    if [ -n "${EPOCHREALTIME:-}" ]; then
+        local usec="${EPOCHREALTIME/[.,]/}"
+        echo $((10#$usec / 1000))
+    else
+        echo $(($(date +%s) * 1000))
+    fi
+}
+
+# Append a timing span to the trace read by `saci profile` (same fields as
+# the hook spans written by .saci/hooks/saci_trace.py)
+# Usage: trace_span <kind> <name> <start_ms> [outcome]
+trace_span() {
+    [ -n "${SACI_TRACE_FILE:-}" ] || return 0
+    local start_ms="$3"
+    local end_ms
+    end_ms=$(now_ms)
+    printf '{"ts":%d.%03d,"kind":"%s","name":"%s","task_id":"%s","iteration":%s,"duration_ms":%d,"outcome":"%s"}\n' \
+        $((start_ms / 1000)) $((start_ms % 1000)) "$1" "$2" "${SACI_TASK_ID:-}" "${SACI_ITERATION:-null}" \
+        $((end_ms - start_ms)) "${4:-ok}" >> "$SACI_TRACE_FILE" 2>/dev/null || true
+}
+
+# Shared state lock: with --jobs N several workers write prp.json,
+# progress.txt and the metrics log. mkdir is atomic, so the lock needs no
+# extra tools. A no-op unless STATE_LOCK_DIR is set (parallel mode).
+STATE_LOCK_DIR=""
+
+state_lock() {
+    [ -n "$STATE_LOCK_DIR" ] || return 0
+    until mkdir "$STATE_LOCK_DIR" 2>/dev/null; do
+        sleep 0.05
+    done
+}
+
+state_unlock() {
+    [ -n "$STATE_LOCK_DIR" ] || return 0
+    rmdir "$STATE_LOCK_DIR" 2>/dev/null || true
+}
+
 log_progress() {
     local task_id="$1"
     local status="$2"
@@ -90,21 +158,44 @@ log_progress() {
     local tokens="${4:-0}"        # Optional: tokens used
     local cost_usd="${5:-0.00}"   # Optional: cost in USD
 
-    echo "" >> "$PROGRESS_FILE"
-    echo "## [$(timestamp)] Task $task_id - $status" >> "$PROGRESS_FILE"
+    state_lock
+    {
+        echo ""
+        echo "## [$(timestamp)] Task $task_id - $status"
 
-    # Add metrics if available (tokens != 0)
-    if [ "$tokens" != "0" ] && [ "$tokens" != "N/A" ]; then
-        echo "**Tokens:** $tokens (\$$cost_usd USD)" >> "$PROGRESS_FILE"
-    fi
+        # Add metrics if available (tokens != 0)
+        if [ "$tokens" != "0" ] && [ "$tokens" != "N/A" ]; then
+            echo "**Tokens:** $tokens (\$$cost_usd USD)"
+        fi
 
-    echo "$message" >> "$PROGRESS_FILE"
+        echo "$message"
+    } >> "$PROGRESS_FILE"
+    state_unlock
 }
 
 # ============================================================================
 # PRP Functions
 # ============================================================================
 
+use_prp_engine() {
+    if [ -z "$PRP_ENGINE_OK" ]; then
+        if command -v python3 >/dev/null 2>&1 && [ -f "$PRP_ENGINE" ]; then
+            PRP_ENGINE_OK=true
+        else
+            PRP_ENGINE_OK=false
+        fi
+    fi
+    [ "$PRP_ENGINE_OK" = "true" ]
+}
+
+prp_engine() {
+    local start status=0
+    start=$(now_ms)
+    python3 "$PRP_ENGINE" --prp "$PRP_FILE" "$@" || status=$?
+    trace_span prp "$1" "$start" "$([ $status -eq 0 ] && echo ok || echo "exit-$status")"
+    return $status
+}
+
 check_dependencies() {
     local missing=()
     
@@ -118,8 +209,11 @@ check_dependencies() {
         amp)
             command -v amp >/dev/null 2>&1 || missing+=("amp (https://ampcode.com)")
             ;;
+        stub)
+            command -v python3 >/dev/null 2>&1 || missing+=("python3 (for the stub provider)")
+            ;;
         *)
-            log_error "Unknown CLI provider: $CLI_PROVIDER. Valid options: claude, amp"
+            log_error "Unknown CLI provider: $CLI_PROVIDER. Valid options: claude, amp, stub"
             exit 1
             ;;
     esac
@@ -131,6 +225,11 @@ check_dependencies() {
 }
 
 get_next_task() {
+    if use_prp_engine; then
+        prp_engine next
+        return
+    fi
+
     # Find first task with passes: false that has all dependencies satisfied
     # Get all candidate tasks sorted by priority
     local candidates=$(jq -r '
@@ -163,11 +262,19 @@ get_next_task() {
 get_task_field() {
     local task_id="$1"
     local field="$2"
+    if use_prp_engine; then
+        prp_engine field "$task_id" "$field"
+        return
+    fi
     jq -r --arg id "$task_id" '.features[].tasks[] | select(.id == $id) | .'"$field" "$PRP_FILE"
 }
 
 get_task_context() {
     local task_id="$1"
+    if use_prp_engine; then
+        prp_engine context "$task_id"
+        return
+    fi
     jq -r --arg id "$task_id" '
         .features[].tasks[] | select(.id == $id) | .context | 
         "Files: \(.files // [] | join(", "))\n" +
@@ -178,6 +285,10 @@ get_task_context() {
 
 get_acceptance_criteria() {
     local task_id="$1"
+    if use_prp_engine; then
+        prp_engine acceptance "$task_id"
+        return
+    fi
     jq -r --arg id "$task_id" '
         .features[].tasks[] | select(.id == $id) | 
         .acceptance // [] | map("- " + .) | join("\n")
@@ -186,36 +297,106 @@ get_acceptance_criteria() {
 
 get_test_command() {
     local task_id="$1"
+    if use_prp_engine; then
+        prp_engine test-command "$task_id"
+        return
+    fi
     jq -r --arg id "$task_id" '
         .features[].tasks[] | select(.id == $id) | 
         .tests.command // "npm test"
     ' "$PRP_FILE"
 }
 
+# With the PRP engine, status flips are appended to a journal (see
+# lib/prp_store.py) and folded back into prp.json by compact_prp_journal
 mark_task_complete() {
     local task_id="$1"
-    local tmp_file=$(mktemp)
-    
-    jq --arg id "$task_id" '
-        .features |= map(.tasks |= map(if .id == $id then .passes = true else . end))
-    ' "$PRP_FILE" > "$tmp_file" && mv "$tmp_file" "$PRP_FILE"
+    local status=0
+
+    state_lock
+    if use_prp_engine; then
+        prp_engine mark "$task_id" || status=$?
+    else
+        local tmp_file=$(mktemp)
+        jq --arg id "$task_id" '
+            .features |= map(.tasks |= map(if .id == $id then .passes = true else . end))
+        ' "$PRP_FILE" > "$tmp_file" && mv "$tmp_file" "$PRP_FILE" || status=$?
+    fi
+    state_unlock
+    return $status
+}
+
+# Bring prp.json up to date with the status journal, before anyone outside
+# Saci reads it (a CLI session, the end of a run)
+compact_prp_journal() {
+    use_prp_engine || return 0
+    [ -f "$PRP_FILE" ] || return 0
+    prp_engine compact || log_warning "Could not update $PRP_FILE from its status journal"
 }
 
 count_remaining_tasks() {
+    if use_prp_engine; then
+        prp_engine remaining
+        return
+    fi
     jq '[.features[].tasks[] | select(.passes == false)] | length' "$PRP_FILE"
 }
 
 count_total_tasks() {
+    if use_prp_engine; then
+        prp_engine total
+        return
+    fi
     jq '[.features[].tasks[]] | length' "$PRP_FILE"
 }
 
 get_feature_for_task() {
     local task_id="$1"
+    if use_prp_engine; then
+        prp_engine feature "$task_id"
+        return
+    fi
     jq -r --arg id "$task_id" '
         .features[] | select(.tasks[] | .id == $id) | .name
     ' "$PRP_FILE"
 }
 
+# Next task and counts for the main loop in one PRP read
+# Sets: NEXT_TASK, REMAINING_TASKS, TOTAL_TASKS
+load_loop_state() {
+    if use_prp_engine; then
+        local state
+        state=$(prp_engine loop-state) || return 1
+        eval "$state"
+        return 0
+    fi
+    NEXT_TASK=$(get_next_task)
+    REMAINING_TASKS=$(count_remaining_tasks)
+    TOTAL_TASKS=$(count_total_tasks)
+}
+
+# Everything the prompt builder needs about a task in one PRP read
+# Sets: TASK_TITLE, TASK_DESCRIPTION, TASK_CONTEXT, TASK_ACCEPTANCE,
+#       TASK_TEST_CMD, TASK_FEATURE, TASK_FILES, TASK_LIBRARIES, TASK_HINTS
+load_task_env() {
+    local task_id="$1"
+    if use_prp_engine; then
+        local env
+        env=$(prp_engine task-env "$task_id") || return 1
+        eval "$env"
+        return 0
+    fi
+    TASK_TITLE=$(get_task_field "$task_id" "title")
+    TASK_DESCRIPTION=$(get_task_field "$task_id" "description")
+    TASK_CONTEXT=$(get_task_context "$task_id")
+    TASK_ACCEPTANCE=$(get_acceptance_criteria "$task_id")
+    TASK_TEST_CMD=$(get_test_command "$task_id")
+    TASK_FEATURE=$(get_feature_for_task "$task_id")
+    TASK_FILES=$(jq -r --arg id "$task_id" '.features[].tasks[] | select(.id == $id) | .context.files // [] | join(" ")' "$PRP_FILE" 2>/dev/null || echo "")
+    TASK_LIBRARIES=$(jq -r --arg id "$task_id" '.features[].tasks[] | select(.id == $id) | .context.libraries // [] | join(" ")' "$PRP_FILE" 2>/dev/null || echo "")
+    TASK_HINTS=$(jq -r --arg id "$task_id" '.features[].tasks[] | select(.id == $id) | .context.hints // [] | join(" ")' "$PRP_FILE" 2>/dev/null || echo "")
+}
+
 # ============================================================================
 # Dependency Helper Functions
 # ============================================================================
@@ -238,6 +419,11 @@ get_dependency_mode() {
 
 check_dependencies_met() {
     local task_id="$1"
+    if use_prp_engine; then
+        prp_engine deps-met "$task_id"
+        return
+    fi
+
     local mode=$(get_dependency_mode "$task_id")
     local dependencies=$(get_task_dependencies "$task_id")
 
@@ -276,6 +462,11 @@ check_dependencies_met() {
 
 get_blocked_dependencies() {
     local task_id="$1"
+    if use_prp_engine; then
+        prp_engine blocked "$task_id"
+        return
+    fi
+
     local dependencies=$(get_task_dependencies "$task_id")
 
     # If no dependencies, return empty
@@ -310,6 +501,11 @@ get_blocked_dependencies() {
 # ============================================================================
 
 check_prp_complete() {
+    if use_prp_engine; then
+        prp_engine complete
+        return
+    fi
+
     local total_tasks=$(jq '[.features[].tasks[]] | length' "$PRP_FILE")
     local completed_tasks=$(jq '[.features[].tasks[] | select(.passes == true)] | length' "$PRP_FILE")
 
@@ -371,11 +567,55 @@ detect_circular_dependency() {
     return 0
 }
 
+# Report the PRP engine's dependency check: duplicate ids, unknown ids,
+# invalid dependencyMode and every cycle, from one O(V+E) pass over the graph
+validate_dependencies_engine() {
+    local prp_file="$1"
+    local problems status=0
+
+    problems=$(python3 "$PRP_ENGINE" --prp "$prp_file" validate) || status=$?
+    if [ $status -gt 1 ]; then
+        log_error "Could not read $prp_file"
+        return 1
+    fi
+
+    local kind task_id detail
+    while IFS='|' read -r kind task_id detail; do
+        case "$kind" in
+            duplicate)
+                log_error "Duplicate task ID '$task_id' (dependencies on it are ambiguous)"
+                ;;
+            missing)
+                log_error "Task $task_id: Invalid dependency reference '$detail' (task does not exist)"
+                ;;
+            mode)
+                log_error "Task $task_id: Invalid dependencyMode '$detail' (must be 'all' or 'any')"
+                ;;
+            cycle)
+                log_error "Circular dependency detected!"
+                log_error "Cycle path: $task_id"
+                ;;
+        esac
+    done <<< "$problems"
+
+    if [ $status -ne 0 ]; then
+        return 1
+    fi
+
+    log_success "All task dependencies are valid"
+    return 0
+}
+
 validate_dependencies() {
     local prp_file="${1:-$PRP_FILE}"
 
     log_info "Validating task dependencies..."
 
+    if use_prp_engine; then
+        validate_dependencies_engine "$prp_file"
+        return
+    fi
+
     # Get all task IDs for existence checking
     local all_task_ids=$(jq -r '.features[].tasks[].id' "$prp_file")
     local has_errors=0
@@ -449,28 +689,9 @@ validate_dependencies() {
 
 # Detect task domain based on context hints (files, libraries, description)
 detect_task_domain() {
-    local task_id="$1"
-
-    # Get files and libraries from task context
-    local files=$(jq -r --arg id "$task_id" '
-        .features[].tasks[] | select(.id == $id) |
-        .context.files // [] | join(" ")
-    ' "$PRP_FILE" 2>/dev/null || echo "")
-
-    local libraries=$(jq -r --arg id "$task_id" '
-        .features[].tasks[] | select(.id == $id) |
-        .context.libraries // [] | join(" ")
-    ' "$PRP_FILE" 2>/dev/null || echo "")
-
-    local description=$(get_task_field "$task_id" "description")
-
-    local hints=$(jq -r --arg id "$task_id" '
-        .features[].tasks[] | select(.id == $id) |
-        .context.hints // [] | join(" ")
-    ' "$PRP_FILE" 2>/dev/null || echo "")
-
+    # Uses the TASK_* fields set by load_task_env
     # Combine all context for domain detection
-    local combined="$files $libraries $description $hints"
+    local combined="$TASK_FILES $TASK_LIBRARIES $TASK_DESCRIPTION $TASK_HINTS"
 
     # Frontend detection
     if echo "$combined" | grep -qiE "(react|component|tsx|jsx|css|ui|frontend|tailwind|styled|vue|angular|svelte)"; then
@@ -508,12 +729,9 @@ detect_task_domain() {
 
 # Detect task type based on title and description
 detect_task_type() {
-    local task_id="$1"
-    local title=$(get_task_field "$task_id" "title")
-    local description=$(get_task_field "$task_id" "description")
-
+    # Uses the TASK_* fields set by load_task_env
     # Combine for analysis
-    local combined="$title $description"
+    local combined="$TASK_TITLE $TASK_DESCRIPTION"
 
     # Bug fix detection
     if echo "$combined" | grep -qiE "(fix|bug|issue|error|crash|broken|resolve)"; then
@@ -531,69 +749,91 @@ detect_task_type() {
     echo "feature"
 }
 
-build_task_prompt() {
-    local task_id="$1"
-    local iteration="$2"
-    local previous_error="${3:-}"  # Error from previous iteration
-    local title=$(get_task_field "$task_id" "title")
-    local description=$(get_task_field "$task_id" "description")
-    local context=$(get_task_context "$task_id")
-    local acceptance=$(get_acceptance_criteria "$task_id")
-    local test_cmd=$(get_test_command "$task_id")
+# The prompt runs from its most stable part to its most volatile one, so
+# consecutive sessions share the longest possible byte-identical prefix and
+# the provider can serve it from its prompt cache:
+#   1. static prefix   base template + session instructions (every task)
+#   2. guidance        domain and task-type templates (tasks of that kind)
+#   3. task            the task's prp.json fields (every iteration of it)
+#   4. iteration       iteration number, previous error, recent progress
+# Nothing before the iteration section may depend on the iteration; it starts
+# with PROMPT_ITERATION_HEADING, which marks where the cacheable prefix ends.
+PROMPT_ITERATION_HEADING="# Iteration "
+PROMPT_SECTION_BREAK=$'\n\n---\n\n'
+
+prompt_static_prefix() {
+    local prp_base="$SCRIPT_DIR/templates/prp/base.md"
+    if [ -f "$prp_base" ]; then
+        cat "$prp_base"
+    elif [ -f "$PROMPT_FILE" ]; then
+        # Legacy single-file prompt when the PRP templates are not installed
+        cat "$PROMPT_FILE"
+    fi
+    printf '%s' "$PROMPT_SECTION_BREAK"
+    cat <<'EOF'
+## How Each Session Works
 
-    # ================================================================
-    # NEW: Smart template selection based on domain and task type
-    # ================================================================
-    local domain=$(detect_task_domain "$task_id")
-    local task_type=$(detect_task_type "$task_id")
+You are one session of an autonomous loop. The task to implement is described
+below, followed by the state of this iteration: what failed before (if
+anything) and the recent progress log.
 
-    # Build PRP template paths
-    local prp_base="$SCRIPT_DIR/templates/prp/base.md"
-    local prp_domain="$SCRIPT_DIR/templates/prp/domains/${domain}.md"
-    local prp_task_type="$SCRIPT_DIR/templates/prp/task-types/${task_type}.md"
+1. Read the previous progress at the end of this prompt to understand what has been tried before
+2. Implement the task following the context hints and domain-specific guidelines
+3. Run the task's test command
+4. If tests pass, commit with the commit message given in the task
+5. If tests fail, document what you tried and the errors
 
-    # Assemble PRP layers
-    local prp_template=""
+**IMPORTANT:**
+- If previous attempts failed, try a DIFFERENT approach.
+- Focus on completing ALL acceptance criteria.
+- Follow domain-specific best practices and patterns.
 
-    # Layer 1: Base (System + Interaction + Response)
-    if [ -f "$prp_base" ]; then
-        prp_template+=$(cat "$prp_base")
-        prp_template+=$'\n\n---\n\n'
-    fi
+## Available Skills
+- **prp**: For planning new features - generates spec document + prp.json.
 
-    # Layer 2: Domain-specific context
-    if [ -f "$prp_domain" ]; then
-        prp_template+=$(cat "$prp_domain")
-        prp_template+=$'\n\n---\n\n'
-    fi
+Refer to guidelines in default.md for implementation and debugging best practices.
+EOF
+}
 
-    # Layer 3: Task type context
-    if [ -f "$prp_task_type" ]; then
-        prp_template+=$(cat "$prp_task_type")
-        prp_template+=$'\n\n---\n\n'
-    fi
+# Usage: prompt_guidance <domain> <task_type>
+prompt_guidance() {
+    local layer
+    for layer in "$SCRIPT_DIR/templates/prp/domains/$1.md" "$SCRIPT_DIR/templates/prp/task-types/$2.md"; do
+        if [ -f "$layer" ]; then
+            printf '%s' "$PROMPT_SECTION_BREAK"
+            cat "$layer"
+        fi
+    done
+}
 
-    # Fallback to legacy prompt.md if PRP templates don't exist
-    if [ -z "$prp_template" ] && [ -f "$PROMPT_FILE" ]; then
-        prp_template=$(cat "$PROMPT_FILE")
-        prp_template+=$'\n\n---\n\n'
-    fi
+build_task_prompt() {
+    local task_id="$1"
+    local iteration="$2"
+    local previous_error="${3:-}"  # Error from previous iteration
+    load_task_env "$task_id"
+    local title="$TASK_TITLE"
+    local description="$TASK_DESCRIPTION"
+    local context="$TASK_CONTEXT"
+    local acceptance="$TASK_ACCEPTANCE"
+    local test_cmd="$TASK_TEST_CMD"
+
+    # Smart template selection based on domain and task type
+    local domain=$(detect_task_domain)
+    local task_type=$(detect_task_type)
 
     # ================================================================
-    # Task-specific context (from prp.json)
+    # Sections 1-3: the same for every iteration of this task
     # ================================================================
-    local task_context="# Current Task: $title
+    prompt_static_prefix
+    prompt_guidance "$domain" "$task_type"
+    printf '%s' "$PROMPT_SECTION_BREAK"
+    cat <<EOF
+# Current Task: $title
 
 **Task ID:** $task_id
-**Iteration:** $iteration of $MAX_ITERATIONS
 **Domain:** $domain
 **Type:** $task_type
 
-## Available Skills
-- **prp**: For planning new features - generates spec document + prp.json.
-
-Refer to guidelines in default.md for implementation and debugging best practices.
-
 ## Description
 $description
 
@@ -604,10 +844,14 @@ $context
 $acceptance
 
 ## Test Command
-\`$test_cmd\`"
+\`$test_cmd\`
+
+## Commit Message
+\`feat: $title [task-$task_id]\`
+EOF
 
     # ================================================================
-    # Historical context (progress.txt + errors)
+    # Section 4: this iteration (previous error, progress.txt)
     # ================================================================
     local progress_context=""
     if [ -f "$PROGRESS_FILE" ] && [ -s "$PROGRESS_FILE" ]; then
@@ -617,8 +861,6 @@ $acceptance
     local error_section=""
     if [ -n "$previous_error" ]; then
         error_section="
----
-
 ## ⚠️ PREVIOUS ITERATION FAILED
 
 The last attempt failed with this error:
@@ -632,37 +874,75 @@ Analyze the error above and fix the root cause, don't just retry the same thing.
 "
     fi
 
-    # ================================================================
-    # Assemble final prompt
-    # ================================================================
+    printf '%s' "$PROMPT_SECTION_BREAK"
     cat <<EOF
-$prp_template
-$task_context
+${PROMPT_ITERATION_HEADING}$iteration of $MAX_ITERATIONS
 $error_section
----
-
 ## Previous Progress & Learnings
 $progress_context
 
 ---
 
-## Instructions
-
-1. Read the previous progress above to understand what has been tried before
-2. Implement the task following the context hints and domain-specific guidelines
-3. Run the test command: \`$test_cmd\`
-4. If tests pass, commit with: "feat: $title [task-$task_id]"
-5. If tests fail, document what you tried and the errors
-
-**IMPORTANT:**
-- This is iteration $iteration. If previous attempts failed, try a DIFFERENT approach.
-- Focus on completing ALL acceptance criteria.
-- Follow domain-specific best practices and patterns.
+This is iteration $iteration. If previous attempts failed, try a DIFFERENT approach.
+Run \`$test_cmd\` before you finish.
 
 Start implementing now.
 EOF
 }
 
+# Identifies the cacheable part of a prompt (everything before the iteration
+# section) in the metrics: cksum checksum and size in bytes
+# Usage: prompt_prefix_id <prompt>
+prompt_prefix_id() {
+    local prefix="${1%%"${PROMPT_SECTION_BREAK}${PROMPT_ITERATION_HEADING}"*}"
+    printf '%s' "$prefix" | cksum | awk '{print $1 "," $2}'
+}
+
+# ============================================================================
+# Checkpoints - snapshot before each iteration, targeted rollback after it
+# ============================================================================
+
+# Snapshot the working tree and start the edit journal the PostToolUse hook
+# (track-edits.py) appends to. Without a snapshot, rollbacks reset the tree.
+create_checkpoint_snapshot() {
+    unset SACI_EDIT_JOURNAL
+    if [ "$ROLLBACK" != "targeted" ] || ! command -v python3 &>/dev/null || [ ! -f "$CHECKPOINT_PY" ]; then
+        return
+    fi
+    local journal
+    if journal=$(python3 "$CHECKPOINT_PY" create 2>/dev/null); then
+        export SACI_EDIT_JOURNAL="$journal"
+    fi
+}
+
+# Undo a failed iteration: restore only the paths that differ from the
+# snapshot (ignored caches survive), verified by checkpoint.py; anything it
+# can't restore falls back to resetting the whole tree
+# Usage: rollback_to_checkpoint <commit>
+rollback_to_checkpoint() {
+    local checkpoint="$1"
+    local phase_start summary
+    phase_start=$(now_ms)
+
+    if [ -n "${SACI_EDIT_JOURNAL:-}" ] && summary=$(python3 "$CHECKPOINT_PY" restore 2>/dev/null); then
+        log_info "Restored from snapshot: $summary"
+        trace_span phase rollback "$phase_start" targeted
+        return 0
+    fi
+
+    git reset --hard "$checkpoint" 2>/dev/null || true
+    git clean -fd -e prp.json -e progress.txt 2>/dev/null || true
+    trace_span phase rollback "$phase_start" full
+}
+
+# Stop the speculative test worker the session's edits started, so no test
+# run overlaps the post-session tests or a rollback
+stop_test_worker() {
+    if [ "$SPECULATIVE_TESTS" = "true" ] && command -v python3 &>/dev/null; then
+        python3 "$SACI_HOOKS_DIR/test_worker.py" stop 2>/dev/null || true
+    fi
+}
+
 # ============================================================================
 # Core Loop - NEW SESSION per iteration (Real Ralph Loop)
 # Enhanced with: error capture, git rollback, smarter retries
@@ -671,22 +951,31 @@ EOF
 # Global to store last error for next iteration
 LAST_ERROR=""
 LAST_APPROACH=""
+PROMPT_PREFIX_ID=""  # "checksum,bytes" of the current prompt's cacheable prefix
 
 # ============================================================================
 # Token Tracking and Metrics Functions
 # ============================================================================
 
+# Streaming parser: reads the CLI output once for usage, cost, model and turns
+SESSION_OUTPUT_PY="$SCRIPT_DIR/lib/session_output.py"
+
 # Extract tokens and cost from CLI output (JSON format)
-# Returns: input_tokens,output_tokens,cache_read_tokens,cache_creation_tokens,total_tokens,model,cost_usd
+# Returns: input_tokens,output_tokens,cache_read_tokens,cache_creation_tokens,total_tokens,model,cost_usd,turns,turn_tokens
+# (turn_tokens is a JSON array of tokens per assistant turn, always the last field)
 extract_tokens_from_output() {
     local output_file="$1"
 
     # Check if file exists and is not empty
     if [ ! -f "$output_file" ] || [ ! -s "$output_file" ]; then
-        echo "0,0,0,0,0,unknown,0.000000"
+        echo "0,0,0,0,0,unknown,0.000000,0,[]"
         return
     fi
 
+    if command -v python3 >/dev/null 2>&1 && [ -f "$SESSION_OUTPUT_PY" ]; then
+        python3 "$SESSION_OUTPUT_PY" "$output_file" 2>/dev/null && return
+    fi
+
     # Claude CLI with --output-format json outputs a JSON array
     # Find the result object (object with type:"result")
     local input_tokens=$(jq -r '.[] | select(.type == "result") | .usage.input_tokens // 0' "$output_file" 2>/dev/null || echo "0")
@@ -703,7 +992,7 @@ extract_tokens_from_output() {
     # Extract cost (Claude CLI calculates this for us, includes cache costs)
     local cost_usd=$(jq -r '.[] | select(.type == "result") | .total_cost_usd // 0' "$output_file" 2>/dev/null || echo "0")
 
-    echo "$input_tokens,$output_tokens,$cache_read,$cache_creation,$total_tokens,$model,$cost_usd"
+    echo "$input_tokens,$output_tokens,$cache_read,$cache_creation,$total_tokens,$model,$cost_usd,0,[]"
 }
 
 # Calculate cost in USD based on Claude pricing (as of 2026-01-16)
@@ -742,7 +1031,7 @@ calculate_cost() {
     echo "scale=6; $input_cost + $output_cost" | bc
 }
 
-# Log metrics to .saci/metrics.jsonl
+# Log metrics to $METRICS_FILE (.saci/metrics.jsonl)
 log_metrics() {
     local task_id="$1"
     local iteration="$2"
@@ -756,16 +1045,80 @@ log_metrics() {
     local duration_ms="${10}"
     local error_type="${11:-}"  # ENVIRONMENT, CODE, TIMEOUT, UNKNOWN, or empty
     local cost_usd="${12}"      # Cost from CLI (already calculated)
+    local turns="${13:-0}"      # Assistant turns in the session
+    local turn_tokens="${14:-[]}"  # JSON array: tokens per turn
 
     local timestamp=$(date -Iseconds)
 
+    # Share of the prompt's input tokens served from the provider's prompt cache
+    local cache_hit_ratio
+    cache_hit_ratio=$(awk -v read="$cache_read" -v created="$cache_creation" -v fresh="$input_tokens" \
+        'BEGIN { total = read + created + fresh; printf "%.4f", (total > 0 ? read / total : 0) }')
+
+    # Checksum/size of the prompt's cacheable prefix (see prompt_prefix_id)
+    local prefix_sum prefix_bytes
+    IFS=',' read -r prefix_sum prefix_bytes <<< "${PROMPT_PREFIX_ID:-,0}"
+
     # Ensure .saci directory exists
-    mkdir -p .saci
+    mkdir -p "$(dirname "$METRICS_FILE")"
 
     # Append to metrics.jsonl (one line per iteration)
-    cat >> .saci/metrics.jsonl <<EOF
-{"timestamp":"$timestamp","task_id":"$task_id","iteration":$iteration,"input_tokens":$input_tokens,"output_tokens":$output_tokens,"cache_read_tokens":$cache_read,"cache_creation_tokens":$cache_creation,"total_tokens":$total_tokens,"model":"$model","result":"$result","duration_ms":$duration_ms,"error_type":"$error_type","cost_usd":$cost_usd}
+    state_lock
+    cat >> "$METRICS_FILE" <<EOF
+{"timestamp":"$timestamp","task_id":"$task_id","iteration":$iteration,"input_tokens":$input_tokens,"output_tokens":$output_tokens,"cache_read_tokens":$cache_read,"cache_creation_tokens":$cache_creation,"total_tokens":$total_tokens,"model":"$model","result":"$result","duration_ms":$duration_ms,"error_type":"$error_type","cost_usd":$cost_usd,"turns":$turns,"turn_tokens":$turn_tokens,"cache_hit_ratio":$cache_hit_ratio,"prompt_prefix":"$prefix_sum","prompt_prefix_bytes":${prefix_bytes:-0}}
 EOF
+    state_unlock
+}
+
+# Compact summary of failing test output for the next prompt: failing tests,
+# first assertion, error type, top frames (the last 50 lines without python3)
+# Usage: failure_digest <output_file>
+failure_digest() {
+    local output_file="$1"
+    local digest
+    if command -v python3 >/dev/null 2>&1 && [ -f "$FAILURE_DIGEST" ] &&
+        digest=$(python3 "$FAILURE_DIGEST" "$output_file" --tokens "$FAILURE_DIGEST_TOKENS" 2>/dev/null); then
+        echo "$digest"
+        return
+    fi
+    tail -50 "$output_file"
+}
+
+# Run a task's test command, reusing the cached verdict when the working tree,
+# command and package.json are unchanged since the last run (e.g. the Stop hook
+# already ran the same tests at the end of the session).
+# Usage: run_test_command <test_cmd> <output_file>
+# Output is shown and written to output_file; returns the tests' exit status
+run_test_command() {
+    local test_cmd="$1"
+    local output_file="$2"
+    local cache="$SACI_HOOKS_DIR/test_cache.py"
+    local lookup="" key=""
+    local start
+    start=$(now_ms)
+
+    if [ "$TEST_CACHE" = "true" ] && [ -f "$cache" ]; then
+        lookup=$(python3 "$cache" lookup "$test_cmd" --output "$output_file" 2>/dev/null || echo "")
+        case "$lookup" in
+            pass|fail)
+                log_info "Working tree unchanged since last test run - reusing result ($lookup)"
+                cat "$output_file"
+                trace_span test loop "$start" cached
+                [ "$lookup" = "pass" ]
+                return
+                ;;
+            miss\ *) key="${lookup#miss }" ;;
+        esac
+    fi
+
+    local status=0
+    eval "$test_cmd" 2>&1 | tee "$output_file" || status=$?
+    trace_span test loop "$start" "$([ $status -eq 0 ] && echo pass || echo fail)"
+
+    if [ -n "$key" ]; then
+        python3 "$cache" record "$test_cmd" "$status" --key "$key" --output "$output_file" 2>/dev/null || true
+    fi
+    return $status
 }
 
 run_single_iteration() {
@@ -785,15 +1138,28 @@ run_single_iteration() {
     # GIT CHECKPOINT - Save state before making changes
     # ========================================================================
     local git_checkpoint=""
-    if command -v git &>/dev/null && [ -d ".git" ]; then
+    # .git is a file inside a worktree (--jobs N), a directory otherwise
+    if command -v git &>/dev/null && [ -e ".git" ]; then
         git_checkpoint=$(git rev-parse HEAD 2>/dev/null || echo "")
+        # The Stop hook diffs against this to run only the affected tests
+        export SACI_CHECKPOINT="$git_checkpoint"
+        export SACI_TEST_SELECTION="$TEST_SELECTION"
+        export SACI_SPECULATIVE_TESTS="$SPECULATIVE_TESTS"
         if [ -n "$git_checkpoint" ]; then
             log_info "Git checkpoint: ${git_checkpoint:0:7}"
+            create_checkpoint_snapshot
         fi
     fi
     
     # Build the prompt for this iteration (with error context if available)
+    local phase_start
+    phase_start=$(now_ms)
     local prompt=$(build_task_prompt "$task_id" "$iteration" "$previous_error")
+    PROMPT_PREFIX_ID=$(prompt_prefix_id "$prompt")
+    trace_span phase prompt "$phase_start"
+
+    # The session reads prp.json itself
+    compact_prp_journal
     
     if [ "$DRY_RUN" = "true" ]; then
         log_warning "DRY RUN - Would spawn NEW Claude Code session with prompt:"
@@ -833,10 +1199,17 @@ run_single_iteration() {
         amp)
             cli_cmd="amp --print --dangerously-skip-permissions"
             ;;
+        stub)
+            # Replays canned sessions offline (see lib/stub_cli.py)
+            cli_cmd="python3 $STUB_CLI"
+            ;;
     esac
     
     # Run CLI with the prompt - this starts a NEW session
+    phase_start=$(now_ms)
     if cat "$prompt_file" | $cli_cmd 2>&1 | tee "$cli_output_file"; then
+        trace_span phase cli "$phase_start"
+        stop_test_worker
         rm -f "$prompt_file"
 
         # ================================================================
@@ -846,7 +1219,7 @@ run_single_iteration() {
         local duration_ms=$((end_time - start_time))
 
         # Parse tokens and cost from CLI output (includes cache tokens)
-        IFS=',' read -r input_tokens output_tokens cache_read cache_creation total_tokens model cost_usd <<< "$(extract_tokens_from_output "$cli_output_file")"
+        IFS=',' read -r input_tokens output_tokens cache_read cache_creation total_tokens model cost_usd turns turn_tokens <<< "$(extract_tokens_from_output "$cli_output_file")"
 
         # Fallback to calculate_cost if cost not available from CLI
         if [ "$cost_usd" = "0" ] || [ "$cost_usd" = "0.000000" ]; then
@@ -856,7 +1229,7 @@ run_single_iteration() {
         # Log token info with cache breakdown
         if [ "$total_tokens" != "0" ]; then
             if [ "$cache_read" != "0" ] || [ "$cache_creation" != "0" ]; then
-                log_info "Tokens: $total_tokens ($input_tokens new, $cache_read cached, $output_tokens out) - \$$cost_usd USD"
+                log_info "Tokens: $total_tokens ($input_tokens new, $cache_read cached, $cache_creation cache writes, $output_tokens out) - \$$cost_usd USD"
             else
                 log_info "Tokens: $total_tokens ($input_tokens in, $output_tokens out) - \$$cost_usd USD"
             fi
@@ -865,16 +1238,17 @@ run_single_iteration() {
         # ================================================================
         # CHECK IF ANY FILES WERE ACTUALLY MODIFIED
         # ================================================================
-        local changed_files=$(git status --porcelain 2>/dev/null | wc -l | tr -d ' ')
+        local changed_files=$(git status --porcelain ${WORKER_PATHSPEC[@]+"${WORKER_PATHSPEC[@]}"} 2>/dev/null | wc -l | tr -d ' ')
         if [ "$changed_files" -eq 0 ]; then
             # Check if task was already marked as complete (AI may have updated prp.json)
-            local task_status=$(jq -r --arg id "$task_id" '.features[].tasks[] | select(.id == $id) | .passes' "$PRP_FILE")
+            local task_status=$(get_task_field "$task_id" "passes")
             if [ "$task_status" = "true" ]; then
                 log_success "Task already marked as complete - skipping to next"
 
                 # Log metrics for this (already complete) iteration
                 log_metrics "$task_id" "$iteration" "$input_tokens" "$output_tokens" \
-                    "$total_tokens" "$model" "success" "$duration_ms" ""
+                    "$cache_read" "$cache_creation" "$total_tokens" "$model" "success" "$duration_ms" "" "$cost_usd" \
+                    "$turns" "$turn_tokens"
 
                 rm -f "$cli_output_file"
                 return 0
@@ -885,7 +1259,8 @@ run_single_iteration() {
 
             # Log metrics for failed iteration (CODE error - didn't implement)
             log_metrics "$task_id" "$iteration" "$input_tokens" "$output_tokens" \
-                "$cache_read" "$cache_creation" "$total_tokens" "$model" "failed" "$duration_ms" "CODE" "$cost_usd"
+                "$cache_read" "$cache_creation" "$total_tokens" "$model" "failed" "$duration_ms" "CODE" "$cost_usd" \
+                "$turns" "$turn_tokens"
 
             rm -f "$cli_output_file"
             return 1
@@ -896,31 +1271,37 @@ run_single_iteration() {
         log_info "Running tests: $test_cmd"
         local test_output_file=$(mktemp)
         
-        if eval "$test_cmd" 2>&1 | tee "$test_output_file"; then
+        if run_test_command "$test_cmd" "$test_output_file"; then
             # Tests passed!
             log_success "Tests passed!"
             rm -f "$test_output_file" "$cli_output_file"
 
             # Log metrics for successful iteration
             log_metrics "$task_id" "$iteration" "$input_tokens" "$output_tokens" \
-                "$cache_read" "$cache_creation" "$total_tokens" "$model" "success" "$duration_ms" "" "$cost_usd"
+                "$cache_read" "$cache_creation" "$total_tokens" "$model" "success" "$duration_ms" "" "$cost_usd" \
+                "$turns" "$turn_tokens"
 
             # Commit changes
-            git add -A 2>/dev/null || true
+            phase_start=$(now_ms)
+            git add -A ${WORKER_PATHSPEC[@]+"${WORKER_PATHSPEC[@]}"} 2>/dev/null || true
             git commit -m "$(cat <<EOF
 feat: $title [task-$task_id]
 
 Co-Authored-By: Saci <noreply@saci.sh>
 EOF
 )" 2>/dev/null || true
+            trace_span phase commit "$phase_start"
 
-            # Mark task complete
-            mark_task_complete "$task_id"
+            # Mark task complete (a parallel worker leaves this to the
+            # scheduler, which marks the task once its branch is merged)
+            if [ "$PARALLEL_WORKER" != "true" ]; then
+                mark_task_complete "$task_id"
 
-            # Check if all tasks are now complete
-            if check_prp_complete; then
-                log_success "🎉 All tasks in PRP complete!"
-                log_info "Create new PRP for next feature or reset this one"
+                # Check if all tasks are now complete
+                if check_prp_complete; then
+                    log_success "🎉 All tasks in PRP complete!"
+                    log_info "Create new PRP for next feature or reset this one"
+                fi
             fi
 
             # Clear error state
@@ -938,14 +1319,15 @@ EOF
             # ================================================================
             # TESTS FAILED - Capture specific error for next iteration
             # ================================================================
-            local test_output=$(cat "$test_output_file" | tail -50)
+            local test_output=$(failure_digest "$test_output_file")
             rm -f "$test_output_file"
 
             log_warning "Tests failed on iteration $iteration"
 
             # Log metrics for failed iteration
             log_metrics "$task_id" "$iteration" "$input_tokens" "$output_tokens" \
-                "$cache_read" "$cache_creation" "$total_tokens" "$model" "failed" "$duration_ms" "CODE" "$cost_usd"
+                "$cache_read" "$cache_creation" "$total_tokens" "$model" "failed" "$duration_ms" "CODE" "$cost_usd" \
+                "$turns" "$turn_tokens"
 
             # Store error for next iteration
             LAST_ERROR="$test_output"
@@ -955,8 +1337,7 @@ EOF
             # ================================================================
             if [ -n "$git_checkpoint" ]; then
                 log_info "Rolling back to checkpoint ${git_checkpoint:0:7}..."
-                git reset --hard "$git_checkpoint" 2>/dev/null || true
-                git clean -fd -e prp.json -e progress.txt 2>/dev/null || true
+                rollback_to_checkpoint "$git_checkpoint"
                 log_success "Rollback complete"
             fi
 
@@ -974,6 +1355,8 @@ $test_output
             return 1
         fi
     else
+        trace_span phase cli "$phase_start" failed
+        stop_test_worker
         rm -f "$prompt_file"
         log_error "$CLI_PROVIDER session failed"
 
@@ -982,7 +1365,7 @@ $test_output
         local duration_ms=$((end_time - start_time))
 
         # Try to extract tokens and cost (may be partial or unavailable)
-        IFS=',' read -r input_tokens output_tokens cache_read cache_creation total_tokens model cost_usd <<< "$(extract_tokens_from_output "$cli_output_file")"
+        IFS=',' read -r input_tokens output_tokens cache_read cache_creation total_tokens model cost_usd turns turn_tokens <<< "$(extract_tokens_from_output "$cli_output_file")"
 
         # Fallback to calculate_cost if cost not available from CLI
         if [ "$cost_usd" = "0" ] || [ "$cost_usd" = "0.000000" ]; then
@@ -994,7 +1377,7 @@ $test_output
         # ================================================================
         # CHECK IF USEFUL WORK WAS DONE BEFORE FAILURE
         # ================================================================
-        local changed_files=$(git status --porcelain 2>/dev/null | wc -l | tr -d ' ')
+        local changed_files=$(git status --porcelain ${WORKER_PATHSPEC[@]+"${WORKER_PATHSPEC[@]}"} 2>/dev/null | wc -l | tr -d ' ')
 
         if [ "$changed_files" -gt 0 ]; then
             # Files were modified before the session failed
@@ -1005,7 +1388,8 @@ $test_output
 
             # Log metrics for failed session (ENVIRONMENT error type since it's likely API/network)
             log_metrics "$task_id" "$iteration" "$input_tokens" "$output_tokens" \
-                "$cache_read" "$cache_creation" "$total_tokens" "$model" "failed" "$duration_ms" "ENVIRONMENT" "$cost_usd"
+                "$cache_read" "$cache_creation" "$total_tokens" "$model" "failed" "$duration_ms" "ENVIRONMENT" "$cost_usd" \
+                "$turns" "$turn_tokens"
 
             log_progress "$task_id" "⚠️ SESSION FAILED (CHANGES PRESERVED)" "
 **Iteration:** $iteration
@@ -1018,14 +1402,14 @@ $test_output
             log_warning "Session failed with no changes made - rolling back to clean state"
             if [ -n "$git_checkpoint" ]; then
                 log_info "Rolling back to checkpoint ${git_checkpoint:0:7}..."
-                git reset --hard "$git_checkpoint" 2>/dev/null || true
-                git clean -fd -e prp.json -e progress.txt 2>/dev/null || true
+                rollback_to_checkpoint "$git_checkpoint"
             fi
             LAST_ERROR="Claude Code session failed with no changes. This may indicate a prompt issue or API problem."
 
             # Log metrics for failed session
             log_metrics "$task_id" "$iteration" "$input_tokens" "$output_tokens" \
-                "$cache_read" "$cache_creation" "$total_tokens" "$model" "failed" "$duration_ms" "ENVIRONMENT" "$cost_usd"
+                "$cache_read" "$cache_creation" "$total_tokens" "$model" "failed" "$duration_ms" "ENVIRONMENT" "$cost_usd" \
+                "$turns" "$turn_tokens"
 
             log_progress "$task_id" "❌ SESSION FAILED (ROLLED BACK)" "
 **Iteration:** $iteration
@@ -1053,11 +1437,20 @@ execute_task_with_retries() {
         log_info ""
         log_iteration "━━━ Iteration $iteration of $MAX_ITERATIONS ━━━"
         
+        # Spans recorded until the iteration ends (hooks included) belong to it
+        export SACI_TASK_ID="$task_id" SACI_ITERATION="$iteration"
+        local iteration_start
+        iteration_start=$(now_ms)
+
         # Pass LAST_ERROR to the iteration
         if run_single_iteration "$task_id" "$iteration" "$LAST_ERROR"; then
+            trace_span phase iteration "$iteration_start" success
+            unset SACI_TASK_ID SACI_ITERATION
             log_success "Task $task_id completed on iteration $iteration!"
             return 0
         fi
+        trace_span phase iteration "$iteration_start" failed
+        unset SACI_TASK_ID SACI_ITERATION
         
         iteration=$((iteration + 1))
         
@@ -1076,6 +1469,343 @@ execute_task_with_retries() {
     return 1
 }
 
+# ============================================================================
+# Parallel Execution - ready tasks in isolated git worktrees (--jobs N)
+# ============================================================================
+#
+# Every ready task (pending, dependencies met) gets its own worktree on a
+# saci/task-<id> branch cut from the current HEAD, so its checkpoint and
+# rollback only touch that worktree. Workers write prp.json, progress.txt and
+# the metrics log of the main tree through the state lock. The scheduler
+# merges a successful branch into the main tree and only then marks the task
+# complete, so dependents start from a HEAD that already contains their
+# dependencies: merges happen in dependency order by construction.
+#
+# The main tree's prp.json and progress.txt are uncommitted while tasks run,
+# so a branch that touched them could not be merged. In each worktree they
+# are symlinks to the main tree's files that git does not see: sessions read
+# the current PRP and append to the one progress log, and no branch carries
+# a copy of either.
+
+PARALLEL_WORKER=false   # true inside a worker subshell
+PARALLEL_DIR=""         # worktrees, worker logs and the state lock
+PARALLEL_RUNNING=()     # "pid:task_id" of live workers
+WORKER_PATHSPEC=()      # `git status`/`git add` pathspec of a task's changes in a worker
+PARALLEL_EXCLUDE=""      # info/exclude file the run added /node_modules to (removed on cleanup)
+
+# Absolute path of a (possibly not yet existing) file
+absolute_path() {
+    local path="$1"
+    case "$path" in
+        /*) echo "$path" ;;
+        *) echo "$(pwd)/$path" ;;
+    esac
+}
+
+# Branch/directory-safe form of a task id
+task_slug() {
+    echo "$1" | tr -c 'A-Za-z0-9._\n-' '-'
+}
+
+# Parallel mode needs git with at least one commit to branch from
+can_run_parallel() {
+    command -v git &>/dev/null || return 1
+    git rev-parse --verify -q HEAD >/dev/null 2>&1 || return 1
+    # The scheduler asks the PRP engine for the whole ready set
+    use_prp_engine
+}
+
+# Replace the worktree's copies of the state files with links to the main
+# tree's. Tracked ones are marked skip-worktree, so status, `git add -A`,
+# resets and merges leave them alone; untracked ones are excluded from the
+# worker's status and commits through WORKER_PATHSPEC.
+# Usage: link_state_files <root_dir> <worktree>
+link_state_files() {
+    local root_dir="$1"
+    local worktree="$2"
+    local state_file rel
+
+    WORKER_PATHSPEC=()
+    for state_file in "$PRP_FILE" "$PROGRESS_FILE"; do
+        rel="${state_file#"$root_dir"/}"
+        [ "$rel" != "$state_file" ] || continue
+        mkdir -p "$(dirname "$worktree/$rel")"
+        rm -f "$worktree/$rel"
+        ln -s "$state_file" "$worktree/$rel"
+        if git -C "$worktree" ls-files --error-unmatch -- "$rel" >/dev/null 2>&1; then
+            git -C "$worktree" update-index --skip-worktree -- "$rel"
+        else
+            [ ${#WORKER_PATHSPEC[@]} -gt 0 ] || WORKER_PATHSPEC=(-- ":/")
+            WORKER_PATHSPEC+=(":(exclude,top)$rel")
+        fi
+    done
+}
+
+# Runs inside the worker subshell, in the task's worktree
+run_task_worker() {
+    local task_id="$1"
+    local worktree="$2"
+
+    cd "$worktree" || return 1
+    PARALLEL_WORKER=true
+    LAST_ERROR=""
+    LAST_APPROACH=""
+
+    if [ "$DRY_RUN" = "true" ]; then
+        run_single_iteration "$task_id" "1"
+        return
+    fi
+    execute_task_with_retries "$task_id"
+}
+
+# Create the task's worktree and start its worker in the background
+# Sets: WORKER_PID
+start_task_worker() {
+    local task_id="$1"
+    local root_dir="$2"
+    local slug
+    slug=$(task_slug "$task_id")
+    local branch="saci/task-$slug"
+    local worktree="$PARALLEL_DIR/worktrees/$slug"
+
+    # A branch left by an earlier run would make `worktree add -b` fail
+    git -C "$root_dir" branch -D "$branch" >/dev/null 2>&1 || true
+    if ! git -C "$root_dir" worktree add -q -b "$branch" "$worktree" HEAD >/dev/null 2>&1; then
+        log_error "Could not create a worktree for task $task_id"
+        return 1
+    fi
+
+    # Share installed dependencies instead of reinstalling per worktree
+    if [ -d "$root_dir/node_modules" ] && [ ! -e "$worktree/node_modules" ]; then
+        ln -s "$root_dir/node_modules" "$worktree/node_modules"
+    fi
+    link_state_files "$root_dir" "$worktree"
+
+    ( run_task_worker "$task_id" "$worktree" ) > "$PARALLEL_DIR/$slug.log" 2>&1 &
+    WORKER_PID=$!
+    log_info "▶ Task $task_id started on branch $branch (pid $WORKER_PID)"
+}
+
+# Collect a finished worker: merge its branch and mark the task complete
+finish_task_worker() {
+    local pid="$1"
+    local task_id="$2"
+    local root_dir="$3"
+    local slug
+    slug=$(task_slug "$task_id")
+    local branch="saci/task-$slug"
+    local worktree="$PARALLEL_DIR/worktrees/$slug"
+    local log_file="$PARALLEL_DIR/$slug.log"
+    local status=0
+    local keep_branch=false
+
+    wait "$pid" 2>/dev/null || status=$?
+
+    if [ $status -ne 0 ]; then
+        log_warning "Task $task_id failed - last lines of its log:"
+        tail -20 "$log_file" 2>/dev/null | sed 's/^/    /'
+    elif git -C "$root_dir" merge -q --no-edit "$branch" >/dev/null 2>&1; then
+        if mark_task_complete "$task_id"; then
+            log_success "Task $task_id merged and marked complete"
+        else
+            log_error "Task $task_id merged but $PRP_FILE could not be updated"
+            status=1
+        fi
+    else
+        git -C "$root_dir" merge --abort >/dev/null 2>&1 || true
+        log_error "Task $task_id could not be merged - its work is kept on branch $branch"
+        log_progress "$task_id" "⚠️ MERGE CONFLICT" "
+**Branch:** $branch
+**Action:** Tests passed in the task's worktree, but merging into the main tree failed. Merge the branch manually.
+"
+        keep_branch=true
+        status=1
+    fi
+
+    git -C "$root_dir" worktree remove --force "$worktree" >/dev/null 2>&1 || true
+    if [ "$keep_branch" != "true" ]; then
+        git -C "$root_dir" branch -D "$branch" >/dev/null 2>&1 || true
+    fi
+    rm -f "$log_file"
+    return $status
+}
+
+# Stop live workers and remove their worktrees (EXIT trap)
+cleanup_parallel() {
+    [ -n "$PARALLEL_DIR" ] || return 0
+    local entry
+    for entry in ${PARALLEL_RUNNING[@]+"${PARALLEL_RUNNING[@]}"}; do
+        kill "${entry%%:*}" 2>/dev/null || true
+    done
+    for entry in ${PARALLEL_RUNNING[@]+"${PARALLEL_RUNNING[@]}"}; do
+        wait "${entry%%:*}" 2>/dev/null || true
+    done
+    PARALLEL_RUNNING=()
+    git worktree prune >/dev/null 2>&1 || true
+    local worktree
+    for worktree in "$PARALLEL_DIR"/worktrees/*; do
+        [ -d "$worktree" ] || continue
+        git worktree remove --force "$worktree" >/dev/null 2>&1 || true
+    done
+    rm -rf "$PARALLEL_DIR"
+    PARALLEL_DIR=""
+    STATE_LOCK_DIR=""
+
+    # Leave the repository's exclude file as it was
+    if [ -n "$PARALLEL_EXCLUDE" ]; then
+        local kept
+        kept=$(grep -vx '/node_modules' "$PARALLEL_EXCLUDE" || true)
+        if [ -n "$kept" ]; then
+            printf '%s\n' "$kept" > "$PARALLEL_EXCLUDE"
+        else
+            : > "$PARALLEL_EXCLUDE"
+        fi
+        PARALLEL_EXCLUDE=""
+    fi
+}
+
+# Scheduler: keep up to $JOBS workers busy until no task is ready
+# Updates the caller's completed/failed counters
+run_parallel() {
+    local root_dir
+    root_dir=$(pwd)
+
+    PARALLEL_DIR=$(mktemp -d)
+    mkdir -p "$PARALLEL_DIR/worktrees"
+    STATE_LOCK_DIR="$PARALLEL_DIR/state.lock"
+
+    # Workers run from their worktrees but share the main tree's state files
+    PRP_FILE=$(absolute_path "$PRP_FILE")
+    PROGRESS_FILE=$(absolute_path "$PROGRESS_FILE")
+    METRICS_FILE=$(absolute_path "$METRICS_FILE")
+
+    # Keep the node_modules symlinks out of `git add -A` and `git clean` for
+    # the run (info/exclude is shared by all worktrees)
+    local exclude_file
+    exclude_file=$(absolute_path "$(git rev-parse --git-path info/exclude)")
+    if ! grep -qx '/node_modules' "$exclude_file" 2>/dev/null; then
+        mkdir -p "$(dirname "$exclude_file")"
+        echo "/node_modules" >> "$exclude_file"
+        PARALLEL_EXCLUDE="$exclude_file"
+    fi
+
+    log_info "Running up to $JOBS tasks in parallel (isolated git worktrees)"
+
+    local done_ids=" "
+    local ready_id entry pid task_id
+    local still_running=()
+
+    while true; do
+        # Fill free slots with ready tasks that are not running or done
+        if [ ${#PARALLEL_RUNNING[@]} -lt "$JOBS" ]; then
+            for ready_id in $(prp_engine ready); do
+                [ ${#PARALLEL_RUNNING[@]} -lt "$JOBS" ] || break
+                case "$done_ids" in *" $ready_id "*) continue ;; esac
+                case " ${PARALLEL_RUNNING[*]:-} " in *":$ready_id "*) continue ;; esac
+
+                if start_task_worker "$ready_id" "$root_dir"; then
+                    PARALLEL_RUNNING+=("$WORKER_PID:$ready_id")
+                else
+                    done_ids="$done_ids$ready_id "
+                    failed=$((failed + 1))
+                fi
+            done
+        fi
+
+        [ ${#PARALLEL_RUNNING[@]} -gt 0 ] || break
+        sleep 1
+
+        # Reap the workers that exited
+        still_running=()
+        for entry in "${PARALLEL_RUNNING[@]}"; do
+            pid="${entry%%:*}"
+            task_id="${entry#*:}"
+            if kill -0 "$pid" 2>/dev/null; then
+                still_running+=("$entry")
+                continue
+            fi
+            if finish_task_worker "$pid" "$task_id" "$root_dir"; then
+                completed=$((completed + 1))
+            else
+                failed=$((failed + 1))
+            fi
+            done_ids="$done_ids$task_id "
+        done
+        PARALLEL_RUNNING=(${still_running[@]+"${still_running[@]}"})
+    done
+
+    if check_prp_complete; then
+        log_success "🎉 All tasks in PRP complete!"
+    else
+        load_loop_state
+        if [ "$REMAINING_TASKS" -gt 0 ]; then
+            log_warning "$REMAINING_TASKS task(s) not completed (failed or blocked by a failed dependency)"
+        fi
+    fi
+}
+
+# ============================================================================
+# Hook Server - keeps hook scripts warm for the duration of a run
+# ============================================================================
+
+HOOK_SERVER_PID=""
+HOOK_SERVER_DIR=""
+
+start_hook_server() {
+    [ "$HOOK_SERVER" = "true" ] || return 0
+    command -v python3 >/dev/null 2>&1 || return 0
+    [ -f "$SACI_HOOKS_DIR/hook_server.py" ] || return 0
+
+    # Private directory (mode 700) so only this user can talk to the socket
+    HOOK_SERVER_DIR=$(mktemp -d) || return 0
+    local socket_path="$HOOK_SERVER_DIR/hooks.sock"
+
+    # Import the hooks up front so the first tool call is already warm
+    local preload=()
+    local hook
+    for hook in "$SACI_HOOKS_DIR"/*.py .saci/hooks/*.py "$HOME/.claude/hooks/safety-check.py"; do
+        # Hook entry points are dash-named; underscore modules are helpers
+        case "$hook" in
+            */*_*.py) continue ;;
+        esac
+        [ -f "$hook" ] && preload+=("$hook")
+    done
+
+    python3 "$SACI_HOOKS_DIR/hook_server.py" \
+        --socket "$socket_path" \
+        --parent-pid $$ \
+        --preload "${preload[@]+"${preload[@]}"}" >/dev/null 2>&1 &
+    HOOK_SERVER_PID=$!
+
+    # Wait (up to ~2s) for the socket to appear
+    local attempt
+    for attempt in $(seq 1 20); do
+        [ -S "$socket_path" ] && break
+        sleep 0.1
+    done
+
+    if [ -S "$socket_path" ]; then
+        export SACI_HOOK_SOCKET="$socket_path"
+        log_info "Hook server started (pid $HOOK_SERVER_PID)"
+    else
+        log_warning "Hook server did not start - hooks will run in-process"
+        stop_hook_server
+    fi
+}
+
+stop_hook_server() {
+    if [ -n "$HOOK_SERVER_PID" ]; then
+        kill "$HOOK_SERVER_PID" 2>/dev/null || true
+        wait "$HOOK_SERVER_PID" 2>/dev/null || true
+        HOOK_SERVER_PID=""
+    fi
+    if [ -n "$HOOK_SERVER_DIR" ]; then
+        rm -rf "$HOOK_SERVER_DIR"
+        HOOK_SERVER_DIR=""
+    fi
+    unset SACI_HOOK_SOCKET
+}
+
 # ============================================================================
 # Main Loop
 # ============================================================================
@@ -1089,6 +1819,13 @@ main() {
             --prp) PRP_FILE="$2"; shift 2 ;;
             --max-iter) MAX_ITERATIONS="$2"; shift 2 ;;
             --provider) CLI_PROVIDER="$2"; shift 2 ;;
+            --no-hook-server) HOOK_SERVER=false; shift ;;
+            --no-test-cache) TEST_CACHE=false; shift ;;
+            --full-tests) TEST_SELECTION=full; shift ;;
+            --full-rollback) ROLLBACK=full; shift ;;
+            --speculative-tests) SPECULATIVE_TESTS=true; shift ;;
+            --jobs) JOBS="$2"; shift 2 ;;
+            --no-trace) TRACE=false; shift ;;
             --help) 
                 echo "Usage: saci.sh [OPTIONS]"
                 echo ""
@@ -1097,7 +1834,14 @@ main() {
                 echo "  --tui            Enable visual TUI mode (requires gum)"
                 echo "  --prp FILE       Use specified PRP file (default: prp.json)"
                 echo "  --max-iter N     Max iterations per task (default: 10)"
-                echo "  --provider NAME  CLI provider: claude or amp (default: claude)"
+                echo "  --provider NAME  CLI provider: claude, amp or stub (default: claude)"
+                echo "  --no-hook-server Run hooks in-process instead of the warm hook server"
+                echo "  --no-test-cache  Always re-run tests, even if the working tree is unchanged"
+                echo "  --full-tests     Stop hook runs the full suite instead of affected tests"
+                echo "  --full-rollback  Undo failed iterations with git reset --hard + clean"
+                echo "  --speculative-tests Pre-run the Stop hook's tests in the background after edits"
+                echo "  --jobs N         Run up to N ready tasks in parallel git worktrees (default: 1)"
+                echo "  --no-trace       Do not record timing spans for saci profile"
                 echo "  --help           Show this help"
                 exit 0
                 ;;
@@ -1105,6 +1849,17 @@ main() {
         esac
     done
     
+    if ! [[ "$JOBS" =~ ^[1-9][0-9]*$ ]]; then
+        log_error "--jobs expects a positive number, got: $JOBS"
+        exit 1
+    fi
+
+    # The TUI follows a single current task
+    if [ "$JOBS" -gt 1 ] && [ "$TUI_MODE" = "true" ]; then
+        log_warning "--tui is not supported with --jobs, using standard output"
+        TUI_MODE=false
+    fi
+
     # Initialize TUI if enabled
     if [ "$TUI_MODE" = "true" ]; then
         source "$SCRIPT_DIR/lib/tui.sh"
@@ -1155,8 +1910,9 @@ EOF
     fi
     
     # Show initial status
-    local total=$(count_total_tasks)
-    local remaining=$(count_remaining_tasks)
+    load_loop_state
+    local total="$TOTAL_TASKS"
+    local remaining="$REMAINING_TASKS"
     log_info "Total tasks: $total"
     log_info "Remaining: $remaining"
     log_info "Max iterations per task: $MAX_ITERATIONS"
@@ -1174,13 +1930,39 @@ EOF
         exit 0
     fi
 
+    if [ "$JOBS" -gt 1 ] && ! can_run_parallel; then
+        log_warning "--jobs needs git with at least one commit and python3 - running tasks sequentially"
+        JOBS=1
+    fi
+
+    # Hooks and workers (in other worktrees) append to the same trace
+    if [ "$TRACE" = "true" ] && [ "$DRY_RUN" != "true" ]; then
+        mkdir -p "$(dirname "$TRACE_FILE")"
+        export SACI_TRACE_FILE
+        SACI_TRACE_FILE=$(absolute_path "$TRACE_FILE")
+    fi
+
+    # Keep hooks warm for the whole run (skipped in dry-run, nothing spawns hooks)
+    if [ "$DRY_RUN" != "true" ]; then
+        local server_start
+        server_start=$(now_ms)
+        start_hook_server
+        trace_span phase hook-server "$server_start"
+    fi
+    trap 'cleanup_parallel; stop_hook_server; compact_prp_journal' EXIT
+
     # Main loop - process each task
     local task_id
     local completed=0
     local failed=0
-    
-    while task_id=$(get_next_task) && [ -n "$task_id" ]; do
-        remaining=$(count_remaining_tasks)
+
+    if [ "$JOBS" -gt 1 ]; then
+        run_parallel
+    fi
+
+    while [ "$JOBS" -eq 1 ] && load_loop_state && [ -n "$NEXT_TASK" ]; do
+        task_id="$NEXT_TASK"
+        remaining="$REMAINING_TASKS"
         
         # Render TUI if enabled
         if [ "$TUI_MODE" = "true" ]; then
@@ -1251,6 +2033,12 @@ reset_task_cascade() {
         return 0
     fi
 
+    # The engine resets the whole cascade from one pass over the graph
+    if use_prp_engine; then
+        prp_engine reset "$task_id" --cascade
+        return
+    fi
+
     # Reset this task
     local tmp_file=$(mktemp)
     jq --arg id "$task_id" '
@@ -1305,6 +2093,9 @@ run_reset() {
             done
 
             log_success "Reset $reset_count task(s) in cascade: $task_names"
+        elif use_prp_engine; then
+            prp_engine reset "$task_id" >/dev/null
+            log_success "Reset task $task_id to passes: false"
         else
             # Reset single task (backward compatible)
             local tmp_file=$(mktemp)
@@ -1315,12 +2106,19 @@ run_reset() {
         fi
     else
         # Reset all tasks
-        local tmp_file=$(mktemp)
-        jq '.features |= map(.tasks |= map(.passes = false))' "$prp_file" > "$tmp_file" && mv "$tmp_file" "$prp_file"
+        if use_prp_engine; then
+            prp_engine reset >/dev/null
+        else
+            local tmp_file=$(mktemp)
+            jq '.features |= map(.tasks |= map(.passes = false))' "$prp_file" > "$tmp_file" && mv "$tmp_file" "$prp_file"
+        fi
         local count=$(jq '[.features[].tasks[]] | length' "$prp_file")
         log_success "Reset all $count tasks to passes: false"
     fi
 
+    # Leave prp.json itself up to date
+    compact_prp_journal
+
     # Also clear progress file
     if [ -f "$PROGRESS_FILE" ]; then
         echo "# Progress reset at $(timestamp)" > "$PROGRESS_FILE"
@@ -1334,6 +2132,11 @@ validate_task_structure() {
 
     log_info "Validating task structure and uniqueness..."
 
+    if use_prp_engine; then
+        validate_task_structure_engine "$prp_file"
+        return
+    fi
+
     # Required task fields
     local required_fields=("id" "title" "description" "priority" "passes" "context" "acceptance" "tests")
 
@@ -1409,6 +2212,46 @@ validate_task_structure() {
     fi
 }
 
+# Report the PRP engine's structure check (same rules as above, one parse)
+validate_task_structure_engine() {
+    local prp_file="$1"
+    local problems status=0
+    local duplicates_logged=false
+    local task_count=0
+
+    problems=$(python3 "$PRP_ENGINE" --prp "$prp_file" structure) || status=$?
+    if [ $status -gt 1 ]; then
+        log_error "Could not read $prp_file"
+        return 1
+    fi
+
+    local kind task_id detail
+    while IFS='|' read -r kind task_id detail; do
+        case "$kind" in
+            duplicate)
+                if [ "$duplicates_logged" = "false" ]; then
+                    log_error "Duplicate task IDs found:"
+                    duplicates_logged=true
+                fi
+                echo -e "  ${RED}✗${NC} Duplicate ID: $task_id"
+                ;;
+            format) log_error "Task $task_id: Invalid ID format (must match F[num]-T[num])" ;;
+            field) log_error "Task $task_id: Missing required field '$detail'" ;;
+            priority) log_error "Task $task_id: Field 'priority' must be a number" ;;
+            passes) log_error "Task $task_id: Field 'passes' must be boolean (true or false)" ;;
+            acceptance) log_error "Task $task_id: Field 'acceptance' must be non-empty array" ;;
+            tests) log_error "Task $task_id: Missing required field 'tests.command'" ;;
+            tasks) task_count="$task_id" ;;
+        esac
+    done <<< "$problems"
+
+    if [ $status -eq 0 ]; then
+        log_success "All $task_count tasks have valid structure"
+        return 0
+    fi
+    return 1
+}
+
 run_validate() {
     local prp_file="${1:-$PRP_FILE}"
 
@@ -1574,6 +2417,15 @@ display_validation_summary() {
     echo ""
 }
 
+# Breakdown of where the wall-clock time of past runs went (see lib/profile_report.py)
+run_profile() {
+    if ! command -v python3 >/dev/null 2>&1; then
+        log_error "saci profile requires python3"
+        exit 1
+    fi
+    python3 "$SCRIPT_DIR/lib/profile_report.py" --file "$TRACE_FILE" "$@"
+}
+
 show_help() {
     echo ""
     echo -e "${CYAN}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━${NC}"
@@ -1585,31 +2437,50 @@ show_help() {
     echo "Commands:"
     echo "  scan                     Scan codebase and auto-detect context"
     echo "  init                     Interactively generate PRP from your idea"
-    echo "  analyze <file>           Analyze a file and suggest patterns/hints"
+    echo "  analyze <path>...        Analyze files, directories or globs and suggest patterns/hints"
     echo "  reset [task-id]          Reset all tasks (or specific task) to passes: false"
     echo "  reset <task-id> --cascade Reset task and all dependent tasks recursively"
     echo "  status                   Show task progress with nice TUI (requires gum)"
     echo "  validate [file]          Validate PRP file structure and dependencies (default: prp.json)"
+    echo "  profile [--task ID]      Show where run time went: phases, hooks, tests (--last N, --json)"
     echo "  jump                     Execute the Ralph loop (default)"
     echo ""
     echo "Jump Options:"
     echo "  --dry-run           Show what would be done without executing"
     echo "  --prp FILE          Use specified PRP file (default: prp.json)"
     echo "  --max-iter N        Max iterations per task (default: 10)"
-    echo "  --provider NAME     CLI provider: claude or amp (default: claude)"
+    echo "  --provider NAME     CLI provider: claude, amp or stub (default: claude)"
+    echo "  --no-hook-server    Run hooks in-process instead of the warm hook server"
+    echo "  --no-test-cache     Always re-run tests, even if the working tree is unchanged"
+    echo "  --full-tests        Stop hook runs the full suite instead of affected tests"
+    echo "  --full-rollback     Undo failed iterations with git reset --hard + clean"
+    echo "  --speculative-tests Run the Stop hook's tests in the background after edits"
+    echo "  --jobs N            Run up to N ready tasks in parallel git worktrees (default: 1)"
+    echo "  --no-trace          Do not record timing spans for saci profile"
     echo ""
     echo "Environment Variables:"
-    echo "  CLI_PROVIDER        Set default provider (claude or amp)"
+    echo "  CLI_PROVIDER        Set default provider (claude, amp or stub)"
+    echo "  HOOK_SERVER         Set to false to disable the warm hook server"
+    echo "  TEST_CACHE          Set to false to disable test result caching"
+    echo "  TEST_SELECTION      Stop hook test scope: affected (default) or full"
+    echo "  ROLLBACK            Failed iterations: targeted (default) or full reset"
+    echo "  SPECULATIVE_TESTS   Set to true to pre-run the Stop hook's tests after edits"
+    echo "  JOBS                Default for --jobs"
+    echo "  FAILURE_DIGEST_TOKENS  Size of the test failure summary in retry prompts (default: 600)"
+    echo "  TRACE               Set to false to disable timing spans (trace: TRACE_FILE, default .saci/trace.jsonl)"
     echo ""
     echo "Examples:"
     echo "  ./saci.sh scan                       # Detect stack and libs"
     echo "  ./saci.sh init                       # Create PRP interactively"
     echo "  ./saci.sh analyze src/Button.tsx     # Analyze patterns"
+    echo "  ./saci.sh analyze src                # Pattern frequencies across a directory"
     echo "  ./saci.sh validate                   # Validate prp.json"
     echo "  ./saci.sh validate custom.json       # Validate custom PRP file"
     echo "  ./saci.sh jump --dry-run              # Test run"
     echo "  ./saci.sh jump --provider amp         # Use Amp instead of Claude"
+    echo "  ./saci.sh jump --jobs 3               # Run independent tasks in parallel"
     echo "  ./saci.sh jump                        # Execute tasks"
+    echo "  ./saci.sh profile --last 3            # Time breakdown of the last 3 iterations"
     echo ""
 }
 
@@ -1643,6 +2514,10 @@ case "${1:-jump}" in
         shift
         run_validate "$@"
         ;;
+    profile)
+        shift
+        run_profile "$@"
+        ;;
     jump)
         shift 2>/dev/null || true
         main "$@"
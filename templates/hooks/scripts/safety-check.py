@@ -3,14 +3,54 @@
 Saci Safety Hook - PreToolUse for Bash
 Blocks dangerous commands that could harm the project or system.
 
+Verdicts are remembered per command (verdict_cache.py) until this hook or a
+rule pack changes, so repeated commands skip the rule tables.
+
 Exit codes:
   0 = allow command
   2 = block command (stderr shown to Claude as feedback)
 """
 import sys
 import json
+import os
 import re
 
+
+def _import_saci_module(name):
+    """
+    Import a shared Saci helper module (from .saci/hooks/).
+
+    This hook is installed into ~/.claude/hooks on its own, so look for the
+    module next to it, in the running saci's hooks dir, in this repo and in
+    the installed saci share dir. Returns None if it can't be found.
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    search = [
+        here,
+        os.environ.get('SACI_HOOKS_DIR', ''),
+        os.path.join(here, '..', '..', '..', '.saci', 'hooks'),
+        os.path.expanduser('~/.local/share/saci/.saci/hooks'),
+    ]
+    for directory in search:
+        if directory and os.path.isfile(os.path.join(directory, f'{name}.py')):
+            if directory not in sys.path:
+                sys.path.append(directory)
+            break
+    try:
+        return __import__(name)
+    except ImportError:
+        return None
+
+
+shell_parser = _import_saci_module('shell_parser')
+rule_packs = _import_saci_module('rule_packs')
+saci_cache = _import_saci_module('saci_cache')
+verdict_cache = _import_saci_module('verdict_cache')
+saci_trace = _import_saci_module('saci_trace')
+regex_prefilter = _import_saci_module('regex_prefilter')
+
+VERDICTS_FILE = 'safety-verdicts.jsonl'
+
 # =============================================================================
 # Protected Files - Cannot be deleted or overwritten
 # =============================================================================
@@ -122,12 +162,14 @@ DATABASE_DANGEROUS = [
 # Secrets Exposure
 # =============================================================================
 SECRETS_PATTERNS = [
-    (r'cat\s+.*\.env', "Don't cat .env files - secrets could be exposed in logs"),
-    (r'echo\s+.*\$\{?[A-Z_]*KEY', "Don't echo environment variables containing KEY"),
-    (r'echo\s+.*\$\{?[A-Z_]*SECRET', "Don't echo environment variables containing SECRET"),
-    (r'echo\s+.*\$\{?[A-Z_]*TOKEN', "Don't echo environment variables containing TOKEN"),
-    (r'echo\s+.*\$\{?[A-Z_]*PASSWORD', "Don't echo environment variables containing PASSWORD"),
-    (r'echo\s+.*\$\{?[A-Z_]*CREDENTIAL', "Don't echo environment variables containing CREDENTIAL"),
+    # cat/echo arguments end at the next command: `.*` here rescanned the rest
+    # of a long command line from every cat/echo in it
+    (r'cat\s+[^\n;&|]*\.env', "Don't cat .env files - secrets could be exposed in logs"),
+    (r'echo\s+[^\n;&|]*\$\{?[A-Z_]*KEY', "Don't echo environment variables containing KEY"),
+    (r'echo\s+[^\n;&|]*\$\{?[A-Z_]*SECRET', "Don't echo environment variables containing SECRET"),
+    (r'echo\s+[^\n;&|]*\$\{?[A-Z_]*TOKEN', "Don't echo environment variables containing TOKEN"),
+    (r'echo\s+[^\n;&|]*\$\{?[A-Z_]*PASSWORD', "Don't echo environment variables containing PASSWORD"),
+    (r'echo\s+[^\n;&|]*\$\{?[A-Z_]*CREDENTIAL', "Don't echo environment variables containing CREDENTIAL"),
     (r'printenv.*(KEY|TOKEN|SECRET|PASSWORD)', "Don't print sensitive environment variables"),
     (r'env\s*\|.*grep.*(KEY|TOKEN|SECRET|PASSWORD)', "Don't grep for secrets in env output"),
     (r'set\s*\|.*grep.*(KEY|TOKEN|SECRET|PASSWORD)', "Don't grep for secrets in set output"),
@@ -149,22 +191,268 @@ SYSTEM_CONFIG_PATTERNS = [
 # =============================================================================
 RISKY_ACTIONS = ['rm ', 'rm -', '> ', 'truncate ', 'shred ', 'mv ', 'unlink ']
 
+# Same actions by command name, used when the command can be parsed:
+# every operand is at risk, except for cp/tee where only targets are written
+RISKY_COMMANDS = {'rm', 'truncate', 'shred', 'mv', 'unlink'}
+
+# Git subcommands whose operands are at risk like rm/mv operands
+RISKY_GIT_SUBCOMMANDS = {'rm', 'mv'}
+
+# find actions that run commands on (or delete) the files it matches
+FIND_ACTIONS = {'-exec', '-execdir', '-ok', '-okdir', '-delete'}
+
+
+# =============================================================================
+# Rule Checks - in priority order (first matching category wins)
+# =============================================================================
+CHECKS = [
+    ("Dangerous command", DANGEROUS_PATTERNS),
+    ("Git operation", GIT_DANGEROUS),
+    ("Remote code execution", REMOTE_EXEC_PATTERNS),
+    ("Package manager", PACKAGE_DANGEROUS),
+    ("Database operation", DATABASE_DANGEROUS),
+    ("Secrets exposure", SECRETS_PATTERNS),
+    ("System config", SYSTEM_CONFIG_PATTERNS),
+]
+
+# Max combined regexes kept per engine (one per distinct candidate set)
+MATCHER_CACHE_SIZE = 256
+
+
+class RuleEngine:
+    """
+    All safety rules compiled once into a single prioritized matcher.
+
+    - A literal keyword prefilter picks the candidate rules for a command
+      (most commands match no keyword at all and skip regex work entirely).
+    - The candidates are checked with one combined regex, cached per
+      candidate set, which preserves category/rule priority.
+    - Protected files are matched with one combined literal regex instead of
+      the PROTECTED_FILES x RISKY_ACTIONS nested scan.
+
+    Without regex_prefilter.py (hook installed on its own) every rule is a
+    candidate and is checked one at a time, as before.
+    """
+
+    def __init__(self, checks, protected_files, risky_actions, keywords=None):
+        self.rules = []             # (category, pattern, message) in priority order
+        self.always = []            # rule indexes without a usable keyword
+        self.by_keyword = {}        # keyword -> [rule indexes]
+
+        # Prefilter keywords per category, precomputed by safety_index()
+        keywords = keywords or safety_index({'checks': checks})
+        for (category, patterns), category_keywords in zip(checks, keywords):
+            for (pattern, message), keyword in zip(patterns, category_keywords):
+                index = len(self.rules)
+                self.rules.append((category, pattern, message))
+                if keyword:
+                    self.by_keyword.setdefault(keyword, []).append(index)
+                else:
+                    self.always.append(index)
+
+        self.protected_files = list(protected_files)
+        self.risky_actions = list(risky_actions)
+        self._protected_re = regex_prefilter.priority_regex(
+            [(i, re.escape(name)) for i, name in enumerate(self.protected_files)]
+        ) if self.protected_files and regex_prefilter else None
+
+        self._compiled = {}         # candidate tuple -> compiled regex (or None)
+
+    def _candidates(self, command: str) -> tuple:
+        lowered = command.lower()
+        hits = list(self.always)
+        for keyword, indexes in self.by_keyword.items():
+            if keyword in lowered:
+                hits.extend(indexes)
+        return tuple(sorted(hits))
+
+    def _matcher(self, candidates: tuple):
+        if regex_prefilter is None:
+            return None
+        if candidates not in self._compiled:
+            if len(self._compiled) >= MATCHER_CACHE_SIZE:
+                self._compiled.clear()
+            try:
+                matcher = regex_prefilter.priority_regex(
+                    [(i, self.rules[i][1]) for i in candidates], re.IGNORECASE
+                )
+            except re.error:
+                # Patterns that cannot be combined (e.g. backreferences) are
+                # checked one at a time below
+                matcher = None
+            self._compiled[candidates] = matcher
+        return self._compiled[candidates]
+
+    def check_rules(self, command: str):
+        """Return (category, message) of the first matching rule, or None."""
+        candidates = self._candidates(command)
+        if not candidates:
+            return None
 
-def check_protected_files(command: str) -> tuple[bool, str]:
-    """Check if command targets a protected file with a risky action."""
-    for protected in PROTECTED_FILES:
-        for action in RISKY_ACTIONS:
-            if protected in command and action in command:
-                return True, f"Cannot modify/delete '{protected}' - this file is protected"
-    return False, ""
+        matcher = self._matcher(candidates)
+        if matcher is not None:
+            match = matcher.match(command)
+            if not match:
+                return None
+            category, _, message = self.rules[int(match.lastgroup[1:])]
+            return category, message
 
+        for index in candidates:
+            category, pattern, message = self.rules[index]
+            if re.search(pattern, command, re.IGNORECASE):
+                return category, message
+        return None
 
-def check_patterns(command: str, patterns: list) -> tuple[bool, str]:
-    """Check if command matches any pattern in the list."""
-    for pattern, message in patterns:
-        if re.search(pattern, command, re.IGNORECASE):
-            return True, message
-    return False, ""
+    def check_protected_files(self, command: str):
+        """Return the message for a risky action on a protected file, or None."""
+        if not any(action in command for action in self.risky_actions):
+            return None
+
+        if self._protected_re is not None:
+            match = self._protected_re.match(command)
+            protected = self.protected_files[int(match.lastgroup[1:])] if match else None
+        else:
+            protected = next((name for name in self.protected_files if name in command), None)
+        if not protected:
+            return None
+        return f"Cannot modify/delete '{protected}' - this file is protected"
+
+    def _protected_name(self, path: str):
+        """Return the protected name `path` refers to (or lives under), or None."""
+        parts = [part for part in path.replace('\\', '/').split('/') if part not in ('', '.')]
+        for name in self.protected_files:
+            if name in parts:
+                return name
+        return None
+
+    @staticmethod
+    def _unresolved(segment) -> bool:
+        """True if the files a segment acts on can't be read from its words."""
+        words = segment.effective_words()
+        if words and words[0].expansion:
+            return True     # command name from a variable or substitution
+        if 'xargs' in segment.wrappers():
+            return True     # operands arrive on stdin
+        if segment.name == 'find' and FIND_ACTIONS.intersection(segment.argv):
+            return True     # acts on whatever find matches
+        script = shell_parser.inline_script(segment)
+        return bool(script) and any(word.expansion for word in script)
+
+    def check_protected_segments(self, parsed):
+        """
+        Structural version of check_protected_files for a parsed command.
+
+        Only operands of risky commands (including `git rm`/`git mv` and
+        commands inside `bash -c`/`eval`) and truncating redirect targets are
+        considered, so `cat .env` or `echo x >> .gitignore` are not blocked.
+        If a segment's targets can't be resolved this way (`xargs rm`, `find
+        -exec`, `$CMD`), the substring check runs on the whole command.
+        """
+        unresolved = False
+        for segment in parsed:
+            if self._unresolved(segment):
+                unresolved = True
+            name = segment.name
+            if name == 'git':
+                operands = segment.operands(flags_with_values=('-C', '-c'))
+                targets = operands[1:] if operands[:1] and operands[0] in RISKY_GIT_SUBCOMMANDS else []
+            elif name in RISKY_COMMANDS:
+                targets = segment.operands()
+            elif name == 'cp':
+                targets = segment.operands()[-1:]
+            elif name == 'tee' and not segment.has_option('-a', '--append'):
+                targets = segment.operands()
+            else:
+                targets = []
+
+            targets += [r.target.text for r in segment.redirects if r.truncates]
+
+            for target in targets:
+                protected = self._protected_name(target)
+                if protected:
+                    return f"Cannot modify/delete '{protected}' - this file is protected"
+        return self.check_protected_files(parsed.source) if unresolved else None
+
+    def check(self, command: str):
+        """Return (category, message) if the command must be blocked, else None."""
+        blocked = self.check_rules(command)
+        if blocked:
+            return blocked
+
+        if shell_parser is not None:
+            reason = self.check_protected_segments(shell_parser.parse_command(command))
+        else:
+            reason = self.check_protected_files(command)
+        if reason:
+            return "Protected file", reason
+        return None
+
+
+def safety_index(table):
+    """Prefilter keyword of every rule in a safety table, grouped by category."""
+    prefix = regex_prefilter.literal_prefix if regex_prefilter else (lambda pattern: '')
+    return [[prefix(pattern) for pattern, _ in rules] for _, rules in table['checks']]
+
+
+ENGINE = RuleEngine(CHECKS, PROTECTED_FILES, RISKY_ACTIONS)
+
+# Engine built from rule packs: (table, engine)
+_PACK_ENGINE = []
+
+
+def get_engine():
+    """
+    The rule engine in effect: the built-in rules merged with any rule packs
+    (see rule_packs.py). Falls back to the built-in rules if packs can't load.
+    """
+    if rule_packs is None:
+        return ENGINE
+    try:
+        table, keywords = rule_packs.load_table(
+            'safety', {'checks': CHECKS, 'protected_files': PROTECTED_FILES}, safety_index
+        )
+    except Exception as e:
+        print(f"Warning: rule packs not loaded: {e}", file=sys.stderr)
+        return ENGINE
+    if keywords is None:
+        return ENGINE
+
+    # load_table returns the same table while the packs are unchanged
+    if not _PACK_ENGINE or _PACK_ENGINE[0] is not table:
+        engine = RuleEngine(table['checks'], table['protected_files'], RISKY_ACTIONS, keywords)
+        _PACK_ENGINE[:] = [table, engine]
+    return _PACK_ENGINE[1]
+
+
+def _code_files():
+    """Code the verdicts depend on: this hook and the helpers it loaded."""
+    helpers = [m.__file__ for m in (shell_parser, rule_packs, regex_prefilter) if m is not None]
+    return [os.path.abspath(path) for path in [__file__] + helpers]
+
+
+def check_command(command: str):
+    """get_engine().check(command), answered from the verdict cache when possible."""
+    if verdict_cache is None or saci_cache is None:
+        return get_engine().check(command)
+    try:
+        path = os.path.join(saci_cache.user_cache_dir(), VERDICTS_FILE)
+    except OSError:
+        return get_engine().check(command)
+
+    cache = verdict_cache.open_cache(path, _code_files())
+    project_dir = os.environ.get('CLAUDE_PROJECT_DIR') or os.getcwd()
+    key = cache.key(command, project_dir)
+    verdict = cache.lookup(key)
+    if verdict is None:
+        deps = verdict_cache.Dependencies()
+        if rule_packs is not None:
+            # A pack that is added, edited or removed changes the rules
+            for pack in rule_packs.candidate_paths(project_dir):
+                deps.file(pack)
+        blocked = get_engine().check(command)
+        verdict = {'blocked': list(blocked) if blocked else None}
+        cache.store(key, verdict, deps)
+    return tuple(verdict['blocked']) if verdict['blocked'] else None
 
 
 def main():
@@ -176,27 +464,10 @@ def main():
         if not command:
             sys.exit(0)
         
-        # All pattern checks
-        checks = [
-            ("Dangerous command", DANGEROUS_PATTERNS),
-            ("Git operation", GIT_DANGEROUS),
-            ("Remote code execution", REMOTE_EXEC_PATTERNS),
-            ("Package manager", PACKAGE_DANGEROUS),
-            ("Database operation", DATABASE_DANGEROUS),
-            ("Secrets exposure", SECRETS_PATTERNS),
-            ("System config", SYSTEM_CONFIG_PATTERNS),
-        ]
-        
-        for category, patterns in checks:
-            blocked, reason = check_patterns(command, patterns)
-            if blocked:
-                print(f"🚫 BLOCKED ({category}): {reason}", file=sys.stderr)
-                sys.exit(2)
-        
-        # Check protected files
-        blocked, reason = check_protected_files(command)
+        blocked = check_command(command)
         if blocked:
-            print(f"🚫 BLOCKED (Protected file): {reason}", file=sys.stderr)
+            category, reason = blocked
+            print(f"🚫 BLOCKED ({category}): {reason}", file=sys.stderr)
             sys.exit(2)
         
         # All checks passed
@@ -209,4 +480,7 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    if saci_trace:
+        saci_trace.run_hook(main, __file__)
+    else:
+        main()
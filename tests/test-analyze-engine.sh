@@ -0,0 +1,157 @@
+#!/bin/bash
+# ============================================================================
+# Tests for the Analyze Engine (lib/analyze_engine.py)
+# Tests: detectors match analyzer.sh's greps, directory/glob expansion,
+# pattern frequencies and hints, process pool results
+# ============================================================================
+
+set -euo pipefail
+
+# Colors for test output
+RED='\033[0;31m'
+GREEN='\033[0;32m'
+NC='\033[0m'
+
+# Test counters
+TESTS_PASSED=0
+TESTS_FAILED=0
+
+# Get script directory
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+SACI_DIR="$(dirname "$SCRIPT_DIR")"
+ANALYZE_ENGINE="$SACI_DIR/lib/analyze_engine.py"
+
+# Test helpers
+assert_equals() {
+    local expected="$1"
+    local actual="$2"
+    local test_name="$3"
+
+    if [ "$expected" = "$actual" ]; then
+        echo -e "${GREEN}✓${NC} $test_name"
+        TESTS_PASSED=$((TESTS_PASSED + 1))
+        return 0
+    else
+        echo -e "${RED}✗${NC} $test_name"
+        echo "  Expected: $expected"
+        echo "  Actual: $actual"
+        TESTS_FAILED=$((TESTS_FAILED + 1))
+        return 1
+    fi
+}
+
+analyze() {
+    python3 "$ANALYZE_ENGINE" "$@"
+}
+
+# Components and an API route; build/ and node_modules/ must be skipped
+create_project() {
+    mkdir -p src/components src/app/api/users build node_modules/pkg
+    cat > src/components/Button.tsx <<'EOF'
+'use client'
+interface ButtonProps { label: string }
+export const Button = forwardRef((props: ButtonProps, ref) => (
+  <button ref={ref} className={cn('btn')} aria-label={props.label} />
+))
+EOF
+    cat > src/components/Card.tsx <<'EOF'
+export function Card() {
+  const [open, setOpen] = useState(false)
+  return <div data-testid="card" className={cn('card')} />
+}
+EOF
+    cat > src/app/api/users/route.ts <<'EOF'
+import { NextResponse } from 'next/server'
+export async function GET() {
+  try { return NextResponse.json(await prisma.user.findMany()) } catch (e) { return NextResponse.error() }
+}
+EOF
+    echo "forwardRef" > build/Ignored.tsx
+    echo "forwardRef" > node_modules/pkg/Dep.tsx
+    echo "build/" > .gitignore
+}
+
+# Patterns analyzer.sh prints for one file
+shell_patterns() {
+    bash "$SACI_DIR/lib/analyzer.sh" "$1" | sed -n '/Patterns detected:/,/^$/p' | grep '•' | sed 's/.*•[^ ]* //'
+}
+
+# Test 1: One pass over each file finds what the per-pattern greps find
+test_matches_shell() {
+    echo ""
+    echo "Test 1: Detectors match analyzer.sh"
+
+    local file
+    for file in src/components/Button.tsx src/app/api/users/route.ts; do
+        assert_equals "$(shell_patterns "$file")" \
+            "$(python3 -c "import sys; sys.path.insert(0, '$SACI_DIR/lib'); import analyze_engine; print('\n'.join(analyze_engine.analyze_file('$file')[2]))")" \
+            "Same patterns as analyzer.sh for $file" || true
+    done
+}
+
+# Test 2: Directories and globs aggregate into one report
+test_batch_report() {
+    echo ""
+    echo "Test 2: Batch report"
+
+    assert_equals "files|3|2|1" "$(analyze . | grep '^files|')" "Directory walk skips ignored and node_modules files" || true
+    assert_equals "files|2|2|0" "$(analyze 'src/**/*.tsx' | grep '^files|')" "Globs are expanded" || true
+    assert_equals "pattern|Uses cn() for classNames|2|100|src/components/Button.tsx" \
+        "$(analyze src | grep '^pattern|' | head -1)" "Most frequent pattern first, with its share" || true
+
+    local hints
+    hints=$(analyze src --min-share 0.6 --format json | jq -r '.hints | join("|")')
+    assert_equals "Use cn() utility for conditional classes|Use NextRequest/NextResponse pattern|Wrap in try/catch and return proper error responses" \
+        "$hints" "Hints only for patterns above --min-share" || true
+}
+
+# Test 3: The process pool gives the same report as the inline path
+test_process_pool() {
+    echo ""
+    echo "Test 3: Process pool"
+
+    local i
+    mkdir -p src/many
+    for i in $(seq 1 80); do
+        echo "export const C$i = () => <i aria-hidden />" > "src/many/C$i.tsx"
+    done
+    assert_equals "$(analyze src --jobs 1 --format json)" "$(analyze src --jobs 4 --format json)" \
+        "Pooled and inline analysis agree" || true
+}
+
+main() {
+    echo "Saci Analyze Engine Tests"
+    echo "=========================================="
+
+    local work_dir
+    work_dir=$(mktemp -d)
+    cd "$work_dir"
+    create_project
+
+    test_matches_shell
+    test_batch_report
+    test_process_pool
+
+    cd "$SACI_DIR"
+    rm -rf "$work_dir"
+
+    echo ""
+    echo "=========================================="
+    echo "Test Results"
+    echo "=========================================="
+    echo -e "${GREEN}Passed: $TESTS_PASSED${NC}"
+    echo -e "${RED}Failed: $TESTS_FAILED${NC}"
+    echo "Total: $((TESTS_PASSED + TESTS_FAILED))"
+    echo ""
+
+    if [ $TESTS_FAILED -eq 0 ]; then
+        echo -e "${GREEN}All tests passed!${NC}"
+        exit 0
+    else
+        echo -e "${RED}Some tests failed!${NC}"
+        exit 1
+    fi
+}
+
+# Run tests
+main "$@"
@@ -0,0 +1,182 @@
+#!/bin/bash
+# ============================================================================
+# Tests for Checkpoints and Targeted Rollback (lib/checkpoint.py, track-edits.py)
+# Tests: restoring only the changed paths (edits, deletions, new files, a
+# commit), ignored caches surviving while ignored files the session created
+# are removed, the fallback when the branch changed, and saci jump rolling a
+# failed iteration back from the snapshot (stub CLI on PATH)
+# ============================================================================
+
+set -euo pipefail
+
+# Colors for test output
+RED='\033[0;31m'
+GREEN='\033[0;32m'
+NC='\033[0m'
+
+# Test counters
+TESTS_PASSED=0
+TESTS_FAILED=0
+
+# Get script directory
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+SACI_DIR="$(dirname "$SCRIPT_DIR")"
+SACI="$SACI_DIR/saci.sh"
+CHECKPOINT="$SACI_DIR/lib/checkpoint.py"
+TRACK_EDITS="$SACI_DIR/.saci/hooks/track-edits.py"
+
+# Test helpers
+assert_equals() {
+    local expected="$1"
+    local actual="$2"
+    local test_name="$3"
+
+    if [ "$expected" = "$actual" ]; then
+        echo -e "${GREEN}✓${NC} $test_name"
+        TESTS_PASSED=$((TESTS_PASSED + 1))
+        return 0
+    else
+        echo -e "${RED}✗${NC} $test_name"
+        echo "  Expected: $expected"
+        echo "  Actual: $actual"
+        TESTS_FAILED=$((TESTS_FAILED + 1))
+        return 1
+    fi
+}
+
+# Project with tracked files, an ignored cache and an untracked note
+create_project() {
+    git init -q
+    git config user.email "saci@test"
+    git config user.name "Saci Test"
+    printf 'node_modules/\ndist/\n' > .gitignore
+    echo "a" > a.txt
+    echo "b" > b.txt
+    git add .gitignore a.txt b.txt
+    git commit -q -m "init"
+    mkdir -p node_modules/.cache
+    echo "warm" > node_modules/.cache/babel.json
+    echo "draft" > notes.txt
+}
+
+# Write through the hook the way Claude's Write tool would
+hook_write() {
+    mkdir -p "$(dirname "$1")"
+    echo "$2" > "$1"
+    printf '{"hook_event_name":"PostToolUse","tool_name":"Write","cwd":"%s","tool_input":{"file_path":"%s"},"tool_response":{"type":"%s"}}' \
+        "$PWD" "$1" "$3" | python3 "$TRACK_EDITS"
+}
+
+# Test 1: Only the changed paths are restored
+test_restore() {
+    echo ""
+    echo "Test 1: Targeted restore"
+
+    local head status journal
+    head=$(git rev-parse HEAD)
+    status=$(git status --porcelain)
+    journal=$(python3 "$CHECKPOINT" create)
+    export SACI_EDIT_JOURNAL="$journal"
+
+    hook_write a.txt "broken" update
+    hook_write src/new/file.txt "new" create
+    hook_write dist/out.js "bundle" create
+    rm b.txt
+    echo "stale" > node_modules/.cache/jest.json
+    git add a.txt && git commit -q -m "wip"
+    unset SACI_EDIT_JOURNAL
+
+    assert_equals "3" "$(wc -l < "$journal" | tr -d ' ')" "Hook journaled each file write" || true
+
+    assert_equals "restored 2, removed 2 path(s)" "$(python3 "$CHECKPOINT" restore)" "Changed paths restored" || true
+    assert_equals "$head|$status|a|b" "$(git rev-parse HEAD)|$(git status --porcelain)|$(cat a.txt)|$(cat b.txt)" \
+        "HEAD, index and files back at the checkpoint" || true
+    assert_equals "false false" "$([ -e src ] && echo true || echo false) $([ -e dist/out.js ] && echo true || echo false)" \
+        "New files and the ignored file the session created are gone" || true
+    assert_equals "warm stale draft" \
+        "$(cat node_modules/.cache/babel.json) $(cat node_modules/.cache/jest.json) $(cat notes.txt)" \
+        "Ignored caches and untracked files kept" || true
+}
+
+# Test 2: What the snapshot can't undo falls back to a full reset
+test_fallback() {
+    echo ""
+    echo "Test 2: Fallback"
+
+    python3 "$CHECKPOINT" create > /dev/null
+    git checkout -q -b elsewhere
+    local status=0
+    python3 "$CHECKPOINT" restore > /dev/null 2>&1 || status=$?
+    assert_equals "1" "$status" "Branch switch is left to the full reset" || true
+    git checkout -q -
+}
+
+# Test 3: saci jump rolls a failed iteration back from the snapshot
+test_jump_rollback() {
+    echo ""
+    echo "Test 3: saci jump"
+
+    cat > prp.json <<'PRP'
+{"project": {"name": "Rollback"}, "features": [{"id": "F1", "name": "F", "tasks": [
+  {"id": "T1", "title": "One", "passes": false, "tests": {"command": "test -f fixed.txt"}}
+]}]}
+PRP
+    git add prp.json && git commit -q -m "prp"
+    mkdir -p bin
+    cat > bin/claude <<'STUB'
+#!/bin/bash
+cat > /dev/null
+if [ -f attempted ]; then touch fixed.txt; else
+    echo "broken" > a.txt
+    echo "cache" > node_modules/.cache/session.json
+fi
+touch attempted
+echo '{"type":"result","usage":{"input_tokens":1,"output_tokens":1},"total_cost_usd":0.01,"num_turns":1}'
+STUB
+    chmod +x bin/claude
+    printf 'bin/\n.saci/\nattempted\n' >> .git/info/exclude
+
+    PATH="$PWD/bin:$PATH" bash "$SACI" jump --max-iter 2 --no-hook-server > /dev/null 2>&1 || true
+    assert_equals "targeted" \
+        "$(jq -r 'select(.kind == "phase" and .name == "rollback") | .outcome' .saci/trace.jsonl)" \
+        "Failed iteration restored from the snapshot" || true
+    assert_equals "a cache draft" "$(cat a.txt) $(cat node_modules/.cache/session.json) $(cat notes.txt)" \
+        "Edits undone, caches and untracked files kept" || true
+}
+
+main() {
+    echo "Saci Checkpoint Tests"
+    echo "=========================================="
+
+    local work_dir
+    work_dir=$(mktemp -d)
+    cd "$work_dir"
+    create_project
+
+    test_restore
+    test_fallback
+    test_jump_rollback
+
+    cd "$SACI_DIR"
+    rm -rf "$work_dir"
+
+    echo ""
+    echo "=========================================="
+    echo "Test Results"
+    echo "=========================================="
+    echo -e "${GREEN}Passed: $TESTS_PASSED${NC}"
+    echo -e "${RED}Failed: $TESTS_FAILED${NC}"
+    echo "Total: $((TESTS_PASSED + TESTS_FAILED))"
+    echo ""
+
+    if [ $TESTS_FAILED -eq 0 ]; then
+        echo -e "${GREEN}All tests passed!${NC}"
+        exit 0
+    else
+        echo -e "${RED}Some tests failed!${NC}"
+        exit 1
+    fi
+}
+
+# Run tests
+main "$@"
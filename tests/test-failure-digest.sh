@@ -0,0 +1,186 @@
+#!/bin/bash
+# ============================================================================
+# Tests for the Failure Digest (lib/failure_digest.py)
+# Tests: failing tests, first assertion and frames from jest/pytest output,
+# the token budget, the fallback to the last lines, and the digest replacing
+# the raw output in the retry prompt of saci jump (stub CLI on PATH)
+# ============================================================================
+
+set -euo pipefail
+
+# Colors for test output
+RED='\033[0;31m'
+GREEN='\033[0;32m'
+NC='\033[0m'
+
+# Test counters
+TESTS_PASSED=0
+TESTS_FAILED=0
+
+# Get script directory
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+SACI_DIR="$(dirname "$SCRIPT_DIR")"
+SACI="$SACI_DIR/saci.sh"
+FAILURE_DIGEST="$SACI_DIR/lib/failure_digest.py"
+
+# Test helpers
+assert_equals() {
+    local expected="$1"
+    local actual="$2"
+    local test_name="$3"
+
+    if [ "$expected" = "$actual" ]; then
+        echo -e "${GREEN}✓${NC} $test_name"
+        TESTS_PASSED=$((TESTS_PASSED + 1))
+        return 0
+    else
+        echo -e "${RED}✗${NC} $test_name"
+        echo "  Expected: $expected"
+        echo "  Actual: $actual"
+        TESTS_FAILED=$((TESTS_FAILED + 1))
+        return 1
+    fi
+}
+
+digest_field() {
+    python3 "$FAILURE_DIGEST" "$1" --format json | jq -r "$2"
+}
+
+# Jest output: one failure listed twice by the reporter, library frames,
+# a code frame and the summary
+create_jest_output() {
+    cat > jest.txt <<'EOF'
+ FAIL  src/Button.test.tsx
+  Button
+    ✓ renders (12 ms)
+    ✕ renders label (8 ms)
+
+  ● Button › renders label
+
+    expect(received).toBe(expected) // Object.is equality
+
+    Expected: "Save"
+    Received: "Submit"
+
+    > 11 |   expect(screen.getByRole('button').textContent).toBe('Save')
+
+      at Object.<anonymous> (src/Button.test.tsx:11:50)
+      at Promise.then.completed (node_modules/jest-circus/build/utils.js:298:28)
+      at Object.<anonymous> (src/Button.test.tsx:11:50)
+
+Tests:       1 failed, 1 passed, 2 total
+EOF
+    for i in $(seq 1 200); do
+        echo "    at callAsyncCircusFn (node_modules/jest-circus/build/utils.js:$i:10)"
+    done >> jest.txt
+}
+
+# Test 1: Structured summary of jest and pytest output
+test_digest() {
+    echo ""
+    echo "Test 1: Failing tests, assertion, frames"
+
+    assert_equals "CODE|Button › renders label|Tests:       1 failed, 1 passed, 2 total" \
+        "$(digest_field jest.txt '[.error_type, (.failing_tests | join(",")), .summary[0]] | join("|")')" \
+        "Error type, one test per failure, summary line" || true
+    assert_equals 'expect(received).toBe(expected) // Object.is equality|Expected: "Save"|Received: "Submit"' \
+        "$(digest_field jest.txt '.assertion[:3] | map(ltrimstr(" ") | ltrimstr("   ")) | join("|")')" \
+        "First assertion with expected/received" || true
+    assert_equals "src/Button.test.tsx:11 (Object.<anonymous>)" \
+        "$(digest_field jest.txt '.frames | join(",")')" \
+        "Frames deduplicated, node_modules dropped" || true
+
+    printf '%s\n' '>       assert divide(6, 3) == 3' 'E       assert 2.0 == 3' \
+        'FAILED tests/test_calc.py::test_divide - assert 2.0 == 3' > pytest.txt
+    assert_equals "tests/test_calc.py::test_divide|>       assert divide(6, 3) == 3" \
+        "$(digest_field pytest.txt '[.failing_tests[0], .assertion[0]] | join("|")')" \
+        "pytest failures and assertion" || true
+}
+
+# Test 2: Budget and fallback
+test_budget() {
+    echo ""
+    echo "Test 2: Token budget"
+
+    assert_equals "true" "$([ "$(python3 "$FAILURE_DIGEST" jest.txt --tokens 40 | wc -c)" -le 160 ] && echo true || echo false)" \
+        "Digest stays within --tokens" || true
+    assert_equals "true" "$([ "$(python3 "$FAILURE_DIGEST" jest.txt | wc -c)" -lt "$(tail -50 jest.txt | wc -c)" ] && echo true || echo false)" \
+        "Smaller than the last 50 lines it replaces" || true
+
+    printf 'compiling\nSegmentation fault (core dumped)\n' > crash.txt
+    assert_equals "Segmentation fault (core dumped)" "$(python3 "$FAILURE_DIGEST" crash.txt | tail -1)" \
+        "Unstructured output falls back to its last lines" || true
+}
+
+# Test 3: The retry prompt carries the digest
+test_retry_prompt() {
+    echo ""
+    echo "Test 3: Retry prompt"
+
+    git init -q
+    git config user.email "saci@test"
+    git config user.name "Saci Test"
+    cat > prp.json <<'PRP'
+{"project": {"name": "Digest"}, "features": [{"id": "F1", "name": "F", "tasks": [
+  {"id": "T1", "title": "One", "passes": false, "tests": {"command": "test -f fixed.txt || { cat jest.txt; exit 1; }"}}
+]}]}
+PRP
+    git add prp.json jest.txt
+    git commit -q -m "init"
+
+    mkdir -p bin
+    cat > bin/claude <<'STUB'
+#!/bin/bash
+prompt="prompt-$(ls prompt-* 2>/dev/null | wc -l | tr -d ' ').txt"
+cat > "$prompt"
+# The first attempt leaves the tests failing, the retry fixes them
+[ "$prompt" = "prompt-0.txt" ] && echo "$RANDOM" > work.txt || touch fixed.txt
+echo '{"type":"result","usage":{"input_tokens":1,"output_tokens":1},"total_cost_usd":0,"num_turns":1}'
+STUB
+    chmod +x bin/claude
+    echo "prompt-*.txt" > .git/info/exclude
+    echo "bin/" >> .git/info/exclude
+
+    PATH="$PWD/bin:$PATH" bash "$SACI" jump --max-iter 2 --no-hook-server --no-trace > /dev/null 2>&1 || true
+    # (the progress log quoted in the prompt carries the same digest)
+    assert_equals "true 0" \
+        "$(grep -q 'Failing tests (1):' prompt-1.txt && echo true || echo false) $(grep -c 'node_modules' prompt-1.txt || true)" \
+        "Second iteration gets the digest, not the raw frames" || true
+}
+
+main() {
+    echo "Saci Failure Digest Tests"
+    echo "=========================================="
+
+    local work_dir
+    work_dir=$(mktemp -d)
+    cd "$work_dir"
+    create_jest_output
+
+    test_digest
+    test_budget
+    test_retry_prompt
+
+    cd "$SACI_DIR"
+    rm -rf "$work_dir"
+
+    echo ""
+    echo "=========================================="
+    echo "Test Results"
+    echo "=========================================="
+    echo -e "${GREEN}Passed: $TESTS_PASSED${NC}"
+    echo -e "${RED}Failed: $TESTS_FAILED${NC}"
+    echo "Total: $((TESTS_PASSED + TESTS_FAILED))"
+    echo ""
+
+    if [ $TESTS_FAILED -eq 0 ]; then
+        echo -e "${GREEN}All tests passed!${NC}"
+        exit 0
+    else
+        echo -e "${RED}Some tests failed!${NC}"
+        exit 1
+    fi
+}
+
+# Run tests
+main "$@"
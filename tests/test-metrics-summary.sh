@@ -0,0 +1,127 @@
+#!/bin/bash
+# ============================================================================
+# Tests for the Incremental Metrics Aggregator (lib/metrics_summary.py)
+# Tests: totals, appended lines only, partial last line, rewritten log
+# ============================================================================
+
+set -euo pipefail
+
+# Colors for test output
+RED='\033[0;31m'
+GREEN='\033[0;32m'
+NC='\033[0m'
+
+# Test counters
+TESTS_PASSED=0
+TESTS_FAILED=0
+
+# Get script directory
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+SACI_DIR="$(dirname "$SCRIPT_DIR")"
+METRICS_SUMMARY="$SACI_DIR/lib/metrics_summary.py"
+
+# Test helpers
+assert_equals() {
+    local expected="$1"
+    local actual="$2"
+    local test_name="$3"
+
+    if [ "$expected" = "$actual" ]; then
+        echo -e "${GREEN}✓${NC} $test_name"
+        TESTS_PASSED=$((TESTS_PASSED + 1))
+        return 0
+    else
+        echo -e "${RED}✗${NC} $test_name"
+        echo "  Expected: $expected"
+        echo "  Actual: $actual"
+        TESTS_FAILED=$((TESTS_FAILED + 1))
+        return 1
+    fi
+}
+
+# Append one metrics line: tokens cost duration result error_type
+add_metric() {
+    printf '{"total_tokens":%s,"cost_usd":%s,"duration_ms":%s,"result":"%s","error_type":"%s"}\n' \
+        "$1" "$2" "$3" "$4" "$5" >> .saci/metrics.jsonl
+}
+
+summary() {
+    python3 "$METRICS_SUMMARY" "$@"
+}
+
+# Test 1: Summary matches the whole log
+test_summary_totals() {
+    echo ""
+    echo "Test 1: Summary totals"
+
+    add_metric 100 0.5 1000 success ""
+    add_metric 300 1.5 3000 failed CODE
+
+    assert_equals '{"total_tokens":400,"cost_usd":2.0,"avg_time_ms":2000.0,"success_rate":50.0,"error_counts":{"CODE":1}}' \
+        "$(summary)" "Totals, average, success rate and error counts" || true
+}
+
+# Test 2: Only appended lines are read, a partial last line waits for its newline
+test_incremental_append() {
+    echo ""
+    echo "Test 2: Incremental append"
+
+    add_metric 600 1.0 2000 success ""
+    printf '{"total_tokens":1000,' >> .saci/metrics.jsonl
+    assert_equals "1000" "$(summary tokens)" "Partial line not counted yet" || true
+
+    printf '"cost_usd":0,"duration_ms":0,"result":"success","error_type":""}\n' >> .saci/metrics.jsonl
+    assert_equals "2000" "$(summary tokens)" "Completed line counted once" || true
+
+    local offset size
+    offset=$(jq '.offset' .saci/cache/metrics-summary.json)
+    size=$(wc -c < .saci/metrics.jsonl | tr -d ' ')
+    assert_equals "$size" "$offset" "Checkpoint offset at end of log" || true
+}
+
+# Test 3: A truncated/rewritten log is summed again from the start
+test_rewritten_log() {
+    echo ""
+    echo "Test 3: Rewritten log"
+
+    : > .saci/metrics.jsonl
+    add_metric 42 0.1 10 success ""
+    assert_equals "42" "$(summary tokens)" "Truncated log re-summed" || true
+}
+
+main() {
+    echo "Saci Metrics Summary Tests"
+    echo "=========================================="
+
+    local work_dir
+    work_dir=$(mktemp -d)
+    cd "$work_dir"
+    mkdir -p .saci
+
+    test_summary_totals
+    test_incremental_append
+    test_rewritten_log
+
+    cd "$SACI_DIR"
+    rm -rf "$work_dir"
+
+    echo ""
+    echo "=========================================="
+    echo "Test Results"
+    echo "=========================================="
+    echo -e "${GREEN}Passed: $TESTS_PASSED${NC}"
+    echo -e "${RED}Failed: $TESTS_FAILED${NC}"
+    echo "Total: $((TESTS_PASSED + TESTS_FAILED))"
+    echo ""
+
+    if [ $TESTS_FAILED -eq 0 ]; then
+        echo -e "${GREEN}All tests passed!${NC}"
+        exit 0
+    else
+        echo -e "${RED}Some tests failed!${NC}"
+        exit 1
+    fi
+}
+
+# Run tests
+main "$@"
@@ -0,0 +1,140 @@
+#!/bin/bash
+# ============================================================================
+# Tests for the Stub Provider and Orchestration Benchmark
+# Tests: lib/stub_cli.py replaying canned sessions, `saci jump --provider stub`
+# retrying a scripted failure, and .saci/bench/bench-orchestration.py running
+# a synthetic PRP with dependencies to completion
+# ============================================================================
+
+set -euo pipefail
+
+# Colors for test output
+RED='\033[0;31m'
+GREEN='\033[0;32m'
+NC='\033[0m'
+
+# Test counters
+TESTS_PASSED=0
+TESTS_FAILED=0
+
+# Get script directory
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+SACI_DIR="$(dirname "$SCRIPT_DIR")"
+STUB_CLI="$SACI_DIR/lib/stub_cli.py"
+BENCH="$SACI_DIR/.saci/bench/bench-orchestration.py"
+
+# Test helpers
+assert_equals() {
+    local expected="$1"
+    local actual="$2"
+    local test_name="$3"
+
+    if [ "$expected" = "$actual" ]; then
+        echo -e "${GREEN}✓${NC} $test_name"
+        TESTS_PASSED=$((TESTS_PASSED + 1))
+        return 0
+    else
+        echo -e "${RED}✗${NC} $test_name"
+        echo "  Expected: $expected"
+        echo "  Actual: $actual"
+        TESTS_FAILED=$((TESTS_FAILED + 1))
+        return 1
+    fi
+}
+
+# ============================================================================
+# Tests
+# ============================================================================
+
+test_stub_session() {
+    echo ""
+    echo "Test: Stub CLI replays the default session"
+
+    local output
+    output=$(printf '**Task ID:** F1-T1\n\n# Iteration 1 of 3\n' | python3 "$STUB_CLI")
+
+    assert_equals "F1-T1 iteration 1" "$(cat stub/F1-T1.txt)" "Default session writes stub/<task>.txt" || true
+    assert_equals "success stub" "$(echo "$output" | jq -r '.[-1].subtype + " " + .[0].model')" \
+        "Prints a claude --output-format json transcript" || true
+}
+
+test_scripted_retry() {
+    echo ""
+    echo "Test: Scripted failure is retried by saci jump --provider stub"
+
+    git init -q project
+    (
+        cd project
+        git config user.email "saci@test"
+        git config user.name "Saci Test"
+        printf '.saci/\n' > .gitignore
+        cat > prp.json << 'EOF'
+{"project": {"name": "Stub"}, "features": [{"id": "F1", "name": "Stub", "tasks": [
+  {"id": "F1-T1", "title": "Fix app", "description": "", "passes": false,
+   "tests": {"command": "grep -q fixed app.txt"}}]}]}
+EOF
+        echo '{"F1-T1": [{"edits": {"app.txt": "broken\n"}}, {"edits": {"app.txt": "fixed\n"}}]}' > ../script.json
+        git add -A && git commit -q -m "init"
+        SACI_STUB_SCRIPT="$PWD/../script.json" TUI_MODE=false \
+            bash "$SACI_DIR/saci.sh" jump --provider stub --max-iter 2 --no-hook-server < /dev/null > ../jump.log 2>&1 || true
+    )
+
+    assert_equals "true" "$(jq -r '.features[0].tasks[0].passes' project/prp.json)" "Task passes on the second session" || true
+    assert_equals "failed success" \
+        "$(jq -rs '[.[] | select(.kind == "phase" and .name == "iteration") | .outcome] | join(" ")' project/.saci/trace.jsonl)" \
+        "First iteration failed, second succeeded" || true
+}
+
+test_bench() {
+    echo ""
+    echo "Test: Orchestration benchmark runs a synthetic PRP to completion"
+
+    local results
+    results=$(python3 "$BENCH" --tasks 4 --fan-out 2 --json)
+
+    assert_equals "4 4" "$(echo "$results" | jq -r '"\(.completed) \(.iterations)"')" \
+        "All tasks complete in one iteration each" || true
+    assert_equals "true" "$(echo "$results" | jq -r '.selection.count > 0 and .overhead.mean_ms >= 0 and .cli.count == 4')" \
+        "Reports task selection, overhead and CLI time" || true
+    assert_equals "true" "$(echo "$results" | jq -r '.tasks_per_minute > 0')" "Reports throughput" || true
+}
+
+# ============================================================================
+# Main
+# ============================================================================
+
+main() {
+    echo "Saci Orchestration Benchmark Tests"
+    echo "=========================================="
+
+    local work_dir
+    work_dir=$(mktemp -d)
+    cd "$work_dir"
+
+    test_stub_session
+    test_scripted_retry
+    test_bench
+
+    cd "$SACI_DIR"
+    rm -rf "$work_dir"
+
+    echo ""
+    echo "=========================================="
+    echo "Test Results"
+    echo "=========================================="
+    echo -e "${GREEN}Passed: $TESTS_PASSED${NC}"
+    echo -e "${RED}Failed: $TESTS_FAILED${NC}"
+    echo "Total: $((TESTS_PASSED + TESTS_FAILED))"
+    echo ""
+
+    if [ $TESTS_FAILED -eq 0 ]; then
+        echo -e "${GREEN}All tests passed!${NC}"
+        exit 0
+    else
+        echo -e "${RED}Some tests failed!${NC}"
+        exit 1
+    fi
+}
+
+# Run tests
+main "$@"
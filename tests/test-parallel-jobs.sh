@@ -0,0 +1,183 @@
+#!/bin/bash
+# ============================================================================
+# Tests for Parallel Execution (saci.sh jump --jobs N)
+# Tests: dependency-ordered completion, worktree/branch cleanup, state files
+# written to the main tree (dry-run), and sessions that edit progress.txt and
+# read prp.json in their worktrees (stub provider)
+# ============================================================================
+
+set -euo pipefail
+
+# Colors for test output
+RED='\033[0;31m'
+GREEN='\033[0;32m'
+NC='\033[0m'
+
+# Test counters
+TESTS_PASSED=0
+TESTS_FAILED=0
+
+# Get script directory
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+SACI_DIR="$(dirname "$SCRIPT_DIR")"
+SACI="$SACI_DIR/saci.sh"
+
+# Test helpers
+assert_equals() {
+    local expected="$1"
+    local actual="$2"
+    local test_name="$3"
+
+    if [ "$expected" = "$actual" ]; then
+        echo -e "${GREEN}✓${NC} $test_name"
+        TESTS_PASSED=$((TESTS_PASSED + 1))
+        return 0
+    else
+        echo -e "${RED}✗${NC} $test_name"
+        echo "  Expected: $expected"
+        echo "  Actual: $actual"
+        TESTS_FAILED=$((TESTS_FAILED + 1))
+        return 1
+    fi
+}
+
+# Git project with a diamond of dependencies: T3 needs T1 and T2, T4 needs T3
+create_project() {
+    git init -q
+    git config user.email "saci@test"
+    git config user.name "Saci Test"
+    cat > prp.json <<'PRP'
+{
+  "project": {"name": "Parallel"},
+  "features": [
+    {
+      "id": "F1",
+      "name": "Feature 1",
+      "tasks": [
+        {"id": "T1", "title": "One", "passes": false},
+        {"id": "T2", "title": "Two", "passes": false},
+        {"id": "T3", "title": "Three", "passes": false, "dependencies": ["T1", "T2"]},
+        {"id": "T4", "title": "Four", "passes": false, "dependencies": ["T3"]}
+      ]
+    }
+  ]
+}
+PRP
+    git add prp.json
+    git commit -q -m "init"
+}
+
+# Test 1: Every task completes, dependents only after their dependencies
+test_dry_run_completes() {
+    echo ""
+    echo "Test 1: Parallel dry run"
+
+    local output
+    output=$(bash "$SACI" jump --dry-run --jobs 2 2>&1)
+
+    assert_equals "true true true true" \
+        "$(jq -r '[.features[].tasks[].passes] | map(tostring) | join(" ")' prp.json)" \
+        "All tasks marked complete" || true
+
+    local started
+    started=$(echo "$output" | grep -o 'Task T[0-9] started' | awk '{print $2}' | tr '\n' ' ' | sed 's/ $//')
+    assert_equals "T1 T2 T3 T4" "$started" "Independent tasks first, dependents after" || true
+}
+
+# Test 2: Worktrees and task branches are removed after the run
+test_cleanup() {
+    echo ""
+    echo "Test 2: Cleanup"
+
+    assert_equals "1" "$(git worktree list | wc -l | tr -d ' ')" "No worktrees left" || true
+    assert_equals "" "$(git branch --list 'saci/*')" "No task branches left" || true
+    assert_equals "0" "$(grep -cx '/node_modules' .git/info/exclude || true)" "info/exclude restored" || true
+}
+
+# Test 3: An invalid job count is rejected
+test_invalid_jobs() {
+    echo ""
+    echo "Test 3: Invalid --jobs"
+
+    local status=0
+    bash "$SACI" jump --dry-run --jobs 0 >/dev/null 2>&1 || status=$?
+    assert_equals "1" "$status" "--jobs 0 exits with an error" || true
+}
+
+# Test 4: Sessions that edit progress.txt still merge, and see the current prp.json
+test_state_files_in_worktrees() {
+    echo ""
+    echo "Test 4: State files edited from worktrees"
+
+    mkdir stub-project
+    (
+        cd stub-project
+        git init -q
+        git config user.email "saci@test"
+        git config user.name "Saci Test"
+        printf '.saci/\n' > .gitignore
+        cat > prp.json <<'PRP'
+{"project": {"name": "Stub"}, "features": [{"id": "F1", "name": "Stub", "tasks": [
+  {"id": "T1", "title": "One", "passes": false, "tests": {"command": "test -f one.txt"}},
+  {"id": "T2", "title": "Two", "passes": false, "tests": {"command": "test -f two.txt"}},
+  {"id": "T3", "title": "Three", "passes": false, "dependencies": ["T1", "T2"],
+   "tests": {"command": "test $(grep -c '\"passes\": true' prp.json) -eq 2"}}]}]}
+PRP
+        echo "# Progress" > progress.txt
+        git add -A
+        git commit -q -m "init"
+        cat > ../script.json <<'SCRIPT'
+{"T1": [{"edits": {"one.txt": "1\n", "progress.txt": "# Progress\nT1 notes\n"}}],
+ "T2": [{"edits": {"two.txt": "2\n", "progress.txt": "# Progress\nT2 notes\n"}}],
+ "T3": [{"edits": {"three.txt": "3\n"}}]}
+SCRIPT
+        SACI_STUB_SCRIPT="$PWD/../script.json" TUI_MODE=false \
+            bash "$SACI" jump --provider stub --jobs 2 --max-iter 1 --no-hook-server < /dev/null > ../stub-jump.log 2>&1 || true
+    )
+
+    assert_equals "true true true" \
+        "$(jq -r '[.features[].tasks[].passes] | map(tostring) | join(" ")' stub-project/prp.json)" \
+        "Branches merge while the main tree's progress.txt is modified" || true
+    assert_equals "" "$(git -C stub-project log --format= --name-only --grep='\[task-' | grep -x 'prp.json\|progress.txt' | sort -u | tr '\n' ' ')" \
+        "No task commit carries prp.json or progress.txt" || true
+    assert_equals "1" "$(grep -c 'T[12] notes' stub-project/progress.txt)" \
+        "Session notes land in the main tree's progress.txt" || true
+}
+
+main() {
+    echo "Saci Parallel Jobs Tests"
+    echo "=========================================="
+
+    local work_dir
+    work_dir=$(mktemp -d)
+    cd "$work_dir"
+    create_project
+
+    test_dry_run_completes
+    test_cleanup
+    test_invalid_jobs
+    test_state_files_in_worktrees
+
+    cd "$SACI_DIR"
+    rm -rf "$work_dir"
+
+    echo ""
+    echo "=========================================="
+    echo "Test Results"
+    echo "=========================================="
+    echo -e "${GREEN}Passed: $TESTS_PASSED${NC}"
+    echo -e "${RED}Failed: $TESTS_FAILED${NC}"
+    echo "Total: $((TESTS_PASSED + TESTS_FAILED))"
+    echo ""
+
+    if [ $TESTS_FAILED -eq 0 ]; then
+        echo -e "${GREEN}All tests passed!${NC}"
+        exit 0
+    else
+        echo -e "${RED}Some tests failed!${NC}"
+        exit 1
+    fi
+}
+
+# Run tests
+main "$@"
@@ -0,0 +1,145 @@
+#!/bin/bash
+# ============================================================================
+# Tests for Prompt Cache Friendly Prompts (build_task_prompt in saci.sh)
+# Tests: the static prefix shared by every task, the prompt of a retry being
+# byte-identical to the first attempt up to the iteration section, and the
+# cache hit ratio and prefix id in metrics.jsonl (stub CLI on PATH)
+# ============================================================================
+
+set -euo pipefail
+
+# Colors for test output
+RED='\033[0;31m'
+GREEN='\033[0;32m'
+NC='\033[0m'
+
+# Test counters
+TESTS_PASSED=0
+TESTS_FAILED=0
+
+# Get script directory
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+SACI_DIR="$(dirname "$SCRIPT_DIR")"
+SACI="$SACI_DIR/saci.sh"
+
+# Test helpers
+assert_equals() {
+    local expected="$1"
+    local actual="$2"
+    local test_name="$3"
+
+    if [ "$expected" = "$actual" ]; then
+        echo -e "${GREEN}✓${NC} $test_name"
+        TESTS_PASSED=$((TESTS_PASSED + 1))
+        return 0
+    else
+        echo -e "${RED}✗${NC} $test_name"
+        echo "  Expected: $expected"
+        echo "  Actual: $actual"
+        TESTS_FAILED=$((TESTS_FAILED + 1))
+        return 1
+    fi
+}
+
+# Two tasks; T1's first attempt leaves its tests failing, the retry fixes them.
+# The stub saves each prompt and reports prompt cache usage.
+create_project() {
+    git init -q
+    git config user.email "saci@test"
+    git config user.name "Saci Test"
+    cat > prp.json <<'PRP'
+{"project": {"name": "Cache"}, "features": [{"id": "F1", "name": "F", "tasks": [
+  {"id": "T1", "title": "One", "passes": false, "tests": {"command": "test -f fixed.txt"}},
+  {"id": "T2", "title": "Two", "passes": false, "tests": {"command": "true"}}
+]}]}
+PRP
+    git add prp.json
+    git commit -q -m "init"
+
+    mkdir -p bin
+    cat > bin/claude <<'STUB'
+#!/bin/bash
+prompt="prompt-$(ls prompt-* 2>/dev/null | wc -l | tr -d ' ').txt"
+cat > "$prompt"
+[ "$prompt" = "prompt-0.txt" ] && echo "$RANDOM" > work.txt || touch fixed.txt
+echo '{"type":"result","usage":{"input_tokens":100,"output_tokens":10,"cache_read_input_tokens":300,"cache_creation_input_tokens":100},"total_cost_usd":0.01,"num_turns":1}'
+STUB
+    chmod +x bin/claude
+    echo "prompt-*.txt" > .git/info/exclude
+    echo "bin/" >> .git/info/exclude
+    echo ".saci/" >> .git/info/exclude
+
+    PATH="$PWD/bin:$PATH" bash "$SACI" jump --max-iter 2 --no-hook-server --no-trace > /dev/null 2>&1 || true
+}
+
+# Bytes before the first occurrence of a line in a file (its prefix)
+prefix_of() {
+    awk -v marker="$2" 'index($0, marker) == 1 { exit } { print }' "$1"
+}
+
+# Test 1: Layout of the prompts
+test_prompt_layout() {
+    echo ""
+    echo "Test 1: Stable prefix"
+
+    assert_equals "3" "$(ls prompt-*.txt | wc -l | tr -d ' ')" "Two attempts of T1 and one of T2" || true
+
+    # prompt-0/1: T1 iterations 1 and 2, prompt-2: T2
+    assert_equals "$(prefix_of prompt-0.txt '# Iteration ' | cksum)" "$(prefix_of prompt-1.txt '# Iteration ' | cksum)" \
+        "Retry is byte-identical to the first attempt up to the iteration section" || true
+    assert_equals "$(prefix_of prompt-0.txt '# Current Task: ' | cksum)" "$(prefix_of prompt-2.txt '# Current Task: ' | cksum)" \
+        "Tasks share the static prefix byte for byte" || true
+    assert_equals "true" \
+        "$(prefix_of prompt-1.txt '# Iteration ' | grep -q -e 'PREVIOUS ITERATION FAILED' -e 'iteration 2' && echo false || echo true)" \
+        "Iteration state only after the iteration heading" || true
+}
+
+# Test 2: Cache hit ratio in the metrics
+test_metrics() {
+    echo ""
+    echo "Test 2: Metrics"
+
+    assert_equals "0.6000 0.6000 0.6000" \
+        "$(jq -r '.cache_hit_ratio | tostring | . + "000" | .[:6]' .saci/metrics.jsonl | paste -sd' ' -)" \
+        "cache_hit_ratio = cache reads / all prompt tokens" || true
+    assert_equals "1 2" \
+        "$(jq -sr '[.[] | select(.task_id | endswith("T1")) | .prompt_prefix] | unique | length | tostring' .saci/metrics.jsonl) $(jq -sr '[.[].prompt_prefix] | unique | length | tostring' .saci/metrics.jsonl)" \
+        "Same prefix id across T1's iterations, another for T2" || true
+    assert_equals "true" "$(jq -s 'all(.[]; .prompt_prefix_bytes > 0)' .saci/metrics.jsonl)" "Prefix size recorded" || true
+}
+
+main() {
+    echo "Saci Prompt Cache Tests"
+    echo "=========================================="
+
+    local work_dir
+    work_dir=$(mktemp -d)
+    cd "$work_dir"
+    create_project
+
+    test_prompt_layout
+    test_metrics
+
+    cd "$SACI_DIR"
+    rm -rf "$work_dir"
+
+    echo ""
+    echo "=========================================="
+    echo "Test Results"
+    echo "=========================================="
+    echo -e "${GREEN}Passed: $TESTS_PASSED${NC}"
+    echo -e "${RED}Failed: $TESTS_FAILED${NC}"
+    echo "Total: $((TESTS_PASSED + TESTS_FAILED))"
+    echo ""
+
+    if [ $TESTS_FAILED -eq 0 ]; then
+        echo -e "${GREEN}All tests passed!${NC}"
+        exit 0
+    else
+        echo -e "${RED}Some tests failed!${NC}"
+        exit 1
+    fi
+}
+
+# Run tests
+main "$@"
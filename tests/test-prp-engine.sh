@@ -0,0 +1,250 @@
+#!/bin/bash
+# ============================================================================
+# Tests for the PRP Engine (lib/prp_engine.py)
+# Tests: priority order, dependency modes, task fields and counts, compared
+# with the jq queries the engine replaces in saci.sh; dependency validation;
+# journaled status updates (lib/prp_store.py)
+# ============================================================================
+
+set -euo pipefail
+
+# Colors for test output
+RED='\033[0;31m'
+GREEN='\033[0;32m'
+NC='\033[0m'
+
+# Test counters
+TESTS_PASSED=0
+TESTS_FAILED=0
+
+# Get script directory
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+SACI_DIR="$(dirname "$SCRIPT_DIR")"
+PRP_ENGINE="$SACI_DIR/lib/prp_engine.py"
+
+# Test helpers
+assert_equals() {
+    local expected="$1"
+    local actual="$2"
+    local test_name="$3"
+
+    if [ "$expected" = "$actual" ]; then
+        echo -e "${GREEN}✓${NC} $test_name"
+        TESTS_PASSED=$((TESTS_PASSED + 1))
+        return 0
+    else
+        echo -e "${RED}✗${NC} $test_name"
+        echo "  Expected: $expected"
+        echo "  Actual: $actual"
+        TESTS_FAILED=$((TESTS_FAILED + 1))
+        return 1
+    fi
+}
+
+engine() {
+    python3 "$PRP_ENGINE" --prp "$PRP_FILE" "$@"
+}
+
+# Create temp PRP file
+create_temp_prp() {
+    local temp_file=$(mktemp)
+    cat > "$temp_file" <<'EOF'
+{
+  "project": {"name": "Test Project"},
+  "features": [
+    {
+      "id": "F1",
+      "name": "Feature 1",
+      "tasks": [
+        {"id": "T1", "title": "Setup", "description": "Create the API server", "priority": 2, "passes": true,
+         "context": {"files": ["src/server.ts"], "libraries": ["express"], "hints": ["Use port 3000"]},
+         "acceptance": ["Server starts", "Health route"], "tests": {"command": "npm run test:api"}},
+        {"id": "T2", "title": "Routes", "priority": 1, "passes": false, "dependencies": ["T1"]},
+        {"id": "T3", "title": "Auth", "priority": 1, "passes": false, "dependencies": ["T2", "T1"]},
+        {"id": "T4", "title": "Docs", "priority": 3, "passes": false, "dependencies": ["T2", "T3"], "dependencyMode": "any"}
+      ]
+    },
+    {
+      "id": "F2",
+      "name": "Feature 2",
+      "tasks": [
+        {"id": "T5", "title": "UI", "passes": false},
+        {"id": "T6", "title": "Missing dep", "priority": 0, "passes": false, "dependencies": ["T99"]}
+      ]
+    }
+  ]
+}
+EOF
+    echo "$temp_file"
+}
+
+# jq queries from saci.sh, for comparison
+jq_candidates() {
+    jq -r '[.features[] | .tasks[] | select(.passes == false)] | sort_by(.priority) | .[] | .id' "$PRP_FILE"
+}
+
+jq_task_context() {
+    jq -r --arg id "$1" '
+        .features[].tasks[] | select(.id == $id) | .context |
+        "Files: \(.files // [] | join(", "))\n" +
+        "Libraries: \(.libraries // [] | join(", "))\n" +
+        "Hints:\n\(.hints // [] | map("- " + .) | join("\n"))"
+    ' "$PRP_FILE"
+}
+
+# Test 1: Ready queue follows jq's stable priority order (null priority first)
+test_priority_order() {
+    echo ""
+    echo "Test 1: Priority order"
+
+    assert_equals "$(jq_candidates)" "$(engine pending)" "Candidate order matches jq sort_by" || true
+    assert_equals "T5 T2" "$(engine ready | tr '\n' ' ' | sed 's/ $//')" "Only tasks with met dependencies are ready" || true
+    assert_equals "T5" "$(engine next)" "Next task is the first ready one" || true
+}
+
+# Test 2: dependencyMode all/any and unknown dependencies
+test_dependency_modes() {
+    echo ""
+    echo "Test 2: Dependency modes"
+
+    local status=0
+    engine deps-met T3 || status=$?
+    assert_equals "1" "$status" "Mode 'all' blocks until every dependency passes" || true
+    assert_equals "T2" "$(engine blocked T3)" "Blocked lists only unmet dependencies" || true
+
+    jq '(.features[0].tasks[1].passes) = true' "$PRP_FILE" > "$PRP_FILE.tmp" && mv "$PRP_FILE.tmp" "$PRP_FILE"
+    status=0
+    engine deps-met T4 || status=$?
+    assert_equals "0" "$status" "Mode 'any' is met by one passing dependency" || true
+
+    status=0
+    engine deps-met T6 || status=$?
+    assert_equals "1" "$status" "Unknown dependency is never met" || true
+}
+
+# Test 3: Task fields formatted like the jq queries
+test_task_fields() {
+    echo ""
+    echo "Test 3: Task fields"
+
+    assert_equals "$(jq_task_context T1)" "$(engine context T1)" "Context matches jq output" || true
+    assert_equals "$(jq_task_context T5)" "$(engine context T5)" "Context without context object matches jq" || true
+    assert_equals "npm run test:api" "$(engine test-command T1)" "Test command from tests.command" || true
+    assert_equals "npm test" "$(engine test-command T5)" "Default test command" || true
+
+    local TASK_TITLE="" TASK_ACCEPTANCE="" TASK_FEATURE=""
+    eval "$(engine task-env T1)"
+    assert_equals "Setup|- Server starts
+- Health route|Feature 1" "$TASK_TITLE|$TASK_ACCEPTANCE|$TASK_FEATURE" "task-env exports the task fields" || true
+}
+
+# Test 4: Counts and loop state
+test_counts() {
+    echo ""
+    echo "Test 4: Counts"
+
+    local NEXT_TASK="" REMAINING_TASKS="" TOTAL_TASKS=""
+    eval "$(engine loop-state)"
+    assert_equals "T5 4 6" "$NEXT_TASK $REMAINING_TASKS $TOTAL_TASKS" "loop-state reports next task and counts" || true
+
+    local status=0
+    engine complete || status=$?
+    assert_equals "1" "$status" "PRP with pending tasks is not complete" || true
+}
+
+# Test 5: Validation reports every cycle, unknown ids and duplicates
+test_validation() {
+    echo ""
+    echo "Test 5: Dependency validation"
+
+    local prp_file
+    prp_file=$(mktemp)
+    cat > "$prp_file" <<'EOF'
+{
+  "features": [
+    {"name": "F", "tasks": [
+      {"id": "A", "dependencies": ["C"]},
+      {"id": "B", "dependencies": ["A", "Z"]},
+      {"id": "C", "dependencies": ["B"]},
+      {"id": "D", "dependencies": ["D"], "dependencyMode": "some"},
+      {"id": "E", "dependencies": ["A"]},
+      {"id": "E"}
+    ]}
+  ]
+}
+EOF
+
+    local problems status=0
+    problems=$(python3 "$PRP_ENGINE" --prp "$prp_file" validate) || status=$?
+    assert_equals "1" "$status" "Invalid graph exits with 1" || true
+    assert_equals "duplicate|E
+missing|B|Z
+mode|D|some
+cycle|A -> C -> B -> A
+cycle|D -> D" "$problems" "Duplicates, unknown ids, modes and all cycles" || true
+
+    assert_equals "missing|T6|T99" "$(engine validate || true)" "Acyclic graph reports only the unknown id" || true
+
+    rm -f "$prp_file"
+}
+
+# Test 6: Status changes go to the journal until compaction
+test_status_journal() {
+    echo ""
+    echo "Test 6: Status journal"
+
+    local before
+    before=$(cat "$PRP_FILE")
+    engine mark T5
+    engine mark T6
+    assert_equals "$before" "$(cat "$PRP_FILE")" "mark leaves prp.json untouched" || true
+    assert_equals "T5|true" "$(engine status | grep '^T5|' | cut -d'|' -f1,2)" "Reads see the journaled status" || true
+
+    assert_equals "T2 T3 T4" "$(engine reset T2 --cascade)" "Cascade reset covers dependents transitively" || true
+
+    engine compact
+    assert_equals "true false false false true true" \
+        "$(jq -r '[.features[].tasks[].passes] | map(tostring) | join(" ")' "$PRP_FILE")" \
+        "compact writes the journal into prp.json" || true
+    assert_equals "0" "$(wc -c < "$(dirname "$PRP_FILE")/.saci/cache/$(basename "$PRP_FILE").journal" | tr -d ' ')" \
+        "compact empties the journal" || true
+}
+
+main() {
+    echo "Saci PRP Engine Tests"
+    echo "=========================================="
+
+    local work_dir
+    work_dir=$(mktemp -d)
+    PRP_FILE="$work_dir/prp.json"
+    mv "$(create_temp_prp)" "$PRP_FILE"
+
+    test_priority_order
+    test_dependency_modes
+    test_task_fields
+    test_counts
+    test_validation
+    test_status_journal
+
+    rm -rf "$work_dir"
+
+    echo ""
+    echo "=========================================="
+    echo "Test Results"
+    echo "=========================================="
+    echo -e "${GREEN}Passed: $TESTS_PASSED${NC}"
+    echo -e "${RED}Failed: $TESTS_FAILED${NC}"
+    echo "Total: $((TESTS_PASSED + TESTS_FAILED))"
+    echo ""
+
+    if [ $TESTS_FAILED -eq 0 ]; then
+        echo -e "${GREEN}All tests passed!${NC}"
+        exit 0
+    else
+        echo -e "${RED}Some tests failed!${NC}"
+        exit 1
+    fi
+}
+
+# Run tests
+main "$@"
@@ -0,0 +1,151 @@
+#!/bin/bash
+# ============================================================================
+# Tests for the Scan Engine (lib/scan_engine.py)
+# Tests: detection matches scanner.sh's detect_* functions, .gitignore
+# pruning, workspace packages, incremental re-scans from the scan index
+# ============================================================================
+
+set -euo pipefail
+
+# Colors for test output
+RED='\033[0;31m'
+GREEN='\033[0;32m'
+NC='\033[0m'
+
+# Test counters
+TESTS_PASSED=0
+TESTS_FAILED=0
+
+# Get script directory
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+SACI_DIR="$(dirname "$SCRIPT_DIR")"
+SCAN_ENGINE="$SACI_DIR/lib/scan_engine.py"
+
+# Test helpers
+assert_equals() {
+    local expected="$1"
+    local actual="$2"
+    local test_name="$3"
+
+    if [ "$expected" = "$actual" ]; then
+        echo -e "${GREEN}✓${NC} $test_name"
+        TESTS_PASSED=$((TESTS_PASSED + 1))
+        return 0
+    else
+        echo -e "${RED}✗${NC} $test_name"
+        echo "  Expected: $expected"
+        echo "  Actual: $actual"
+        TESTS_FAILED=$((TESTS_FAILED + 1))
+        return 1
+    fi
+}
+
+scan() {
+    python3 "$SCAN_ENGINE" --root . "$@"
+}
+
+# Lines of one kind from the shell output, space separated
+scan_field() {
+    scan | grep "^$1|" | cut -d'|' -f2- | tr '\n' ' ' | sed 's/ $//'
+}
+
+# A monorepo with two workspace packages and some ignored output
+create_project() {
+    cat > package.json <<'EOF'
+{"name": "mono", "workspaces": ["apps/*"], "dependencies": {"next": "14", "zod": "3", "tailwindcss": "3"},
+ "devDependencies": {"jest": "29"}}
+EOF
+    touch tsconfig.json requirements.txt
+    mkdir -p src/components src/hooks apps/web/src/app/api apps/api/src build/out dist node_modules/pkg
+    echo '{"name": "@mono/web", "dependencies": {"react": "18", "axios": "1"}}' > apps/web/package.json
+    echo '{"name": "@mono/api", "dependencies": {"express": "4", "prisma": "5"}}' > apps/api/package.json
+    echo 'export const Input = forwardRef(() => null)' > src/components/Input.tsx
+    echo '"use server"' > build/out/actions.tsx
+    touch dist/button.spec.ts node_modules/pkg/ThemeProvider.js
+    printf 'build/\n/dist\n' > .gitignore
+}
+
+# Test 1: Same stack, paths and libraries as the shell detection
+test_matches_shell() {
+    echo ""
+    echo "Test 1: Root detection matches scanner.sh"
+
+    local shell_stack shell_paths shell_libs
+    shell_stack=$(bash -c "source '$SACI_DIR/lib/scanner.sh'; detect_stack")
+    shell_paths=$(bash -c "source '$SACI_DIR/lib/scanner.sh'; detect_paths")
+    shell_libs=$(bash -c "source '$SACI_DIR/lib/scanner.sh'; detect_libraries")
+
+    local engine_stack
+    engine_stack=$(python3 -c "import sys; sys.path.insert(0, '$SACI_DIR/lib'); import scan_engine; print(' '.join(scan_engine.project_stack('.')))")
+    assert_equals "$shell_stack" "$engine_stack" "Root stack matches detect_stack" || true
+    assert_equals "$shell_paths" "$(scan | grep '^path|' | cut -d'|' -f2- | tr '|' ':' | tr '\n' ' ' | sed 's/ $//')" \
+        "Paths match detect_paths" || true
+    assert_equals "$shell_libs axios" "$(scan_field lib)" "Libraries match detect_libraries, plus the packages'" || true
+}
+
+# Test 2: Workspace packages and .gitignore pruning
+test_monorepo() {
+    echo ""
+    echo "Test 2: Workspaces and .gitignore"
+
+    assert_equals "Next.js TypeScript Tailwind Jest Python Express Prisma React" "$(scan_field stack)" \
+        "Package stacks are merged into the project's" || true
+    assert_equals "Uses forwardRef for component refs Next.js App Router API routes Custom hooks in dedicated folder" \
+        "$(scan | grep '^pattern|' | cut -d'|' -f2 | paste -sd' ' -)" \
+        "Ignored and node_modules files add no patterns" || true
+}
+
+# Test 3: Re-scans only re-examine what changed
+test_incremental() {
+    echo ""
+    echo "Test 3: Incremental re-scan"
+
+    scan > /dev/null
+    assert_equals "0" "$(scan | grep '^scanned|' | cut -d'|' -f3)" "Unchanged tree lists no directory again" || true
+
+    echo 'const ThemeContext = createContext(null)' > src/components/ThemeContext.tsx
+    echo '"use server"' > src/components/Input.tsx
+    local output
+    output=$(scan)
+    assert_equals "1" "$(echo "$output" | grep '^scanned|' | cut -d'|' -f3)" "Only the changed directory is listed again" || true
+    assert_equals "React Context for state|Uses Server Actions" \
+        "$(echo "$output" | grep '^pattern|' | cut -d'|' -f2 | grep -E 'Context|Server|forwardRef' | paste -sd'|' -)" \
+        "New file and edited source are picked up" || true
+}
+
+main() {
+    echo "Saci Scan Engine Tests"
+    echo "=========================================="
+
+    local work_dir
+    work_dir=$(mktemp -d)
+    cd "$work_dir"
+    create_project
+
+    test_matches_shell
+    test_monorepo
+    test_incremental
+
+    cd "$SACI_DIR"
+    rm -rf "$work_dir"
+
+    echo ""
+    echo "=========================================="
+    echo "Test Results"
+    echo "=========================================="
+    echo -e "${GREEN}Passed: $TESTS_PASSED${NC}"
+    echo -e "${RED}Failed: $TESTS_FAILED${NC}"
+    echo "Total: $((TESTS_PASSED + TESTS_FAILED))"
+    echo ""
+
+    if [ $TESTS_FAILED -eq 0 ]; then
+        echo -e "${GREEN}All tests passed!${NC}"
+        exit 0
+    else
+        echo -e "${RED}Some tests failed!${NC}"
+        exit 1
+    fi
+}
+
+# Run tests
+main "$@"
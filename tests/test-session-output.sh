@@ -0,0 +1,139 @@
+#!/bin/bash
+# ============================================================================
+# Tests for the Session Output Parser (lib/session_output.py)
+# Tests: fields match the jq queries it replaces, per-turn breakdown,
+# stderr noise between messages, newline-delimited output
+# ============================================================================
+
+set -euo pipefail
+
+# Colors for test output
+RED='\033[0;31m'
+GREEN='\033[0;32m'
+NC='\033[0m'
+
+# Test counters
+TESTS_PASSED=0
+TESTS_FAILED=0
+
+# Get script directory
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+SACI_DIR="$(dirname "$SCRIPT_DIR")"
+SESSION_OUTPUT="$SACI_DIR/lib/session_output.py"
+
+# Test helpers
+assert_equals() {
+    local expected="$1"
+    local actual="$2"
+    local test_name="$3"
+
+    if [ "$expected" = "$actual" ]; then
+        echo -e "${GREEN}✓${NC} $test_name"
+        TESTS_PASSED=$((TESTS_PASSED + 1))
+        return 0
+    else
+        echo -e "${RED}✗${NC} $test_name"
+        echo "  Expected: $expected"
+        echo "  Actual: $actual"
+        TESTS_FAILED=$((TESTS_FAILED + 1))
+        return 1
+    fi
+}
+
+# Claude CLI --output-format json --verbose: a JSON array of messages.
+# m1 is one response split over two content blocks (one turn).
+create_session_output() {
+    cat > "$1" <<'JSON'
+[{"type":"system","subtype":"init","session_id":"s1"},
+{"type":"assistant","message":{"id":"m1","content":[{"type":"text","text":"quote \" and { brace"}],"usage":{"input_tokens":10,"cache_read_input_tokens":100,"output_tokens":5}}},
+{"type":"assistant","message":{"id":"m1","content":[{"type":"tool_use","input":{"command":"echo }"}}],"usage":{"input_tokens":10,"cache_read_input_tokens":100,"output_tokens":7}}},
+{"type":"assistant","message":{"id":"m2","usage":{"input_tokens":3,"output_tokens":2}}},
+{"type":"result","subtype":"success","num_turns":2,"usage":{"input_tokens":13,"output_tokens":9,"cache_read_input_tokens":100,"cache_creation_input_tokens":40},"total_cost_usd":0.01234,"modelUsage":{"claude-sonnet-4":{},"claude-haiku":{}}}]
+JSON
+}
+
+# The jq queries extract_tokens_from_output used to run, one per field
+jq_fields() {
+    local file="$1" field
+    for field in input_tokens output_tokens cache_read_input_tokens cache_creation_input_tokens; do
+        jq -r ".[] | select(.type == \"result\") | .usage.$field // 0" "$file"
+    done
+    jq -r '.[] | select(.type == "result") | .modelUsage | keys[0] // "unknown"' "$file"
+    jq -r '.[] | select(.type == "result") | .total_cost_usd // 0' "$file"
+}
+
+# Test 1: Usage, model and cost match jq
+test_matches_jq() {
+    echo ""
+    echo "Test 1: Fields match jq"
+
+    local csv input output cache_read cache_creation total model cost turns turn_tokens
+    csv=$(python3 "$SESSION_OUTPUT" session.json)
+    IFS=',' read -r input output cache_read cache_creation total model cost turns turn_tokens <<< "$csv"
+
+    assert_equals "$(jq_fields session.json | tr '\n' ' ')" \
+        "$input $output $cache_read $cache_creation $model $cost " "Usage, model and cost" || true
+    assert_equals "122" "$total" "Total = input + cache reads + output" || true
+}
+
+# Test 2: One entry per turn, repeated message ids counted once
+test_turns() {
+    echo ""
+    echo "Test 2: Per-turn breakdown"
+
+    assert_equals '2 [117,5]' "$(python3 "$SESSION_OUTPUT" session.json --format json | jq -c '"\(.turns) \(.turn_tokens)"' -r)" \
+        "Turns and tokens per turn" || true
+}
+
+# Test 3: stderr lines mixed in by 2>&1, and newline-delimited messages
+test_noisy_output() {
+    echo ""
+    echo "Test 3: Noisy and newline-delimited output"
+
+    { echo "warning: retrying {request"; cat session.json; echo "done"; } > noisy.json
+    assert_equals "$(python3 "$SESSION_OUTPUT" session.json)" "$(python3 "$SESSION_OUTPUT" noisy.json)" \
+        "Text between messages is skipped" || true
+
+    jq -c '.[]' session.json > stream.jsonl
+    assert_equals "$(python3 "$SESSION_OUTPUT" session.json)" "$(python3 "$SESSION_OUTPUT" stream.jsonl)" \
+        "Newline-delimited messages" || true
+
+    assert_equals "0,0,0,0,0,unknown,0,0,[]" "$(python3 "$SESSION_OUTPUT" missing.json)" "Missing output yields zeros" || true
+}
+
+main() {
+    echo "Saci Session Output Tests"
+    echo "=========================================="
+
+    local work_dir
+    work_dir=$(mktemp -d)
+    cd "$work_dir"
+    create_session_output session.json
+
+    test_matches_jq
+    test_turns
+    test_noisy_output
+
+    cd "$SACI_DIR"
+    rm -rf "$work_dir"
+
+    echo ""
+    echo "=========================================="
+    echo "Test Results"
+    echo "=========================================="
+    echo -e "${GREEN}Passed: $TESTS_PASSED${NC}"
+    echo -e "${RED}Failed: $TESTS_FAILED${NC}"
+    echo "Total: $((TESTS_PASSED + TESTS_FAILED))"
+    echo ""
+
+    if [ $TESTS_FAILED -eq 0 ]; then
+        echo -e "${GREEN}All tests passed!${NC}"
+        exit 0
+    else
+        echo -e "${RED}Some tests failed!${NC}"
+        exit 1
+    fi
+}
+
+# Run tests
+main "$@"
@@ -0,0 +1,205 @@
+#!/bin/bash
+# ============================================================================
+# Tests for Speculative Test Runs (.saci/hooks/test_worker.py)
+# Tests: an edit (track-edits.py) starting a debounced background run whose
+# verdict the Stop hook reuses, the Stop hook joining a run in flight instead
+# of starting its own, newer edits cancelling a stale run, a run longer than
+# the Stop hook's wait reported as still running, and stopping the worker
+# ============================================================================
+
+set -euo pipefail
+
+# Colors for test output
+RED='\033[0;31m'
+GREEN='\033[0;32m'
+NC='\033[0m'
+
+# Test counters
+TESTS_PASSED=0
+TESTS_FAILED=0
+
+# Get script directory
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+SACI_DIR="$(dirname "$SCRIPT_DIR")"
+HOOKS_DIR="$SACI_DIR/.saci/hooks"
+
+# Test helpers
+assert_equals() {
+    local expected="$1"
+    local actual="$2"
+    local test_name="$3"
+
+    if [ "$expected" = "$actual" ]; then
+        echo -e "${GREEN}✓${NC} $test_name"
+        TESTS_PASSED=$((TESTS_PASSED + 1))
+        return 0
+    else
+        echo -e "${RED}✗${NC} $test_name"
+        echo "  Expected: $expected"
+        echo "  Actual: $actual"
+        TESTS_FAILED=$((TESTS_FAILED + 1))
+        return 1
+    fi
+}
+
+# Tests take a second and log each run (runs.log is ignored)
+create_project() {
+    git init -q
+    git config user.email "saci@test"
+    git config user.name "Saci Test"
+    echo '{"scripts": {"test": "echo run >> runs.log && sleep 1 && test -f ok.txt"}}' > package.json
+    printf 'runs.log\ntrace.jsonl\n.saci/\n' > .gitignore
+    git add package.json .gitignore
+    git commit -q -m "init"
+}
+
+# Write a file through the PostToolUse hook
+edit() {
+    echo "$2" > "$1"
+    printf '{"hook_event_name":"PostToolUse","tool_name":"Write","cwd":"%s","tool_input":{"file_path":"%s"},"tool_response":{"type":"update"}}' \
+        "$PWD" "$1" | python3 "$HOOKS_DIR/track-edits.py"
+}
+
+# Outcomes of the trace's test spans named $1, space separated
+outcomes() {
+    [ -f trace.jsonl ] || return 0
+    jq -r --arg name "$1" 'select(.kind == "test" and .name == $name) | .outcome' trace.jsonl | paste -sd' ' -
+}
+
+runs() {
+    [ -f runs.log ] && wc -l < runs.log | tr -d ' ' || echo 0
+}
+
+wait_for_outcome() {
+    for _ in $(seq 1 100); do
+        [ -n "$(outcomes speculative)" ] && return
+        sleep 0.1
+    done
+}
+
+# Test 1: An edit starts a background run the Stop hook reuses
+test_background_run() {
+    echo ""
+    echo "Test 1: Background run"
+
+    edit ok.txt "fixed"
+    wait_for_outcome
+    assert_equals "pass 1" "$(outcomes speculative) $(runs)" "Edit triggered one debounced run" || true
+
+    local output
+    output=$(echo '{"hook_event_name":"Stop"}' | python3 "$HOOKS_DIR/check-if-done.py")
+    assert_equals "|cached|1" "$output|$(outcomes check-if-done)|$(runs)" \
+        "Stop hook allowed from the stored verdict without running tests" || true
+}
+
+# Test 2: The Stop hook joins the worker instead of running the suite itself
+test_join() {
+    echo ""
+    echo "Test 2: Stop during a debounce"
+
+    rm -f runs.log trace.jsonl
+    edit ok.txt "fixed again"
+    local output
+    output=$(echo '{"hook_event_name":"Stop"}' | python3 "$HOOKS_DIR/check-if-done.py")
+    assert_equals "|speculative|pass|1" "$output|$(outcomes check-if-done)|$(outcomes speculative)|$(runs)" \
+        "Stop hook waited for the worker's run (one run in total)" || true
+}
+
+# Test 3: Newer edits cancel a stale run
+test_cancel() {
+    echo ""
+    echo "Test 3: Cancellation"
+
+    rm -f runs.log trace.jsonl
+    edit ok.txt "v3"
+    for _ in $(seq 1 50); do
+        [ -f runs.log ] && break
+        sleep 0.1
+    done
+    edit ok.txt "v4"
+    for _ in $(seq 1 100); do
+        [ "$(outcomes speculative)" = "cancelled pass" ] && break
+        sleep 0.1
+    done
+    assert_equals "cancelled pass 2" "$(outcomes speculative) $(runs)" "Stale run cancelled, the new tree tested" || true
+}
+
+# Test 4: A run longer than the Stop hook's wait is not waited for or repeated
+test_still_running() {
+    echo ""
+    echo "Test 4: Run longer than the Stop hook's wait"
+
+    rm -f runs.log trace.jsonl
+    edit package.json '{"scripts": {"test": "echo run >> runs.log && sleep 5 && test -f ok.txt"}}'
+    for _ in $(seq 1 50); do
+        [ -f runs.log ] && break
+        sleep 0.1
+    done
+
+    local started output decision elapsed
+    started=$(date +%s)
+    output=$(echo '{"hook_event_name":"Stop"}' | python3 "$HOOKS_DIR/check-if-done.py")
+    elapsed=$(($(date +%s) - started))
+    decision=$(echo "$output" | jq -r '.decision + " " + (.reason | test("still running") | tostring)')
+    assert_equals "block true|pending|1" "$decision|$(outcomes check-if-done)|$(runs)" \
+        "Stop hook blocked as still running without a run of its own" || true
+    assert_equals "true" "$([ "$elapsed" -lt 5 ] && echo true || echo false)" "Stop hook answered within its timeout" || true
+
+    wait_for_outcome
+    output=$(echo '{"hook_event_name":"Stop"}' | python3 "$HOOKS_DIR/check-if-done.py")
+    assert_equals "|pending cached|1" "$output|$(outcomes check-if-done)|$(runs)" \
+        "Next stop attempt allowed from the finished run" || true
+}
+
+# Test 5: Stopping the worker
+test_stop() {
+    echo ""
+    echo "Test 5: Stop"
+
+    local pid
+    pid=$(cat .saci/cache/test-worker/worker.pid)
+    python3 "$HOOKS_DIR/test_worker.py" stop
+    assert_equals "false" "$(kill -0 "$pid" 2>/dev/null && echo true || echo false)" "Worker exited" || true
+}
+
+main() {
+    echo "Saci Speculative Test Tests"
+    echo "=========================================="
+
+    local work_dir
+    work_dir=$(mktemp -d)
+    cd "$work_dir"
+    create_project
+    export SACI_SPECULATIVE_TESTS=true
+    export SACI_TRACE_FILE="$work_dir/trace.jsonl"
+
+    test_background_run
+    test_join
+    test_cancel
+    test_still_running
+    test_stop
+
+    python3 "$HOOKS_DIR/test_worker.py" stop
+    cd "$SACI_DIR"
+    rm -rf "$work_dir"
+
+    echo ""
+    echo "=========================================="
+    echo "Test Results"
+    echo "=========================================="
+    echo -e "${GREEN}Passed: $TESTS_PASSED${NC}"
+    echo -e "${RED}Failed: $TESTS_FAILED${NC}"
+    echo "Total: $((TESTS_PASSED + TESTS_FAILED))"
+    echo ""
+
+    if [ $TESTS_FAILED -eq 0 ]; then
+        echo -e "${GREEN}All tests passed!${NC}"
+        exit 0
+    else
+        echo -e "${RED}Some tests failed!${NC}"
+        exit 1
+    fi
+}
+
+# Run tests
+main "$@"
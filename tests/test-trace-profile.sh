@@ -0,0 +1,188 @@
+#!/bin/bash
+# ============================================================================
+# Tests for Timing Traces and `saci profile` (saci_trace.py, profile_report.py)
+# Tests: hook spans (outcome, event, payload size, task attribution), spans of
+# the Stop hook's test run, loop phase spans of `saci jump` and the profile
+# breakdown built from them (a stub CLI on PATH stands in for claude)
+# ============================================================================
+
+set -euo pipefail
+
+# Colors for test output
+RED='\033[0;31m'
+GREEN='\033[0;32m'
+NC='\033[0m'
+
+# Test counters
+TESTS_PASSED=0
+TESTS_FAILED=0
+
+# Get script directory
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+SACI_DIR="$(dirname "$SCRIPT_DIR")"
+SACI="$SACI_DIR/saci.sh"
+HOOKS_DIR="$SACI_DIR/.saci/hooks"
+
+# Test helpers
+assert_equals() {
+    local expected="$1"
+    local actual="$2"
+    local test_name="$3"
+
+    if [ "$expected" = "$actual" ]; then
+        echo -e "${GREEN}✓${NC} $test_name"
+        TESTS_PASSED=$((TESTS_PASSED + 1))
+        return 0
+    else
+        echo -e "${RED}✗${NC} $test_name"
+        echo "  Expected: $expected"
+        echo "  Actual: $actual"
+        TESTS_FAILED=$((TESTS_FAILED + 1))
+        return 1
+    fi
+}
+
+# Git project with one task and a CLI stub that edits a file and triggers
+# the PreToolUse and Stop hooks the way a session would
+create_project() {
+    git init -q
+    git config user.email "saci@test"
+    git config user.name "Saci Test"
+    cat > prp.json <<'PRP'
+{
+  "project": {"name": "Trace"},
+  "features": [
+    {"id": "F1", "name": "Feature 1", "tasks": [
+      {"id": "T1", "title": "One", "passes": false, "tests": {"command": "true"}}
+    ]}
+  ]
+}
+PRP
+    echo '{"scripts": {"test": "true"}}' > package.json
+    git add prp.json package.json
+    git commit -q -m "init"
+
+    mkdir -p "$STUB_DIR"
+    cat > "$STUB_DIR/claude" <<STUB
+#!/bin/bash
+cat > /dev/null
+echo '{"hook_event_name":"PreToolUse","tool_name":"Bash","tool_input":{"command":"npm run nope"}}' \\
+    | python3 "$HOOKS_DIR/hook_client.py" "$HOOKS_DIR/validate-bash.py" > /dev/null
+echo '{"hook_event_name":"Stop"}' | python3 "$HOOKS_DIR/check-if-done.py"
+echo done > work.txt
+echo '{"type":"result","usage":{"input_tokens":10,"output_tokens":5},"total_cost_usd":0.01,"num_turns":1}'
+STUB
+    chmod +x "$STUB_DIR/claude"
+}
+
+# Field of the trace's spans of one kind/name, space separated
+span_field() {
+    python3 -c "
+import json, sys
+for line in open(sys.argv[1]):
+    span = json.loads(line)
+    if span['kind'] == sys.argv[2] and span['name'] == sys.argv[3]:
+        print(span.get(sys.argv[4]))
+" "$1" "$2" "$3" "$4" | tr '\n' ' ' | sed 's/ $//'
+}
+
+# Test 1: Hook spans carry outcome, event, payload size and the task
+test_hook_spans() {
+    echo ""
+    echo "Test 1: Hook spans"
+
+    local payload='{"hook_event_name":"PreToolUse","tool_name":"Bash","tool_input":{"command":"npm run nope"}}'
+    echo "$payload" | python3 "$HOOKS_DIR/validate-bash.py" > /dev/null
+    assert_equals "false" "$([ -f hooks.jsonl ] && echo true || echo false)" \
+        "No trace without SACI_TRACE_FILE" || true
+
+    printf '%s' "$payload" | SACI_TRACE_FILE="$PWD/hooks.jsonl" SACI_TASK_ID=T9 SACI_ITERATION=3 \
+        python3 "$HOOKS_DIR/validate-bash.py" > /dev/null
+    assert_equals "blocked PreToolUse ${#payload} T9 3" \
+        "$(for field in outcome event payload_bytes task_id iteration; do span_field hooks.jsonl hook validate-bash $field; echo; done | paste -sd' ' -)" \
+        "Denied command is a blocked PreToolUse span of the task's iteration" || true
+
+    echo '{"scripts": {"test": "exit 1"}}' > package.json
+    echo '{"hook_event_name":"Stop"}' | SACI_TRACE_FILE="$PWD/hooks.jsonl" python3 "$HOOKS_DIR/check-if-done.py" > /dev/null
+    git checkout -q package.json
+    assert_equals "blocked fail" \
+        "$(span_field hooks.jsonl hook check-if-done outcome) $(span_field hooks.jsonl test check-if-done outcome)" \
+        "Stop hook span and the span of the tests it ran" || true
+    rm -f hooks.jsonl
+}
+
+# Test 2: A run records its phases and `saci profile` breaks them down
+test_profile() {
+    echo ""
+    echo "Test 2: Run phases and profile"
+
+    PATH="$STUB_DIR:$PATH" bash "$SACI" jump --no-hook-server > /dev/null 2>&1
+    assert_equals "success" "$(span_field .saci/trace.jsonl phase iteration outcome)" \
+        "Iteration span with its result" || true
+
+    local profile
+    profile=$(bash "$SACI" profile --json)
+    assert_equals "T1 1 cli commit loop prompt" \
+        "$(echo "$profile" | jq -r '.iterations[0] | [.task_id, (.iteration | tostring)] + ([.phases[].name] | sort) | join(" ")')" \
+        "Sequential phases of the iteration" || true
+    assert_equals "check-if-done|check-if-done (Stop)|validate-bash (PreToolUse)" \
+        "$(echo "$profile" | jq -r '[.iterations[0].nested[] | select(.kind != "prp") | .name] | sort | join("|")')" \
+        "Hooks and their tests are listed within the iteration" || true
+    assert_equals "true" \
+        "$(echo "$profile" | jq '.iterations[0] | (.phases | map(.total_ms) | add) + .other_ms == .wall_ms')" \
+        "Phases and other add up to the iteration's wall-clock time" || true
+}
+
+# Test 3: --no-trace records nothing
+test_no_trace() {
+    echo ""
+    echo "Test 3: Tracing disabled"
+
+    rm -f .saci/trace.jsonl
+    jq '.features[].tasks[].passes = false' prp.json > prp.tmp && mv prp.tmp prp.json
+    PATH="$STUB_DIR:$PATH" bash "$SACI" jump --no-hook-server --no-trace > /dev/null 2>&1
+    assert_equals "false" "$([ -f .saci/trace.jsonl ] && echo true || echo false)" "No trace written" || true
+
+    local status=0
+    bash "$SACI" profile > /dev/null 2>&1 || status=$?
+    assert_equals "1" "$status" "profile without a trace exits with an error" || true
+}
+
+main() {
+    echo "Saci Trace and Profile Tests"
+    echo "=========================================="
+
+    local work_dir
+    work_dir=$(mktemp -d)
+    STUB_DIR="$work_dir/bin"
+    mkdir -p "$work_dir/project"
+    cd "$work_dir/project"
+    create_project
+
+    test_hook_spans
+    test_profile
+    test_no_trace
+
+    cd "$SACI_DIR"
+    rm -rf "$work_dir"
+
+    echo ""
+    echo "=========================================="
+    echo "Test Results"
+    echo "=========================================="
+    echo -e "${GREEN}Passed: $TESTS_PASSED${NC}"
+    echo -e "${RED}Failed: $TESTS_FAILED${NC}"
+    echo "Total: $((TESTS_PASSED + TESTS_FAILED))"
+    echo ""
+
+    if [ $TESTS_FAILED -eq 0 ]; then
+        echo -e "${GREEN}All tests passed!${NC}"
+        exit 0
+    else
+        echo -e "${RED}Some tests failed!${NC}"
+        exit 1
+    fi
+}
+
+# Run tests
+main "$@"